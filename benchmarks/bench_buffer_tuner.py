@@ -0,0 +1,80 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+BufferTuner searching the smallest acquisition buffer count for a consumer that stalls for 60 ms
+every 25 frames at 100 fps, then a second run starting directly from the stored result.
+
+    python benchmarks/bench_buffer_tuner.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+SESSION_SECONDS = 2.0
+MAX_SESSIONS = 16
+
+
+def consume(data_stream, seconds):
+    # a detector that usually keeps up, but stalls now and then
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        raw_image = data_stream.get_image(100)
+        if raw_image is None:
+            continue
+        count += 1
+        time.sleep(0.06 if count % 25 == 0 else 0.002)
+
+
+def run(device_manager, sn, store_path):
+    cam = device_manager.open_device_by_sn(sn)
+    cam.Width.set(640)
+    cam.Height.set(480)
+    cam.AcquisitionFrameRateMode.set(gx.GxSwitchEntry.ON)
+    cam.AcquisitionFrameRate.set(100.0)
+
+    tuner = gx.BufferTuner(cam, store_path=store_path, baseline={"AcquisitionBufferNumber": 16})
+    print("%-10s %8s %10s %8s %8s %8s" % ("phase", "buffers", "footprint", "fps", "lost", "clean"))
+    for i in range(MAX_SESSIONS):
+        phase = tuner.get_phase()
+        tuner.start_session()
+        consume(cam.data_stream[0], SESSION_SECONDS)
+        report = tuner.stop_session()
+        print("%-10s %8d %8.1f MB %8.1f %8d %8s" % (
+            phase, report["settings"]["AcquisitionBufferNumber"], report["footprint"] / 1e6,
+            report["fps"], report["lost"], report["clean"]))
+        if phase == gx.BufferTunerPhase.CONVERGED or tuner.get_phase() == gx.BufferTunerPhase.FAILED:
+            break
+    cam.close_device()
+    return tuner.get_settings()
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    sn = dev_info_list[0].get("sn")
+    store_path = os.path.join(tempfile.mkdtemp(), "buffer_tuning.json")
+    print("first run, tuning from 16 buffers:")
+    settings = run(device_manager, sn, store_path)
+    print("tuned: %s" % settings)
+    print("second run, from %s:" % store_path)
+    run(device_manager, sn, store_path)
+
+    os.remove(store_path)
+    os.rmdir(os.path.dirname(store_path))
+
+
+if __name__ == "__main__":
+    main()
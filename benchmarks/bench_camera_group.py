@@ -0,0 +1,110 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Software-triggered capture of 1, 2 and 4 cameras: one Python loop dequeuing every camera in turn
+against a CameraGroup with a thread per camera and a CameraGroup with a worker process per camera,
+then matching with frames lost by one camera. The worker processes only pay off with a core per
+camera to spare, the CPU count is printed with the results.
+
+    python benchmarks/bench_camera_group.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+os.environ.setdefault("GXIPY_SIM_CAMERAS", "4")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+TRIGGERS = 200
+FEATURES = [("Width", 1280), ("Height", 1024)]
+
+
+def configure(cam):
+    cam.get_remote_device_feature_control().apply(FEATURES, rollback=False)
+    cam.TriggerMode.set(gx.GxSwitchEntry.ON)
+    cam.TriggerSource.set(gx.GxTriggerSourceEntry.SOFTWARE)
+
+
+def single_loop(device_manager, serial_numbers):
+    cams = [device_manager.open_device_by_sn(sn) for sn in serial_numbers]
+    for cam in cams:
+        configure(cam)
+        cam.stream_on()
+    start = time.perf_counter()
+    for i in range(TRIGGERS):
+        for cam in cams:
+            cam.TriggerSoftware.send_command()
+        images = [cam.data_stream[0].dq_buf(1000, zero_copy=True) for cam in cams]
+        for image in images:
+            image.get_numpy_array().sum()
+            image.release()
+    rate = TRIGGERS / (time.perf_counter() - start)
+    for cam in cams:
+        cam.stream_off()
+        cam.close_device()
+    return rate
+
+
+def camera_group(device_manager, serial_numbers, loss_rate=0.0, processes=False):
+    group = gx.CameraGroup(device_manager, serial_numbers, tolerance=0.005, features=FEATURES,
+                           processes=processes)
+    if loss_rate and gx.get_simulated_library() is not None:
+        gx.get_simulated_library().get_camera(serial_numbers[-1]).set_faults(loss_rate=loss_rate, seed=3)
+    group.start()
+    skew = 0.0
+    matched = 0
+    start = time.perf_counter()
+    for i in range(TRIGGERS):
+        group.trigger()
+        frameset = group.get_frameset(50 if loss_rate else 1000)
+        if frameset is None:
+            continue
+        matched += 1
+        skew = max(skew, frameset.get_skew())
+        for image in frameset.get_images():
+            image.get_numpy_array().sum()
+        frameset.release()
+    rate = TRIGGERS / (time.perf_counter() - start)
+    statistics = group.get_statistics()
+    group.close()
+    if loss_rate and gx.get_simulated_library() is not None:
+        gx.get_simulated_library().get_camera(serial_numbers[-1]).set_faults()
+    return rate, matched, skew, statistics
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    serial_numbers = [info.get("sn") for info in dev_info_list]
+    print("%d triggers, 1280x1024, triggers/s, %d CPUs" % (TRIGGERS, os.cpu_count()))
+    print("%-8s %12s %12s %12s %12s %12s" % ("cameras", "one loop", "threads", "skew ms", "processes",
+                                             "skew ms"))
+    for count in (1, 2, 4):
+        if count > len(serial_numbers):
+            break
+        loop_rate = single_loop(device_manager, serial_numbers[:count])
+        group_rate, matched, skew, statistics = camera_group(device_manager, serial_numbers[:count])
+        process_rate, matched, process_skew, statistics = camera_group(device_manager, serial_numbers[:count],
+                                                                       processes=True)
+        print("%-8d %12.1f %12.1f %12.3f %12.1f %12.3f" % (count, loop_rate, group_rate, skew * 1000,
+                                                           process_rate, process_skew * 1000))
+
+    if len(serial_numbers) >= 2:
+        rate, matched, skew, statistics = camera_group(device_manager, serial_numbers[:2], loss_rate=0.05)
+        print("2 cameras, 5%% of the frames of %s lost: %d of %d triggers matched" % (
+            serial_numbers[1], matched, TRIGGERS))
+        for sn, counters in statistics["cameras"].items():
+            print("    %s acquired %d, unmatched %d" % (sn, counters["acquired"], counters["unmatched"]))
+
+
+if __name__ == "__main__":
+    main()
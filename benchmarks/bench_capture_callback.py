@@ -0,0 +1,82 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Capture callback cost: the default callback (a RawImage copying every frame) against the fast one
+(a reused CaptureFrame borrowing the driver buffer). The callback reads the frame id and a subsampled
+sum of the image. Free run gives the frames/s the callback path sustains, then both are run at
+250 fps and the delivered rate and lost frames are compared.
+
+    python benchmarks/bench_capture_callback.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+SECONDS = 3.0
+FRAME_RATE = 250.0
+
+
+def run(cam, fast):
+    data_stream = cam.data_stream[0]
+    counts = [0]
+
+    def capture_callback(frame):
+        frame.get_frame_id()
+        frame.get_numpy_array()[::64, ::64].sum()
+        counts[0] += 1
+
+    lost = data_stream.StreamLostFrameCount.get()
+    data_stream.register_capture_callback(capture_callback, fast=fast)
+    cam.stream_on()
+    start = time.perf_counter()
+    time.sleep(SECONDS)
+    cam.stream_off()
+    elapsed = time.perf_counter() - start
+    data_stream.unregister_capture_callback()
+    return counts[0] / elapsed, data_stream.StreamLostFrameCount.get() - lost
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    sn = dev_info_list[0].get("sn")
+    cam = device_manager.open_device_by_sn(sn)
+    cam.Width.set(1280)
+    cam.Height.set(1024)
+    cam.ExposureTime.set(100.0)
+    simulated_camera = gx.get_simulated_library() and gx.get_simulated_library().get_camera(sn)
+
+    print("1280x1024, %.0f s per run" % SECONDS)
+    print("%-22s %12s %12s" % ("", "copy", "fast"))
+    if simulated_camera is not None:
+        # frames as fast as they are taken, the rate is bound by the callback path
+        simulated_camera.set_realtime(False)
+    cam.AcquisitionFrameRateMode.set(gx.GxSwitchEntry.OFF)
+    copy_rate = run(cam, False)[0]
+    fast_rate = run(cam, True)[0]
+    print("%-22s %12.1f %12.1f" % ("free run frames/s", copy_rate, fast_rate))
+
+    if simulated_camera is not None:
+        simulated_camera.set_realtime(True)
+    cam.AcquisitionFrameRateMode.set(gx.GxSwitchEntry.ON)
+    cam.AcquisitionFrameRate.set(FRAME_RATE)
+    copy_rate, copy_lost = run(cam, False)
+    fast_rate, fast_lost = run(cam, True)
+    print("%-22s %12.1f %12.1f" % ("%.0f fps frames/s" % FRAME_RATE, copy_rate, fast_rate))
+    print("%-22s %12d %12d" % ("%.0f fps lost" % FRAME_RATE, copy_lost, fast_lost))
+    cam.close_device()
+
+
+if __name__ == "__main__":
+    main()
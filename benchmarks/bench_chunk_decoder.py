@@ -0,0 +1,108 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Per-frame metadata from chunk data against feature reads: exposure time and gain read with
+Feature.get() after every frame, the chunk block copied with get_chunkdata() and unpacked with struct,
+and ChunkDecoder.decode() on the frame. Then the batch decode of a recording into columns.
+
+    python benchmarks/bench_chunk_decoder.py
+"""
+
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+FRAMES = 2000
+CHUNKS = ("FrameID", "Timestamp", "CounterValue", "ExposureTime", "Gain", "LineStatusAll")
+
+
+def read_features(cam, image):
+    return image.get_frame_id(), image.get_timestamp(), cam.ExposureTime.get(), cam.Gain.get()
+
+
+def unpack_chunkdata(cam, image):
+    data = image.get_chunkdata()
+    return struct.unpack_from("<Q8xQ8xQ8xd8xd8xQ", data)
+
+
+def capture(cam, read, decoder=None):
+    data_stream = cam.data_stream[0]
+    elapsed = 0.0
+    cam.stream_on()
+    for i in range(FRAMES):
+        image = data_stream.dq_buf(1000, zero_copy=True)
+        start = time.perf_counter()
+        if decoder is not None:
+            record = decoder.decode(image)
+            record["exposure_time"], record["gain"]
+        else:
+            read(cam, image)
+        elapsed += time.perf_counter() - start
+        image.release()
+    cam.stream_off()
+    return elapsed / FRAMES * 1e6
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    sn = dev_info_list[0].get("sn")
+    cam = device_manager.open_device_by_sn(sn)
+    cam.Width.set(640)
+    cam.Height.set(480)
+    cam.AcquisitionFrameRateMode.set(gx.GxSwitchEntry.OFF)
+    cam.ExposureTime.set(100.0)
+    feature_control = cam.get_remote_device_feature_control()
+    cam.ChunkModeActive.set(True)
+    for name in CHUNKS:
+        feature_control.get_enum_feature("ChunkSelector").set(name)
+        cam.ChunkEnable.set(True)
+    simulated_camera = gx.get_simulated_library() and gx.get_simulated_library().get_camera(sn)
+    if simulated_camera is not None:
+        simulated_camera.set_realtime(False)
+
+    decoder = gx.ChunkDecoder()
+    print("%d frames, 640x480 with %d chunks, us per frame for exposure and gain" % (FRAMES, len(CHUNKS)))
+    print("%-28s %8.2f" % ("Feature.get", capture(cam, read_features)))
+    print("%-28s %8.2f" % ("get_chunkdata + struct", capture(cam, unpack_chunkdata)))
+    print("%-28s %8.2f" % ("ChunkDecoder.decode", capture(cam, None, decoder)))
+    print("layout parsed %d time(s): %s" % (decoder.get_parse_count(),
+                                            ", ".join(name for chunk_id, name, offset, length in decoder.get_layout())))
+
+    directory = tempfile.mkdtemp()
+    recorder = gx.RawRecorder(directory)
+    recorder.start()
+    data_stream = cam.data_stream[0]
+    cam.stream_on()
+    for i in range(FRAMES):
+        recorder.record(data_stream.dq_buf(1000, zero_copy=True))
+    cam.stream_off()
+    recorder.stop()
+
+    reader = gx.RawRecordReader(directory)
+    start = time.perf_counter()
+    columns = gx.ChunkDecoder().decode_sequence(reader)
+    elapsed = time.perf_counter() - start
+    print("decode_sequence: %d frames in %.1f ms (%.2f us per frame), %d valid, frame ids %d..%d" % (
+        len(columns["valid"]), elapsed * 1e3, elapsed / len(columns["valid"]) * 1e6, columns["valid"].sum(),
+        columns["frame_id"][0], columns["frame_id"][-1]))
+    reader.close()
+    shutil.rmtree(directory)
+    cam.close_device()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Latency from open_device_by_sn to the first frame. The features of Device and DataStream are built
+on first access, "all features" touches every one of them after opening, which is the cost every
+open paid when Device.__init__ built them eagerly.
+
+    python benchmarks/bench_device_open.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+RUNS = 10
+
+
+def open_to_first_frame(device_manager, sn, touch_all):
+    start = time.perf_counter()
+    cam = device_manager.open_device_by_sn(sn)
+    if touch_all:
+        for name in gx.LazyFeature.get_names(type(cam)):
+            getattr(cam, name)
+        for data_stream in cam.data_stream:
+            for name in gx.LazyFeature.get_names(type(data_stream)):
+                getattr(data_stream, name)
+    opened = time.perf_counter()
+
+    cam.stream_on()
+    raw_image = cam.data_stream[0].get_image(1000)
+    first_frame = time.perf_counter()
+    cam.stream_off()
+    built = sum(isinstance(value, gx.Feature) for value in vars(cam).values())
+    cam.close_device()
+    if raw_image is None:
+        print("no frame")
+    return opened - start, first_frame - start, built
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    sn = dev_info_list[0].get("sn")
+    simulated_library = gx.get_simulated_library()
+    if simulated_library is not None:
+        # deliver the first frame at once instead of after a frame period
+        simulated_library.get_camera(sn).set_realtime(False)
+
+    print("%d runs, median ms" % RUNS)
+    print("%-14s %10s %14s %16s" % ("", "open", "first frame", "features built"))
+    for label, touch_all in (("lazy", False), ("all features", True)):
+        results = [open_to_first_frame(device_manager, sn, touch_all) for i in range(RUNS)]
+        opened = sorted(result[0] for result in results)[RUNS // 2]
+        first_frame = sorted(result[1] for result in results)[RUNS // 2]
+        print("%-14s %10.2f %14.2f %16d" % (label, opened * 1000, first_frame * 1000, results[0][2]))
+
+
+if __name__ == "__main__":
+    main()
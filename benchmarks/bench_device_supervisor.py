@@ -0,0 +1,93 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Unplug and replug a streaming camera under a DeviceSupervisor. Per outage: how long the camera stayed
+unplugged, the recovery time the supervisor reports (offline event to stream restarted), the time to the
+first frame after it, the frames lost as estimated by the supervisor and as expected from the configured
+frame rate, and whether the configured ROI, exposure and frame rate came back. Needs the simulated
+camera to unplug it.
+
+    python benchmarks/bench_device_supervisor.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+FRAME_RATE = 100.0
+OUTAGES = (0.05, 0.3, 1.0)
+STREAM_SECONDS = 0.5
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    sn = dev_info_list[0].get("sn")
+    simulated_camera = gx.get_simulated_library() and gx.get_simulated_library().get_camera(sn)
+    if simulated_camera is None:
+        print("the camera is unplugged through the simulated camera, run with GXIPY_BACKEND=sim")
+        return
+
+    frames = []
+    arrived = threading.Event()
+
+    def on_frame(frame):
+        frames.append(time.perf_counter())
+        arrived.set()
+
+    supervisor = gx.DeviceSupervisor(device_manager, sn, backoff_initial=0.02, backoff_max=0.2)
+    cam = supervisor.open()
+    cam.Width.set(640)
+    cam.Height.set(480)
+    cam.OffsetX.set(64)
+    cam.ExposureTime.set(2000.0)
+    cam.AcquisitionFrameRate.set(FRAME_RATE)
+    supervisor.set_acquisition_buffer_number(8)
+    supervisor.register_capture_callback(on_frame, fast=True)
+    supervisor.stream_on()
+    expected = dict(supervisor.get_snapshot())
+    time.sleep(STREAM_SECONDS)
+
+    print("%.0f fps, backoff 0.02..0.2 s" % FRAME_RATE)
+    print("%10s %12s %14s %12s %12s %14s %10s" % ("unplugged", "attempts", "recovery ms", "first frame",
+                                                  "lost (est)", "lost (rate)", "restored"))
+    for outage in OUTAGES:
+        attempts = supervisor.get_statistics()["attempts"]
+        arrived.clear()
+        unplugged = time.perf_counter()
+        last_frame = frames[-1]
+        simulated_camera.set_online(False)
+        time.sleep(outage)
+        simulated_camera.set_online(True)
+        if not supervisor.wait_online(10.0) or not arrived.wait(10.0):
+            print("not recovered: %s" % supervisor.get_last_error())
+            break
+        first_frame = next(frame_time for frame_time in frames if frame_time > unplugged)
+        statistics = supervisor.get_statistics()
+        restored = supervisor.get_device().get_remote_device_feature_control().snapshot(list(expected))
+        print("%8.0f ms %12d %14.1f %9.0f ms %12s %14d %10s" % (
+            outage * 1e3, statistics["attempts"] - attempts, statistics["last_recovery_seconds"] * 1e3,
+            (first_frame - unplugged) * 1e3, statistics["last_frames_lost"],
+            max(0, int(round((first_frame - last_frame) * FRAME_RATE)) - 1), restored == expected))
+        time.sleep(STREAM_SECONDS)
+
+    statistics = supervisor.get_statistics()
+    print("%d reconnects, %d frames, %d lost, recovery max %.1f ms" % (
+        statistics["reconnects"], statistics["frames"], statistics["frames_lost"],
+        statistics["max_recovery_seconds"] * 1e3))
+    supervisor.close()
+
+
+if __name__ == "__main__":
+    main()
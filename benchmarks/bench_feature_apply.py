@@ -0,0 +1,111 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Switching between two camera profiles, the set() sequence of main.py against FeatureControl.apply.
+The profiles move the ROI both ways, so writing them in a fixed order would go out of range.
+
+    python benchmarks/bench_feature_apply.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+SWITCHES = 200
+
+FULL = {
+    "OffsetX": 0, "OffsetY": 0, "Width": 1280, "Height": 1024,
+    "ExposureAuto": "Off", "ExposureTime": 12000.0, "GainAuto": "Off", "Gain": 12.0,
+    "AcquisitionFrameRateMode": "On", "AcquisitionFrameRate": 5.0, "BalanceWhiteAuto": "Continuous",
+}
+
+CROP = {
+    "Width": 640, "Height": 480, "OffsetX": 320, "OffsetY": 272,
+    "ExposureAuto": "Off", "ExposureTime": 2000.0, "GainAuto": "Off", "Gain": 12.0,
+    "AcquisitionFrameRateMode": "On", "AcquisitionFrameRate": 60.0, "BalanceWhiteAuto": "Continuous",
+}
+
+
+def set_sequence(remote_feature_control, profile):
+    # what a script does without apply: every feature in a fixed safe order, changed or not
+    remote_feature_control.get_int_feature("OffsetX").set(0)
+    remote_feature_control.get_int_feature("OffsetY").set(0)
+    for name in ("Width", "Height", "OffsetX", "OffsetY"):
+        remote_feature_control.get_int_feature(name).set(profile[name])
+    for name in ("ExposureAuto", "GainAuto", "AcquisitionFrameRateMode", "BalanceWhiteAuto"):
+        remote_feature_control.get_enum_feature(name).set(profile[name])
+    for name in ("ExposureTime", "Gain", "AcquisitionFrameRate"):
+        remote_feature_control.get_float_feature(name).set(profile[name])
+
+
+def count_device_calls(simulated_library, counter):
+    # every GX* call of gxwrapper is a round-trip to a real camera
+    def counted(function):
+        def call(*args):
+            counter[0] += 1
+            return function(*args)
+        return call
+
+    for name in dir(simulated_library):
+        if name.startswith("GX"):
+            setattr(simulated_library, name, counted(getattr(simulated_library, name)))
+
+
+def measure(switch, counter):
+    counter[0] = 0
+    start = time.perf_counter()
+    for i in range(SWITCHES):
+        switch(CROP if i % 2 == 0 else FULL)
+    return (time.perf_counter() - start) / SWITCHES * 1000, counter[0] / float(SWITCHES)
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    cam = device_manager.open_device_by_sn(dev_info_list[0].get("sn"))
+    remote_feature_control = cam.get_remote_device_feature_control()
+    remote_feature_control.apply(FULL)
+    counter = [0]
+    simulated_library = gx.get_simulated_library()
+    if simulated_library is not None:
+        count_device_calls(simulated_library, counter)
+
+    print("switch between 2 profiles of %d features, %d switches" % (len(FULL), SWITCHES))
+    print("%-14s %10s %14s" % ("", "ms/switch", "calls/switch"))
+    for label, switch in (("set sequence", lambda profile: set_sequence(remote_feature_control, profile)),
+                          ("apply", remote_feature_control.apply),
+                          ("apply again", lambda profile: remote_feature_control.apply(FULL))):
+        milliseconds, calls = measure(switch, counter)
+        print("%-14s %10.3f %14.1f" % (label, milliseconds, calls))
+
+    report = remote_feature_control.apply(CROP)
+    print("apply report:")
+    for name, result in report.items():
+        print("  %-26s %-8s %8.1f us" % (name, "written" if result["written"] else "skipped",
+                                         result["seconds"] * 1e6))
+
+    snapshot = remote_feature_control.snapshot(list(CROP))
+    print("snapshot matches: %s" % all(snapshot[name] == value for name, value in CROP.items()))
+
+    # a failing write restores the features written before it
+    try:
+        remote_feature_control.apply({"Width": 1280, "OffsetX": 0, "Gain": 1000.0})
+    except gx.OutOfRange:
+        pass
+    print("rollback: %s" % (remote_feature_control.snapshot(["Width", "OffsetX"]) ==
+                            {"Width": CROP["Width"], "OffsetX": CROP["OffsetX"]}))
+    cam.close_device()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Cost of the per-frame feature polling of a control loop, with and without the feature cache.
+Runs on the simulated backend, whose ctypes round-trips are cheaper than a real camera's.
+
+    python benchmarks/bench_feature_cache.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+LOOPS = 2000
+
+
+def poll(cam, remote_feature_control):
+    cam.Width.get()
+    cam.Height.get()
+    cam.PixelFormat.get()
+    cam.CurrentAcquisitionFrameRate.get()
+    remote_feature_control.get_float_feature("ExposureTime").get()
+
+
+def microseconds_per_loop(cam, remote_feature_control):
+    poll(cam, remote_feature_control)
+    start = time.perf_counter()
+    for i in range(LOOPS):
+        poll(cam, remote_feature_control)
+    return (time.perf_counter() - start) / LOOPS * 1e6
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    cam = device_manager.open_device_by_sn(dev_info_list[0].get("sn"))
+    remote_feature_control = cam.get_remote_device_feature_control()
+    cache = cam.get_feature_cache()
+
+    cache.set_enabled(False)
+    uncached = microseconds_per_loop(cam, remote_feature_control)
+    cache.set_enabled(True)
+    cache.reset_statistics()
+    cached = microseconds_per_loop(cam, remote_feature_control)
+    print("poll Width/Height/PixelFormat/CurrentAcquisitionFrameRate/ExposureTime, %d loops" % LOOPS)
+    print("uncached %8.1f us/loop" % uncached)
+    print("cached   %8.1f us/loop  (%.1fx)" % (cached, uncached / cached))
+    print("cache: %s" % ", ".join("%s %d" % item for item in sorted(cache.get_statistics().items())))
+
+    # a write has to be visible to the next read
+    width = cam.Width.get()
+    cam.Width.set(width - 16)
+    ok = cam.Width.get() == width - 16 and cam.OffsetX.get_range()["max"] == 16
+    cam.Width.set(width)
+    print("write invalidates: %s" % ok)
+    cam.close_device()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Control loop latency next to a slow recorder, 200 fps. Baseline: one AcquisitionWorker queue drained in
+order, the control loop gets every frame and hands it to the recorder. MailboxWorker: the control loop
+takes the newest frame from the mailbox, the recorder drains the lossless record channel on its own
+thread. The age of a control frame is the number of frames the camera produced after it.
+
+    python benchmarks/bench_frame_mailbox.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+SECONDS = 3.0
+FRAME_RATE = 200.0
+BUFFER_NUM = 8
+# the recorder needs longer than a frame period per frame
+RECORD_SECONDS = 0.008
+CONTROL_SECONDS = 0.001
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100.0))] if values else 0
+
+
+def baseline(cam, simulated_camera):
+    data_stream = cam.data_stream[0]
+    worker = gx.AcquisitionWorker(data_stream, queue_size=BUFFER_NUM - 2, policy=gx.AcquisitionQueuePolicy.BLOCK)
+    recorded = []
+    ages = []
+    cam.stream_on()
+    worker.start()
+    deadline = time.perf_counter() + SECONDS
+    while time.perf_counter() < deadline:
+        image = worker.get_image(100)
+        if image is None:
+            continue
+        ages.append(simulated_camera.get_statistics()["generated"] - 1 - image.get_frame_id())
+        time.sleep(CONTROL_SECONDS)
+        time.sleep(RECORD_SECONDS)
+        recorded.append(image.get_frame_id())
+        image.release()
+    statistics = worker.get_statistics()
+    worker.stop()
+    cam.stream_off()
+    return ages, len(recorded), statistics["acquired"], statistics["driver_lost"]
+
+
+def mailbox(cam, simulated_camera):
+    data_stream = cam.data_stream[0]
+    worker = gx.MailboxWorker(data_stream, record_queue_size=1024, record_buffer_num=2)
+    recorded = []
+    ages = []
+    running = [True]
+
+    def record():
+        while running[0] or worker.get_record_queue_length() != 0:
+            image = worker.get_record_image(100)
+            if image is None:
+                continue
+            time.sleep(RECORD_SECONDS)
+            recorded.append(image.get_frame_id())
+            image.release()
+
+    cam.stream_on()
+    worker.start()
+    recorder = threading.Thread(target=record)
+    recorder.start()
+    deadline = time.perf_counter() + SECONDS
+    while time.perf_counter() < deadline:
+        image = worker.get_latest(100)
+        if image is None:
+            continue
+        ages.append(simulated_camera.get_statistics()["generated"] - 1 - image.get_frame_id())
+        time.sleep(CONTROL_SECONDS)
+        image.release()
+    cam.stream_off()
+    running[0] = False
+    recorder.join()
+    statistics = worker.get_statistics()
+    worker.stop()
+    in_order = all(second == first + 1 for first, second in zip(recorded, recorded[1:]))
+    return ages, len(recorded), statistics["acquired"], statistics["driver_lost"], statistics, in_order
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    sn = dev_info_list[0].get("sn")
+    simulated_camera = gx.get_simulated_library() and gx.get_simulated_library().get_camera(sn)
+    if simulated_camera is None:
+        print("the frame age is read from the simulated camera, run with GXIPY_BACKEND=sim")
+        return
+
+    cam = device_manager.open_device_by_sn(sn)
+    cam.Width.set(640)
+    cam.Height.set(480)
+    cam.ExposureTime.set(1000.0)
+    cam.AcquisitionFrameRate.set(FRAME_RATE)
+    cam.data_stream[0].set_acquisition_buffer_number(BUFFER_NUM)
+
+    print("%.0f fps, %d buffers, recorder %.0f ms per frame, %.0f s" % (FRAME_RATE, BUFFER_NUM,
+                                                                       RECORD_SECONDS * 1e3, SECONDS))
+    print("%-16s %10s %10s %10s %10s %10s %12s" % ("", "age mean", "age p99", "age max", "acquired",
+                                                  "recorded", "driver lost"))
+    ages, recorded, acquired, lost = baseline(cam, simulated_camera)
+    print("%-16s %10.2f %10d %10d %10d %10d %12s" % ("single queue", sum(ages) / float(len(ages)),
+                                                    percentile(ages, 99), max(ages), acquired, recorded, lost))
+    ages, recorded, acquired, lost, statistics, in_order = mailbox(cam, simulated_camera)
+    print("%-16s %10.2f %10d %10d %10d %10d %12s" % ("MailboxWorker", sum(ages) / float(len(ages)),
+                                                    percentile(ages, 99), max(ages), acquired, recorded, lost))
+    print("MailboxWorker: control took %d frames, %d overwritten, %d record frames copied, %d dropped, "
+          "recorded in order: %s" % (statistics["latest"], statistics["overwritten"], statistics["record_copied"],
+                                     statistics["record_dropped"], in_order))
+    cam.close_device()
+
+
+if __name__ == "__main__":
+    main()
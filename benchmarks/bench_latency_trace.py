@@ -0,0 +1,81 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Latency of every frame from its sensor timestamp to dequeue, convert, process and sink, through an
+AcquisitionWorker and a Pipeline traced by one LatencyTracer.
+
+    python benchmarks/bench_latency_trace.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+FRAMES = 300
+
+
+def process(rgb_image):
+    # stand-in for target detection: a reduction over the frame
+    numpy_image = rgb_image.get_numpy_array()
+    return numpy_image[::4, ::4].mean()
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    cam = device_manager.open_device_by_sn(dev_info_list[0].get("sn"))
+    cam.Width.set(640)
+    cam.Height.set(480)
+    cam.AcquisitionFrameRateMode.set(gx.GxSwitchEntry.ON)
+    cam.AcquisitionFrameRate.set(100.0)
+
+    tracer = gx.LatencyTracer(cam)
+    uncertainty = tracer.calibrate()
+    calibration = tracer.get_calibration()
+    print("clock: %d Hz, offset uncertainty %.1f us" % (calibration["tick_frequency"], uncertainty * 1e6))
+
+    received = []
+    worker = gx.AcquisitionWorker(cam.data_stream[0], queue_size=4, tracer=tracer)
+    pipeline = gx.Pipeline([gx.PipelineStage(gx.LatencyStage.CONVERT, gx.convert_stage("RGB")),
+                            gx.PipelineStage(gx.LatencyStage.PROCESS, process)],
+                           received.append, tracer=tracer)
+    cam.stream_on()
+    worker.start()
+    pipeline.start()
+    start = time.perf_counter()
+    while len(received) < FRAMES and time.perf_counter() - start < 30:
+        raw_image = worker.get_image(1000)
+        if raw_image is not None:
+            pipeline.submit(raw_image)
+        if time.perf_counter() - start > 1.0 and tracer.get_calibration()["points"] == 1:
+            # a second calibration a second later corrects the clock drift
+            tracer.calibrate()
+    pipeline.stop()
+    worker.stop()
+    cam.stream_off()
+    cam.close_device()
+
+    statistics = tracer.get_statistics()
+    print("%d frames at 100 fps, 640x480, ms" % len(received))
+    print("%-10s %8s %8s %8s %8s %10s %10s" % ("stage", "count", "p50", "p99", "max", "stage p50", "stage p99"))
+    for stage in (gx.LatencyStage.DEQUEUE, gx.LatencyStage.CONVERT, gx.LatencyStage.PROCESS, gx.LatencyStage.SINK):
+        result = statistics[stage]
+        print("%-10s %8d %8.3f %8.3f %8.3f %10.3f %10.3f" % (
+            stage, result["count"], result["p50"] * 1000, result["p99"] * 1000, result["max"] * 1000,
+            result["stage_p50"] * 1000, result["stage_p99"] * 1000))
+    print("pending %d, evicted %d, discarded %d, clock rate %.6f" % (
+        statistics["pending"], statistics["evicted"], statistics["discarded"], tracer.get_calibration()["rate"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Capture into the stream's own buffers (dq_buf copying the frame, then get_numpy_array) against
+register_numpy_buffers (dq_buf zero copy, the frame is the registered (H, W) array), with base pages
+and with huge pages. Per run: frames/s of a loop that reads the whole frame, minor page faults per
+frame, and how the arena is mapped (pages needed to cover it, i.e. TLB entries, and the huge page
+bytes the kernel reports for it in /proc/self/smaps).
+
+    python benchmarks/bench_numpy_buffers.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+try:
+    import resource
+except ImportError:
+    # not on Windows
+    resource = None
+
+FRAMES = 500
+BUFFER_NUM = 8
+BASE_PAGE_SIZE = 4096
+
+
+def minor_faults():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_minflt if resource is not None else 0
+
+
+def huge_page_bytes(address):
+    """
+    :return:    AnonHugePages of the mapping starting at address, None without /proc/self/smaps
+    """
+    try:
+        with open("/proc/self/smaps") as smaps_file:
+            lines = smaps_file.read().splitlines()
+    except IOError:
+        return None
+    inside = False
+    for line in lines:
+        fields = line.split()
+        if "-" in fields[0] and len(fields) >= 5:
+            start = int(fields[0].split("-")[0], 16)
+            inside = start <= address < int(fields[0].split("-")[1], 16)
+        elif inside and fields[0] == "AnonHugePages:":
+            return int(fields[1]) * 1024
+    return None
+
+
+def capture(cam, numpy_buffers, huge_pages=False):
+    data_stream = cam.data_stream[0]
+    arena = None
+    if numpy_buffers:
+        start = time.perf_counter()
+        arena = data_stream.register_numpy_buffers(BUFFER_NUM, shape=(cam.Height.get(), cam.Width.get()),
+                                                   huge_pages=huge_pages)
+        setup = time.perf_counter() - start
+    else:
+        cam.data_stream[0].set_acquisition_buffer_number(BUFFER_NUM)
+        setup = 0.0
+    cam.stream_on()
+    info = arena.get_info() if arena is not None else None
+    mapped = huge_page_bytes(info["address"]) if info is not None else None
+
+    faults = minor_faults()
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        if numpy_buffers:
+            image = data_stream.dq_buf(1000, zero_copy=True)
+            image.get_user_param().sum()
+            image.release()
+        else:
+            image = data_stream.dq_buf(1000)
+            data_stream.q_buf(image)
+            image.get_numpy_array().sum()
+    elapsed = time.perf_counter() - start
+    faults = minor_faults() - faults
+    cam.stream_off()
+    return FRAMES / elapsed, faults / float(FRAMES), setup, info, mapped
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    sn = dev_info_list[0].get("sn")
+    cam = device_manager.open_device_by_sn(sn)
+    cam.Width.set(1280)
+    cam.Height.set(1024)
+    cam.AcquisitionFrameRateMode.set(gx.GxSwitchEntry.OFF)
+    cam.ExposureTime.set(100.0)
+    simulated_camera = gx.get_simulated_library() and gx.get_simulated_library().get_camera(sn)
+    if simulated_camera is not None:
+        # frames as fast as they are taken, the loop measures the host side
+        simulated_camera.set_realtime(False)
+
+    print("1280x1024 Mono8, %d buffers, %d frames per run" % (BUFFER_NUM, FRAMES))
+    print("%-24s %10s %14s %10s %12s %12s %14s" % ("", "frames/s", "faults/frame", "setup ms", "page mode",
+                                                  "TLB entries", "huge bytes"))
+    capture(cam, False)
+    for name, numpy_buffers, huge_pages in (("driver buffers, copy", False, False),
+                                            ("numpy buffers", True, False),
+                                            ("numpy buffers, huge", True, True)):
+        rate, faults, setup, info, mapped = capture(cam, numpy_buffers, huge_pages)
+        if info is None:
+            print("%-24s %10.1f %14.2f %10s %12s %12s %14s" % (name, rate, faults, "-", "-", "-", "-"))
+            continue
+        page_size = BASE_PAGE_SIZE if info["page_mode"] == gx.ArenaPageMode.NORMAL else gx.ARENA_HUGE_PAGE_SIZE
+        if info["page_mode"] == gx.ArenaPageMode.TRANSPARENT and not mapped:
+            # the kernel did not merge the pages
+            page_size = BASE_PAGE_SIZE
+        print("%-24s %10.1f %14.2f %10.2f %12s %12d %14s" % (
+            name, rate, faults, setup * 1e3, info["page_mode"], info["size"] // page_size,
+            "n/a" if mapped is None else mapped))
+    cam.close_device()
+
+
+if __name__ == "__main__":
+    main()
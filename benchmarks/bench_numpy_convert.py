@@ -0,0 +1,78 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Throughput of the numpy conversion engine, and of DxImageProc when the library is installed.
+
+    python benchmarks/bench_numpy_convert.py
+"""
+
+import sys
+import time
+import numpy
+from ctypes import c_ubyte, addressof
+
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+PF = gx.GxPixelFormatEntry
+WIDTH = 1920
+HEIGHT = 1200
+FRAMES = 30
+
+
+def make_raw_image(pixel_format):
+    size = gx.get_pixel_buffer_size(pixel_format, WIDTH, HEIGHT)
+    buf = (c_ubyte * size).from_buffer_copy(numpy.random.RandomState(0).randint(0, 256, size).astype(numpy.uint8))
+    frame_data = gx.GxFrameData()
+    frame_data.status = gx.GxFrameStatusList.SUCCESS
+    frame_data.image_buf = addressof(buf)
+    frame_data.width = WIDTH
+    frame_data.height = HEIGHT
+    frame_data.pixel_format = pixel_format
+    frame_data.image_size = size
+    image = gx.RawImage(frame_data)
+    image.source_buffer = buf
+    return image
+
+
+def frames_per_second(image, mode):
+    image.convert(mode)
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        image.convert(mode)
+    return FRAMES / (time.perf_counter() - start)
+
+
+def main():
+    cases = (("BayerRG8  -> RGB8", PF.BAYER_RG8, "RGB"),
+             ("BayerRG12 -> RGB8", PF.BAYER_RG12, "RGB"),
+             ("Mono12    -> Mono8", PF.MONO12, "RAW8"),
+             ("Mono12_P  -> Mono8", PF.MONO12_P, "RAW8"),
+             ("Mono10_P  -> Mono8", PF.MONO10_P, "RAW8"))
+
+    engine = gx.ConvertEngineManager.get_engine(gx.CONVERT_ENGINE_NUMPY)
+    runs = [("numpy nearest", gx.CONVERT_ENGINE_NUMPY, gx.NumpyBayerInterpolation.NEAREST),
+            ("numpy bilinear", gx.CONVERT_ENGINE_NUMPY, gx.NumpyBayerInterpolation.BILINEAR)]
+    if gx.ConvertEngineManager.is_dx_available():
+        runs.append(("DxImageProc", gx.CONVERT_ENGINE_DX, None))
+
+    print("%dx%d, frames/s" % (WIDTH, HEIGHT))
+    print("%-20s" % "" + "".join("%16s" % name for name, _, _ in runs))
+    for label, pixel_format, mode in cases:
+        image = make_raw_image(pixel_format)
+        row = "%-20s" % label
+        for name, engine_name, interpolation in runs:
+            gx.ConvertEngineManager.set_current_engine(engine_name)
+            if interpolation is not None:
+                engine.set_interpolation(interpolation)
+            row += "%16.1f" % frames_per_second(image, mode)
+        print(row)
+
+    engine.set_interpolation(gx.NumpyBayerInterpolation.BY_CONVERT_TYPE)
+    gx.ConvertEngineManager.set_current_engine(gx.CONVERT_ENGINE_AUTO)
+
+
+if __name__ == "__main__":
+    main()
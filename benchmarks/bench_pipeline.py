@@ -0,0 +1,92 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Compare a single-threaded convert -> enhance loop with the same work on a gxipy.Pipeline. Without
+DxImageProc the frames are converted by the NumPy engine and enhanced with a NumPy lookup table.
+
+    python benchmarks/bench_pipeline.py [workers]
+"""
+
+import sys
+import time
+from ctypes import c_ubyte, addressof
+
+import numpy
+
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+WIDTH = 1920
+HEIGHT = 1200
+FRAMES = 300
+
+
+def make_raw_image(driver_buf, frame_id):
+    frame_data = gx.GxFrameData()
+    frame_data.status = gx.GxFrameStatusList.SUCCESS
+    frame_data.image_buf = addressof(driver_buf)
+    frame_data.width = WIDTH
+    frame_data.height = HEIGHT
+    frame_data.pixel_format = gx.GxPixelFormatEntry.BAYER_RG8
+    frame_data.image_size = len(driver_buf)
+    frame_data.frame_id = frame_id
+    return gx.RawImage(frame_data)
+
+
+def enhance_stage():
+    """
+    :return:    stage function, its description
+    """
+    if gx.ConvertEngineManager.is_dx_available():
+        return gx.improvement_stage(0, gx.Utility.get_contrast_lut(10), gx.Utility.get_gamma_lut(1.5)), \
+            "image_improvement"
+
+    # the gamma and contrast lookup of image_improvement, in NumPy
+    values = numpy.arange(256) / 255.0
+    lut = numpy.clip(((values ** (1 / 1.5)) * 255.0 - 128.0) * 1.1 + 128.0, 0, 255).astype(numpy.uint8)
+
+    def improvement(rgb_image):
+        array = rgb_image.get_numpy_array()
+        numpy.take(lut, array, out=array)
+        return rgb_image
+    return improvement, "NumPy lookup table, DxImageProc not loaded"
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    driver_buf = (c_ubyte * (WIDTH * HEIGHT))()
+    for i in range(len(driver_buf)):
+        driver_buf[i] = i & 0xff
+    convert = gx.convert_stage("RGB")
+    improvement, enhance_name = enhance_stage()
+    print("enhance: %s" % enhance_name)
+
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        improvement(convert(make_raw_image(driver_buf, i)))
+    serial_fps = FRAMES / (time.perf_counter() - start)
+
+    frame_ids = []
+    pipeline = gx.Pipeline([gx.PipelineStage("debayer", convert, workers),
+                            gx.PipelineStage("enhance", improvement, workers)],
+                           lambda rgb_image: frame_ids.append(rgb_image.frame_data.frame_id))
+    pipeline.start()
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        pipeline.submit(make_raw_image(driver_buf, i))
+    pipeline.stop()
+    pipeline_fps = FRAMES / (time.perf_counter() - start)
+
+    print("single thread          frames/s: %8.1f" % serial_fps)
+    print("pipeline (%2d workers)  frames/s: %8.1f   in order: %s"
+          % (workers, pipeline_fps, frame_ids == sorted(frame_ids)))
+    for name, stage in sorted(pipeline.get_statistics().items()):
+        if name == "submit_dropped":
+            continue
+        print("  %-8s p50 %8.3f ms   p99 %8.3f ms" % (name, stage["p50"] * 1000, stage["p99"] * 1000))
+
+
+if __name__ == "__main__":
+    main()
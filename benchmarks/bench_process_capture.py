@@ -0,0 +1,94 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Aggregate capture rate of 1, 2 and 4 free-running cameras: every camera in this process with a
+thread each, against ProcessCapture with a worker process each and shared-memory frame rings.
+
+    python benchmarks/bench_process_capture.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+os.environ.setdefault("GXIPY_SIM_CAMERAS", "4")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+SECONDS = 3.0
+# as fast as the camera (for the simulator: the CPU) allows
+FEATURES = [("Width", 1280), ("Height", 1024), ("AcquisitionFrameRateMode", "Off"), ("ExposureTime", 100.0)]
+
+
+def in_process(device_manager, serial_numbers):
+    cams = [device_manager.open_device_by_sn(sn) for sn in serial_numbers]
+    counts = [0] * len(cams)
+    running = [True]
+
+    def drain(index):
+        data_stream = cams[index].data_stream[0]
+        while running[0]:
+            image = data_stream.dq_buf(100, zero_copy=True)
+            if image is not None:
+                image.get_numpy_array()[::64, ::64].sum()
+                image.release()
+                counts[index] += 1
+
+    for cam in cams:
+        cam.get_remote_device_feature_control().apply(FEATURES, rollback=False)
+        cam.stream_on()
+    threads = [threading.Thread(target=drain, args=(index,)) for index in range(len(cams))]
+    for thread in threads:
+        thread.start()
+    time.sleep(SECONDS)
+    running[0] = False
+    for thread in threads:
+        thread.join()
+    for cam in cams:
+        cam.stream_off()
+        cam.close_device()
+    return sum(counts) / SECONDS
+
+
+def process_capture(serial_numbers):
+    capture = gx.ProcessCapture(serial_numbers, slot_num=8, features=FEATURES)
+    capture.start()
+    count = 0
+    deadline = time.perf_counter() + SECONDS
+    while time.perf_counter() < deadline:
+        for sn in capture.wait(100):
+            image = capture.get_image(sn)
+            while image is not None:
+                image.get_numpy_array()[::64, ::64].sum()
+                image.release()
+                count += 1
+                image = capture.get_image(sn)
+    statistics = capture.get_statistics()
+    capture.stop()
+    return count / SECONDS, sum(result["dropped"] for result in statistics.values())
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    serial_numbers = [info.get("sn") for info in dev_info_list]
+    print("free run, 1280x1024, %d cores, frames/s summed over the cameras" % os.cpu_count())
+    print("%-8s %12s %16s %14s" % ("cameras", "in process", "ProcessCapture", "ring dropped"))
+    for count in (1, 2, 4):
+        if count > len(serial_numbers):
+            break
+        threaded = in_process(device_manager, serial_numbers[:count])
+        processes, dropped = process_capture(serial_numbers[:count])
+        print("%-8d %12.1f %16.1f %14d" % (count, threaded, processes, dropped))
+
+
+if __name__ == "__main__":
+    main()
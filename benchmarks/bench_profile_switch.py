@@ -0,0 +1,114 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Day/night exposure switching: import_config_file of the saved profile, which re-applies every node of
+the file and so has to stop acquisition, against ProfileManager.apply, which writes the changed ones.
+
+    python benchmarks/bench_profile_switch.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+SWITCHES = 100
+
+
+def count_device_calls(simulated_library, counter):
+    # every GX* call of gxwrapper is a round-trip to a real camera
+    def counted(function):
+        def call(*args):
+            counter[0] += 1
+            return function(*args)
+        return call
+
+    for name in dir(simulated_library):
+        if name.startswith("GX"):
+            setattr(simulated_library, name, counted(getattr(simulated_library, name)))
+
+
+def measure(switch, counter):
+    # switch returns the number of nodes it wrote
+    counter[0] = 0
+    written = 0
+    start = time.perf_counter()
+    for i in range(SWITCHES):
+        written += switch("night" if i % 2 == 0 else "day")
+    return (time.perf_counter() - start) / SWITCHES * 1000, counter[0] / float(SWITCHES), \
+        written / float(SWITCHES)
+
+
+def import_config_file(cam, path, nodes):
+    # the whole file is replayed in one library call
+    cam.import_config_file(path)
+    return nodes
+
+
+def apply_profile(profile_manager, name):
+    report = profile_manager.apply(name)
+    return sum(result["written"] for result in report.values())
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    cam = device_manager.open_device_by_sn(dev_info_list[0].get("sn"))
+    remote_feature_control = cam.get_remote_device_feature_control()
+    profile_manager = gx.ProfileManager(remote_feature_control)
+
+    directory = tempfile.mkdtemp()
+    files = {}
+    for name, features in (("night", {"ExposureAuto": "Off", "ExposureTime": 30000.0, "Gain": 18.0}),
+                           ("day", {"ExposureAuto": "Off", "ExposureTime": 2000.0, "Gain": 0.0})):
+        remote_feature_control.apply(features)
+        files[name] = os.path.join(directory, name + ".txt")
+        cam.export_config_file(files[name])
+        profile_manager.load(name, files[name])
+
+    counter = [0]
+    simulated_library = gx.get_simulated_library()
+    if simulated_library is not None:
+        count_device_calls(simulated_library, counter)
+
+    print("switch day/night, %d switches, profiles of %d features, frame period %.1f ms"
+          % (SWITCHES, len(profile_manager.get_profile("day")), 1000.0 / cam.CurrentAcquisitionFrameRate.get()))
+    print("%-34s %10s %14s %14s" % ("", "ms/switch", "calls/switch", "nodes written"))
+    nodes = len(gx.ProfileManager.parse(files["day"])[0])
+    milliseconds, calls, written = measure(lambda name: import_config_file(cam, files[name], nodes), counter)
+    print("%-34s %10.3f %14.1f %14.1f" % ("import_config_file, stream off", milliseconds, calls, written))
+
+    cam.stream_on()
+    try:
+        cam.import_config_file(files["night"])
+        print("import_config_file, acquiring      ok")
+    except gx.OutOfRange:
+        # the file writes Width, Height and PixelFormat too, which are locked while acquiring
+        print("import_config_file, acquiring      fails, locked features")
+    milliseconds, calls, written = measure(lambda name: apply_profile(profile_manager, name), counter)
+    print("%-34s %10.3f %14.1f %14.1f" % ("ProfileManager.apply, acquiring", milliseconds, calls, written))
+
+    # a write behind the manager's back is seen by the next switch
+    cam.ExposureTime.set(1000.0)
+    profile_manager.apply("day")
+    cam.stream_off()
+    print("diff after an outside write: %s" % (len(profile_manager.diff("day")) == 0))
+    cam.close_device()
+
+    for path in files.values():
+        os.remove(path)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
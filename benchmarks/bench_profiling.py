@@ -0,0 +1,89 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Cost of gxipy.profiling on a capture loop (dq_buf, q_buf and a feature read per frame): disabled,
+enabled, and enabled with call stacks, then the report of the enabled run.
+
+    python benchmarks/bench_profiling.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+FRAMES = 2000
+
+
+def capture(cam):
+    data_stream = cam.data_stream[0]
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        image = data_stream.dq_buf(1000, zero_copy=True)
+        image.get_frame_id()
+        image.release()
+        cam.ExposureTime.get()
+    return (time.perf_counter() - start) / FRAMES * 1e6
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    cam = device_manager.open_device_by_sn(dev_info_list[0].get("sn"))
+    cam.Width.set(320)
+    cam.Height.set(240)
+    cam.AcquisitionFrameRateMode.set(gx.GxSwitchEntry.OFF)
+    cam.ExposureTime.set(20.0)
+    simulated_camera = gx.get_simulated_library() and \
+        gx.get_simulated_library().get_camera(dev_info_list[0].get("sn"))
+    if simulated_camera is not None:
+        # frames as fast as they are taken, the loop measures the Python side only
+        simulated_camera.set_realtime(False)
+    cam.stream_on()
+
+    capture(cam)
+    disabled = capture(cam)
+    gx.profiling.enable()
+    enabled = capture(cam)
+    gx.profiling.disable()
+    text = gx.profiling.report(limit=8)
+    statistics = gx.profiling.get_statistics()
+    calls = sum(result["calls"] for result in statistics.values()) / float(FRAMES)
+
+    gx.profiling.reset()
+    gx.profiling.enable(stacks=True)
+    stacks = capture(cam)
+    gx.profiling.disable()
+    cam.stream_off()
+    cam.close_device()
+
+    print("%d frames, us per frame: disabled %.2f, enabled %.2f, with stacks %.2f" % (
+        FRAMES, disabled, enabled, stacks))
+    print("%.1f wrapper calls per frame, %.2f us per timed call" % (calls, (enabled - disabled) / calls))
+    print(text)
+
+    directory = tempfile.mkdtemp()
+    json_path = os.path.join(directory, "profile.json")
+    collapsed_path = os.path.join(directory, "profile.folded")
+    gx.profiling.dump_json(json_path)
+    gx.profiling.dump_collapsed(collapsed_path)
+    with open(collapsed_path) as collapsed_file:
+        lines = collapsed_file.read().splitlines()
+    print("collapsed stacks: %d, e.g.\n    %s" % (len(lines), max(lines, key=lambda line: int(line.rsplit(" ", 1)[1]))))
+    os.remove(json_path)
+    os.remove(collapsed_path)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Acquisition throughput on the simulated backend, no camera or vendor library needed.
+Runs free (not realtime) with seeded faults, so every run delivers the same frames.
+
+    python benchmarks/bench_sim_backend.py
+"""
+
+import os
+import sys
+import time
+
+os.environ["GXIPY_BACKEND"] = "sim"
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+FRAMES = 300
+LOSS_RATE = 0.01
+INCOMPLETE_RATE = 0.02
+TIMEOUT_RATE = 0.01
+
+
+def open_camera(device_manager, sim_camera):
+    sim_camera.set_realtime(False)
+    sim_camera.set_faults(LOSS_RATE, INCOMPLETE_RATE, TIMEOUT_RATE, seed=0)
+    device_manager.update_device_list()
+    return device_manager.open_device_by_sn(sim_camera.get_serial_number())
+
+
+def run(label, cam, sim_camera, grab):
+    cam.stream_on()
+    frame_ids = []
+    incomplete = 0
+    timeouts = 0
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        status, frame_id = grab(cam.data_stream[0])
+        if status is None:
+            timeouts += 1
+            continue
+        frame_ids.append(frame_id)
+        if status == gx.GxFrameStatusList.INCOMPLETE:
+            incomplete += 1
+    elapsed = time.perf_counter() - start
+    statistics = sim_camera.get_statistics()
+    cam.stream_off()
+
+    gaps = sum(b - a - 1 for a, b in zip(frame_ids, frame_ids[1:]))
+    print("%-10s %8.1f frames/s  received %d, frame id gaps %d, incomplete %d, timeouts %d"
+          % (label, len(frame_ids) / elapsed, len(frame_ids), gaps, incomplete, timeouts))
+    print("%-10s camera: %s" % ("", ", ".join("%s %d" % item for item in statistics.items())))
+    return frame_ids
+
+
+def grab_image(data_stream):
+    raw_image = data_stream.get_image(1000)
+    if raw_image is None:
+        return None, None
+    return raw_image.get_status(), raw_image.get_frame_id()
+
+
+def grab_buffer(data_stream):
+    raw_image = data_stream.dq_buf(1000)
+    if raw_image is None:
+        return None, None
+    result = raw_image.get_status(), raw_image.get_frame_id()
+    data_stream.q_buf(raw_image)
+    return result
+
+
+def main():
+    sim_camera = gx.get_simulated_library().get_cameras()[0]
+    device_manager = gx.DeviceManager()
+    cam = open_camera(device_manager, sim_camera)
+    print("%dx%d %s, %d frames, loss %.2f incomplete %.2f timeout %.2f" % (
+        cam.Width.get(), cam.Height.get(), cam.PixelFormat.get()[1], FRAMES,
+        LOSS_RATE, INCOMPLETE_RATE, TIMEOUT_RATE))
+
+    first = run("get_image", cam, sim_camera, grab_image)
+    cam.close_device()
+
+    # a fresh session with the same seed has to deliver the same frames
+    cam = open_camera(device_manager, sim_camera)
+    second = run("dq_buf", cam, sim_camera, grab_buffer)
+    cam.close_device()
+    print("deterministic: %s" % (first == second))
+
+
+if __name__ == "__main__":
+    main()
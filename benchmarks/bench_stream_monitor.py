@@ -0,0 +1,87 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+StreamMonitor sampling the stream counters of a camera losing frames: cost of a sample, the achieved
+against the configured frame rate, the loss alert, and the metrics scraped from the local endpoint.
+
+    python benchmarks/bench_stream_monitor.py
+"""
+
+import logging
+import os
+import sys
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+if sys.version_info.major > 2:
+    from urllib.request import urlopen
+else:
+    from urllib2 import urlopen
+
+SAMPLES = 1000
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    cam = device_manager.open_device_by_sn(dev_info_list[0].get("sn"))
+    cam.Width.set(640)
+    cam.Height.set(480)
+    cam.AcquisitionFrameRateMode.set(gx.GxSwitchEntry.ON)
+    cam.AcquisitionFrameRate.set(100.0)
+
+    alerts = []
+    monitor = gx.StreamMonitor(cam, interval=0.5, loss_threshold=0.02, alert_callback=alerts.append)
+    server = gx.MetricsServer(monitor.get_registry(), port=0)
+    cam.stream_on()
+    worker = gx.AcquisitionWorker(cam.data_stream[0], queue_size=4)
+    worker.start()
+    monitor.start()
+    server.start()
+
+    start = time.perf_counter()
+    for i in range(SAMPLES):
+        monitor.sample()
+    print("sample: %.1f us, sampler thread at 0.5 s: %.4f%% of a core"
+          % ((time.perf_counter() - start) / SAMPLES * 1e6,
+             (time.perf_counter() - start) / SAMPLES / 0.5 * 100))
+
+    # a clean second, two seconds losing 5% of the frames, then clean again
+    simulated_camera = gx.get_simulated_library() and \
+        gx.get_simulated_library().get_camera(dev_info_list[0].get("sn"))
+    for loss_rate, seconds in ((0.0, 1.0), (0.05, 2.0), (0.0, 1.5)):
+        if simulated_camera is not None:
+            simulated_camera.set_faults(loss_rate=loss_rate, seed=1)
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            worker.get_image(100)
+        sample = monitor.get_sample()
+        print("loss %4.1f%%: fps %6.1f of %6.1f, loss ratio %.3f, alert %s" % (
+            loss_rate * 100, sample["fps"], sample["expected_fps"], sample["loss_ratio"], sample["alert"]))
+
+    body = urlopen("http://127.0.0.1:%d/metrics" % server.get_port()).read().decode("utf-8")
+    print("scraped %d bytes from port %d:" % (len(body), server.get_port()))
+    for line in body.splitlines():
+        if not line.startswith("#"):
+            print("    " + line)
+    print("alert callbacks: %s" % [sample["alert"] for sample in alerts])
+
+    server.stop()
+    monitor.stop()
+    worker.stop()
+    cam.stream_off()
+    cam.close_device()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Compare the copying RawImage path (string_at) with the zero-copy path (BufferLease).
+
+    python benchmarks/bench_zero_copy.py            # synthetic driver buffer, no camera needed
+    python benchmarks/bench_zero_copy.py --camera   # dq_buf on the first enumerated camera
+"""
+
+import sys
+import time
+import tracemalloc
+from ctypes import c_ubyte, addressof
+
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+WIDTH = 1280
+HEIGHT = 1024
+FRAMES = 2000
+
+
+def make_frame_data(driver_buf, frame_id):
+    frame_data = gx.GxFrameData()
+    frame_data.status = gx.GxFrameStatusList.SUCCESS
+    frame_data.image_buf = addressof(driver_buf)
+    frame_data.width = WIDTH
+    frame_data.height = HEIGHT
+    frame_data.pixel_format = gx.GxPixelFormatEntry.BAYER_RG8
+    frame_data.image_size = len(driver_buf)
+    frame_data.frame_id = frame_id
+    return frame_data
+
+
+def run_synthetic(zero_copy):
+    driver_buf = (c_ubyte * (WIDTH * HEIGHT))()
+    # python-side allocation per frame, the payload copy dominates it in copy mode
+    copied = 0
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        before = tracemalloc.get_traced_memory()[0]
+        lease = gx.BufferLease() if zero_copy else None
+        image = gx.RawImage(make_frame_data(driver_buf, i), lease)
+        numpy_image = image.get_numpy_array()
+        copied += tracemalloc.get_traced_memory()[0] - before
+        del numpy_image, image
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    return copied / FRAMES, FRAMES / elapsed
+
+
+def run_camera(zero_copy):
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("Number of enumerated devices is 0")
+        return None
+
+    cam = device_manager.open_device_by_sn(dev_info_list[0].get("sn"))
+    cam.stream_on()
+    stream = cam.data_stream[0]
+
+    frames = 0
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        image = stream.dq_buf(1000, zero_copy=zero_copy)
+        if image is None:
+            continue
+        image.get_numpy_array()
+        stream.q_buf(image)
+        frames += 1
+    elapsed = time.perf_counter() - start
+
+    cam.stream_off()
+    cam.close_device()
+    copied = 0 if zero_copy else WIDTH * HEIGHT
+    return copied, frames / elapsed
+
+
+def main():
+    runner = run_camera if "--camera" in sys.argv else run_synthetic
+    for name, zero_copy in (("string_at copy", False), ("zero-copy", True)):
+        result = runner(zero_copy)
+        if result is None:
+            return
+        copied, fps = result
+        print("%-16s bytes copied/frame: %10d   frames/s: %10.1f" % (name, copied, fps))
+
+
+if __name__ == "__main__":
+    main()
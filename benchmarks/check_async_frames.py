@@ -0,0 +1,194 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Check DataStream.frames() on the simulated camera: frame order and drops of the three queue
+policies with a slow consumer, frames keeping their own payload, cancelling a consumer waiting
+for a frame, stream_off while the consumer waits and while the callback thread waits for room,
+and restarting the stream.
+
+    python benchmarks/check_async_frames.py
+
+Exits with status 1 if a check fails.
+"""
+
+import asyncio
+import ctypes
+import os
+import sys
+import time
+
+os.environ.setdefault("GXIPY_BACKEND", "sim")
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+FRAME_RATE = 200.0
+FRAMES = 40
+failures = []
+checked = []
+
+
+def check(name, passed, detail=""):
+    checked.append(name)
+    if not passed:
+        failures.append(name)
+    print("%s %s %s" % ("ok  " if passed else "FAIL", name, detail))
+
+
+def increasing(frame_ids):
+    return all(second > first for first, second in zip(frame_ids, frame_ids[1:]))
+
+
+async def consume(frames, count, delay=0.0):
+    frame_ids = []
+    async for image in frames:
+        frame_ids.append(image.get_frame_id())
+        if delay:
+            await asyncio.sleep(delay)
+        if len(frame_ids) == count:
+            break
+    return frame_ids
+
+
+async def check_policies(cam):
+    data_stream = cam.data_stream[0]
+    for policy, delay in ((gx.AcquisitionQueuePolicy.BLOCK, 0.0),
+                          (gx.AcquisitionQueuePolicy.DROP_NEWEST, 0.02),
+                          (gx.AcquisitionQueuePolicy.DROP_OLDEST, 0.02)):
+        cam.stream_on()
+        async with data_stream.frames(queue_size=4, policy=policy) as frames:
+            frame_ids = await consume(frames, FRAMES, delay)
+            drops = frames.get_drop_count()
+        cam.stream_off()
+        name = {gx.AcquisitionQueuePolicy.BLOCK: "block", gx.AcquisitionQueuePolicy.DROP_NEWEST: "drop newest",
+                gx.AcquisitionQueuePolicy.DROP_OLDEST: "drop oldest"}[policy]
+        if policy == gx.AcquisitionQueuePolicy.BLOCK:
+            check(name + ": every frame in order", frame_ids == list(range(frame_ids[0], frame_ids[0] + FRAMES)),
+                  "%d frames, %d dropped" % (len(frame_ids), drops))
+        else:
+            check(name + ": in order, slow consumer drops", increasing(frame_ids) and drops > 0,
+                  "%d frames, %d dropped" % (len(frame_ids), drops))
+
+
+async def check_owned(cam):
+    data_stream = cam.data_stream[0]
+    images = []
+    cam.stream_on()
+    async with data_stream.frames(queue_size=4) as frames:
+        async for image in frames:
+            images.append(image)
+            await asyncio.sleep(0.02)
+            if len(images) == 20:
+                break
+    cam.stream_off()
+
+    # convert, get_chunkdata and RawRecorder read frame_data.image_buf, the driver refilled its buffers since
+    stale = [image.get_frame_id() for image in images
+             if ctypes.string_at(image.frame_data.image_buf, image.frame_data.image_size) != image.get_data()]
+    check("owned: image_buf holds the frame after later frames arrived", not stale,
+          "%d of %d frames stale" % (len(stale), len(images)))
+
+
+async def check_cancel(cam):
+    data_stream = cam.data_stream[0]
+    frames = data_stream.frames()
+
+    async def wait_forever():
+        async with frames:
+            async for image in frames:
+                pass
+
+    # the stream is off, the consumer waits for a frame that never comes
+    task = asyncio.ensure_future(wait_forever())
+    await asyncio.sleep(0.1)
+    task.cancel()
+    try:
+        await task
+        cancelled = False
+    except asyncio.CancelledError:
+        cancelled = True
+    check("cancel: waiting consumer cancelled", cancelled)
+
+    # the callback is unregistered, a new iterator gets the frames
+    cam.stream_on()
+    async with data_stream.frames() as frames:
+        frame_ids = await asyncio.wait_for(consume(frames, 5), 5.0)
+    cam.stream_off()
+    check("cancel: frames() usable again", len(frame_ids) == 5 and increasing(frame_ids))
+
+
+async def check_stream_off(cam):
+    data_stream = cam.data_stream[0]
+    loop = asyncio.get_running_loop()
+
+    # stream_off while the consumer waits: no frame, no hang, the iterator goes on after stream_on
+    async with data_stream.frames() as frames:
+        cam.stream_on()
+        first = await consume(frames, 5)
+        cam.stream_off()
+        try:
+            await asyncio.wait_for(frames.__anext__(), 0.3)
+            timed_out = False
+        except asyncio.TimeoutError:
+            timed_out = True
+        check("stream off: waiting consumer times out", timed_out)
+        cam.stream_on()
+        second = await asyncio.wait_for(consume(frames, 5), 5.0)
+        cam.stream_off()
+        check("stream off: iteration resumes after stream_on", len(second) == 5 and second[0] > first[-1] - 1)
+
+    # stream_off while the callback thread waits for room in a full BLOCK queue
+    async with data_stream.frames(queue_size=2) as frames:
+        cam.stream_on()
+        await consume(frames, 1)
+        await asyncio.sleep(0.1)
+        start = time.perf_counter()
+        drops = frames.get_drop_count()
+        stopping = loop.run_in_executor(None, cam.stream_off)
+        try:
+            await asyncio.wait_for(asyncio.shield(stopping), 5.0)
+            elapsed = time.perf_counter() - start
+        except asyncio.TimeoutError:
+            elapsed = None
+        check("stream off: callback blocked on a full queue returns", elapsed is not None,
+              "" if elapsed is None else "%.0f ms" % (elapsed * 1e3))
+        if elapsed is not None:
+            check("stream off: the waiting frame is dropped", frames.get_drop_count() == drops + 1,
+                  "%d dropped" % (frames.get_drop_count() - drops))
+            pending = await asyncio.wait_for(consume(frames, 2), 1.0)
+            check("stream off: queued frames still delivered", len(pending) == 2 and increasing(pending))
+    # a stream_off stuck on the callback is released by closing the iterator
+    await stopping
+
+
+async def run(cam):
+    await check_policies(cam)
+    await check_owned(cam)
+    await check_cancel(cam)
+    await check_stream_off(cam)
+
+
+def main():
+    device_manager = gx.DeviceManager()
+    dev_num, dev_info_list = device_manager.update_device_list()
+    if dev_num == 0:
+        print("no device")
+        return
+
+    cam = device_manager.open_device_by_sn(dev_info_list[0].get("sn"))
+    cam.Width.set(320)
+    cam.Height.set(240)
+    cam.ExposureTime.set(1000.0)
+    cam.AcquisitionFrameRate.set(FRAME_RATE)
+    asyncio.run(run(cam))
+    cam.close_device()
+
+    if failures:
+        print("%d of %d checks failed" % (len(failures), len(checked)))
+        sys.exit(1)
+    print("%d checks passed" % len(checked))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Check the numpy conversion engine against per-pixel reference implementations, and against
+DxImageProc when the library is installed (differences are reported, interpolation at the
+borders is not expected to match bit for bit).
+
+    python benchmarks/check_numpy_convert.py
+
+Exits with status 1 if a check fails.
+"""
+
+import sys
+import numpy
+from ctypes import c_ubyte, addressof
+
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+import gxipy as gx
+
+PF = gx.GxPixelFormatEntry
+SIZES = ((8, 6), (13, 7), (64, 48))
+PATTERN_PHASES = {
+    "RG": (("R", "G"), ("G", "B")),
+    "GR": (("G", "R"), ("B", "G")),
+    "GB": (("G", "B"), ("R", "G")),
+    "BG": (("B", "G"), ("G", "R")),
+}
+failures = []
+checked = []
+
+
+def make_raw_image(data, width, height, pixel_format):
+    buf = (c_ubyte * len(data)).from_buffer_copy(data)
+    frame_data = gx.GxFrameData()
+    frame_data.status = gx.GxFrameStatusList.SUCCESS
+    frame_data.image_buf = addressof(buf)
+    frame_data.width = width
+    frame_data.height = height
+    frame_data.pixel_format = pixel_format
+    frame_data.image_size = len(data)
+    image = gx.RawImage(frame_data)
+    # keep the source alive as long as the image
+    image.source_buffer = buf
+    return image
+
+
+def check(name, result, expected):
+    checked.append(name)
+    if result is None or result.shape != expected.shape or not numpy.array_equal(result, expected):
+        failures.append(name)
+        print("FAIL %s" % name)
+
+
+def mirror(index, size):
+    if index < 0:
+        return -index
+    if index >= size:
+        return 2 * size - 2 - index
+    return index
+
+
+def reference_demosaic(raw, pattern, bilinear):
+    height, width = raw.shape
+    out = numpy.zeros((height, width, 3), dtype=numpy.uint8)
+    channel_of = {"R": 0, "G": 1, "B": 2}
+
+    def colour(y, x):
+        return PATTERN_PHASES[pattern][mirror(y, height) % 2][mirror(x, width) % 2]
+
+    def sample(y, x):
+        return int(raw[mirror(y, height), mirror(x, width)])
+
+    for y in range(height):
+        for x in range(width):
+            for name, channel in channel_of.items():
+                if colour(y, x) == name:
+                    out[y, x, channel] = raw[y, x]
+                    continue
+                if bilinear:
+                    ring = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (dy, dx) != (0, 0)]
+                    # the closest ring of same-colour samples: edge neighbours first, then diagonals
+                    edge = [(dy, dx) for dy, dx in ring if abs(dy) + abs(dx) == 1 and colour(y + dy, x + dx) == name]
+                    points = edge if edge else [(dy, dx) for dy, dx in ring if colour(y + dy, x + dx) == name]
+                    values = [sample(y + dy, x + dx) for dy, dx in points]
+                    out[y, x, channel] = (sum(values) + len(values) // 2) // len(values)
+                else:
+                    for dy, dx in ((0, 1), (1, 0), (1, 1)):
+                        if colour(y + dy, x + dx) == name:
+                            out[y, x, channel] = sample(y + dy, x + dx)
+                            break
+    return out
+
+
+def pack(pixels, depth, packing):
+    """
+    Reference packer written from the GVSP / PFNC bit layouts.
+    """
+    pixels = [int(value) for value in pixels]
+    data = bytearray()
+    if packing == "pfnc":
+        bit_stream = 0
+        bit_count = 0
+        for value in pixels:
+            bit_stream |= value << bit_count
+            bit_count += depth
+        data = bytearray((bit_stream >> (8 * i)) & 0xFF for i in range((bit_count + 7) // 8))
+    else:
+        if len(pixels) % 2:
+            pixels.append(0)
+        low = depth - 8
+        for p0, p1 in zip(pixels[0::2], pixels[1::2]):
+            data.append(p0 >> low)
+            data.append((p0 & ((1 << low) - 1)) | ((p1 & ((1 << low) - 1)) << 4))
+            data.append(p1 >> low)
+    return bytes(data)
+
+
+def check_demosaic(engine):
+    random = numpy.random.RandomState(1)
+    for pattern in ("RG", "GR", "GB", "BG"):
+        for width, height in SIZES[:2]:
+            raw = random.randint(0, 256, (height, width)).astype(numpy.uint8)
+            image = make_raw_image(raw.tobytes(), width, height, getattr(PF, "BAYER_%s8" % pattern))
+            for interpolation, bilinear in ((gx.NumpyBayerInterpolation.NEAREST, False),
+                                            (gx.NumpyBayerInterpolation.BILINEAR, True)):
+                engine.set_interpolation(interpolation)
+                expected = reference_demosaic(raw, pattern, bilinear)
+                name = "bayer %s8 %dx%d %s" % (pattern, width, height, "bilinear" if bilinear else "nearest")
+                check(name + " rgb", image.convert("RGB").get_numpy_array(), expected)
+                check(name + " bgr", image.convert("RGB", channel_order=gx.DxRGBChannelOrder.ORDER_BGR).get_numpy_array(),
+                      expected[:, :, ::-1])
+                check(name + " flip", image.convert("RGB", flip=True).get_numpy_array(), expected[::-1])
+    engine.set_interpolation(gx.NumpyBayerInterpolation.BY_CONVERT_TYPE)
+
+
+def check_high_bit_depth():
+    random = numpy.random.RandomState(2)
+    width, height = SIZES[1]
+    for depth in (10, 12, 16):
+        raw = random.randint(0, 1 << depth, (height, width)).astype(numpy.uint16)
+        for valid_bits in range(0, depth - 7):
+            expected = ((raw >> valid_bits) & 0xFF).astype(numpy.uint8)
+            image = make_raw_image(raw.tobytes(), width, height, getattr(PF, "MONO%d" % depth))
+            check("mono%d raw8 valid_bits %d" % (depth, valid_bits),
+                  image.convert("RAW8", valid_bits=valid_bits).get_numpy_array(), expected)
+
+        image = make_raw_image(raw.tobytes(), width, height, getattr(PF, "BAYER_RG%d" % depth))
+        expected = reference_demosaic(((raw >> (depth - 8)) & 0xFF).astype(numpy.uint8), "RG", True)
+        check("bayer rg%d rgb" % depth, image.convert("RGB").get_numpy_array(), expected)
+
+
+def check_unpack():
+    random = numpy.random.RandomState(3)
+    converter = gx.ImageFormatConvert()
+    for width, height in SIZES:
+        for depth in (10, 12):
+            for packing, suffix in (("gvsp", "_PACKED"), ("pfnc", "_P")):
+                if not hasattr(PF, "MONO%d%s" % (depth, suffix)):
+                    continue
+                pixels = random.randint(0, 1 << depth, (height, width)).astype(numpy.uint16)
+                packed = pack(pixels.ravel(), depth, packing)
+                src_format = getattr(PF, "MONO%d%s" % (depth, suffix))
+                name = "mono%d%s %dx%d" % (depth, suffix.lower(), width, height)
+
+                image = make_raw_image(packed, width, height, src_format)
+                check(name + " raw8", image.convert("RAW8").get_numpy_array(),
+                      (pixels >> (depth - 8)).astype(numpy.uint8))
+
+                converter.set_dest_format(getattr(PF, "MONO%d" % depth))
+                out = numpy.zeros((height, width), dtype=numpy.uint16)
+                converter.convert(image, out.ctypes.data, out.nbytes, False)
+                check(name + " unpack", out, pixels)
+
+
+def compare_with_dx():
+    if not gx.ConvertEngineManager.is_dx_available():
+        print("DxImageProc not loaded, skipped the comparison")
+        return
+
+    random = numpy.random.RandomState(4)
+    width, height = SIZES[2]
+    raw = random.randint(0, 256, (height, width)).astype(numpy.uint8)
+    image = make_raw_image(raw.tobytes(), width, height, PF.BAYER_RG8)
+    results = {}
+    for engine in (gx.CONVERT_ENGINE_DX, gx.CONVERT_ENGINE_NUMPY):
+        gx.ConvertEngineManager.set_current_engine(engine)
+        results[engine] = image.convert("RGB").get_numpy_array().astype(numpy.int16)
+    difference = numpy.abs(results[gx.CONVERT_ENGINE_DX] - results[gx.CONVERT_ENGINE_NUMPY])
+    inner = difference[2:-2, 2:-2]
+    print("dx vs numpy bayer rg8: max diff %d, inner max diff %d, mean diff %.3f"
+          % (difference.max(), inner.max(), difference.mean()))
+
+
+def main():
+    gx.ConvertEngineManager.set_current_engine(gx.CONVERT_ENGINE_NUMPY)
+    engine = gx.ConvertEngineManager.get_engine(gx.CONVERT_ENGINE_NUMPY)
+    check_demosaic(engine)
+    check_high_bit_depth()
+    check_unpack()
+    compare_with_dx()
+    gx.ConvertEngineManager.set_current_engine(gx.CONVERT_ENGINE_AUTO)
+
+    if failures:
+        print("%d of %d checks failed" % (len(failures), len(checked)))
+        sys.exit(1)
+    print("%d checks passed" % len(checked))
+
+
+if __name__ == "__main__":
+    main()
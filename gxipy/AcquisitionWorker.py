@@ -0,0 +1,302 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import numpy
+from gxipy.gxwrapper import *
+from gxipy.gxidef import *
+from gxipy.ImageProc import *
+from gxipy.Exception import *
+import collections
+import threading
+import time
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+
+# queue full policy
+class AcquisitionQueuePolicy:
+    DROP_OLDEST = 0             # discard the oldest queued frame to make room
+    DROP_NEWEST = 1             # discard the frame just dequeued from the driver
+    BLOCK = 2                   # wait until the consumer makes room, the driver may lose frames meanwhile
+
+    def __init__(self):
+        pass
+
+
+class AcquisitionWorker:
+    """
+    Drains a DataStream on a dedicated thread into a bounded queue.
+    Frames are taken with dq_buf(zero_copy=True), so a queued image borrows its driver buffer and
+    gives it back once the consumer drops it (or calls RawImage.release()). The queue size should
+    therefore stay below the acquisition buffer number (DataStream.set_acquisition_buffer_number).
+    The queue is a deque, whose append/popleft are atomic, the events are only used to wait
+    for frames (consumer) or for room (BLOCK policy).
+    """
+    def __init__(self, data_stream, queue_size=4, policy=AcquisitionQueuePolicy.DROP_OLDEST,
+                 timeout=1000, drop_incomplete=True, tracer=None):
+        """
+        :brief  Constructor for instance initialization
+        :param  data_stream:        DataStream object, acquisition is started by the user (Device.stream_on)
+        :param  queue_size:         bounded queue size, range:[1, 0xFFFFFFFF]
+        :param  policy:             AcquisitionQueuePolicy
+        :param  timeout:            dq_buf timeout of the acquisition thread, range:[0, 0xFFFFFFFF]
+        :param  drop_incomplete:    True: frames whose status is not SUCCESS are not queued
+        :param  tracer:             LatencyTracer, frames are traced from the moment they are dequeued
+        """
+        if not isinstance(queue_size, INT_TYPE):
+            raise ParameterTypeError("AcquisitionWorker.__init__: "
+                                     "Expected queue_size type is int, not %s" % type(queue_size))
+
+        if not isinstance(timeout, INT_TYPE):
+            raise ParameterTypeError("AcquisitionWorker.__init__: "
+                                     "Expected timeout type is int, not %s" % type(timeout))
+
+        if queue_size < 1 or queue_size > UNSIGNED_INT_MAX:
+            raise InvalidParameter("AcquisitionWorker.__init__: queue_size out of bounds, minimum=1, maximum=%s"
+                                   % hex(UNSIGNED_INT_MAX).__str__())
+
+        if timeout < 0 or timeout > UNSIGNED_INT_MAX:
+            raise InvalidParameter("AcquisitionWorker.__init__: timeout out of bounds, minimum=0, maximum=%s"
+                                   % hex(UNSIGNED_INT_MAX).__str__())
+
+        if policy not in (AcquisitionQueuePolicy.DROP_OLDEST, AcquisitionQueuePolicy.DROP_NEWEST,
+                          AcquisitionQueuePolicy.BLOCK):
+            raise InvalidParameter("AcquisitionWorker.__init__: policy is not a AcquisitionQueuePolicy value")
+
+        if tracer is not None:
+            # LatencyTracer builds on Pipeline, which is loaded after this module
+            from gxipy.LatencyTracer import LatencyTracer
+            if not isinstance(tracer, LatencyTracer):
+                raise ParameterTypeError("AcquisitionWorker.__init__: "
+                                         "Expected tracer type is LatencyTracer, not %s" % type(tracer))
+
+        self.__data_stream = data_stream
+        self.__tracer = tracer
+        self.__queue_size = queue_size
+        self.__policy = policy
+        self.__timeout = timeout
+        self.__drop_incomplete = drop_incomplete
+        self.__queue = collections.deque()
+        self.__not_empty = threading.Event()
+        self.__not_full = threading.Event()
+        self.__running = False
+        self.__thread = None
+        self.__last_error = None
+        self.__lost_frame_base = None
+        self.__reset_statistics()
+
+    def __reset_statistics(self):
+        self.__acquired_count = 0
+        self.__delivered_count = 0
+        self.__timeout_count = 0
+        self.__incomplete_drop_count = 0
+        self.__queue_drop_count = 0
+        self.__block_count = 0
+
+    def start(self):
+        """
+        :brief      Start the acquisition thread
+        :return:    None
+        """
+        if self.__running:
+            return
+
+        self.__reset_statistics()
+        self.__last_error = None
+        try:
+            self.__lost_frame_base = self.__data_stream.StreamLostFrameCount.get()
+        except Exception:
+            self.__lost_frame_base = None
+
+        self.__running = True
+        self.__not_full.set()
+        self.__thread = threading.Thread(target=self.__run, name="AcquisitionWorker")
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def stop(self):
+        """
+        :brief      Stop the acquisition thread and give every queued buffer back to the driver
+        :return:    None
+        """
+        if not self.__running:
+            return
+
+        self.__running = False
+        self.__not_full.set()
+        self.__thread.join()
+        self.__thread = None
+        while True:
+            try:
+                self.__discard(self.__queue.popleft())
+            except IndexError:
+                break
+        self.__not_empty.set()
+
+    def is_running(self):
+        """
+        :brief      Whether the acquisition thread is running
+        :return:    True/False
+        """
+        return self.__running
+
+    def get_last_error(self):
+        """
+        :brief      Get the exception that stopped the acquisition thread
+        :return:    Exception object, None if the thread didn't fail
+        """
+        return self.__last_error
+
+    def get_image(self, timeout=1000):
+        """
+        :brief      Take the oldest queued image
+        :param      timeout:    wait time in ms, range:[0, 0xFFFFFFFF]
+        :return:    RawImage object, None on timeout or when the worker is stopped
+        """
+        if not isinstance(timeout, INT_TYPE):
+            raise ParameterTypeError("AcquisitionWorker.get_image: "
+                                     "Expected timeout type is int, not %s" % type(timeout))
+
+        if (timeout < 0) or (timeout > UNSIGNED_INT_MAX):
+            print("AcquisitionWorker.get_image: "
+                  "timeout out of bounds, minimum=0, maximum=%s"
+                  % hex(UNSIGNED_INT_MAX).__str__())
+            return None
+
+        deadline = time.monotonic() + timeout / 1000.0
+        while True:
+            try:
+                image = self.__queue.popleft()
+                self.__not_full.set()
+                self.__delivered_count += 1
+                return image
+            except IndexError:
+                pass
+
+            if not self.__running:
+                return None
+
+            # clear first and look again, a frame queued in between would otherwise be missed
+            self.__not_empty.clear()
+            if len(self.__queue) != 0:
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.__not_empty.wait(remaining):
+                return None
+
+    def get_queue_length(self):
+        """
+        :brief      Get the number of queued images
+        :return:    queue length
+        """
+        return len(self.__queue)
+
+    def get_statistics(self):
+        """
+        :brief      Get frame counters since start()
+                    acquired:           frames dequeued from the driver
+                    delivered:          frames taken by get_image
+                    timeout:            dq_buf timeouts
+                    incomplete_dropped: frames dropped because their status is not SUCCESS
+                    queue_dropped:      frames dropped by the DROP_OLDEST/DROP_NEWEST policy
+                    blocked:            times the BLOCK policy had to wait for room
+                    driver_lost:        StreamLostFrameCount increase, None if the feature is not readable
+        :return:    dict
+        """
+        driver_lost = None
+        if self.__lost_frame_base is not None:
+            try:
+                driver_lost = self.__data_stream.StreamLostFrameCount.get() - self.__lost_frame_base
+            except Exception:
+                driver_lost = None
+
+        return {
+            "acquired": self.__acquired_count,
+            "delivered": self.__delivered_count,
+            "timeout": self.__timeout_count,
+            "incomplete_dropped": self.__incomplete_drop_count,
+            "queue_dropped": self.__queue_drop_count,
+            "blocked": self.__block_count,
+            "driver_lost": driver_lost,
+        }
+
+    def __run(self):
+        """
+        :brief      Acquisition thread body
+        :return:    None
+        """
+        while self.__running:
+            if self.__data_stream.acquisition_flag is False:
+                time.sleep(0.01)
+                continue
+
+            try:
+                image = self.__data_stream.dq_buf(self.__timeout, zero_copy=True)
+            except Exception as error:
+                self.__last_error = error
+                self.__running = False
+                self.__not_empty.set()
+                return
+
+            if image is None:
+                self.__timeout_count += 1
+                continue
+
+            self.__acquired_count += 1
+            if self.__drop_incomplete and image.get_status() != GxFrameStatusList.SUCCESS:
+                self.__incomplete_drop_count += 1
+                image.release()
+                continue
+
+            if self.__tracer is not None:
+                self.__tracer.begin(image)
+
+            self.__push(image)
+
+    def __push(self, image):
+        """
+        :brief      Queue an image according to the policy
+        :param      image:  RawImage object
+        :return:    None
+        """
+        if len(self.__queue) >= self.__queue_size:
+            if self.__policy == AcquisitionQueuePolicy.DROP_NEWEST:
+                self.__queue_drop_count += 1
+                self.__discard(image)
+                return
+            elif self.__policy == AcquisitionQueuePolicy.DROP_OLDEST:
+                try:
+                    self.__discard(self.__queue.popleft())
+                    self.__queue_drop_count += 1
+                except IndexError:
+                    pass
+            else:
+                self.__block_count += 1
+                while self.__running and len(self.__queue) >= self.__queue_size:
+                    self.__not_full.clear()
+                    if len(self.__queue) < self.__queue_size:
+                        break
+                    self.__not_full.wait(0.1)
+
+                if not self.__running:
+                    self.__discard(image)
+                    return
+
+        self.__queue.append(image)
+        self.__not_empty.set()
+
+    def __discard(self, image):
+        """
+        :brief      Give a dropped image back to the driver
+        :param      image:  RawImage object
+        :return:    None
+        """
+        if self.__tracer is not None:
+            self.__tracer.discard(image)
+        image.release()
@@ -0,0 +1,190 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import numpy
+from gxipy.gxidef import *
+from gxipy.ImageProc import *
+from gxipy.Exception import *
+from gxipy.AcquisitionWorker import *
+import asyncio
+import threading
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+
+class AsyncFrameIterator:
+    """
+    Asynchronous iterator over the frames of a DataStream, created by DataStream.frames().
+    Frames arrive on the fast capture callback of the driver, are copied out of the driver buffer
+    (CaptureFrame.retain) and handed to the event loop with loop.call_soon_threadsafe, no extra
+    thread is started. A frame dropped by the policy is not copied.
+    Backpressure follows the AcquisitionQueuePolicy:
+        BLOCK:          the callback thread waits for room, the driver keeps the frames in its
+                        acquisition buffers and drops by its own buffer handling mode once they are full;
+                        a frame still waiting when Device.stream_off is called is dropped
+        DROP_NEWEST:    frames arriving while queue_size frames are pending are dropped
+        DROP_OLDEST:    the oldest pending frame is dropped to make room
+    """
+    def __init__(self, data_stream, queue_size=4, policy=AcquisitionQueuePolicy.BLOCK):
+        """
+        :brief  Constructor for instance initialization
+        :param  data_stream:    DataStream object
+        :param  queue_size:     maximum number of frames waiting for the consumer, range:[1, 0xFFFFFFFF]
+        :param  policy:         AcquisitionQueuePolicy
+        """
+        if not isinstance(queue_size, INT_TYPE):
+            raise ParameterTypeError("AsyncFrameIterator.__init__: "
+                                     "Expected queue_size type is int, not %s" % type(queue_size))
+
+        if queue_size < 1 or queue_size > UNSIGNED_INT_MAX:
+            raise InvalidParameter("AsyncFrameIterator.__init__: queue_size out of bounds, minimum=1, maximum=%s"
+                                   % hex(UNSIGNED_INT_MAX).__str__())
+
+        if policy not in (AcquisitionQueuePolicy.DROP_OLDEST, AcquisitionQueuePolicy.DROP_NEWEST,
+                          AcquisitionQueuePolicy.BLOCK):
+            raise InvalidParameter("AsyncFrameIterator.__init__: policy is not a AcquisitionQueuePolicy value")
+
+        self.__data_stream = data_stream
+        self.__queue_size = queue_size
+        self.__policy = policy
+        self.__slots = threading.Semaphore(queue_size)
+        self.__loop = None
+        self.__queue = None
+        self.__closed = False
+        self.__drop_count = 0
+        self.__frame_count = 0
+
+    def __open(self):
+        """
+        :brief      Bind to the running event loop and register the capture callback
+        :return:    None
+        """
+        self.__loop = asyncio.get_running_loop()
+        # unbounded, the bound is enforced by the slots so the end marker always fits
+        self.__queue = asyncio.Queue()
+
+        def capture_callback(capture_frame):
+            self.__on_capture(capture_frame)
+
+        self.__data_stream.register_capture_callback(capture_callback, fast=True)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.__closed:
+            raise StopAsyncIteration
+
+        if self.__loop is None:
+            self.__open()
+
+        image = await self.__queue.get()
+        if image is None:
+            raise StopAsyncIteration
+
+        if self.__policy != AcquisitionQueuePolicy.DROP_OLDEST:
+            self.__slots.release()
+
+        return image
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def aclose(self):
+        self.close()
+
+    def close(self):
+        """
+        :brief      Unregister the capture callback and end the iteration, must be called from the event loop
+        :return:    None
+        """
+        if self.__closed:
+            return
+
+        self.__closed = True
+        if self.__loop is None:
+            return
+
+        self.__data_stream.unregister_capture_callback()
+        # wake a callback thread waiting for room
+        self.__slots.release()
+        self.__queue.put_nowait(None)
+
+    def get_frame_count(self):
+        """
+        :brief      Get the number of frames received from the capture callback
+        :return:    frame count
+        """
+        return self.__frame_count
+
+    def get_drop_count(self):
+        """
+        :brief      Get the number of frames dropped by the DROP_OLDEST/DROP_NEWEST policy,
+                    or by the BLOCK policy at stream_off
+        :return:    drop count
+        """
+        return self.__drop_count
+
+    def get_pending_num(self):
+        """
+        :brief      Get the number of frames waiting for the consumer
+        :return:    pending frame number
+        """
+        if self.__queue is None:
+            return 0
+        return self.__queue.qsize()
+
+    def __on_capture(self, capture_frame):
+        """
+        :brief      Runs on the capture callback thread
+        :param      capture_frame:  CaptureFrame object, borrows the driver buffer until the callback returns
+        :return:    None
+        """
+        if self.__closed:
+            return
+
+        self.__frame_count += 1
+        if self.__policy == AcquisitionQueuePolicy.BLOCK:
+            while not self.__slots.acquire(timeout=0.1):
+                if self.__closed:
+                    return
+                if self.__data_stream.stopping:
+                    self.__drop_count += 1
+                    return
+            if self.__closed:
+                return
+        elif self.__policy == AcquisitionQueuePolicy.DROP_NEWEST:
+            if not self.__slots.acquire(blocking=False):
+                self.__drop_count += 1
+                return
+
+        # the driver refills its buffer once the callback returns, the event loop gets a copy
+        raw_image = capture_frame.retain()
+        try:
+            self.__loop.call_soon_threadsafe(self.__deliver, raw_image)
+        except RuntimeError:
+            # event loop already closed
+            pass
+
+    def __deliver(self, raw_image):
+        """
+        :brief      Runs on the event loop thread
+        :param      raw_image:  RawImage object
+        :return:    None
+        """
+        if self.__closed:
+            return
+
+        if self.__policy == AcquisitionQueuePolicy.DROP_OLDEST and self.__queue.qsize() >= self.__queue_size:
+            self.__queue.get_nowait()
+            self.__drop_count += 1
+
+        self.__queue.put_nowait(raw_image)
@@ -0,0 +1,311 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import numpy
+from gxipy.gxwrapper import *
+from gxipy.gxidef import *
+from gxipy.ImageProc import *
+from gxipy.Exception import *
+import collections
+import ctypes
+import functools
+import mmap
+import os
+import threading
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+BUFFER_ALIGNMENT = 64
+ARENA_HUGE_PAGE_SIZE = 2 * 1024 * 1024
+# mmap flag of a hugetlbfs backed mapping on Linux, not exported by the mmap module
+ARENA_MAP_HUGETLB = getattr(mmap, "MAP_HUGETLB", 0x40000)
+
+
+class ArenaPageMode:
+    NORMAL = "normal"                   # base pages
+    TRANSPARENT = "transparent"         # base pages the kernel may merge into huge pages (madvise)
+    HUGETLB = "hugetlb"                 # reserved huge pages (vm.nr_hugepages)
+
+    def __init__(self):
+        pass
+
+
+def _align(value, alignment):
+    return (value + alignment - 1) // alignment * alignment
+
+
+class _PoolSlot:
+    def __init__(self, index, buffer_size, alignment):
+        """
+        :brief  One pre-allocated, aligned frame buffer and the GxFrameData describing it
+        :param  index:          slot index in the pool
+        :param  buffer_size:    usable buffer size
+        :param  alignment:      start address alignment in bytes
+        """
+        self.index = index
+        self.storage = (c_ubyte * (buffer_size + alignment))()
+        offset = (-addressof(self.storage)) % alignment
+        self.address = addressof(self.storage) + offset
+        self.frame_data = GxFrameData()
+
+
+class FrameBufferPool:
+    """
+    Fixed set of pre-allocated frame buffers handed out round-robin.
+    Images created by acquire() own no memory, their BufferLease puts the buffer back
+    into the pool when the image and its numpy views are dropped (or on RawImage.release()).
+    """
+    def __init__(self, buffer_num, buffer_size, alignment=BUFFER_ALIGNMENT):
+        """
+        :brief  Constructor for instance initialization
+        :param  buffer_num:     number of buffers, range:[1, 0xFFFFFFFF]
+        :param  buffer_size:    size of every buffer, normally DataStream.get_payload_size()
+        :param  alignment:      start address alignment in bytes, power of two
+        """
+        if not isinstance(buffer_num, INT_TYPE):
+            raise ParameterTypeError("FrameBufferPool.__init__: "
+                                     "Expected buffer_num type is int, not %s" % type(buffer_num))
+
+        if not isinstance(buffer_size, INT_TYPE):
+            raise ParameterTypeError("FrameBufferPool.__init__: "
+                                     "Expected buffer_size type is int, not %s" % type(buffer_size))
+
+        if buffer_num < 1 or buffer_size < 1:
+            raise InvalidParameter("FrameBufferPool.__init__: buffer_num and buffer_size must be greater than 0")
+
+        if alignment < 1 or (alignment & (alignment - 1)) != 0:
+            raise InvalidParameter("FrameBufferPool.__init__: alignment must be a power of two")
+
+        self.__buffer_size = buffer_size
+        self.__slots = [_PoolSlot(index, buffer_size, alignment) for index in range(buffer_num)]
+        self.__free = collections.deque(range(buffer_num))
+        self.__mutex = threading.Lock()
+        self.__miss_count = 0
+
+    def get_buffer_num(self):
+        """
+        :brief      Get the number of buffers in the pool
+        :return:    buffer number
+        """
+        return len(self.__slots)
+
+    def get_buffer_size(self):
+        """
+        :brief      Get the size of every buffer
+        :return:    buffer size
+        """
+        return self.__buffer_size
+
+    def get_free_num(self):
+        """
+        :brief      Get the number of buffers not handed out
+        :return:    free buffer number
+        """
+        with self.__mutex:
+            return len(self.__free)
+
+    def get_miss_count(self):
+        """
+        :brief      Get how often acquire() found no free buffer
+        :return:    miss count
+        """
+        return self.__miss_count
+
+    def acquire(self, image_size):
+        """
+        :brief      Take the next free buffer and wrap it into a RawImage
+        :param      image_size:     bytes the image needs, must not exceed get_buffer_size()
+        :return:    RawImage object, None if every buffer is in use or image_size is too large
+        """
+        if image_size > self.__buffer_size:
+            self.__miss_count += 1
+            return None
+
+        with self.__mutex:
+            if len(self.__free) == 0:
+                self.__miss_count += 1
+                return None
+            index = self.__free.popleft()
+
+        slot = self.__slots[index]
+        frame_data = slot.frame_data
+        frame_data.status = 0
+        frame_data.image_buf = slot.address
+        frame_data.image_size = image_size
+        return RawImage(frame_data, BufferLease(functools.partial(self.__give_back, index)))
+
+    def __give_back(self, index):
+        """
+        :brief      Return a buffer to the end of the free list
+        :param      index:  slot index
+        :return:    None
+        """
+        with self.__mutex:
+            self.__free.append(index)
+
+
+class BufferArena:
+    """
+    One anonymous memory mapping cut into page-aligned frame buffers, each available both as the
+    ctypes.Array DataStream.register_buffer takes and as a numpy array of the frame shape over the
+    same memory. The pages are touched at creation so that no page fault is left for acquisition.
+    With huge_pages the mapping is taken from the reserved huge pages if there are any, else the kernel
+    is asked to back it with transparent huge pages; lock keeps it in RAM (mlock).
+    """
+    def __init__(self, buffer_num, buffer_size, shape=None, dtype=numpy.uint8, huge_pages=False, lock=False):
+        """
+        :brief  Constructor for instance initialization
+        :param  buffer_num:     number of buffers, range:[1, 0xFFFFFFFF]
+        :param  buffer_size:    size of every buffer, normally DataStream.get_payload_size()
+        :param  shape:          shape of the numpy arrays, e.g. (height, width), None for one dimension
+                                over the whole buffer
+        :param  dtype:          numpy dtype of the arrays
+        :param  huge_pages:     True: back the arena with huge pages where the system allows it
+        :param  lock:           True: lock the arena in RAM, a failing mlock (RLIMIT_MEMLOCK) is reported
+                                by get_info() and the arena stays unlocked
+        """
+        if not isinstance(buffer_num, INT_TYPE):
+            raise ParameterTypeError("BufferArena.__init__: "
+                                     "Expected buffer_num type is int, not %s" % type(buffer_num))
+
+        if not isinstance(buffer_size, INT_TYPE):
+            raise ParameterTypeError("BufferArena.__init__: "
+                                     "Expected buffer_size type is int, not %s" % type(buffer_size))
+
+        if buffer_num < 1 or buffer_size < 1:
+            raise InvalidParameter("BufferArena.__init__: buffer_num and buffer_size must be greater than 0")
+
+        dtype = numpy.dtype(dtype)
+        if shape is None:
+            shape = (buffer_size // dtype.itemsize,)
+        shape = tuple(shape)
+        count = int(numpy.prod(shape))
+        if count * dtype.itemsize > buffer_size:
+            raise InvalidParameter("BufferArena.__init__: shape %s of %s needs %d bytes, the buffer size is %d"
+                                   % (shape, dtype, count * dtype.itemsize, buffer_size))
+
+        self.__buffer_size = buffer_size
+        self.__stride = _align(buffer_size, mmap.PAGESIZE)
+        self.__page_mode = ArenaPageMode.NORMAL
+        self.__locked = False
+        self.__map = None
+        arena_size = self.__stride * buffer_num
+        if huge_pages:
+            arena_size = _align(arena_size, ARENA_HUGE_PAGE_SIZE)
+            self.__map = self.__map_huge_pages(arena_size)
+        if self.__map is None:
+            self.__map = mmap.mmap(-1, arena_size)
+        self.__size = arena_size
+
+        # fault every page in now instead of on the first frames
+        numpy.frombuffer(self.__map, dtype=numpy.uint8)[::mmap.PAGESIZE] = 0
+        self.__address = ctypes.addressof(ctypes.c_ubyte.from_buffer(self.__map))
+        if lock:
+            self.__locked = self.__lock()
+
+        self.__c_buffers = [(c_ubyte * buffer_size).from_buffer(self.__map, index * self.__stride)
+                            for index in range(buffer_num)]
+        self.__arrays = [numpy.frombuffer(self.__map, dtype=dtype, count=count, offset=index * self.__stride).
+                         reshape(shape) for index in range(buffer_num)]
+
+    def __map_huge_pages(self, arena_size):
+        """
+        :brief      Anonymous mapping backed by huge pages
+        :return:    mmap object, None where huge pages are not supported
+        """
+        if not sys.platform.startswith("linux"):
+            return None
+
+        flags = mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS
+        try:
+            arena_map = mmap.mmap(-1, arena_size, flags=flags | ARENA_MAP_HUGETLB)
+            self.__page_mode = ArenaPageMode.HUGETLB
+            return arena_map
+        except OSError:
+            # no huge pages reserved
+            pass
+
+        arena_map = mmap.mmap(-1, arena_size, flags=flags)
+        if hasattr(arena_map, "madvise") and hasattr(mmap, "MADV_HUGEPAGE"):
+            try:
+                arena_map.madvise(mmap.MADV_HUGEPAGE)
+                self.__page_mode = ArenaPageMode.TRANSPARENT
+            except OSError:
+                # transparent huge pages disabled
+                pass
+        return arena_map
+
+    def __lock(self):
+        """
+        :brief      mlock the arena
+        :return:    True if it is locked
+        """
+        if sys.platform == "win32":
+            result = ctypes.windll.kernel32.VirtualLock(ctypes.c_void_p(self.__address),
+                                                        ctypes.c_size_t(self.__size))
+            return result != 0
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        result = libc.mlock(ctypes.c_void_p(self.__address), ctypes.c_size_t(self.__size))
+        if result != 0:
+            print("BufferArena.__init__: mlock failed, %s" % os.strerror(ctypes.get_errno()))
+            return False
+        return True
+
+    def get_buffer_num(self):
+        """
+        :brief      Get the number of buffers in the arena
+        :return:    buffer number
+        """
+        return len(self.__c_buffers)
+
+    def get_buffer_size(self):
+        """
+        :brief      Get the size of every buffer
+        :return:    buffer size
+        """
+        return self.__buffer_size
+
+    def get_c_buffers(self):
+        """
+        :brief      The buffers as ctypes arrays, for DataStream.register_buffer
+        :return:    list of ctypes.Array
+        """
+        return list(self.__c_buffers)
+
+    def get_arrays(self):
+        """
+        :brief      The buffers as numpy arrays of the arena shape, in the order of get_c_buffers()
+        :return:    list of numpy.ndarray
+        """
+        return list(self.__arrays)
+
+    def get_info(self):
+        """
+        :brief      Layout of the arena
+        :return:    dict: address, size, stride (bytes between two buffers), page_mode (ArenaPageMode),
+                    locked
+        """
+        return {"address": self.__address, "size": self.__size, "stride": self.__stride,
+                "page_mode": self.__page_mode, "locked": self.__locked}
+
+    def close(self):
+        """
+        :brief      Drop the arena. The memory is unmapped once the numpy arrays handed out are dropped too.
+        :return:    None
+        """
+        self.__c_buffers = []
+        self.__arrays = []
+        if self.__map is None:
+            return
+        try:
+            self.__map.close()
+        except BufferError:
+            # arrays still exported, the mapping goes with the last of them
+            pass
+        self.__map = None
@@ -0,0 +1,364 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+from gxipy.gxidef import *
+from gxipy.LatencyTracer import *
+from gxipy.Exception import *
+import collections
+import json
+import os
+import time
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+# acquisition buffers of the first session unless a baseline is given
+BUFFER_TUNER_BASELINE_BUFFER_NUM = 8
+BUFFER_TUNER_MAX_BUFFER_NUM = 1024
+# a knob is settled once its bounds are this close, relative to the lossless value
+BUFFER_TUNER_RESOLUTION = 0.125
+
+# knobs in search order, AcquisitionBufferNumber is DataStream.set_acquisition_buffer_number,
+# the others are features of U3VDataStream or GEVDataStream
+_TUNER_KNOBS = ("AcquisitionBufferNumber", "StreamTransferNumberUrb", "StreamTransferSize",
+                "MaxNumQueueBuffer", "SocketBufferSize", "PacketTimeout")
+_TUNER_BUFFER_KNOB = "AcquisitionBufferNumber"
+
+
+class BufferTunerPhase:
+    GROW = "grow"               # doubling every knob until a session loses nothing
+    SHRINK = "shrink"           # bisecting one knob at a time between a lossy and a lossless value
+    VERIFY = "verify"           # one more session at the smallest lossless settings
+    CONVERGED = "converged"     # settings found, applied by every later session
+    FAILED = "failed"           # frames lost with every knob at its maximum
+
+    def __init__(self):
+        pass
+
+
+class BufferTuner:
+    """
+    Finds, over successive stream sessions, the smallest acquisition buffer count and transfer settings
+    with which a camera delivers its target frame rate without losing a frame. Each session runs
+    between start_session() and stop_session(), which turn the stream on and off; the settings are
+    changed only in between. The knobs are first doubled from the baseline until a session is clean,
+    then bisected down one at a time, and the result is confirmed by a last session.
+    The search state is kept in a JSON file per camera serial number, so tuning carries on across
+    runs, and a converged camera starts directly with its settings. A record made for another
+    payload size or frame rate is ignored.
+    """
+    def __init__(self, device, store_path=None, target_fps=None, baseline=None, stream_index=0,
+                 max_dequeue_latency=None, tracer=None, fps_tolerance=0.05):
+        """
+        :brief  Constructor for instance initialization
+        :param  device:                 Device object, not acquiring
+        :param  store_path:             JSON file of the tuned settings, None keeps them in memory
+        :param  target_fps:             frame rate a session has to reach, None: CurrentAcquisitionFrameRate
+        :param  baseline:               dict of knob name: value of the first session, knobs not given start
+                                        from BUFFER_TUNER_BASELINE_BUFFER_NUM buffers or the device value
+        :param  stream_index:           index in Device.data_stream
+        :param  max_dequeue_latency:    seconds, a session whose p99 dequeue latency is above is not clean,
+                                        needs tracer
+        :param  tracer:                 LatencyTracer fed by the consumer, its statistics are reset by
+                                        start_session
+        :param  fps_tolerance:          fraction of target_fps a session may fall short of
+        """
+        if store_path is not None and not isinstance(store_path, str):
+            raise ParameterTypeError("BufferTuner.__init__: "
+                                     "Expected store_path type is str, not %s" % type(store_path))
+
+        if target_fps is not None and (not isinstance(target_fps, (INT_TYPE, float)) or target_fps <= 0):
+            raise InvalidParameter("BufferTuner.__init__: target_fps must be a positive number")
+
+        if baseline is not None and not isinstance(baseline, dict):
+            raise ParameterTypeError("BufferTuner.__init__: "
+                                     "Expected baseline type is dict, not %s" % type(baseline))
+
+        if not isinstance(stream_index, INT_TYPE):
+            raise ParameterTypeError("BufferTuner.__init__: "
+                                     "Expected stream_index type is int, not %s" % type(stream_index))
+
+        if stream_index < 0 or stream_index >= len(device.data_stream):
+            raise InvalidParameter("BufferTuner.__init__: stream_index out of bounds, minimum=0, maximum=%d"
+                                   % (len(device.data_stream) - 1))
+
+        if tracer is not None and not isinstance(tracer, LatencyTracer):
+            raise ParameterTypeError("BufferTuner.__init__: "
+                                     "Expected tracer type is LatencyTracer, not %s" % type(tracer))
+
+        if max_dequeue_latency is not None and tracer is None:
+            raise InvalidParameter("BufferTuner.__init__: max_dequeue_latency needs a tracer")
+
+        if not isinstance(fps_tolerance, (INT_TYPE, float)) or fps_tolerance < 0 or fps_tolerance >= 1:
+            raise InvalidParameter("BufferTuner.__init__: fps_tolerance out of bounds, minimum=0, maximum=1")
+
+        self.__device = device
+        self.__data_stream = device.data_stream[stream_index]
+        self.__store_path = store_path
+        self.__target_fps = target_fps
+        self.__baseline = dict(baseline or {})
+        self.__max_dequeue_latency = max_dequeue_latency
+        self.__tracer = tracer
+        self.__fps_tolerance = fps_tolerance
+        self.__serial_number = device.DeviceSerialNumber.get()
+        self.__knobs = None
+        self.__state = None
+        self.__session = None
+
+        unknown = [name for name in self.__baseline if name not in _TUNER_KNOBS]
+        if unknown:
+            raise InvalidParameter("BufferTuner.__init__: unknown knobs %s, supported: %s"
+                                   % (", ".join(unknown), ", ".join(_TUNER_KNOBS)))
+
+    # ---------------knobs-------------------------------------------------
+    def __get_knobs(self):
+        """
+        :brief      Knobs of this stream: OrderedDict of name: (minimum, maximum, increment, device value)
+        """
+        if self.__knobs is not None:
+            return self.__knobs
+
+        knobs = collections.OrderedDict()
+        knobs[_TUNER_BUFFER_KNOB] = (1, BUFFER_TUNER_MAX_BUFFER_NUM, 1, BUFFER_TUNER_BASELINE_BUFFER_NUM)
+        for name in _TUNER_KNOBS[1:]:
+            feature = getattr(self.__data_stream, name, None)
+            if feature is None or not feature.is_implemented() or not feature.is_writable():
+                continue
+            feature_range = feature.get_range()
+            knobs[name] = (feature_range["min"], feature_range["max"], max(feature_range["inc"], 1), feature.get())
+        self.__knobs = knobs
+        return knobs
+
+    def __align(self, name, value):
+        minimum, maximum, increment, device_value = self.__get_knobs()[name]
+        value = minimum + (max(value, minimum) - minimum + increment - 1) // increment * increment
+        return min(value, maximum - (maximum - minimum) % increment)
+
+    def __apply(self, settings):
+        for name, value in settings.items():
+            if name == _TUNER_BUFFER_KNOB:
+                self.__data_stream.set_acquisition_buffer_number(value)
+            else:
+                getattr(self.__data_stream, name).set(value)
+
+    def get_footprint(self, settings=None):
+        """
+        :brief      Host memory held by the acquisition buffers and the USB transfers of settings
+        :param      settings:   dict of knob name: value, None: the settings of the next session
+        :return:    bytes
+        """
+        settings = self.get_settings() if settings is None else settings
+        payload_size = self.__data_stream.get_payload_size()
+        footprint = settings.get(_TUNER_BUFFER_KNOB, 0) * payload_size
+        footprint += settings.get("StreamTransferNumberUrb", 0) * settings.get("StreamTransferSize", 0)
+        footprint += settings.get("MaxNumQueueBuffer", 0) * payload_size
+        return footprint
+
+    # ---------------state-------------------------------------------------
+    def __get_key(self):
+        return {"payload_size": self.__data_stream.get_payload_size(), "target_fps": round(self.__get_target(), 3)}
+
+    def __get_target(self):
+        if self.__target_fps is not None:
+            return float(self.__target_fps)
+        return self.__device.CurrentAcquisitionFrameRate.get()
+
+    def __read_store(self):
+        if self.__store_path is None or not os.path.exists(self.__store_path):
+            return {}
+        with open(self.__store_path, "r") as store_file:
+            return json.load(store_file)
+
+    def __write_store(self):
+        if self.__store_path is None:
+            return
+        records = self.__read_store()
+        records[self.__serial_number] = self.__state
+        with open(self.__store_path, "w") as store_file:
+            json.dump(records, store_file, indent=4, sort_keys=True)
+
+    def __get_state(self):
+        """
+        :brief      Search state of this camera, from the store if it was made for the same payload and rate
+        """
+        if self.__state is not None:
+            return self.__state
+
+        key = self.__get_key()
+        state = self.__read_store().get(self.__serial_number)
+        knobs = self.__get_knobs()
+        if state is None or state.get("key") != key or set(state["settings"]) != set(knobs):
+            settings = collections.OrderedDict()
+            for name, (minimum, maximum, increment, device_value) in knobs.items():
+                settings[name] = self.__align(name, self.__baseline.get(name, device_value))
+            state = {"key": key, "phase": BufferTunerPhase.GROW, "settings": settings, "lossless": None,
+                     "lossy": dict((name, knob[0] - knob[2]) for name, knob in knobs.items()),
+                     "knob": 0, "sessions": 0}
+        self.__state = state
+        return state
+
+    def reset(self):
+        """
+        :brief      Forget the tuning of this camera and start over from the baseline
+        :return:    None
+        """
+        self.__state = None
+        self.__knobs = None
+        records = self.__read_store()
+        if records.pop(self.__serial_number, None) is not None:
+            with open(self.__store_path, "w") as store_file:
+                json.dump(records, store_file, indent=4, sort_keys=True)
+
+    def get_phase(self):
+        """
+        :return:    BufferTunerPhase
+        """
+        return self.__get_state()["phase"]
+
+    def is_converged(self):
+        return self.get_phase() == BufferTunerPhase.CONVERGED
+
+    def get_settings(self):
+        """
+        :return:    dict of knob name: value the next session runs with
+        """
+        return dict(self.__get_state()["settings"])
+
+    # ---------------sessions----------------------------------------------
+    def __read_counters(self):
+        return (self.__data_stream.StreamDeliveredFrameCount.get(), self.__data_stream.StreamLostFrameCount.get(),
+                self.__data_stream.StreamIncompleteFrameCount.get())
+
+    def start_session(self):
+        """
+        :brief      Apply the settings of the next session and turn the stream on
+        :return:    dict of knob name: value applied
+        """
+        if self.__session is not None:
+            raise InvalidCall("BufferTuner.start_session: the session is already started")
+
+        state = self.__get_state()
+        self.__apply(state["settings"])
+        before = self.__read_counters()
+        if self.__tracer is not None:
+            self.__tracer.reset_statistics()
+        self.__device.stream_on()
+        start = time.perf_counter()
+        after = self.__read_counters()
+        # drivers that restart the counters with the stream count from zero
+        self.__session = (start, before if after[0] >= before[0] else (0, 0, 0))
+        return dict(state["settings"])
+
+    def stop_session(self):
+        """
+        :brief      Turn the stream off, judge the session and choose the settings of the next one
+        :return:    dict: settings, seconds, delivered, lost, incomplete, fps, target_fps,
+                    dequeue_p99 (None without tracer), clean, footprint (bytes), phase (after the session)
+        """
+        if self.__session is None:
+            raise InvalidCall("BufferTuner.stop_session: the session is not started")
+
+        start, before = self.__session
+        counters = self.__read_counters()
+        seconds = time.perf_counter() - start
+        self.__device.stream_off()
+        self.__session = None
+
+        delivered, lost, incomplete = [counters[i] - before[i] for i in range(3)]
+        target_fps = self.__get_target()
+        dequeue_p99 = None
+        if self.__tracer is not None:
+            statistics = self.__tracer.get_statistics().get(LatencyStage.DEQUEUE)
+            dequeue_p99 = None if statistics is None else statistics["p99"]
+        fps = delivered / seconds if seconds > 0 else 0.0
+        clean = lost == 0 and incomplete == 0 and fps >= target_fps * (1 - self.__fps_tolerance)
+        if self.__max_dequeue_latency is not None and dequeue_p99 is not None:
+            clean = clean and dequeue_p99 <= self.__max_dequeue_latency
+
+        state = self.__get_state()
+        report = {"settings": dict(state["settings"]), "seconds": seconds, "delivered": delivered, "lost": lost,
+                  "incomplete": incomplete, "fps": fps, "target_fps": target_fps, "dequeue_p99": dequeue_p99,
+                  "clean": clean, "footprint": self.get_footprint(state["settings"])}
+        self.__advance(state, clean)
+        state["sessions"] += 1
+        self.__write_store()
+        report["phase"] = state["phase"]
+        return report
+
+    def __advance(self, state, clean):
+        """
+        :brief      Next settings after a session
+        """
+        knobs = self.__get_knobs()
+        settings = state["settings"]
+        phase = state["phase"]
+        if phase == BufferTunerPhase.CONVERGED:
+            if not clean:
+                # conditions changed under converged settings: search again above them
+                state["floor"] = dict(settings)
+                self.__grow(state)
+            return
+
+        if phase in (BufferTunerPhase.GROW, BufferTunerPhase.FAILED):
+            if clean:
+                state["lossless"] = dict(settings)
+                # the settings of a failed verification bound the bisection from below
+                state["lossy"] = dict(state.get("floor") or
+                                      dict((name, knob[0] - knob[2]) for name, knob in knobs.items()))
+                state["phase"] = BufferTunerPhase.SHRINK
+                state["knob"] = 0
+                self.__next_candidate(state)
+            else:
+                state["lossy"] = dict(settings)
+                self.__grow(state)
+            return
+
+        if phase == BufferTunerPhase.SHRINK:
+            name = list(knobs)[state["knob"]]
+            if clean:
+                state["lossless"][name] = settings[name]
+            else:
+                state["lossy"][name] = settings[name]
+            self.__next_candidate(state)
+            return
+
+        # VERIFY
+        if clean:
+            state["phase"] = BufferTunerPhase.CONVERGED
+        else:
+            state["floor"] = dict(settings)
+            self.__grow(state)
+
+    def __grow(self, state):
+        """
+        :brief      Double every knob below its maximum, FAILED when all are at the maximum
+        """
+        settings = state["settings"]
+        grown = dict((name, self.__align(name, max(settings[name] * 2, settings[name] + knob[2])))
+                     for name, knob in self.__get_knobs().items())
+        state["phase"] = BufferTunerPhase.FAILED if grown == dict(settings) else BufferTunerPhase.GROW
+        settings.update(grown)
+
+    def __next_candidate(self, state):
+        """
+        :brief      Bisect the current knob, the next knob once it is settled, VERIFY after the last one
+        """
+        names = list(self.__get_knobs())
+        while state["knob"] < len(names):
+            name = names[state["knob"]]
+            minimum, maximum, increment, device_value = self.__get_knobs()[name]
+            low = state["lossy"][name]
+            high = state["lossless"][name]
+            candidate = self.__align(name, low + (high - low) // 2)
+            if high - low > increment and (high - low) > high * BUFFER_TUNER_RESOLUTION and low < candidate < high:
+                state["settings"] = dict(state["lossless"])
+                state["settings"][name] = candidate
+                return
+            state["knob"] += 1
+
+        state["settings"] = dict(state["lossless"])
+        state["phase"] = BufferTunerPhase.VERIFY
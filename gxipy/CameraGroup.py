@@ -0,0 +1,542 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+from gxipy.gxidef import *
+from gxipy.Device import *
+from gxipy.LatencyTracer import *
+from gxipy.ProcessCapture import *
+from gxipy.Exception import *
+import collections
+import threading
+import time
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+
+class CameraGroupTrigger:
+    ACTION = "action"           # one GigE Vision action command reaches every camera, GEV only
+    SOFTWARE = "software"       # TriggerSoftware sent to the cameras one after the other
+    EXTERNAL = "external"       # trigger wiring or free run set up by the user, left untouched
+
+    def __init__(self):
+        pass
+
+
+class CameraGroupTimebase:
+    HOST = "host"               # device timestamps related to time.perf_counter per camera (LatencyTracer)
+    DEVICE = "device"           # device timestamps as they are, for clocks synchronized by PTP
+
+    def __init__(self):
+        pass
+
+
+class FrameSet:
+    """
+    Frames of every camera of a CameraGroup taken by the same trigger, in the order of the serial numbers.
+    The images borrow driver buffers, release() gives them all back.
+    """
+    def __init__(self, images, times):
+        self.__images = images
+        self.__times = times
+
+    def get_images(self):
+        """
+        :return:    list of RawImage, one per camera
+        """
+        return list(self.__images)
+
+    def get_times(self):
+        """
+        :return:    list of the timestamps of the images in seconds, in the timebase of the group
+        """
+        return list(self.__times)
+
+    def get_time(self):
+        """
+        :return:    mean timestamp in seconds
+        """
+        return sum(self.__times) / len(self.__times)
+
+    def get_skew(self):
+        """
+        :return:    seconds between the earliest and the latest frame
+        """
+        return max(self.__times) - min(self.__times)
+
+    def release(self):
+        """
+        :brief      Give the buffers of every image back to the driver
+        :return:    None
+        """
+        for image in self.__images:
+            image.release()
+
+
+class CameraGroup:
+    """
+    Cameras opened by serial number and captured together: one trigger fires them all, each camera is
+    drained by its own thread, and frames whose timestamps lie within tolerance of each other are matched
+    into FrameSets. The threads keep a camera that is late from holding back the frames of the others,
+    but they share the GIL: they capture as many triggers per second as a loop dequeuing the cameras in
+    turn, not more. With processes=True every camera is opened and drained by a ProcessCapture worker
+    process of its own, only the matching runs in this process; a frame then costs a copy into shared
+    memory and a process switch, which pays off with a core per camera to spare and is slower on a
+    host without (benchmarks/bench_camera_group.py).
+    Frames arrive in timestamp order per camera, so the oldest pending frames of the cameras that cannot
+    be matched any more (a partner frame was lost) are dropped and counted as unmatched.
+    Pending frames hold driver buffers: max_pending + queue_size should stay below the acquisition
+    buffer number of each stream.
+    """
+    def __init__(self, device_manager, serial_numbers, trigger=None, tolerance=0.002,
+                 timebase=CameraGroupTimebase.HOST, queue_size=4, max_pending=4, drop_incomplete=True,
+                 action_keys=(1, 1, 1), broadcast_address="255.255.255.255", calibration_interval=5.0,
+                 features=None, processes=False):
+        """
+        :brief  Constructor for instance initialization, opens the cameras (in this process without processes)
+        :param  device_manager:         DeviceManager object, update_device_list already called
+        :param  serial_numbers:         list of serial numbers, the order of the images of a FrameSet
+        :param  trigger:                CameraGroupTrigger, None: ACTION if every camera is GEV, else SOFTWARE
+        :param  tolerance:              seconds two frames of a set may be apart
+        :param  timebase:               CameraGroupTimebase of the matching
+        :param  queue_size:             FrameSets kept for get_frameset, the oldest is dropped beyond it
+        :param  max_pending:            unmatched frames kept per camera
+        :param  drop_incomplete:        True: frames whose status is not SUCCESS are not matched
+        :param  action_keys:            (device key, group key, group mask) of the action command
+        :param  broadcast_address:      destination of the action command
+        :param  calibration_interval:   seconds between two clock calibrations of a camera (HOST timebase)
+        :param  features:               dict or list of (name, value) applied to every camera with
+                                        FeatureControl.apply by start(), before the trigger is armed
+        :param  processes:              True: each camera is opened and drained by a ProcessCapture worker
+                                        process, get_devices() is empty
+        """
+        if not isinstance(serial_numbers, (list, tuple)) or not serial_numbers:
+            raise ParameterTypeError("CameraGroup.__init__: "
+                                     "Expected serial_numbers type is a non-empty list, not %s" % type(serial_numbers))
+
+        if len(set(serial_numbers)) != len(serial_numbers):
+            raise InvalidParameter("CameraGroup.__init__: serial_numbers are not unique")
+
+        if trigger not in (None, CameraGroupTrigger.ACTION, CameraGroupTrigger.SOFTWARE,
+                           CameraGroupTrigger.EXTERNAL):
+            raise InvalidParameter("CameraGroup.__init__: trigger is not a CameraGroupTrigger value")
+
+        if timebase not in (CameraGroupTimebase.HOST, CameraGroupTimebase.DEVICE):
+            raise InvalidParameter("CameraGroup.__init__: timebase is not a CameraGroupTimebase value")
+
+        if not isinstance(tolerance, (INT_TYPE, float)) or tolerance < 0:
+            raise InvalidParameter("CameraGroup.__init__: tolerance must be a positive number of seconds")
+
+        for name, value in (("queue_size", queue_size), ("max_pending", max_pending)):
+            if not isinstance(value, INT_TYPE):
+                raise ParameterTypeError("CameraGroup.__init__: "
+                                         "Expected %s type is int, not %s" % (name, type(value)))
+            if value < 1 or value > UNSIGNED_INT_MAX:
+                raise InvalidParameter("CameraGroup.__init__: %s out of bounds, minimum=1, maximum=%s"
+                                       % (name, hex(UNSIGNED_INT_MAX).__str__()))
+
+        if not isinstance(action_keys, (list, tuple)) or len(action_keys) != 3 or \
+                not all(isinstance(key, INT_TYPE) for key in action_keys):
+            raise ParameterTypeError("CameraGroup.__init__: "
+                                     "Expected action_keys type is a tuple of 3 int")
+
+        self.__device_manager = device_manager
+        self.__serial_numbers = list(serial_numbers)
+        self.__tolerance = float(tolerance)
+        self.__timebase = timebase
+        self.__queue_size = queue_size
+        self.__max_pending = max_pending
+        self.__drop_incomplete = drop_incomplete
+        self.__action_keys = tuple(action_keys)
+        self.__broadcast_address = broadcast_address
+        self.__calibration_interval = calibration_interval
+        self.__features = list(features.items()) if isinstance(features, dict) else list(features or [])
+        self.__processes = processes
+        self.__capture = None
+
+        self.__devices = []
+        if processes:
+            # the workers open the cameras, the device class comes from the device list
+            device_classes = dict((info.get("sn"), info.get("device_class"))
+                                  for info in device_manager.get_device_info())
+            for serial_number in self.__serial_numbers:
+                if serial_number not in device_classes:
+                    raise NotFoundDevice("CameraGroup.__init__: %s is not in the device list" % serial_number)
+            all_gev = all(device_classes[serial_number] == GxDeviceClassList.GEV
+                          for serial_number in self.__serial_numbers)
+        else:
+            try:
+                for serial_number in self.__serial_numbers:
+                    self.__devices.append(device_manager.open_device_by_sn(serial_number))
+            except Exception:
+                self.__close_devices()
+                raise
+            all_gev = all(isinstance(device, GEVDevice) for device in self.__devices)
+
+        if trigger is None:
+            trigger = CameraGroupTrigger.ACTION if all_gev else CameraGroupTrigger.SOFTWARE
+        if trigger == CameraGroupTrigger.ACTION and not all_gev:
+            self.__close_devices()
+            raise InvalidParameter("CameraGroup.__init__: action commands need GEV cameras only")
+        self.__trigger = trigger
+
+        camera_num = len(self.__serial_numbers)
+        self.__mutex = threading.Lock()
+        self.__pending = [collections.deque() for index in range(camera_num)]
+        self.__framesets = collections.deque()
+        self.__not_empty = threading.Event()
+        self.__tracers = [None] * camera_num
+        self.__tick_frequencies = [None] * camera_num
+        self.__threads = []
+        self.__running = False
+        self.__last_error = None
+        self.__reset_statistics()
+
+    def __reset_statistics(self):
+        self.__frameset_count = 0
+        self.__frameset_drop_count = 0
+        self.__counters = [{"acquired": 0, "timeout": 0, "incomplete_dropped": 0, "unmatched": 0}
+                           for serial_number in self.__serial_numbers]
+
+    def get_devices(self):
+        """
+        :return:    list of Device objects, in the order of the serial numbers, empty with processes
+        """
+        return list(self.__devices)
+
+    def get_trigger(self):
+        """
+        :return:    CameraGroupTrigger in use
+        """
+        return self.__trigger
+
+    def __get_arm_features(self):
+        """
+        :brief      Features applied to every camera: the features of the constructor, then the trigger
+        :return:    list of (name, value)
+        """
+        if self.__trigger == CameraGroupTrigger.ACTION:
+            device_key, group_key, group_mask = self.__action_keys
+            return self.__features + [("ActionDeviceKey", device_key), ("ActionSelector", 0),
+                                      ("ActionGroupKey", group_key), ("ActionGroupMask", group_mask),
+                                      ("TriggerMode", "On"), ("TriggerSource", "Action0")]
+        if self.__trigger == CameraGroupTrigger.SOFTWARE:
+            return self.__features + [("TriggerMode", "On"), ("TriggerSource", "Software")]
+        return list(self.__features)
+
+    def start(self):
+        """
+        :brief      Arm the trigger of every camera, relate their clocks, turn the streams on
+                    and start one acquisition thread per camera, or one worker process per camera
+                    and a thread matching their frames
+        :return:    None
+        """
+        if self.__running:
+            return
+
+        if self.__processes:
+            self.__start_processes()
+            return
+
+        features = self.__get_arm_features()
+        for index, device in enumerate(self.__devices):
+            if features:
+                device.get_remote_device_feature_control().apply(features, rollback=False)
+            if self.__timebase == CameraGroupTimebase.HOST:
+                self.__tracers[index] = LatencyTracer(device)
+                self.__tracers[index].calibrate()
+            else:
+                self.__tick_frequencies[index] = float(device.TimestampTickFrequency.get())
+
+        self.__reset_statistics()
+        self.__last_error = None
+        self.__running = True
+        try:
+            for device in self.__devices:
+                device.stream_on()
+        except Exception:
+            self.__running = False
+            for device in self.__devices:
+                if device.data_stream[0].acquisition_flag:
+                    device.stream_off()
+            raise
+
+        self.__threads = []
+        for index in range(len(self.__devices)):
+            thread = threading.Thread(target=self.__run, args=(index,),
+                                      name="CameraGroup-%s" % self.__serial_numbers[index])
+            thread.daemon = True
+            thread.start()
+            self.__threads.append(thread)
+
+    def __start_processes(self):
+        """
+        :brief      Start a ProcessCapture worker per camera, the workers arm the trigger and relate the
+                    clocks, and the thread matching their frames
+        """
+        host_time = self.__timebase == CameraGroupTimebase.HOST
+        # pending and queued frames, the FrameSet held by the consumer and the one being matched
+        capture = ProcessCapture(self.__serial_numbers, slot_num=self.__max_pending + self.__queue_size + 2,
+                                 features=self.__get_arm_features(), host_time=host_time,
+                                 calibration_interval=self.__calibration_interval)
+        capture.start()
+        if not host_time:
+            self.__tick_frequencies = [float(capture.get_tick_frequency(serial_number))
+                                       for serial_number in self.__serial_numbers]
+
+        self.__capture = capture
+        self.__reset_statistics()
+        self.__last_error = None
+        self.__running = True
+        thread = threading.Thread(target=self.__run_processes, name="CameraGroup")
+        thread.daemon = True
+        thread.start()
+        self.__threads = [thread]
+
+    def stop(self):
+        """
+        :brief      Stop the acquisition threads and the streams, the pending and queued frames are released
+        :return:    None
+        """
+        if not self.__running:
+            return
+
+        self.__running = False
+        for thread in self.__threads:
+            thread.join()
+        self.__threads = []
+        if not self.__processes:
+            for device in self.__devices:
+                device.stream_off()
+
+        with self.__mutex:
+            images = [image for pending in self.__pending for frame_time, image in pending]
+            for pending in self.__pending:
+                pending.clear()
+            framesets = list(self.__framesets)
+            self.__framesets.clear()
+        for image in images:
+            image.release()
+        for frameset in framesets:
+            frameset.release()
+        if self.__capture is not None:
+            self.__capture.stop()
+            self.__capture = None
+        self.__not_empty.set()
+
+    def close(self):
+        """
+        :brief      Stop and close every camera
+        :return:    None
+        """
+        self.stop()
+        error = self.__close_devices()
+        if error is not None:
+            raise error
+
+    def __close_devices(self):
+        """
+        :brief      Close the opened cameras, also when the constructor fails
+        :return:    the first exception of close_device, None if every camera closed
+        """
+        devices = self.__devices
+        self.__devices = []
+        error = None
+        for device in devices:
+            try:
+                device.close_device()
+            except Exception as close_error:
+                error = error or close_error
+        return error
+
+    def is_running(self):
+        return self.__running
+
+    def get_last_error(self):
+        """
+        :return:    exception that stopped an acquisition thread, None if none failed
+        """
+        return self.__last_error
+
+    def trigger(self, action_time=None, timeout=500):
+        """
+        :brief      Fire the shared trigger once
+        :param      action_time:    device time of a scheduled action command (PTP synchronized cameras),
+                                    None: now
+        :param      timeout:        ms to wait for the acknowledges of an action command
+        :return:    number of cameras that acknowledged an action command, or the number of cameras
+                    sent TriggerSoftware
+        """
+        if not self.__running:
+            raise InvalidCall("CameraGroup.trigger: the group is not started")
+
+        if self.__trigger == CameraGroupTrigger.EXTERNAL:
+            raise InvalidCall("CameraGroup.trigger: the cameras are triggered externally")
+
+        if self.__trigger == CameraGroupTrigger.SOFTWARE:
+            if self.__processes:
+                for serial_number in self.__serial_numbers:
+                    self.__capture.send_command(serial_number, "TriggerSoftware")
+            else:
+                for device in self.__devices:
+                    device.TriggerSoftware.send_command()
+            return len(self.__serial_numbers)
+
+        device_key, group_key, group_mask = self.__action_keys
+        if action_time is None:
+            acknowledges = self.__device_manager.issue_action_command(
+                device_key, group_key, group_mask, self.__broadcast_address, "", timeout, len(self.__devices))
+        else:
+            acknowledges = self.__device_manager.issue_scheduled_action_command(
+                device_key, group_key, group_mask, action_time, self.__broadcast_address, "", timeout,
+                len(self.__devices))
+        return len(acknowledges) if isinstance(acknowledges, (list, tuple)) else acknowledges
+
+    def __get_time(self, index, image):
+        """
+        :brief      Timestamp of an image in seconds, in the timebase of the group
+        """
+        if self.__timebase == CameraGroupTimebase.DEVICE:
+            return image.get_timestamp() / self.__tick_frequencies[index]
+        return self.__tracers[index].to_host_time(image.get_timestamp())
+
+    def __run(self, index):
+        """
+        :brief      Acquisition thread body of one camera
+        """
+        data_stream = self.__devices[index].data_stream[0]
+        tracer = self.__tracers[index]
+        counters = self.__counters[index]
+        calibrated = time.perf_counter()
+        while self.__running:
+            try:
+                if tracer is not None and self.__calibration_interval is not None and \
+                        time.perf_counter() - calibrated >= self.__calibration_interval:
+                    tracer.calibrate(4)
+                    calibrated = time.perf_counter()
+                image = data_stream.dq_buf(100, zero_copy=True)
+            except Exception as error:
+                self.__last_error = error
+                self.__not_empty.set()
+                return
+
+            if image is None:
+                counters["timeout"] += 1
+                continue
+
+            counters["acquired"] += 1
+            if self.__drop_incomplete and image.get_status() != GxFrameStatusList.SUCCESS:
+                counters["incomplete_dropped"] += 1
+                image.release()
+                continue
+
+            self.__push(index, self.__get_time(index, image), image)
+
+    def __run_processes(self):
+        """
+        :brief      Thread body matching the frames the worker processes publish
+        """
+        capture = self.__capture
+        indexes = dict((serial_number, index) for index, serial_number in enumerate(self.__serial_numbers))
+        while self.__running:
+            for serial_number in capture.wait(100):
+                index = indexes[serial_number]
+                counters = self.__counters[index]
+                image, host_time = capture.get_frame(serial_number)
+                while image is not None:
+                    counters["acquired"] += 1
+                    if self.__drop_incomplete and image.get_status() != GxFrameStatusList.SUCCESS:
+                        counters["incomplete_dropped"] += 1
+                        image.release()
+                    elif self.__timebase == CameraGroupTimebase.HOST:
+                        self.__push(index, host_time, image)
+                    else:
+                        self.__push(index, image.get_timestamp() / self.__tick_frequencies[index], image)
+                    image, host_time = capture.get_frame(serial_number)
+
+            for serial_number in self.__serial_numbers:
+                error = capture.get_last_error(serial_number)
+                if error is not None:
+                    self.__last_error = UnexpectedError("CameraGroup: %s failed\n%s" % (serial_number, error))
+                    self.__not_empty.set()
+                    return
+
+    def __push(self, index, frame_time, image):
+        """
+        :brief      Add a frame of camera index and emit the FrameSets it completes
+        """
+        released = []
+        with self.__mutex:
+            pending = self.__pending[index]
+            pending.append((frame_time, image))
+            if len(pending) > self.__max_pending:
+                released.append(pending.popleft()[1])
+                self.__counters[index]["unmatched"] += 1
+
+            while all(self.__pending):
+                heads = [camera_pending[0][0] for camera_pending in self.__pending]
+                earliest = min(heads)
+                near = [head - earliest <= self.__tolerance for head in heads]
+                if all(near):
+                    frames = [camera_pending.popleft() for camera_pending in self.__pending]
+                    self.__emit(FrameSet([frame[1] for frame in frames], [frame[0] for frame in frames]),
+                                released)
+                    continue
+                # a camera is already past these frames, their partner was lost
+                for camera_index, is_near in enumerate(near):
+                    if is_near:
+                        released.append(self.__pending[camera_index].popleft()[1])
+                        self.__counters[camera_index]["unmatched"] += 1
+
+        for dropped in released:
+            dropped.release()
+
+    def __emit(self, frameset, released):
+        """
+        :brief      Queue a FrameSet, called with the mutex held
+        """
+        if len(self.__framesets) >= self.__queue_size:
+            released.extend(self.__framesets.popleft().get_images())
+            self.__frameset_drop_count += 1
+        self.__framesets.append(frameset)
+        self.__frameset_count += 1
+        self.__not_empty.set()
+
+    def get_frameset(self, timeout=1000):
+        """
+        :brief      Take the oldest matched FrameSet
+        :param      timeout:    wait time in ms
+        :return:    FrameSet object, None on timeout or when the group is stopped
+        """
+        if not isinstance(timeout, INT_TYPE):
+            raise ParameterTypeError("CameraGroup.get_frameset: "
+                                     "Expected timeout type is int, not %s" % type(timeout))
+
+        deadline = time.perf_counter() + timeout / 1000.0
+        while True:
+            with self.__mutex:
+                if self.__framesets:
+                    return self.__framesets.popleft()
+                self.__not_empty.clear()
+
+            remaining = deadline - time.perf_counter()
+            if not self.__running or self.__last_error is not None or remaining <= 0 or \
+                    not self.__not_empty.wait(remaining):
+                return None
+
+    def get_statistics(self):
+        """
+        :brief      Counters since start()
+        :return:    dict: framesets (matched), frameset_dropped (queue overflow), cameras: OrderedDict of
+                    serial number: {acquired, timeout, incomplete_dropped, unmatched, pending}
+        """
+        with self.__mutex:
+            cameras = collections.OrderedDict()
+            for serial_number, counters, pending in zip(self.__serial_numbers, self.__counters, self.__pending):
+                cameras[serial_number] = dict(counters, pending=len(pending))
+            return {"framesets": self.__frameset_count, "frameset_dropped": self.__frameset_drop_count,
+                    "cameras": cameras}
@@ -0,0 +1,258 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import numpy
+from gxipy.gxidef import *
+from gxipy.ImageProc import *
+from gxipy.RawRecorder import *
+from gxipy.Exception import *
+import struct
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+# every chunk is followed by its trailer: chunk id, data length
+CHUNK_TRAILER_SIZE = 8
+# records kept for the driver buffers of zero-copy images (the driver reuses a fixed set)
+CHUNK_RECORD_CACHE_NUM = 64
+
+
+class ChunkFieldID:
+    """
+    Chunk ids decoded by name by default. They are the ChunkSelector values the chunks are enabled with,
+    as sent by the simulated camera; the ids a camera sends are the ChunkID of its chunk nodes in the
+    device XML, pass them to ChunkDecoder as chunk_fields.
+    """
+    FRAME_ID = GxChunkSelectorEntry.FRAME_ID
+    TIME_STAMP = GxChunkSelectorEntry.TIME_STAMP
+    COUNTER_VALUE = GxChunkSelectorEntry.COUNTER_VALUE
+    EXPOSURE_TIME = 4
+    GAIN = 5
+    LINE_STATUS_ALL = 6
+
+    def __init__(self):
+        pass
+
+
+# chunk id: (field name, numpy type without byte order)
+CHUNK_DEFAULT_FIELDS = {
+    ChunkFieldID.FRAME_ID: ("frame_id", "u8"),
+    ChunkFieldID.TIME_STAMP: ("timestamp", "u8"),
+    ChunkFieldID.COUNTER_VALUE: ("counter_value", "u8"),
+    ChunkFieldID.EXPOSURE_TIME: ("exposure_time", "f8"),
+    ChunkFieldID.GAIN: ("gain", "f8"),
+    ChunkFieldID.LINE_STATUS_ALL: ("line_status_all", "u8"),
+}
+
+
+class ChunkDecoder:
+    """
+    Decoder of the chunk data following the image in a payload. The chunk block is a sequence of
+    chunks, each one its data followed by a trailer (chunk id, length); the trailers are walked from
+    the end of the block once, the layout becomes a numpy structured dtype, and every later block of the
+    same layout is decoded as a view on it. The chunk ids and lengths of the trailers are checked, with a
+    single struct, before a block is decoded, and the layout is parsed again when they change.
+    A chunk whose id is not in chunk_fields, or whose length does not fit its type, is kept as raw bytes
+    named chunk_<id>.
+    """
+    def __init__(self, chunk_fields=None, byteorder="<"):
+        """
+        :brief  Constructor for instance initialization
+        :param  chunk_fields:   dict of chunk id: (field name, numpy type), None for CHUNK_DEFAULT_FIELDS
+        :param  byteorder:      byte order of the trailers and the values, "<" (USB3 Vision) or ">" (GigE Vision)
+        """
+        if chunk_fields is not None and not isinstance(chunk_fields, dict):
+            raise ParameterTypeError("ChunkDecoder.__init__: "
+                                     "Expected chunk_fields type is dict, not %s" % type(chunk_fields))
+
+        if byteorder not in ("<", ">"):
+            raise InvalidParameter("ChunkDecoder.__init__: byteorder must be < or >")
+
+        self.__chunk_fields = dict(CHUNK_DEFAULT_FIELDS if chunk_fields is None else chunk_fields)
+        self.__byteorder = byteorder
+        self.__trailer = struct.Struct(byteorder + "II")
+        self.__block_size = None
+        self.__dtype = None
+        self.__layout = []
+        self.__trailers = None
+        self.__trailer_values = None
+        self.__parse_count = 0
+        self.__records = {}
+
+    def parse(self, chunk_block):
+        """
+        :brief      Parse the layout of a chunk block
+        :param      chunk_block:    chunk data, bytes or uint8 numpy array
+        :return:    numpy.dtype of the block
+        """
+        chunk_block = numpy.frombuffer(chunk_block, dtype=numpy.uint8) \
+            if not isinstance(chunk_block, numpy.ndarray) else chunk_block
+        block_size = len(chunk_block)
+
+        chunks = []
+        position = block_size
+        while position >= CHUNK_TRAILER_SIZE:
+            chunk_id, length = self.__trailer.unpack(chunk_block[position - CHUNK_TRAILER_SIZE:position].tobytes())
+            if chunk_id == 0 or length > position - CHUNK_TRAILER_SIZE:
+                # padding, or the image data in front of the first chunk
+                break
+            position -= CHUNK_TRAILER_SIZE + length
+            chunks.append((chunk_id, position, length))
+
+        if len(chunks) == 0:
+            raise InvalidParameter("ChunkDecoder.parse: no chunk found in %d bytes of chunk data" % block_size)
+
+        names = []
+        formats = []
+        offsets = []
+        layout = []
+        for chunk_id, offset, length in reversed(chunks):
+            name, field_type = self.__chunk_fields.get(chunk_id, (None, None))
+            field_dtype = numpy.dtype(self.__byteorder + field_type) if field_type is not None else None
+            if name is None or field_dtype.itemsize != length:
+                name = "chunk_%x" % chunk_id
+                field_dtype = numpy.dtype((numpy.void, length))
+            if name in names:
+                name = "%s_%d" % (name, offset)
+            names.append(name)
+            formats.append(field_dtype)
+            offsets.append(offset)
+            layout.append((chunk_id, name, offset, length))
+
+        self.__dtype = numpy.dtype({"names": names, "formats": formats, "offsets": offsets,
+                                    "itemsize": block_size})
+        self.__block_size = block_size
+        self.__layout = layout
+        # every trailer of the layout read by one unpack_from, to recognize blocks of this layout
+        trailer_format = self.__byteorder + "%dx" % chunks[-1][1] + \
+            "".join("%dxII" % length for chunk_id, offset, length in reversed(chunks))
+        self.__trailers = struct.Struct(trailer_format)
+        self.__trailer_values = tuple(value for chunk_id, offset, length in reversed(chunks)
+                                      for value in (chunk_id, length))
+        self.__records.clear()
+        self.__parse_count += 1
+        return self.__dtype
+
+    def get_dtype(self):
+        """
+        :brief      Get the structured dtype of the last parsed layout
+        :return:    numpy.dtype, None before the first block
+        """
+        return self.__dtype
+
+    def get_layout(self):
+        """
+        :brief      Get the chunks of the last parsed layout, in payload order
+        :return:    list of (chunk id, field name, offset in the block, length)
+        """
+        return list(self.__layout)
+
+    def get_parse_count(self):
+        """
+        :brief      Get how often a layout was parsed, once per stream configuration
+        :return:    int
+        """
+        return self.__parse_count
+
+    def __is_layout(self, chunk_block):
+        """
+        :brief      Whether a block has the chunks of the last parsed layout
+        """
+        return len(chunk_block) == self.__block_size and \
+            self.__trailers.unpack_from(chunk_block) == self.__trailer_values
+
+    def decode_block(self, chunk_block):
+        """
+        :brief      Decode one chunk block
+        :param      chunk_block:    chunk data, bytes or uint8 numpy array
+        :return:    numpy.void record of get_dtype(), a view on chunk_block
+        """
+        chunk_block = numpy.frombuffer(chunk_block, dtype=numpy.uint8) \
+            if not isinstance(chunk_block, numpy.ndarray) else chunk_block
+        if self.__block_size is None or not self.__is_layout(chunk_block):
+            self.parse(chunk_block)
+        return chunk_block.view(self.__dtype)[0]
+
+    def decode(self, raw_image):
+        """
+        :brief      Decode the chunk data of a frame without copying it. The record is a view on the
+                    image buffer: for a zero-copy image it is valid until the image is released, the
+                    record of a driver buffer is reused for every frame filled into it.
+        :param      raw_image:  RawImage object
+        :return:    numpy.void record of get_dtype(), None if the frame carries no chunk data
+        """
+        if not isinstance(raw_image, RawImage):
+            raise ParameterTypeError("ChunkDecoder.decode: "
+                                     "Expected raw_image type is RawImage, not %s" % type(raw_image))
+
+        # a zero-copy image lives in a driver buffer, its record view is built once per buffer
+        key = None
+        if raw_image.is_zero_copy():
+            frame_data = raw_image.frame_data
+            key = (frame_data.image_buf, frame_data.image_size, frame_data.width, frame_data.height,
+                   frame_data.pixel_format)
+            cached = self.__records.get(key)
+            if cached is not None and self.__is_layout(cached[1]):
+                return cached[0]
+
+        chunk_block = raw_image.get_chunkdata_array()
+        if len(chunk_block) == 0:
+            return None
+        record = self.decode_block(chunk_block)
+        if key is not None:
+            if len(self.__records) >= CHUNK_RECORD_CACHE_NUM:
+                self.__records.clear()
+            self.__records[key] = (record, chunk_block)
+        return record
+
+    def decode_sequence(self, frames):
+        """
+        :brief      Decode the chunk data of many frames into one array per field
+        :param      frames:     RawRecordReader, or an iterable of RawImage objects or chunk blocks
+        :return:    dict of field name: numpy array, plus "valid": bool array, False for a frame
+                    without chunk data or with another layout than the first frame
+        """
+        if isinstance(frames, RawRecordReader):
+            blocks = self.__record_blocks(frames)
+        else:
+            blocks = (frame.get_chunkdata_array() if isinstance(frame, RawImage) else frame for frame in frames)
+
+        records = []
+        valid = []
+        first = None
+        for block in blocks:
+            block = numpy.frombuffer(block, dtype=numpy.uint8) if not isinstance(block, numpy.ndarray) else block
+            if first is None and len(block) != 0:
+                first = self.parse(block)
+            if first is None or not self.__is_layout(block):
+                records.append(None)
+                valid.append(False)
+                continue
+            records.append(block)
+            valid.append(True)
+
+        if first is None:
+            return {"valid": numpy.array(valid, dtype=bool)}
+
+        valid = numpy.array(valid, dtype=bool)
+        table = numpy.zeros(len(records), dtype=first)
+        if valid.any():
+            table[valid] = numpy.concatenate([block for block in records if block is not None]).view(first)
+        columns = dict((name, numpy.ascontiguousarray(table[name])) for name in first.names)
+        columns["valid"] = valid
+        return columns
+
+    @staticmethod
+    def __record_blocks(reader):
+        """
+        :brief      Chunk blocks of the recorded frames, views on the segment files
+        """
+        for position in range(len(reader)):
+            entry, data = reader.get_frame_data(position)
+            imagedata_size = Utility.get_image_data_size(int(entry["pixel_format"]), int(entry["width"]),
+                                                         int(entry["height"]))
+            yield data[imagedata_size:]
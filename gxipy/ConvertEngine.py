@@ -0,0 +1,456 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import numpy
+from gxipy.dxwrapper import *
+from gxipy.gxidef import *
+from gxipy.Exception import *
+import ctypes
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+CONVERT_ENGINE_AUTO = "auto"        # DxImageProc when the library is loaded, otherwise numpy
+CONVERT_ENGINE_DX = "dx"            # DxImageProc only
+CONVERT_ENGINE_NUMPY = "numpy"      # NumpyConvertEngine
+
+
+# bayer interpolation of NumpyConvertEngine
+class NumpyBayerInterpolation:
+    BY_CONVERT_TYPE = 0     # every DxBayerConvertType maps to bilinear
+    NEAREST = 1             # nearest neighbour, copies the closest sample of each colour
+    BILINEAR = 2            # average of the 2 or 4 closest samples of each colour
+
+    def __init__(self):
+        pass
+
+
+class ConvertEngine:
+    """
+    Pixel format conversion engine used by RawImage.convert and ImageFormatConvert.
+    A subclass reports which conversions it supports and converts between two memory addresses,
+    register it with ConvertEngineManager.register_engine.
+    """
+    name = None
+
+    def is_supported(self, src_pixel_format, dest_pixel_format):
+        """
+        :brief      Whether the engine can convert src_pixel_format into dest_pixel_format
+        :return:    True/False
+        """
+        return False
+
+    def get_buffer_size(self, pixel_format, width, height):
+        """
+        :brief      Bytes needed by an image of pixel_format
+        :return:    buffer size
+        """
+        return get_pixel_buffer_size(pixel_format, width, height)
+
+    def convert(self, input_address, input_length, output_address, output_length, src_pixel_format,
+                dest_pixel_format, width, height, valid_bits, convert_type, channel_order, flip):
+        """
+        :brief      Convert one image
+        :param      input_address:      input buffer address
+        :param      input_length:       input buffer size
+        :param      output_address:     output buffer address
+        :param      output_length:      output buffer size
+        :param      src_pixel_format:   input pixel format
+        :param      dest_pixel_format:  output pixel format
+        :param      width:              image width
+        :param      height:             image height
+        :param      valid_bits:         DxValidBit, bits kept when reducing to 8 bit
+        :param      convert_type:       DxBayerConvertType
+        :param      channel_order:      DxRGBChannelOrder
+        :param      flip:               True: turn the image upside down
+        :return:    None
+        """
+        raise NoImplemented("ConvertEngine.convert")
+
+
+def get_pixel_buffer_size(pixel_format, width, height):
+    """
+    :brief      Bytes of an image, from the bits per pixel encoded in the pixel format
+    :param      pixel_format:   GxPixelFormatEntry
+    :param      width:          image width
+    :param      height:         image height
+    :return:    buffer size
+    """
+    bits = (pixel_format & PIXEL_BIT_MASK) >> 16
+    return (width * height * bits + 7) // 8
+
+
+def _build_format_table():
+    """
+    :brief      Describe the pixel formats handled by NumpyConvertEngine
+    :return:    dict pixel format -> (kind, bayer pattern, bit depth, packing)
+    """
+    table = {}
+    for depth in (8, 10, 12, 14, 16):
+        for packing, suffix in ((None, ""), ("gvsp", "_PACKED"), ("pfnc", "_P")):
+            if packing is not None and depth not in (10, 12):
+                continue
+            name = "MONO%d%s" % (depth, suffix)
+            if hasattr(GxPixelFormatEntry, name):
+                table[getattr(GxPixelFormatEntry, name)] = ("mono", None, depth, packing)
+            for pattern in ("RG", "GR", "GB", "BG"):
+                name = "BAYER_%s%d%s" % (pattern, depth, suffix)
+                if hasattr(GxPixelFormatEntry, name):
+                    table[getattr(GxPixelFormatEntry, name)] = ("bayer", pattern, depth, packing)
+    table[GxPixelFormatEntry.RGB8] = ("rgb", "RGB", 8, None)
+    table[GxPixelFormatEntry.BGR8] = ("rgb", "BGR", 8, None)
+    return table
+
+
+# phase (row, column) inside the 2x2 bayer cell -> site colour, "Gr" is green in a red row
+_BAYER_PHASES = {
+    "RG": (("R", "Gr"), ("Gb", "B")),
+    "GR": (("Gr", "R"), ("B", "Gb")),
+    "GB": (("Gb", "B"), ("R", "Gr")),
+    "BG": (("B", "Gb"), ("Gr", "R")),
+}
+
+
+class NumpyConvertEngine(ConvertEngine):
+    """
+    Vectorized numpy implementation of the common conversions, works without DxImageProc:
+        Mono/Bayer 8/10/12/14/16, Mono/Bayer 10/12 GVSP packed (_PACKED) and PFNC packed (_P)
+            -> RGB8/BGR8 (bayer: nearest or bilinear demosaic, mono: replicated)
+            -> 8 bit of the same layout, selecting valid_bits
+            -> unpacked 16 bit container of the same depth (packed inputs)
+        RGB8/BGR8 -> RGB8/BGR8
+    Edges are interpolated from mirrored samples, rounding is to nearest.
+    """
+    name = CONVERT_ENGINE_NUMPY
+
+    def __init__(self, interpolation=NumpyBayerInterpolation.BY_CONVERT_TYPE):
+        self.__formats = _FORMAT_TABLE
+        self.set_interpolation(interpolation)
+
+    def set_interpolation(self, interpolation):
+        """
+        :brief      Select the bayer interpolation
+        :param      interpolation:  NumpyBayerInterpolation
+        :return:    None
+        """
+        if interpolation not in (NumpyBayerInterpolation.BY_CONVERT_TYPE, NumpyBayerInterpolation.NEAREST,
+                                 NumpyBayerInterpolation.BILINEAR):
+            raise InvalidParameter("NumpyConvertEngine.set_interpolation: interpolation is not a "
+                                   "NumpyBayerInterpolation value")
+        self.__interpolation = interpolation
+
+    def get_interpolation(self):
+        return self.__interpolation
+
+    def is_supported(self, src_pixel_format, dest_pixel_format):
+        src = self.__formats.get(src_pixel_format)
+        dest = self.__formats.get(dest_pixel_format)
+        if src is None or dest is None or dest[3] is not None:
+            return False
+
+        src_kind, src_pattern, src_depth, src_packing = src
+        dest_kind, dest_pattern, dest_depth, _ = dest
+        if dest_kind == "rgb":
+            return True
+        if src_kind == "rgb" or src_kind != dest_kind or src_pattern != dest_pattern:
+            return False
+        # 8 bit output, or unpacking into the 16 bit container of the same depth
+        return dest_depth == 8 or (src_packing is not None and dest_depth == src_depth)
+
+    def convert(self, input_address, input_length, output_address, output_length, src_pixel_format,
+                dest_pixel_format, width, height, valid_bits, convert_type, channel_order, flip):
+        if not self.is_supported(src_pixel_format, dest_pixel_format):
+            raise NoImplemented("NumpyConvertEngine: conversion from %s to %s is not supported"
+                                % (hex(src_pixel_format), hex(dest_pixel_format)))
+
+        if output_length < self.get_buffer_size(dest_pixel_format, width, height):
+            raise InvalidParameter("NumpyConvertEngine: output buffer is too small")
+
+        src_kind, src_pattern, src_depth, src_packing = self.__formats[src_pixel_format]
+        dest_kind, dest_pattern, dest_depth, _ = self.__formats[dest_pixel_format]
+        pixel_count = width * height
+
+        src = numpy.ctypeslib.as_array((ctypes.c_ubyte * input_length).from_address(input_address))
+        dst = numpy.ctypeslib.as_array((ctypes.c_ubyte * output_length).from_address(output_address))
+
+        if src_kind == "rgb":
+            image = src[:pixel_count * 3].reshape(height, width, 3)
+            out = dst[:pixel_count * 3].reshape(height, width, 3)
+            if flip:
+                out = out[::-1]
+            if self.__is_bgr(dest_pixel_format, channel_order) != (src_pattern == "BGR"):
+                image = image[:, :, ::-1]
+            out[...] = image
+            return
+
+        image = unpack_raw(src, src_pixel_format, width, height)
+
+        if dest_kind != "rgb" and dest_depth > 8:
+            out = dst[:pixel_count * 2].view(numpy.uint16).reshape(height, width)
+            out[...] = image[::-1] if flip else image
+            return
+
+        image = select_valid_bits(image, src_depth, valid_bits)
+        if dest_kind != "rgb":
+            out = dst[:pixel_count].reshape(height, width)
+            out[...] = image[::-1] if flip else image
+            return
+
+        out = dst[:pixel_count * 3].reshape(height, width, 3)
+        if flip:
+            out = out[::-1]
+        if self.__is_bgr(dest_pixel_format, channel_order):
+            out = out[:, :, ::-1]
+
+        if src_kind == "mono":
+            out[...] = image[:, :, numpy.newaxis]
+        elif self.__interpolation == NumpyBayerInterpolation.NEAREST:
+            demosaic_nearest(image, src_pattern, out)
+        else:
+            demosaic_bilinear(image, src_pattern, out)
+
+    @staticmethod
+    def __is_bgr(dest_pixel_format, channel_order):
+        return dest_pixel_format == GxPixelFormatEntry.BGR8 or channel_order == DxRGBChannelOrder.ORDER_BGR
+
+
+def unpack_raw(src, pixel_format, width, height):
+    """
+    :brief      Decode a Mono/Bayer buffer into a (height, width) array, uint8 for 8 bit, uint16 otherwise
+    :param      src:            uint8 numpy array of the buffer
+    :param      pixel_format:   GxPixelFormatEntry
+    :param      width:          image width
+    :param      height:         image height
+    :return:    numpy array
+    """
+    kind, _, depth, packing = _FORMAT_TABLE[pixel_format]
+    count = width * height
+    if depth == 8:
+        return src[:count].reshape(height, width)
+    if packing is None:
+        return src[:count * 2].view(numpy.uint16).reshape(height, width)
+
+    if depth == 12 or packing == "gvsp":
+        # 2 pixels in 3 bytes
+        group_count = (count + 1) // 2
+        groups = _padded(src, group_count * 3).reshape(group_count, 3).astype(numpy.uint16)
+        pixels = numpy.empty((group_count, 2), dtype=numpy.uint16)
+        if packing == "gvsp" and depth == 12:
+            pixels[:, 0] = (groups[:, 0] << 4) | (groups[:, 1] & 0xF)
+            pixels[:, 1] = (groups[:, 2] << 4) | (groups[:, 1] >> 4)
+        elif packing == "gvsp":
+            pixels[:, 0] = (groups[:, 0] << 2) | (groups[:, 1] & 0x3)
+            pixels[:, 1] = (groups[:, 2] << 2) | ((groups[:, 1] >> 4) & 0x3)
+        else:
+            pixels[:, 0] = groups[:, 0] | ((groups[:, 1] & 0xF) << 8)
+            pixels[:, 1] = (groups[:, 1] >> 4) | (groups[:, 2] << 4)
+    else:
+        # PFNC 10 bit: 4 pixels in 5 bytes, lsb first
+        group_count = (count + 3) // 4
+        groups = _padded(src, group_count * 5).reshape(group_count, 5).astype(numpy.uint16)
+        pixels = numpy.empty((group_count, 4), dtype=numpy.uint16)
+        pixels[:, 0] = groups[:, 0] | ((groups[:, 1] & 0x3) << 8)
+        pixels[:, 1] = (groups[:, 1] >> 2) | ((groups[:, 2] & 0xF) << 6)
+        pixels[:, 2] = (groups[:, 2] >> 4) | ((groups[:, 3] & 0x3F) << 4)
+        pixels[:, 3] = (groups[:, 3] >> 6) | (groups[:, 4] << 2)
+    return pixels.reshape(-1)[:count].reshape(height, width)
+
+
+def _padded(src, length):
+    if len(src) >= length:
+        return src[:length]
+    padded = numpy.zeros(length, dtype=numpy.uint8)
+    padded[:len(src)] = src
+    return padded
+
+
+def select_valid_bits(image, depth, valid_bits):
+    """
+    :brief      Reduce to 8 bit keeping bits [valid_bits, valid_bits + 7], clamped to the bit depth
+    :param      image:          uint8/uint16 numpy array
+    :param      depth:          bit depth of the samples
+    :param      valid_bits:     DxValidBit
+    :return:    uint8 numpy array
+    """
+    if depth == 8:
+        return image
+    shift = min(valid_bits, depth - 8)
+    return ((image >> shift) & 0xFF).astype(numpy.uint8)
+
+
+def _phase_slices(height, width, row, column):
+    return slice(row, height, 2), slice(column, width, 2)
+
+
+def demosaic_nearest(image, pattern, out):
+    """
+    :brief      Nearest neighbour demosaic of an 8 bit bayer image
+    :param      image:      (height, width) uint8 numpy array
+    :param      pattern:    "RG", "GR", "GB" or "BG"
+    :param      out:        (height, width, 3) uint8 RGB view to fill
+    :return:    None
+    """
+    height, width = image.shape
+    padded = numpy.pad(image, 1, mode="reflect")
+
+    def neighbour(rows, columns, offset_row, offset_column):
+        return padded[1 + offset_row + rows.start:1 + offset_row + height:2,
+                      1 + offset_column + columns.start:1 + offset_column + width:2]
+
+    for row in (0, 1):
+        for column in (0, 1):
+            rows, columns = _phase_slices(height, width, row, column)
+            site = _BAYER_PHASES[pattern][row][column]
+            own = image[rows, columns]
+            right = neighbour(rows, columns, 0, 1)
+            below = neighbour(rows, columns, 1, 0)
+            diagonal = neighbour(rows, columns, 1, 1)
+            if site == "R":
+                channels = (own, right, diagonal)
+            elif site == "B":
+                channels = (diagonal, right, own)
+            elif site == "Gr":
+                channels = (right, own, below)
+            else:
+                channels = (below, own, right)
+            for channel, value in enumerate(channels):
+                out[rows, columns, channel] = value
+
+
+def demosaic_bilinear(image, pattern, out):
+    """
+    :brief      Bilinear demosaic of an 8 bit bayer image
+    :param      image:      (height, width) uint8 numpy array
+    :param      pattern:    "RG", "GR", "GB" or "BG"
+    :param      out:        (height, width, 3) uint8 RGB view to fill
+    :return:    None
+    """
+    height, width = image.shape
+    padded = numpy.pad(image, 1, mode="reflect").astype(numpy.uint16)
+
+    def neighbour(rows, columns, offset_row, offset_column):
+        return padded[1 + offset_row + rows.start:1 + offset_row + height:2,
+                      1 + offset_column + columns.start:1 + offset_column + width:2]
+
+    for row in (0, 1):
+        for column in (0, 1):
+            rows, columns = _phase_slices(height, width, row, column)
+            site = _BAYER_PHASES[pattern][row][column]
+            own = image[rows, columns]
+            horizontal = neighbour(rows, columns, 0, -1) + neighbour(rows, columns, 0, 1)
+            vertical = neighbour(rows, columns, -1, 0) + neighbour(rows, columns, 1, 0)
+            if site in ("R", "B"):
+                horizontal += vertical
+                horizontal += 2
+                horizontal >>= 2
+                diagonal = neighbour(rows, columns, -1, -1) + neighbour(rows, columns, -1, 1)
+                diagonal += neighbour(rows, columns, 1, -1)
+                diagonal += neighbour(rows, columns, 1, 1)
+                diagonal += 2
+                diagonal >>= 2
+                channels = (own, horizontal, diagonal) if site == "R" else (diagonal, horizontal, own)
+            else:
+                horizontal += 1
+                horizontal >>= 1
+                vertical += 1
+                vertical >>= 1
+                channels = (horizontal, own, vertical) if site == "Gr" else (vertical, own, horizontal)
+            for channel, value in enumerate(channels):
+                out[rows, columns, channel] = value
+
+
+_FORMAT_TABLE = _build_format_table()
+
+
+class ConvertEngineManager:
+    """
+    Selects the engine used by RawImage.convert and ImageFormatConvert.
+    "dx" is the built-in DxImageProc path, other engines are registered ConvertEngine objects.
+    """
+    __engines = {CONVERT_ENGINE_NUMPY: NumpyConvertEngine()}
+    __current = CONVERT_ENGINE_AUTO
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def is_dx_available():
+        """
+        :brief      Whether the DxImageProc library is loaded
+        :return:    True/False
+        """
+        return "dx_image_format_convert" in globals()
+
+    @staticmethod
+    def register_engine(engine):
+        """
+        :brief      Add or replace an engine, it is selected by its name
+        :param      engine:     ConvertEngine object with a name
+        :return:    None
+        """
+        if not isinstance(engine, ConvertEngine):
+            raise ParameterTypeError("ConvertEngineManager.register_engine: "
+                                     "Expected engine type is ConvertEngine, not %s" % type(engine))
+
+        if not isinstance(engine.name, str) or engine.name in (CONVERT_ENGINE_AUTO, CONVERT_ENGINE_DX):
+            raise InvalidParameter("ConvertEngineManager.register_engine: engine name must be a str "
+                                   "other than \"auto\" and \"dx\"")
+
+        ConvertEngineManager.__engines[engine.name] = engine
+
+    @staticmethod
+    def get_engine(name):
+        """
+        :brief      Get a registered engine
+        :param      name:   engine name
+        :return:    ConvertEngine object, None if there is no such engine
+        """
+        return ConvertEngineManager.__engines.get(name)
+
+    @staticmethod
+    def set_current_engine(name):
+        """
+        :brief      Select the engine, CONVERT_ENGINE_AUTO/CONVERT_ENGINE_DX/CONVERT_ENGINE_NUMPY or a registered name
+        :param      name:   engine name
+        :return:    None
+        """
+        if name not in (CONVERT_ENGINE_AUTO, CONVERT_ENGINE_DX) and name not in ConvertEngineManager.__engines:
+            raise InvalidParameter("ConvertEngineManager.set_current_engine: unknown engine %s" % name)
+
+        ConvertEngineManager.__current = name
+
+    @staticmethod
+    def get_current_engine():
+        """
+        :brief      Get the selected engine name
+        :return:    engine name
+        """
+        return ConvertEngineManager.__current
+
+    @staticmethod
+    def select(src_pixel_format, dest_pixel_format):
+        """
+        :brief      Pick the engine for a conversion
+        :return:    ConvertEngine object, None for the DxImageProc path
+        """
+        name = ConvertEngineManager.__current
+        dx_available = ConvertEngineManager.is_dx_available()
+        if name == CONVERT_ENGINE_DX or (name == CONVERT_ENGINE_AUTO and dx_available):
+            return None
+
+        if name == CONVERT_ENGINE_AUTO:
+            name = CONVERT_ENGINE_NUMPY
+
+        engine = ConvertEngineManager.__engines[name]
+        if engine.is_supported(src_pixel_format, dest_pixel_format):
+            return engine
+
+        if dx_available:
+            return None
+
+        raise NoImplemented("No conversion engine supports %s to %s"
+                            % (hex(src_pixel_format), hex(dest_pixel_format)))
@@ -12,10 +12,25 @@ from gxipy.Interface import *
 from gxipy.Feature import *
 from gxipy.Exception import *
 from gxipy.ImageProc import *
+from gxipy.BufferPool import *
+from gxipy.AcquisitionWorker import *
+from gxipy.LazyFeature import *
 import ctypes
+import functools
 import types
 
+# async def is a SyntaxError before Python 3.5, the iterator needs asyncio.get_running_loop (3.7)
+if (sys.version_info.major == 3 and sys.version_info.minor >= 7) or (sys.version_info.major > 3):
+    from gxipy.AsyncFrameIterator import *
+
 class DataStream:
+    StreamAnnouncedBufferCount = LazyFeature("StreamAnnouncedBufferCount", IntFeature, GxFeatureID.INT_ANNOUNCED_BUFFER_COUNT)
+    StreamDeliveredFrameCount = LazyFeature("StreamDeliveredFrameCount", IntFeature, GxFeatureID.INT_DELIVERED_FRAME_COUNT)
+    StreamLostFrameCount = LazyFeature("StreamLostFrameCount", IntFeature, GxFeatureID.INT_LOST_FRAME_COUNT)
+    StreamIncompleteFrameCount = LazyFeature("StreamIncompleteFrameCount", IntFeature, GxFeatureID.INT_INCOMPLETE_FRAME_COUNT)
+    StreamDeliveredPacketCount = LazyFeature("StreamDeliveredPacketCount", IntFeature, GxFeatureID.INT_DELIVERED_PACKET_COUNT)
+    StreamBufferHandlingMode = LazyFeature("StreamBufferHandlingMode", EnumFeature, GxFeatureID.ENUM_STREAM_BUFFER_HANDLING_MODE)
+
     def __init__(self, dev_handle, stream_handle):
         """
         :brief  Constructor for instance initialization
@@ -25,21 +40,28 @@ class DataStream:
         self.__dev_handle = dev_handle
 
         self.__c_capture_callback = CAP_CALL(self.__on_capture_callback)
+        self.__c_fast_capture_callback = CAP_CALL(self.__on_fast_capture_callback)
         self.__py_capture_callback = None
+        self.__capture_frame = CaptureFrame()
 
-        self.StreamAnnouncedBufferCount = IntFeature(self.__dev_handle, GxFeatureID.INT_ANNOUNCED_BUFFER_COUNT)
-        self.StreamDeliveredFrameCount = IntFeature(self.__dev_handle, GxFeatureID.INT_DELIVERED_FRAME_COUNT)
-        self.StreamLostFrameCount = IntFeature(self.__dev_handle, GxFeatureID.INT_LOST_FRAME_COUNT)
-        self.StreamIncompleteFrameCount = IntFeature(self.__dev_handle, GxFeatureID.INT_INCOMPLETE_FRAME_COUNT)
-        self.StreamDeliveredPacketCount = IntFeature(self.__dev_handle, GxFeatureID.INT_DELIVERED_PACKET_COUNT)
-        self.StreamBufferHandlingMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_STREAM_BUFFER_HANDLING_MODE)
         self.payload_size = 0
         self.acquisition_flag = False
+        # set by Device.stream_off while the stop command runs, see AsyncFrameIterator
+        self.stopping = False
         self.__data_stream_handle = stream_handle
         self.__stream_feature_control = FeatureControl(stream_handle)
         self.__frame_buf_map = {}
         self.__register_buf_param_map = {}
         self.__register_buf_param_content_map = {}
+        self.__buffer_pool = None
+        self.__buffer_arena = None
+
+    def _get_feature_handle(self):
+        """
+        :brief      Handle the stream features are built with, see LazyFeature
+        :return:    Device handle
+        """
+        return self.__dev_handle
 
     def get_feature_control(self):
         """
@@ -77,10 +99,16 @@ class DataStream:
             print("DataStream.get_image: Current data steam don't  start acquisition")
             return None
 
-        frame_data = GxFrameData()
-        frame_data.image_size = self.payload_size
-        frame_data.image_buf = None
-        image = RawImage(frame_data)
+        image = None
+        if self.__buffer_pool is not None:
+            image = self.__buffer_pool.acquire(self.payload_size)
+
+        if image is None:
+            frame_data = GxFrameData()
+            frame_data.image_size = self.payload_size
+            frame_data.image_buf = None
+            image = RawImage(frame_data)
+        frame_data = image.frame_data
 
         status = gx_get_image(self.__dev_handle, image.frame_data, timeout)
         if status == GxStatusList.SUCCESS:
@@ -97,7 +125,47 @@ class DataStream:
             StatusProcessor.process(status, 'DataStream', 'get_image')
             return None
 
-    def dq_buf(self, timeout=1000):
+    def set_buffer_pool(self, buf_num):
+        """
+        :brief      Let get_image fill pre-allocated buffers instead of allocating one per frame.
+                    The buffers are sized from get_payload_size() and reused round-robin, an image
+                    gives its buffer back when it is dropped or on RawImage.release().
+                    If every buffer is still held by the user get_image falls back to allocating.
+        :param      buf_num:    the number of buffers, 0 disables the pool
+        :return:    none
+        """
+        if not isinstance(buf_num, INT_TYPE):
+            raise ParameterTypeError("DataStream.set_buffer_pool: "
+                                     "Expected buf_num type is int, not %s" % type(buf_num))
+
+        if (buf_num < 0) or (buf_num > UNSIGNED_INT_MAX):
+            print("DataStream.set_buffer_pool: "
+                  "buf_num out of bounds, minimum=0, maximum=%s"
+                  % hex(UNSIGNED_INT_MAX).__str__())
+            return
+
+        if buf_num == 0:
+            self.__buffer_pool = None
+            return
+
+        self.__buffer_pool = FrameBufferPool(buf_num, self.get_payload_size())
+
+    def get_buffer_pool(self):
+        """
+        :brief      Get the buffer pool used by get_image
+        :return:    FrameBufferPool object, None if the pool is disabled
+        """
+        return self.__buffer_pool
+
+    def dq_buf(self, timeout=1000, zero_copy=False):
+        """
+        :brief          Dequeue a driver buffer, the buffer must be given back with q_buf
+        :param          timeout:    Acquisition timeout, range:[0, 0xFFFFFFFF]
+        :param          zero_copy:  True: the image borrows the driver buffer instead of copying it,
+                                    the buffer is queued back to the driver by q_buf/RawImage.release,
+                                    or automatically once the image and all its numpy views are dropped
+        :return:        image object
+        """
         if not isinstance(timeout, INT_TYPE):
             raise ParameterTypeError("DataStream.dq_buf: "
                                      "Expected timeout type is int, not %s" % type(timeout))
@@ -136,7 +204,11 @@ class DataStream:
                 frame_data.offset_x = frame_buffer.offset_x
                 frame_data.offset_y = frame_buffer.offset_y
 
-            image = RawImage(frame_data)
+            if zero_copy:
+                lease = BufferLease(functools.partial(self.__requeue_buffer, frame_buffer.buf_id))
+                image = RawImage(frame_data, lease)
+            else:
+                image = RawImage(frame_data)
             try:
                 image.user_param = self.__register_buf_param_content_map[frame_data.user_param]
             except KeyError:
@@ -161,6 +233,10 @@ class DataStream:
         if self.__py_capture_callback != None:
             raise InvalidCall("Can't call q_buf after register capture callback")
 
+        if image.is_zero_copy():
+            image.release()
+            return
+
         ptr_frame_buffer = ctypes.POINTER(GxFrameBuffer)()
         try:
             ptr_frame_buffer = self.__frame_buf_map[image.frame_data.buf_id]
@@ -172,6 +248,20 @@ class DataStream:
         StatusProcessor.process(status, 'DataStream', 'q_buf')
         self.__frame_buf_map.pop(image.frame_data.buf_id)
 
+    def __requeue_buffer(self, buf_id):
+        """
+        :brief      Give a zero-copy driver buffer back, called when its BufferLease is released.
+                    May run from the garbage collector, so errors are printed instead of raised.
+        :param      buf_id:     Image buff ID
+        :return:    none
+        """
+        ptr_frame_buffer = self.__frame_buf_map.pop(buf_id, None)
+        if ptr_frame_buffer is None or self.acquisition_flag is False:
+            return
+
+        status = gx_q_buf(self.__dev_handle, ptr_frame_buffer)
+        StatusProcessor.printing(status, 'DataStream', 'q_buf')
+
     def flush_queue(self):
         status = gx_flush_queue(self.__dev_handle)
         StatusProcessor.process(status, 'DataStream', 'flush_queue')
@@ -182,6 +272,8 @@ class DataStream:
 
     def set_acquisition_flag(self, flag):
         self.acquisition_flag = flag
+        if flag is False and self.__buffer_arena is not None:
+            self.unregister_numpy_buffers()
 
     def set_acquisition_buffer_number(self, buf_num):
         """
@@ -201,17 +293,26 @@ class DataStream:
         status = gx_set_acquisition_buffer_number(self.__dev_handle, buf_num)
         StatusProcessor.process(status, 'DataStream', 'set_acquisition_buffer_number')
 
-    def register_capture_callback(self, callback_func):
+    def register_capture_callback(self, callback_func, fast=False):
         """
         :brief      Register the capture event callback function.
         :param      callback_func:  callback function
+        :param      fast:           False: the callback gets a RawImage holding a copy of every frame
+                                    True: the callback gets a reused CaptureFrame borrowing the driver buffer,
+                                    nothing is allocated or copied per frame; the frame and its views are
+                                    only valid until the callback returns, CaptureFrame.retain() copies it
         :return:    none
         """
         if not isinstance(callback_func, types.FunctionType):
             raise ParameterTypeError("DataStream.register_capture_callback: "
                                      "Expected callback type is function not %s" % type(callback_func))
 
-        status = gx_register_capture_callback(self.__dev_handle, self.__c_capture_callback)
+        if not isinstance(fast, bool):
+            raise ParameterTypeError("DataStream.register_capture_callback: "
+                                     "Expected fast type is bool, not %s" % type(fast))
+
+        c_capture_callback = self.__c_fast_capture_callback if fast else self.__c_capture_callback
+        status = gx_register_capture_callback(self.__dev_handle, c_capture_callback)
         StatusProcessor.process(status, 'DataStream', 'register_capture_callback')
 
         # callback will not recorded when register callback failed.
@@ -226,6 +327,23 @@ class DataStream:
         StatusProcessor.process(status, 'DataStream', 'unregister_capture_callback')
         self.__py_capture_callback = None
 
+    def frames(self, queue_size=4, policy=AcquisitionQueuePolicy.BLOCK):
+        """
+        :brief      Iterate the frames asynchronously: async for raw_image in data_stream.frames()
+                    The capture callback is registered on the first iteration and unregistered when
+                    the iterator is closed, acquisition is started and stopped by the user.
+        :param      queue_size:     maximum number of frames waiting for the consumer
+        :param      policy:         AcquisitionQueuePolicy applied when queue_size frames are waiting
+        :return:    AsyncFrameIterator object
+        """
+        if self.__py_capture_callback != None:
+            raise InvalidCall("Can't call frames after register capture callback")
+
+        if sys.version_info < (3, 7):
+            raise InvalidCall("DataStream.frames: needs Python 3.7 or later")
+
+        return AsyncFrameIterator(self, queue_size, policy)
+
     def register_buffer(self, user_buf, user_param=None):
         """
         :brief      Register the extern buffer for grab.
@@ -260,6 +378,75 @@ class DataStream:
             del self.__register_buf_param_map[id(user_buf)]
         StatusProcessor.process(status, 'DataStream', 'unregister_buffer')
 
+    def register_numpy_buffers(self, count, shape=None, dtype=numpy.uint8, huge_pages=False, lock=False):
+        """
+        :brief      Let the driver acquire into numpy arrays: a BufferArena of count page-aligned buffers of
+                    get_payload_size() bytes is allocated and every buffer registered with register_buffer,
+                    the user_param of a frame (RawImage.get_user_param) is the numpy array it was acquired into.
+                    Call before stream_on, the buffers are unregistered and the arena closed by stream_off.
+                    An array is overwritten once its frame is given back with q_buf.
+        :param      count:      the number of buffers, range:[1, 0xFFFFFFFF]
+        :param      shape:      shape of the arrays, e.g. (height, width), None for one dimension
+        :param      dtype:      numpy dtype of the arrays
+        :param      huge_pages: True: back the arena with huge pages where the system allows it
+        :param      lock:       True: lock the arena in RAM
+        :return:    BufferArena object
+        """
+        if not isinstance(count, INT_TYPE):
+            raise ParameterTypeError("DataStream.register_numpy_buffers: "
+                                     "Expected count type is int, not %s" % type(count))
+
+        if (count < 1) or (count > UNSIGNED_INT_MAX):
+            print("DataStream.register_numpy_buffers: "
+                  "count out of bounds, minimum=1, maximum=%s"
+                  % hex(UNSIGNED_INT_MAX).__str__())
+            return None
+
+        if self.acquisition_flag is True:
+            raise InvalidCall("Can't call register_numpy_buffers while acquisition runs")
+
+        if self.__buffer_arena is not None:
+            self.unregister_numpy_buffers()
+
+        arena = BufferArena(count, self.get_payload_size(), shape, dtype, huge_pages, lock)
+        registered = []
+        try:
+            for c_buffer, array in zip(arena.get_c_buffers(), arena.get_arrays()):
+                self.register_buffer(c_buffer, array)
+                registered.append(c_buffer)
+        except Exception:
+            for c_buffer in registered:
+                self.unregister_buffer(c_buffer)
+            arena.close()
+            raise
+
+        self.__buffer_arena = arena
+        return arena
+
+    def unregister_numpy_buffers(self):
+        """
+        :brief      Unregister the buffers of register_numpy_buffers and close their arena,
+                    done by stream_off
+        :return:    none
+        """
+        arena = self.__buffer_arena
+        if arena is None:
+            return
+
+        self.__buffer_arena = None
+        try:
+            for c_buffer in arena.get_c_buffers():
+                self.unregister_buffer(c_buffer)
+        finally:
+            arena.close()
+
+    def get_numpy_buffers(self):
+        """
+        :brief      Get the arena registered by register_numpy_buffers
+        :return:    BufferArena object, None if no numpy buffers are registered
+        """
+        return self.__buffer_arena
+
     def __on_capture_callback(self, capture_data):
         """
         :brief      Capture event callback function with capture date.
@@ -283,31 +470,46 @@ class DataStream:
         image = RawImage(frame_data)
         self.__py_capture_callback(image)
 
+    def __on_fast_capture_callback(self, capture_data):
+        """
+        :brief      Capture event callback function of the fast mode, the reused CaptureFrame reads the
+                    callback parameter in place.
+        :return:    none
+        """
+        capture_frame = self.__capture_frame
+        capture_frame._bind(capture_data.contents)
+        try:
+            self.__py_capture_callback(capture_frame)
+        finally:
+            capture_frame._unbind()
+
 class U3VDataStream(DataStream):
+    StreamTransferSize = LazyFeature("StreamTransferSize", IntFeature, GxFeatureID.INT_STREAM_TRANSFER_SIZE)
+    StreamTransferNumberUrb = LazyFeature("StreamTransferNumberUrb", IntFeature, GxFeatureID.INT_STREAM_TRANSFER_NUMBER_URB)
+    StopAcquisitionMode = LazyFeature("StopAcquisitionMode", EnumFeature, GxFeatureID.ENUM_STOP_ACQUISITION_MODE)
+
     def __init__(self, dev_handle, stream_handle):
         self.__handle = dev_handle
         DataStream.__init__(self, self.__handle, stream_handle)
-        self.StreamTransferSize = IntFeature(self.__handle, GxFeatureID.INT_STREAM_TRANSFER_SIZE)
-        self.StreamTransferNumberUrb = IntFeature(self.__handle, GxFeatureID.INT_STREAM_TRANSFER_NUMBER_URB)
-        self.StopAcquisitionMode = EnumFeature(self.__handle, GxFeatureID.ENUM_STOP_ACQUISITION_MODE)
 
 
 class GEVDataStream(DataStream):
+    StreamResendPacketCount = LazyFeature("StreamResendPacketCount", IntFeature, GxFeatureID.INT_RESEND_PACKET_COUNT)
+    StreamRescuedPacketCount = LazyFeature("StreamRescuedPacketCount", IntFeature, GxFeatureID.INT_RESCUED_PACKET_COUNT)
+    StreamResendCommandCount = LazyFeature("StreamResendCommandCount", IntFeature, GxFeatureID.INT_RESEND_COMMAND_COUNT)
+    StreamUnexpectedPacketCount = LazyFeature("StreamUnexpectedPacketCount", IntFeature, GxFeatureID.INT_UNEXPECTED_PACKET_COUNT)
+    MaxPacketCountInOneBlock = LazyFeature("MaxPacketCountInOneBlock", IntFeature, GxFeatureID.INT_MAX_PACKET_COUNT_IN_ONE_BLOCK)
+    MaxPacketCountInOneCommand = LazyFeature("MaxPacketCountInOneCommand", IntFeature, GxFeatureID.INT_MAX_PACKET_COUNT_IN_ONE_COMMAND)
+    ResendTimeout = LazyFeature("ResendTimeout", IntFeature, GxFeatureID.INT_RESEND_TIMEOUT)
+    MaxWaitPacketCount = LazyFeature("MaxWaitPacketCount", IntFeature, GxFeatureID.INT_MAX_WAIT_PACKET_COUNT)
+    ResendMode = LazyFeature("ResendMode", EnumFeature, GxFeatureID.ENUM_RESEND_MODE)
+    StreamMissingBlockIDCount = LazyFeature("StreamMissingBlockIDCount", IntFeature, GxFeatureID.INT_MISSING_BLOCK_ID_COUNT)
+    BlockTimeout = LazyFeature("BlockTimeout", IntFeature, GxFeatureID.INT_BLOCK_TIMEOUT)
+    MaxNumQueueBuffer = LazyFeature("MaxNumQueueBuffer", IntFeature, GxFeatureID.INT_MAX_NUM_QUEUE_BUFFER)
+    PacketTimeout = LazyFeature("PacketTimeout", IntFeature, GxFeatureID.INT_PACKET_TIMEOUT)
+    SocketBufferSize = LazyFeature("SocketBufferSize", IntFeature, GxFeatureID.INT_SOCKET_BUFFER_SIZE)
+
     def __init__(self, dev_handle, stream_handle):
         self.__handle = dev_handle
         DataStream.__init__(self, self.__handle, stream_handle)
-        self.StreamResendPacketCount = IntFeature(self.__handle, GxFeatureID.INT_RESEND_PACKET_COUNT)
-        self.StreamRescuedPacketCount = IntFeature(self.__handle, GxFeatureID.INT_RESCUED_PACKET_COUNT)
-        self.StreamResendCommandCount = IntFeature(self.__handle, GxFeatureID.INT_RESEND_COMMAND_COUNT)
-        self.StreamUnexpectedPacketCount = IntFeature(self.__handle, GxFeatureID.INT_UNEXPECTED_PACKET_COUNT)
-        self.MaxPacketCountInOneBlock = IntFeature(self.__handle, GxFeatureID.INT_MAX_PACKET_COUNT_IN_ONE_BLOCK)
-        self.MaxPacketCountInOneCommand = IntFeature(self.__handle, GxFeatureID.INT_MAX_PACKET_COUNT_IN_ONE_COMMAND)
-        self.ResendTimeout = IntFeature(self.__handle, GxFeatureID.INT_RESEND_TIMEOUT)
-        self.MaxWaitPacketCount = IntFeature(self.__handle, GxFeatureID.INT_MAX_WAIT_PACKET_COUNT)
-        self.ResendMode = EnumFeature(self.__handle, GxFeatureID.ENUM_RESEND_MODE)
-        self.StreamMissingBlockIDCount = IntFeature(self.__handle, GxFeatureID.INT_MISSING_BLOCK_ID_COUNT)
-        self.BlockTimeout = IntFeature(self.__handle, GxFeatureID.INT_BLOCK_TIMEOUT)
-        self.MaxNumQueueBuffer = IntFeature(self.__handle, GxFeatureID.INT_MAX_NUM_QUEUE_BUFFER)
-        self.PacketTimeout = IntFeature(self.__handle, GxFeatureID.INT_PACKET_TIMEOUT)
-        self.SocketBufferSize = IntFeature(self.__handle, GxFeatureID.INT_SOCKET_BUFFER_SIZE)
 
@@ -10,6 +10,8 @@ from gxipy.gxiapi import *
 from gxipy.StatusProcessor import *
 from gxipy.Feature import *
 from gxipy.FeatureControl import *
+from gxipy.FeatureCache import *
+from gxipy.LazyFeature import *
 from gxipy.ImageProc import *
 from gxipy.ImageProcessConfig import *
 from gxipy.DataStream import *
@@ -24,6 +26,412 @@ class Device:
     Python interface does not upgrade, or only the definition of the control code can support new features
     """
 
+    # Function code function is obsolete, please use string to obtain attribute value
+    # ---------------Device Information Section--------------------------
+    DeviceVendorName = LazyFeature("DeviceVendorName", StringFeature, GxFeatureID.STRING_DEVICE_VENDOR_NAME)
+    DeviceModelName = LazyFeature("DeviceModelName", StringFeature, GxFeatureID.STRING_DEVICE_MODEL_NAME)
+    DeviceFirmwareVersion = LazyFeature("DeviceFirmwareVersion", StringFeature, GxFeatureID.STRING_DEVICE_FIRMWARE_VERSION)
+    DeviceVersion = LazyFeature("DeviceVersion", StringFeature, GxFeatureID.STRING_DEVICE_VERSION)
+    DeviceSerialNumber = LazyFeature("DeviceSerialNumber", StringFeature, GxFeatureID.STRING_DEVICE_SERIAL_NUMBER)
+    FactorySettingVersion = LazyFeature("FactorySettingVersion", StringFeature, GxFeatureID.STRING_FACTORY_SETTING_VERSION)
+    DeviceUserID = LazyFeature("DeviceUserID", StringFeature, GxFeatureID.STRING_DEVICE_USER_ID)
+    DeviceLinkSelector = LazyFeature("DeviceLinkSelector", IntFeature, GxFeatureID.INT_DEVICE_LINK_SELECTOR)
+    DeviceLinkThroughputLimitMode = LazyFeature("DeviceLinkThroughputLimitMode", EnumFeature, GxFeatureID.ENUM_DEVICE_LINK_THROUGHPUT_LIMIT_MODE)
+    DeviceLinkThroughputLimit = LazyFeature("DeviceLinkThroughputLimit", IntFeature, GxFeatureID.INT_DEVICE_LINK_THROUGHPUT_LIMIT)
+    DeviceLinkCurrentThroughput = LazyFeature("DeviceLinkCurrentThroughput", IntFeature, GxFeatureID.INT_DEVICE_LINK_CURRENT_THROUGHPUT)
+    DeviceReset = LazyFeature("DeviceReset", CommandFeature, GxFeatureID.COMMAND_DEVICE_RESET)
+    TimestampTickFrequency = LazyFeature("TimestampTickFrequency", IntFeature, GxFeatureID.INT_TIMESTAMP_TICK_FREQUENCY)
+    TimestampLatch = LazyFeature("TimestampLatch", CommandFeature, GxFeatureID.COMMAND_TIMESTAMP_LATCH)
+    TimestampReset = LazyFeature("TimestampReset", CommandFeature, GxFeatureID.COMMAND_TIMESTAMP_RESET)
+    TimestampLatchReset = LazyFeature("TimestampLatchReset", CommandFeature, GxFeatureID.COMMAND_TIMESTAMP_LATCH_RESET)
+    TimestampLatchValue = LazyFeature("TimestampLatchValue", IntFeature, GxFeatureID.INT_TIMESTAMP_LATCH_VALUE)
+    DevicePHYVersion = LazyFeature("DevicePHYVersion", StringFeature, GxFeatureID.STRING_DEVICE_PHY_VERSION)
+    DeviceTemperatureSelector = LazyFeature("DeviceTemperatureSelector", EnumFeature, GxFeatureID.ENUM_DEVICE_TEMPERATURE_SELECTOR)
+    DeviceTemperature = LazyFeature("DeviceTemperature", FloatFeature, GxFeatureID.FLOAT_DEVICE_TEMPERATURE)
+    DeviceIspFirmwareVersion = LazyFeature("DeviceIspFirmwareVersion", StringFeature, GxFeatureID.STRING_DEVICE_ISP_FIRMWARE_VERSION)
+    LowPowerMode = LazyFeature("LowPowerMode", EnumFeature, GxFeatureID.ENUM_LOWPOWER_MODE)
+    CloseCCD = LazyFeature("CloseCCD", EnumFeature, GxFeatureID.ENUM_CLOSE_CCD)
+    ProductionCode = LazyFeature("ProductionCode", StringFeature, GxFeatureID.STRING_PRODUCTION_CODE)
+    DeviceOriginalName = LazyFeature("DeviceOriginalName", StringFeature, GxFeatureID.STRING_DEVICE_ORIGINAL_NAME)
+    Revision = LazyFeature("Revision", IntFeature, GxFeatureID.INT_REVISION)
+    VersionsSupported = LazyFeature("VersionsSupported", IntFeature, GxFeatureID.INT_VERSIONS_SUPPORTED)
+    VersionUsed = LazyFeature("VersionUsed", IntFeature, GxFeatureID.INT_VERSION_USED)
+    TecEnable = LazyFeature("TecEnable", BoolFeature, GxFeatureID.BOOL_TEC_ENABLE)
+    TecTargetTemperature = LazyFeature("TecTargetTemperature", FloatFeature, GxFeatureID.FLOAT_TEC_TARGET_TEMPERATURE)
+    FanEnable = LazyFeature("FanEnable", BoolFeature, GxFeatureID.BOOL_FAN_ENABLE)
+    TecEnable = LazyFeature("TecEnable", BoolFeature, GxFeatureID.BOOL_FAN_ENABLE)
+    TemperatureDetectionStatus = LazyFeature("TemperatureDetectionStatus", IntFeature, GxFeatureID.INT_TEMPERATURE_DETECTION_STATUS)
+    FanSpeed = LazyFeature("FanSpeed", IntFeature, GxFeatureID.INT_FAN_SPEED)
+    DeviceHumidity = LazyFeature("DeviceHumidity", FloatFeature, GxFeatureID.FLOAT_DEVICE_HUMIDITY)
+    DevicePressure = LazyFeature("DevicePressure", FloatFeature, GxFeatureID.FLOAT_DEVICE_PRESSURE)
+    AirChangeDetectionStatus = LazyFeature("AirChangeDetectionStatus", IntFeature, GxFeatureID.INT_AIR_CHANGE_DETECTION_STATUS)
+    AirTightnessDetectionStatus = LazyFeature("AirTightnessDetectionStatus", IntFeature, GxFeatureID.INT_AIR_TIGHTNESS_DETECTION_STATUS)
+    DeviceScanType = LazyFeature("DeviceScanType", EnumFeature, GxFeatureID.ENUM_DEVICE_SCAN_TYPE)
+
+    # ---------------ImageFormat Section--------------------------------
+    SensorWidth = LazyFeature("SensorWidth", IntFeature, GxFeatureID.INT_SENSOR_WIDTH)
+    SensorHeight = LazyFeature("SensorHeight", IntFeature, GxFeatureID.INT_SENSOR_HEIGHT)
+    WidthMax = LazyFeature("WidthMax", IntFeature, GxFeatureID.INT_WIDTH_MAX)
+    HeightMax = LazyFeature("HeightMax", IntFeature, GxFeatureID.INT_HEIGHT_MAX)
+    OffsetX = LazyFeature("OffsetX", IntFeature, GxFeatureID.INT_OFFSET_X)
+    OffsetY = LazyFeature("OffsetY", IntFeature, GxFeatureID.INT_OFFSET_Y)
+    Width = LazyFeature("Width", IntFeature, GxFeatureID.INT_WIDTH)
+    Height = LazyFeature("Height", IntFeature, GxFeatureID.INT_HEIGHT)
+    BinningHorizontal = LazyFeature("BinningHorizontal", IntFeature, GxFeatureID.INT_BINNING_HORIZONTAL)
+    BinningVertical = LazyFeature("BinningVertical", IntFeature, GxFeatureID.INT_BINNING_VERTICAL)
+    DecimationHorizontal = LazyFeature("DecimationHorizontal", IntFeature, GxFeatureID.INT_DECIMATION_HORIZONTAL)
+    DecimationVertical = LazyFeature("DecimationVertical", IntFeature, GxFeatureID.INT_DECIMATION_VERTICAL)
+    PixelSize = LazyFeature("PixelSize", EnumFeature, GxFeatureID.ENUM_PIXEL_SIZE)
+    PixelColorFilter = LazyFeature("PixelColorFilter", EnumFeature, GxFeatureID.ENUM_PIXEL_COLOR_FILTER)
+    PixelFormat = LazyFeature("PixelFormat", EnumFeature, GxFeatureID.ENUM_PIXEL_FORMAT)
+    ReverseX = LazyFeature("ReverseX", BoolFeature, GxFeatureID.BOOL_REVERSE_X)
+    ReverseY = LazyFeature("ReverseY", BoolFeature, GxFeatureID.BOOL_REVERSE_Y)
+    TestPattern = LazyFeature("TestPattern", EnumFeature, GxFeatureID.ENUM_TEST_PATTERN)
+    TestPatternGeneratorSelector = LazyFeature("TestPatternGeneratorSelector", EnumFeature, GxFeatureID.ENUM_TEST_PATTERN_GENERATOR_SELECTOR)
+    RegionSendMode = LazyFeature("RegionSendMode", EnumFeature, GxFeatureID.ENUM_REGION_SEND_MODE)
+    RegionMode = LazyFeature("RegionMode", EnumFeature, GxFeatureID.ENUM_REGION_MODE)
+    RegionSelector = LazyFeature("RegionSelector", EnumFeature, GxFeatureID.ENUM_REGION_SELECTOR)
+    CenterWidth = LazyFeature("CenterWidth", IntFeature, GxFeatureID.INT_CENTER_WIDTH)
+    CenterHeight = LazyFeature("CenterHeight", IntFeature, GxFeatureID.INT_CENTER_HEIGHT)
+    BinningHorizontalMode = LazyFeature("BinningHorizontalMode", EnumFeature, GxFeatureID.ENUM_BINNING_HORIZONTAL_MODE)
+    BinningVerticalMode = LazyFeature("BinningVerticalMode", EnumFeature, GxFeatureID.ENUM_BINNING_VERTICAL_MODE)
+    SensorShutterMode = LazyFeature("SensorShutterMode", EnumFeature, GxFeatureID.ENUM_SENSOR_SHUTTER_MODE)
+    DecimationLineNumber = LazyFeature("DecimationLineNumber", IntFeature, GxFeatureID.INT_DECIMATION_LINENUMBER)
+    SensorDecimationHorizontal = LazyFeature("SensorDecimationHorizontal", IntFeature, GxFeatureID.INT_SENSOR_DECIMATION_HORIZONTAL)
+    SensorDecimationVertical = LazyFeature("SensorDecimationVertical", IntFeature, GxFeatureID.INT_SENSOR_DECIMATION_VERTICAL)
+    SensorSelector = LazyFeature("SensorSelector", EnumFeature, GxFeatureID.ENUM_SENSOR_SELECTOR)
+    CurrentSensorWidth = LazyFeature("CurrentSensorWidth", IntFeature, GxFeatureID.INT_CURRENT_SENSOR_WIDTH)
+    CurrentSensorHeight = LazyFeature("CurrentSensorHeight", IntFeature, GxFeatureID.INT_CURRENT_SENSOR_HEIGHT)
+    CurrentSensorOffsetX = LazyFeature("CurrentSensorOffsetX", IntFeature, GxFeatureID.INT_CURRENT_SENSOR_OFFSETX)
+    CurrentSensorOffsetY = LazyFeature("CurrentSensorOffsetY", IntFeature, GxFeatureID.INT_CURRENT_SENSOR_OFFSETY)
+    CurrentSensorWidthMax = LazyFeature("CurrentSensorWidthMax", IntFeature, GxFeatureID.INT_CURRENT_SENSOR_WIDTHMAX)
+    CurrectSensorHeightMax = LazyFeature("CurrectSensorHeightMax", IntFeature, GxFeatureID.INT_CURRENT_SENSOR_HEIGHTMAX)
+    SensorBitDepth = LazyFeature("SensorBitDepth", EnumFeature, GxFeatureID.ENUM_SENSOR_BIT_DEPTH)
+    WatermarkEnable = LazyFeature("WatermarkEnable", BoolFeature, GxFeatureID.BOOL_WATERMARK_ENABLE)
+
+    # ---------------TransportLayer Section-------------------------------
+    PayloadSize = LazyFeature("PayloadSize", IntFeature, GxFeatureID.INT_PAYLOAD_SIZE)
+    GevCurrentIPConfigurationLLA = LazyFeature("GevCurrentIPConfigurationLLA", BoolFeature, GxFeatureID.BOOL_GEV_CURRENT_IP_CONFIGURATION_LLA)
+    GevCurrentIPConfigurationDHCP = LazyFeature("GevCurrentIPConfigurationDHCP", BoolFeature, GxFeatureID.BOOL_GEV_CURRENT_IP_CONFIGURATION_DHCP)
+    GevCurrentIPConfigurationPersistentIP = LazyFeature("GevCurrentIPConfigurationPersistentIP", BoolFeature,
+                                                        GxFeatureID.BOOL_GEV_CURRENT_IP_CONFIGURATION_PERSISTENT_IP)
+    EstimatedBandwidth = LazyFeature("EstimatedBandwidth", IntFeature, GxFeatureID.INT_ESTIMATED_BANDWIDTH)
+    GevHeartbeatTimeout = LazyFeature("GevHeartbeatTimeout", IntFeature, GxFeatureID.INT_GEV_HEARTBEAT_TIMEOUT)
+    GevSCPSPacketSize = LazyFeature("GevSCPSPacketSize", IntFeature, GxFeatureID.INT_GEV_PACKET_SIZE)
+    GevSCPD = LazyFeature("GevSCPD", IntFeature, GxFeatureID.INT_GEV_PACKET_DELAY)
+    GevLinkSpeed = LazyFeature("GevLinkSpeed", IntFeature, GxFeatureID.INT_GEV_LINK_SPEED)
+    DeviceTapGeometry = LazyFeature("DeviceTapGeometry", EnumFeature, GxFeatureID.ENUM_DEVICE_TAP_GEOMETRY)
+
+    # ---------------AcquisitionTrigger Section---------------------------
+    AcquisitionMode = LazyFeature("AcquisitionMode", EnumFeature, GxFeatureID.ENUM_ACQUISITION_MODE)
+    AcquisitionStart = LazyFeature("AcquisitionStart", CommandFeature, GxFeatureID.COMMAND_ACQUISITION_START)
+    AcquisitionStop = LazyFeature("AcquisitionStop", CommandFeature, GxFeatureID.COMMAND_ACQUISITION_STOP)
+    TriggerMode = LazyFeature("TriggerMode", EnumFeature, GxFeatureID.ENUM_TRIGGER_MODE)
+    TriggerSoftware = LazyFeature("TriggerSoftware", CommandFeature, GxFeatureID.COMMAND_TRIGGER_SOFTWARE)
+    TriggerActivation = LazyFeature("TriggerActivation", EnumFeature, GxFeatureID.ENUM_TRIGGER_ACTIVATION)
+    ExposureTime = LazyFeature("ExposureTime", FloatFeature, GxFeatureID.FLOAT_EXPOSURE_TIME)
+    ExposureAuto = LazyFeature("ExposureAuto", EnumFeature, GxFeatureID.ENUM_EXPOSURE_AUTO)
+    TriggerFilterRaisingEdge = LazyFeature("TriggerFilterRaisingEdge", FloatFeature, GxFeatureID.FLOAT_TRIGGER_FILTER_RAISING)
+    TriggerFilterFallingEdge = LazyFeature("TriggerFilterFallingEdge", FloatFeature, GxFeatureID.FLOAT_TRIGGER_FILTER_FALLING)
+    TriggerSource = LazyFeature("TriggerSource", EnumFeature, GxFeatureID.ENUM_TRIGGER_SOURCE)
+    ExposureMode = LazyFeature("ExposureMode", EnumFeature, GxFeatureID.ENUM_EXPOSURE_MODE)
+    TriggerSelector = LazyFeature("TriggerSelector", EnumFeature, GxFeatureID.ENUM_TRIGGER_SELECTOR)
+    TriggerDelay = LazyFeature("TriggerDelay", FloatFeature, GxFeatureID.FLOAT_TRIGGER_DELAY)
+    TransferControlMode = LazyFeature("TransferControlMode", EnumFeature, GxFeatureID.ENUM_TRANSFER_CONTROL_MODE)
+    TransferOperationMode = LazyFeature("TransferOperationMode", EnumFeature, GxFeatureID.ENUM_TRANSFER_OPERATION_MODE)
+    TransferStart = LazyFeature("TransferStart", CommandFeature, GxFeatureID.COMMAND_TRANSFER_START)
+    TransferBlockCount = LazyFeature("TransferBlockCount", IntFeature, GxFeatureID.INT_TRANSFER_BLOCK_COUNT)
+    FrameBufferOverwriteActive = LazyFeature("FrameBufferOverwriteActive", BoolFeature, GxFeatureID.BOOL_FRAMESTORE_COVER_ACTIVE)
+    AcquisitionFrameRateMode = LazyFeature("AcquisitionFrameRateMode", EnumFeature, GxFeatureID.ENUM_ACQUISITION_FRAME_RATE_MODE)
+    AcquisitionFrameRate = LazyFeature("AcquisitionFrameRate", FloatFeature, GxFeatureID.FLOAT_ACQUISITION_FRAME_RATE)
+    CurrentAcquisitionFrameRate = LazyFeature("CurrentAcquisitionFrameRate", FloatFeature, GxFeatureID.FLOAT_CURRENT_ACQUISITION_FRAME_RATE)
+    FixedPatternNoiseCorrectMode = LazyFeature("FixedPatternNoiseCorrectMode", EnumFeature, GxFeatureID.ENUM_FIXED_PATTERN_NOISE_CORRECT_MODE)
+    AcquisitionBurstFrameCount = LazyFeature("AcquisitionBurstFrameCount", IntFeature, GxFeatureID.INT_ACQUISITION_BURST_FRAME_COUNT)
+    AcquisitionStatusSelector = LazyFeature("AcquisitionStatusSelector", EnumFeature, GxFeatureID.ENUM_ACQUISITION_STATUS_SELECTOR)
+    AcquisitionStatus = LazyFeature("AcquisitionStatus", BoolFeature, GxFeatureID.BOOL_ACQUISITION_STATUS)
+    ExposureDelay = LazyFeature("ExposureDelay", FloatFeature, GxFeatureID.FLOAT_EXPOSURE_DELAY)
+    ExposureOverlapTimeMax = LazyFeature("ExposureOverlapTimeMax", FloatFeature, GxFeatureID.FLOAT_EXPOSURE_OVERLAP_TIME_MAX)
+    ExposureTimeMode = LazyFeature("ExposureTimeMode", EnumFeature, GxFeatureID.ENUM_EXPOSURE_TIME_MODE)
+    FrameBufferCount = LazyFeature("FrameBufferCount", IntFeature, GxFeatureID.INT_FRAME_BUFFER_COUNT)
+    FrameBufferFlush = LazyFeature("FrameBufferFlush", CommandFeature, GxFeatureID.COMMAND_FRAME_BUFFER_FLUSH)
+    AcquisitionBurstMode = LazyFeature("AcquisitionBurstMode", EnumFeature, GxFeatureID.ENUM_ACQUISITION_BURST_MODE)
+    OverlapMode = LazyFeature("OverlapMode", EnumFeature, GxFeatureID.ENUM_OVERLAP_MODE)
+    MultiSourceSelector = LazyFeature("MultiSourceSelector", EnumFeature, GxFeatureID.ENUM_MULTISOURCE_SELECTOR)
+    MultiSourceEnable = LazyFeature("MultiSourceEnable", BoolFeature, GxFeatureID.BOOL_MULTISOURCE_ENABLE)
+    TriggerCacheEnable = LazyFeature("TriggerCacheEnable", BoolFeature, GxFeatureID.BOOL_TRIGGER_CACHE_ENABLE)
+
+    # ----------------DigitalIO Section----------------------------------
+    UserOutputSelector = LazyFeature("UserOutputSelector", EnumFeature, GxFeatureID.ENUM_USER_OUTPUT_SELECTOR)
+    UserOutputValue = LazyFeature("UserOutputValue", BoolFeature, GxFeatureID.BOOL_USER_OUTPUT_VALUE)
+    LineSelector = LazyFeature("LineSelector", EnumFeature, GxFeatureID.ENUM_LINE_SELECTOR)
+    LineMode = LazyFeature("LineMode", EnumFeature, GxFeatureID.ENUM_LINE_MODE)
+    LineInverter = LazyFeature("LineInverter", BoolFeature, GxFeatureID.BOOL_LINE_INVERTER)
+    LineSource = LazyFeature("LineSource", EnumFeature, GxFeatureID.ENUM_LINE_SOURCE)
+    LineStatus = LazyFeature("LineStatus", BoolFeature, GxFeatureID.BOOL_LINE_STATUS)
+    LineStatusAll = LazyFeature("LineStatusAll", IntFeature, GxFeatureID.INT_LINE_STATUS_ALL)
+    PulseWidth = LazyFeature("PulseWidth", FloatFeature, GxFeatureID.FLOAT_PULSE_WIDTH)
+    LineRange = LazyFeature("LineRange", IntFeature, GxFeatureID.INT_LINE_RANGE)
+    LineDelay = LazyFeature("LineDelay", IntFeature, GxFeatureID.INT_LINE_DELAY)
+    LineFilterRaisingEdge = LazyFeature("LineFilterRaisingEdge", IntFeature, GxFeatureID.INT_LINE_FILTER_RAISING_EDGE)
+    LineFilterFallingEdge = LazyFeature("LineFilterFallingEdge", IntFeature, GxFeatureID.INT_LINE_FILTER_FALLING_EDGE)
+
+    # ----------------AnalogControls Section----------------------------
+    GainAuto = LazyFeature("GainAuto", EnumFeature, GxFeatureID.ENUM_GAIN_AUTO)
+    GainSelector = LazyFeature("GainSelector", EnumFeature, GxFeatureID.ENUM_GAIN_SELECTOR)
+    BlackLevelAuto = LazyFeature("BlackLevelAuto", EnumFeature, GxFeatureID.ENUM_BLACK_LEVEL_AUTO)
+    BlackLevelSelector = LazyFeature("BlackLevelSelector", EnumFeature, GxFeatureID.ENUM_BLACK_LEVEL_SELECTOR)
+    BalanceWhiteAuto = LazyFeature("BalanceWhiteAuto", EnumFeature, GxFeatureID.ENUM_BALANCE_WHITE_AUTO)
+    BalanceRatioSelector = LazyFeature("BalanceRatioSelector", EnumFeature, GxFeatureID.ENUM_BALANCE_RATIO_SELECTOR)
+    BalanceRatio = LazyFeature("BalanceRatio", FloatFeature, GxFeatureID.FLOAT_BALANCE_RATIO)
+    DeadPixelCorrect = LazyFeature("DeadPixelCorrect", EnumFeature, GxFeatureID.ENUM_DEAD_PIXEL_CORRECT)
+    Gain = LazyFeature("Gain", FloatFeature, GxFeatureID.FLOAT_GAIN)
+    BlackLevel = LazyFeature("BlackLevel", FloatFeature, GxFeatureID.FLOAT_BLACK_LEVEL)
+    GammaEnable = LazyFeature("GammaEnable", BoolFeature, GxFeatureID.BOOL_GAMMA_ENABLE)
+    GammaMode = LazyFeature("GammaMode", EnumFeature, GxFeatureID.ENUM_GAMMA_MODE)
+    Gamma = LazyFeature("Gamma", FloatFeature, GxFeatureID.FLOAT_GAMMA)
+    DigitalShift = LazyFeature("DigitalShift", IntFeature, GxFeatureID.INT_DIGITAL_SHIFT)
+    LightSourcePreset = LazyFeature("LightSourcePreset", EnumFeature, GxFeatureID.ENUM_LIGHT_SOURCE_PRESET)
+    BlackLevelCalibStatus = LazyFeature("BlackLevelCalibStatus", BoolFeature, GxFeatureID.BOOL_BLACKLEVEL_CALIB_STATUS)
+    BlackLevelCalibValue = LazyFeature("BlackLevelCalibValue", IntFeature, GxFeatureID.INT_BLACKLEVEL_CALIB_VALUE)
+    PGAGain = LazyFeature("PGAGain", FloatFeature, GxFeatureID.FLOAT_PGA_GAIN)
+
+    # ---------------CustomFeature Section------------------------------
+    ExpectedGrayValue = LazyFeature("ExpectedGrayValue", IntFeature, GxFeatureID.INT_GRAY_VALUE)
+    AAROIOffsetX = LazyFeature("AAROIOffsetX", IntFeature, GxFeatureID.INT_AAROI_OFFSETX)
+    AAROIOffsetY = LazyFeature("AAROIOffsetY", IntFeature, GxFeatureID.INT_AAROI_OFFSETY)
+    AAROIWidth = LazyFeature("AAROIWidth", IntFeature, GxFeatureID.INT_AAROI_WIDTH)
+    AAROIHeight = LazyFeature("AAROIHeight", IntFeature, GxFeatureID.INT_AAROI_HEIGHT)
+    AutoGainMin = LazyFeature("AutoGainMin", FloatFeature, GxFeatureID.FLOAT_AUTO_GAIN_MIN)
+    AutoGainMax = LazyFeature("AutoGainMax", FloatFeature, GxFeatureID.FLOAT_AUTO_GAIN_MAX)
+    AutoExposureTimeMin = LazyFeature("AutoExposureTimeMin", FloatFeature, GxFeatureID.FLOAT_AUTO_EXPOSURE_TIME_MIN)
+    AutoExposureTimeMax = LazyFeature("AutoExposureTimeMax", FloatFeature, GxFeatureID.FLOAT_AUTO_EXPOSURE_TIME_MAX)
+    ContrastParam = LazyFeature("ContrastParam", IntFeature, GxFeatureID.INT_CONTRAST_PARAM)
+    GammaParam = LazyFeature("GammaParam", FloatFeature, GxFeatureID.FLOAT_GAMMA_PARAM)
+    ColorCorrectionParam = LazyFeature("ColorCorrectionParam", IntFeature, GxFeatureID.INT_COLOR_CORRECTION_PARAM)
+    AWBLampHouse = LazyFeature("AWBLampHouse", EnumFeature, GxFeatureID.ENUM_AWB_LAMP_HOUSE)
+    AWBROIOffsetX = LazyFeature("AWBROIOffsetX", IntFeature, GxFeatureID.INT_AWBROI_OFFSETX)
+    AWBROIOffsetY = LazyFeature("AWBROIOffsetY", IntFeature, GxFeatureID.INT_AWBROI_OFFSETY)
+    AWBROIWidth = LazyFeature("AWBROIWidth", IntFeature, GxFeatureID.INT_AWBROI_WIDTH)
+    AWBROIHeight = LazyFeature("AWBROIHeight", IntFeature, GxFeatureID.INT_AWBROI_HEIGHT)
+    SharpnessMode = LazyFeature("SharpnessMode", EnumFeature, GxFeatureID.ENUM_SHARPNESS_MODE)
+    Sharpness = LazyFeature("Sharpness", FloatFeature, GxFeatureID.FLOAT_SHARPNESS)
+    DataFieldSelector = LazyFeature("DataFieldSelector", EnumFeature, GxFeatureID.ENUM_USER_DATA_FIELD_SELECTOR)
+    DataFieldValue = LazyFeature("DataFieldValue", BufferFeature, GxFeatureID.BUFFER_USER_DATA_FIELD_VALUE)
+    FlatFieldCorrection = LazyFeature("FlatFieldCorrection", EnumFeature, GxFeatureID.ENUM_FLAT_FIELD_CORRECTION)
+    NoiseReductionMode = LazyFeature("NoiseReductionMode", EnumFeature, GxFeatureID.ENUM_NOISE_REDUCTION_MODE)
+    NoiseReduction = LazyFeature("NoiseReduction", FloatFeature, GxFeatureID.FLOAT_NOISE_REDUCTION)
+    FFCLoad = LazyFeature("FFCLoad", BufferFeature, GxFeatureID.BUFFER_FFCLOAD)
+    FFCSave = LazyFeature("FFCSave", BufferFeature, GxFeatureID.BUFFER_FFCSAVE)
+    StaticDefectCorrection = LazyFeature("StaticDefectCorrection", EnumFeature, GxFeatureID.ENUM_STATIC_DEFECT_CORRECTION)
+    NoiseReductionMode2D = LazyFeature("NoiseReductionMode2D", EnumFeature, GxFeatureID.ENUM_2D_NOISE_REDUCTION_MODE)
+    NoiseReductionMode3D = LazyFeature("NoiseReductionMode3D", EnumFeature, GxFeatureID.ENUM_3D_NOISE_REDUCTION_MODE)
+    CloseISP = LazyFeature("CloseISP", CommandFeature, GxFeatureID.COMMAND_CLOSE_ISP)
+    StaticDefectCorrectionValueAll = LazyFeature("StaticDefectCorrectionValueAll", BufferFeature, GxFeatureID.BUFFER_STATIC_DEFECT_CORRECTION_VALUE_ALL)
+    StaticDefectCorrectionFlashValue = LazyFeature("StaticDefectCorrectionFlashValue", BufferFeature,
+                                                   GxFeatureID.BUFFER_STATIC_DEFECT_CORRECTION_FLASH_VALUE)
+    StaticDefectCorrectionFinish = LazyFeature("StaticDefectCorrectionFinish", IntFeature, GxFeatureID.INT_STATIC_DEFECT_CORRECTION_FINISH)
+    StaticDefectCorrectionInfo = LazyFeature("StaticDefectCorrectionInfo", BufferFeature, GxFeatureID.BUFFER_STATIC_DEFECT_CORRECTION_INFO)
+    StripCalibrationStart = LazyFeature("StripCalibrationStart", CommandFeature, GxFeatureID.COMMAND_STRIP_CALIBRATION_START)
+    StripCalibrationStop = LazyFeature("StripCalibrationStop", CommandFeature, GxFeatureID.COMMAND_STRIP_CALIBRATION_STOP)
+    UserDataFiledValueAll = LazyFeature("UserDataFiledValueAll", BufferFeature, GxFeatureID.BUFFER_USER_DATA_FILED_VALUE_ALL)
+    ShadingCorrectionMode = LazyFeature("ShadingCorrectionMode", EnumFeature, GxFeatureID.ENUM_SHADING_CORRECTION_MODE)
+    FFCGenerate = LazyFeature("FFCGenerate", CommandFeature, GxFeatureID.COMMAND_FFC_GENERATE)
+    FFCGenerateStatus = LazyFeature("FFCGenerateStatus", EnumFeature, GxFeatureID.ENUM_FFC_GENERATE_STATUS)
+    FFCExpectedGrayValueEnable = LazyFeature("FFCExpectedGrayValueEnable", EnumFeature, GxFeatureID.ENUM_FFC_EXPECTED_GRAY_VALUE_ENABLE)
+    FFCExpectedGray = LazyFeature("FFCExpectedGray", IntFeature, GxFeatureID.INT_FFC_EXPECTED_GRAY)
+    FFCCoeffinientsSize = LazyFeature("FFCCoeffinientsSize", IntFeature, GxFeatureID.INT_FFC_COEFFICIENTS_SIZE)
+    FFCValueAll = LazyFeature("FFCValueAll", BufferFeature, GxFeatureID.BUFFER_FFC_VALUE_ALL)
+    DSNUSelector = LazyFeature("DSNUSelector", EnumFeature, GxFeatureID.ENUM_DSNU_SELECTOR)
+    DSNUGenerate = LazyFeature("DSNUGenerate", CommandFeature, GxFeatureID.COMMAND_DSNU_GENERATE)
+    DSNUGenerateStatus = LazyFeature("DSNUGenerateStatus", EnumFeature, GxFeatureID.ENUM_DSNU_GENERATE_STATUS)
+    DSNUSave = LazyFeature("DSNUSave", CommandFeature, GxFeatureID.COMMAND_DSNU_SAVE)
+    DSNULoad = LazyFeature("DSNULoad", CommandFeature, GxFeatureID.COMMAND_DSNU_LOAD)
+    PRNUSelector = LazyFeature("PRNUSelector", EnumFeature, GxFeatureID.ENUM_PRNU_SELECTOR)
+    PRNUGenerate = LazyFeature("PRNUGenerate", CommandFeature, GxFeatureID.COMMAND_PRNU_GENERATE)
+    PRNUGenerateStatus = LazyFeature("PRNUGenerateStatus", EnumFeature, GxFeatureID.ENUM_PRNU_GENERATE_STATUS)
+    PRNUSave = LazyFeature("PRNUSave", CommandFeature, GxFeatureID.COMMAND_PRNU_SAVE)
+    PRNULoad = LazyFeature("PRNULoad", CommandFeature, GxFeatureID.COMMAND_PRNU_LOAD)
+    DataFieldValueAll = LazyFeature("DataFieldValueAll", BufferFeature, GxFeatureID.BUFFER_USER_DATA_FILED_VALUE_ALL)
+    StaticDefectCorrectionCalibStatus = LazyFeature("StaticDefectCorrectionCalibStatus", IntFeature, GxFeatureID.INT_STATIC_DEFECT_CORRECTION_CALIB_STATUS)
+    FFCFactoryStatus = LazyFeature("FFCFactoryStatus", IntFeature, GxFeatureID.INT_FFC_FACTORY_STATUS)
+    DSNUFactoryStatus = LazyFeature("DSNUFactoryStatus", IntFeature, GxFeatureID.INT_DSNU_FACTORY_STATUS)
+    PRNUFactoryStatus = LazyFeature("PRNUFactoryStatus", IntFeature, GxFeatureID.INT_PRNU_FACTORY_STATUS)
+    Detect = LazyFeature("Detect", BufferFeature, GxFeatureID.BUFFER_DETECT)
+    FFCCoefficient = LazyFeature("FFCCoefficient", EnumFeature, GxFeatureID.ENUM_FFC_COEFFICIENT)
+    FFCFlashLoad = LazyFeature("FFCFlashLoad", BufferFeature, GxFeatureID.BUFFER_FFCFLASH_LOAD)
+    FFCFlashSave = LazyFeature("FFCFlashSave", BufferFeature, GxFeatureID.BUFFER_FFCFLASH_SAVE)
+
+    # ---------------UserSetControl Section-------------------------------
+    UserSetSelector = LazyFeature("UserSetSelector", EnumFeature, GxFeatureID.ENUM_USER_SET_SELECTOR)
+    UserSetLoad = LazyFeature("UserSetLoad", CommandFeature, GxFeatureID.COMMAND_USER_SET_LOAD)
+    UserSetSave = LazyFeature("UserSetSave", CommandFeature, GxFeatureID.COMMAND_USER_SET_SAVE)
+    UserSetDefault = LazyFeature("UserSetDefault", EnumFeature, GxFeatureID.ENUM_USER_SET_DEFAULT)
+    DataFieldValueAllUsedStatus = LazyFeature("DataFieldValueAllUsedStatus", IntFeature, GxFeatureID.INT_DATA_FIELD_VALUE_ALL_USED_STATUS)
+
+    # ---------------Event Section----------------------------------------
+    EventSelector = LazyFeature("EventSelector", EnumFeature, GxFeatureID.ENUM_EVENT_SELECTOR)
+    EventNotification = LazyFeature("EventNotification", EnumFeature, GxFeatureID.ENUM_EVENT_NOTIFICATION)
+    EventExposureEnd = LazyFeature("EventExposureEnd", IntFeature, GxFeatureID.INT_EVENT_EXPOSURE_END)
+    EventExposureEndTimestamp = LazyFeature("EventExposureEndTimestamp", IntFeature, GxFeatureID.INT_EVENT_EXPOSURE_END_TIMESTAMP)
+    EventExposureEndFrameID = LazyFeature("EventExposureEndFrameID", IntFeature, GxFeatureID.INT_EVENT_EXPOSURE_END_FRAME_ID)
+    EventBlockDiscard = LazyFeature("EventBlockDiscard", IntFeature, GxFeatureID.INT_EVENT_BLOCK_DISCARD)
+    EventBlockDiscardTimestamp = LazyFeature("EventBlockDiscardTimestamp", IntFeature, GxFeatureID.INT_EVENT_BLOCK_DISCARD_TIMESTAMP)
+    EventOverrun = LazyFeature("EventOverrun", IntFeature, GxFeatureID.INT_EVENT_OVERRUN)
+    EventOverrunTimestamp = LazyFeature("EventOverrunTimestamp", IntFeature, GxFeatureID.INT_EVENT_OVERRUN_TIMESTAMP)
+    EventFrameStartOvertrigger = LazyFeature("EventFrameStartOvertrigger", IntFeature, GxFeatureID.INT_EVENT_FRAME_START_OVER_TRIGGER)
+    EventFrameStartOvertriggerTimestamp = LazyFeature("EventFrameStartOvertriggerTimestamp", IntFeature,
+                                                      GxFeatureID.INT_EVENT_FRAME_START_OVER_TRIGGER_TIMESTAMP)
+    EventBlockNotEmpty = LazyFeature("EventBlockNotEmpty", IntFeature, GxFeatureID.INT_EVENT_BLOCK_NOT_EMPTY)
+    EventBlockNotEmptyTimestamp = LazyFeature("EventBlockNotEmptyTimestamp", IntFeature, GxFeatureID.INT_EVENT_BLOCK_NOT_EMPTY_TIMESTAMP)
+    EventInternalError = LazyFeature("EventInternalError", IntFeature, GxFeatureID.INT_EVENT_INTERNAL_ERROR)
+    EventInternalErrorTimestamp = LazyFeature("EventInternalErrorTimestamp", IntFeature, GxFeatureID.INT_EVENT_INTERNAL_ERROR_TIMESTAMP)
+    EventFrameBurstStartOvertrigger = LazyFeature("EventFrameBurstStartOvertrigger", IntFeature, GxFeatureID.INT_EVENT_FRAMEBURSTSTART_OVERTRIGGER)
+    EventFrameBurstStartOvertriggerFrameID = LazyFeature("EventFrameBurstStartOvertriggerFrameID", IntFeature,
+                                                         GxFeatureID.INT_EVENT_FRAMEBURSTSTART_OVERTRIGGER_FRAMEID)
+    EventFrameBurstStartOvertriggerTimestamp = LazyFeature("EventFrameBurstStartOvertriggerTimestamp", IntFeature,
+                                                           GxFeatureID.INT_EVENT_FRAMEBURSTSTART_OVERTRIGGER_TIMESTAMP)
+    EventFrameStartWait = LazyFeature("EventFrameStartWait", IntFeature, GxFeatureID.INT_EVENT_FRAMESTART_WAIT)
+    EventFrameStartWaitTimestamp = LazyFeature("EventFrameStartWaitTimestamp", IntFeature, GxFeatureID.INT_EVENT_FRAMESTART_WAIT_TIMESTAMP)
+    EventFrameBurstStartWait = LazyFeature("EventFrameBurstStartWait", IntFeature, GxFeatureID.INT_EVENT_FRAMEBURSTSTART_WAIT)
+    EventFrameBurstStartWaitTimestamp = LazyFeature("EventFrameBurstStartWaitTimestamp", IntFeature, GxFeatureID.INT_EVENT_FRAMEBURSTSTART_WAIT_TIMESTAMP)
+    EventBlockDiscardFrameID = LazyFeature("EventBlockDiscardFrameID", IntFeature, GxFeatureID.INT_EVENT_BLOCK_DISCARD_FRAMEID)
+    EventFrameStartOvertriggerFrameID = LazyFeature("EventFrameStartOvertriggerFrameID", IntFeature, GxFeatureID.INT_EVENT_FRAMESTART_OVERTRIGGER_FRAMEID)
+    EventBlockNotEmptyFrameID = LazyFeature("EventBlockNotEmptyFrameID", IntFeature, GxFeatureID.INT_EVENT_BLOCK_NOT_EMPTY_FRAMEID)
+    EventFrameStartWaitFrameID = LazyFeature("EventFrameStartWaitFrameID", IntFeature, GxFeatureID.INT_EVENT_FRAMESTART_WAIT_FRAMEID)
+    EventFrameBurstStartWaitFrameID = LazyFeature("EventFrameBurstStartWaitFrameID", IntFeature, GxFeatureID.INT_EVENT_FRAMEBURSTSTART_WAIT_FRAMEID)
+    EventSimpleMode = LazyFeature("EventSimpleMode", EnumFeature, GxFeatureID.ENUM_EVENT_SIMPLE_MODE)
+
+    # ---------------LUT Section------------------------------------------
+    LUTSelector = LazyFeature("LUTSelector", EnumFeature, GxFeatureID.ENUM_LUT_SELECTOR)
+    LUTValueAll = LazyFeature("LUTValueAll", BufferFeature, GxFeatureID.BUFFER_LUT_VALUE_ALL)
+    LUTEnable = LazyFeature("LUTEnable", BoolFeature, GxFeatureID.BOOL_LUT_ENABLE)
+    LUTIndex = LazyFeature("LUTIndex", IntFeature, GxFeatureID.INT_LUT_INDEX)
+    LUTValue = LazyFeature("LUTValue", IntFeature, GxFeatureID.INT_LUT_VALUE)
+    LUTFactoryStatus = LazyFeature("LUTFactoryStatus", IntFeature, GxFeatureID.INT_LUT_FACTORY_STATUS)
+
+    # ---------------ChunkData Section------------------------------------
+    ChunkModeActive = LazyFeature("ChunkModeActive", BoolFeature, GxFeatureID.BOOL_CHUNK_MODE_ACTIVE)
+    ChunkSelector = LazyFeature("ChunkSelector", EnumFeature, GxFeatureID.ENUM_CHUNK_SELECTOR)
+    ChunkEnable = LazyFeature("ChunkEnable", BoolFeature, GxFeatureID.BOOL_CHUNK_ENABLE)
+
+    # ---------------Color Transformation Control-------------------------
+    ColorTransformationMode = LazyFeature("ColorTransformationMode", EnumFeature, GxFeatureID.ENUM_COLOR_TRANSFORMATION_MODE)
+    ColorTransformationEnable = LazyFeature("ColorTransformationEnable", BoolFeature, GxFeatureID.BOOL_COLOR_TRANSFORMATION_ENABLE)
+    ColorTransformationValueSelector = LazyFeature("ColorTransformationValueSelector", EnumFeature, GxFeatureID.ENUM_COLOR_TRANSFORMATION_VALUE_SELECTOR)
+    ColorTransformationValue = LazyFeature("ColorTransformationValue", FloatFeature, GxFeatureID.FLOAT_COLOR_TRANSFORMATION_VALUE)
+    SaturationMode = LazyFeature("SaturationMode", EnumFeature, GxFeatureID.ENUM_SATURATION_MODE)
+    Saturation = LazyFeature("Saturation", IntFeature, GxFeatureID.INT_SATURATION)
+
+    # ---------------CounterAndTimerControl Section-----------------------
+    TimerSelector = LazyFeature("TimerSelector", EnumFeature, GxFeatureID.ENUM_TIMER_SELECTOR)
+    TimerDuration = LazyFeature("TimerDuration", FloatFeature, GxFeatureID.FLOAT_TIMER_DURATION)
+    TimerDelay = LazyFeature("TimerDelay", FloatFeature, GxFeatureID.FLOAT_TIMER_DELAY)
+    TimerTriggerSource = LazyFeature("TimerTriggerSource", EnumFeature, GxFeatureID.ENUM_TIMER_TRIGGER_SOURCE)
+    CounterSelector = LazyFeature("CounterSelector", EnumFeature, GxFeatureID.ENUM_COUNTER_SELECTOR)
+    CounterEventSource = LazyFeature("CounterEventSource", EnumFeature, GxFeatureID.ENUM_COUNTER_EVENT_SOURCE)
+    CounterResetSource = LazyFeature("CounterResetSource", EnumFeature, GxFeatureID.ENUM_COUNTER_RESET_SOURCE)
+    CounterResetActivation = LazyFeature("CounterResetActivation", EnumFeature, GxFeatureID.ENUM_COUNTER_RESET_ACTIVATION)
+    CounterReset = LazyFeature("CounterReset", CommandFeature, GxFeatureID.COMMAND_COUNTER_RESET)
+    CounterTriggerSource = LazyFeature("CounterTriggerSource", EnumFeature, GxFeatureID.ENUM_COUNTER_TRIGGER_SOURCE)
+    CounterDuration = LazyFeature("CounterDuration", IntFeature, GxFeatureID.INT_COUNTER_DURATION)
+    TimerTriggerActivation = LazyFeature("TimerTriggerActivation", EnumFeature, GxFeatureID.ENUM_TIMER_TRIGGER_ACTIVATION)
+    CounterValue = LazyFeature("CounterValue", IntFeature, GxFeatureID.INT_COUNTER_VALUE)
+
+    # ---------------RemoveParameterLimitControl Section------------------
+    RemoveParameterLimit = LazyFeature("RemoveParameterLimit", EnumFeature, GxFeatureID.ENUM_REMOVE_PARAMETER_LIMIT)
+
+    # ---------------HDRControl Section------------------
+    HDRMode = LazyFeature("HDRMode", EnumFeature, GxFeatureID.ENUM_HDR_MODE)
+    HDRTargetLongValue = LazyFeature("HDRTargetLongValue", IntFeature, GxFeatureID.INT_HDR_TARGET_LONG_VALUE)
+    HDRTargetShortValue = LazyFeature("HDRTargetShortValue", IntFeature, GxFeatureID.INT_HDR_TARGET_SHORT_VALUE)
+    HDRTargetMainValue = LazyFeature("HDRTargetMainValue", IntFeature, GxFeatureID.INT_HDR_TARGET_MAIN_VALUE)
+
+    # ---------------MultiGrayControl Section------------------
+    MGCMode = LazyFeature("MGCMode", EnumFeature, GxFeatureID.ENUM_MGC_MODE)
+    MGCSelector = LazyFeature("MGCSelector", IntFeature, GxFeatureID.INT_MGC_SELECTOR)
+    MGCExposureTime = LazyFeature("MGCExposureTime", FloatFeature, GxFeatureID.FLOAT_MGC_EXPOSURE_TIME)
+    MGCGain = LazyFeature("MGCGain", FloatFeature, GxFeatureID.FLOAT_MGC_GAIN)
+
+    # ---------------ImageQualityControl Section------------------
+    StripedCalibrationInfo = LazyFeature("StripedCalibrationInfo", BufferFeature, GxFeatureID.BUFFER_STRIPED_CALIBRATION_INFO)
+    Contrast = LazyFeature("Contrast", FloatFeature, GxFeatureID.FLOAT_CONTRAST)
+    HotPixelCorrection = LazyFeature("HotPixelCorrection", EnumFeature, GxFeatureID.ENUM_HOTPIXEL_CORRECTION)
+
+    # ---------------GyroControl Section------------------
+    IMUData = LazyFeature("IMUData", BufferFeature, GxFeatureID.BUFFER_IMU_DATA)
+    IMUConfigAccRange = LazyFeature("IMUConfigAccRange", EnumFeature, GxFeatureID.ENUM_IMU_CONFIG_ACC_RANGE)
+    IMUConfigAccOdrLowPassFilterSwitch = LazyFeature("IMUConfigAccOdrLowPassFilterSwitch", EnumFeature,
+                                                     GxFeatureID.ENUM_IMU_CONFIG_ACC_ODR_LOW_PASS_FILTER_SWITCH)
+    IMUConfigAccOdr = LazyFeature("IMUConfigAccOdr", EnumFeature, GxFeatureID.ENUM_IMU_CONFIG_ACC_ODR)
+    IMUConfigAccOdrLowPassFilterFrequency = LazyFeature("IMUConfigAccOdrLowPassFilterFrequency", EnumFeature,
+                                                        GxFeatureID.ENUM_IMU_CONFIG_ACC_ODR_LOW_PASS_FILTER_FREQUENCY)
+    IMUConfigGyroXRange = LazyFeature("IMUConfigGyroXRange", EnumFeature, GxFeatureID.ENUM_IMU_CONFIG_GYRO_XRANGE)
+    IMUConfigGyroYRange = LazyFeature("IMUConfigGyroYRange", EnumFeature, GxFeatureID.ENUM_IMU_CONFIG_GYRO_YRANGE)
+    IMUConfigGyroZRange = LazyFeature("IMUConfigGyroZRange", EnumFeature, GxFeatureID.ENUM_IMU_CONFIG_GYRO_ZRANGE)
+    IMUConfigGyroOdrLowPassFilterSwitch = LazyFeature("IMUConfigGyroOdrLowPassFilterSwitch", EnumFeature,
+                                                      GxFeatureID.ENUM_IMU_CONFIG_GYRO_ODR_LOW_PASS_FILTER_SWITCH)
+    IMUConfigGyroOdr = LazyFeature("IMUConfigGyroOdr", EnumFeature, GxFeatureID.ENUM_IMU_CONFIG_GYRO_ODR)
+    IMUConfigGyroOdrLowPassFilterFrequency = LazyFeature("IMUConfigGyroOdrLowPassFilterFrequency", EnumFeature,
+                                                         GxFeatureID.ENUM_IMU_CONFIG_GYRO_ODR_LOW_PASS_FILTER_FREQUENCY)
+    IMURoomTemperature = LazyFeature("IMURoomTemperature", FloatFeature, GxFeatureID.FLOAT_IMU_ROOM_TEMPERATURE)
+    IMUTemperatureOdr = LazyFeature("IMUTemperatureOdr", EnumFeature, GxFeatureID.ENUM_IMU_TEMPERATURE_ODR)
+
+    # ---------------FrameBufferControl Section------------------
+    FrameBufferCount = LazyFeature("FrameBufferCount", IntFeature, GxFeatureID.INT_FRAME_BUFFER_COUNT)
+    FrameBufferFlush = LazyFeature("FrameBufferFlush", CommandFeature, GxFeatureID.COMMAND_FRAME_BUFFER_FLUSH)
+
+    # ---------------SerialPortControl Section------------------
+    DeviceSerialPortSelector = LazyFeature("DeviceSerialPortSelector", EnumFeature, GxFeatureID.ENUM_SERIALPORT_SELECTOR)
+    SerialPortSource = LazyFeature("SerialPortSource", EnumFeature, GxFeatureID.ENUM_SERIALPORT_SOURCE)
+    DeviceSerialPortBaudRate = LazyFeature("DeviceSerialPortBaudRate", EnumFeature, GxFeatureID.ENUM_SERIALPORT_BAUDRATE)
+    SerialPortDataBits = LazyFeature("SerialPortDataBits", IntFeature, GxFeatureID.INT_SERIALPORT_DATA_BITS)
+    SerialPortStopBits = LazyFeature("SerialPortStopBits", EnumFeature, GxFeatureID.ENUM_SERIALPORT_STOP_BITS)
+    SerialPortParity = LazyFeature("SerialPortParity", EnumFeature, GxFeatureID.ENUM_SERIALPORT_PARITY)
+    TransmitQueueMaxCharacterCount = LazyFeature("TransmitQueueMaxCharacterCount", IntFeature, GxFeatureID.INT_TRANSMIT_QUEUE_MAX_CHARACTER_COUNT)
+    TransmitQueueCurrentCharacterCount = LazyFeature("TransmitQueueCurrentCharacterCount", IntFeature, GxFeatureID.INT_TRANSMIT_QUEUE_CURRENT_CHARACTER_COUNT)
+    ReceiveQueueMaxCharacterCount = LazyFeature("ReceiveQueueMaxCharacterCount", IntFeature, GxFeatureID.INT_RECEIVE_QUEUE_MAX_CHARACTER_COUNT)
+    ReceiveQueueCurrentCharacterCount = LazyFeature("ReceiveQueueCurrentCharacterCount", IntFeature, GxFeatureID.INT_RECEIVE_QUEUE_CURRENT_CHARACTER_COUNT)
+    ReceiveFramingErrorCount = LazyFeature("ReceiveFramingErrorCount", IntFeature, GxFeatureID.INT_RECEIVE_FRAMING_ERROR_COUNT)
+    ReceiveParityErrorCount = LazyFeature("ReceiveParityErrorCount", IntFeature, GxFeatureID.INT_RECEIVE_PARITY_ERROR_COUNT)
+    ReceiveQueueClear = LazyFeature("ReceiveQueueClear", CommandFeature, GxFeatureID.COMMAND_RECEIVE_QUEUE_CLEAR)
+    SerialPortData = LazyFeature("SerialPortData", BufferFeature, GxFeatureID.BUFFER_SERIALPORT_DATA)
+    SerialPortDataLength = LazyFeature("SerialPortDataLength", IntFeature, GxFeatureID.INT_SERIALPORT_DATA_LENGTH)
+    SerialPortDetectionStatus = LazyFeature("SerialPortDetectionStatus", IntFeature, GxFeatureID.INT_SERIAL_PORT_DETECTION_STATUS)
+
+    # ---------------CoaXPress Section------------------
+    CxpLinkConfiguration = LazyFeature("CxpLinkConfiguration", EnumFeature, GxFeatureID.ENUM_CXP_LINK_CONFIGURATION)
+    CxpLinkConfigurationPreferred = LazyFeature("CxpLinkConfigurationPreferred", EnumFeature, GxFeatureID.ENUM_CXP_LINK_CONFIGURATION_PREFERRED)
+    CxpLinkConfigurationStatus = LazyFeature("CxpLinkConfigurationStatus", EnumFeature, GxFeatureID.ENUM_CXP_LINK_CONFIGURATION_STATUS)
+    Image1StreamID = LazyFeature("Image1StreamID", IntFeature, GxFeatureID.INT_IMAGE1_STREAM_ID)
+    CxpConnectionSelector = LazyFeature("CxpConnectionSelector", EnumFeature, GxFeatureID.ENUM_CXP_CONNECTION_SELECTOR)
+    CxpConnectionTestMode = LazyFeature("CxpConnectionTestMode", EnumFeature, GxFeatureID.ENUM_CXP_CONNECTION_TEST_MODE)
+    CxpConnectionTestErrorCount = LazyFeature("CxpConnectionTestErrorCount", IntFeature, GxFeatureID.INT_RECEIVE_FRAMING_ERROR_COUNT)
+    CxpConnectionTestPacketRxCount = LazyFeature("CxpConnectionTestPacketRxCount", IntFeature, GxFeatureID.INT_RECEIVE_FRAMING_ERROR_COUNT)
+    CxpConnectionTestPacketTxCount = LazyFeature("CxpConnectionTestPacketTxCount", IntFeature, GxFeatureID.INT_RECEIVE_FRAMING_ERROR_COUNT)
+
+    # ---------------SequencerControl Section------------------
+    SequencerMode = LazyFeature("SequencerMode", EnumFeature, GxFeatureID.ENUM_SEQUENCER_MODE)
+    SequencerConfigurationMode = LazyFeature("SequencerConfigurationMode", EnumFeature, GxFeatureID.ENUM_SEQUENCER_CONFIGURATION_MODE)
+    SequencerFeatureSelector = LazyFeature("SequencerFeatureSelector", EnumFeature, GxFeatureID.ENUM_SEQUENCER_FEATURE_SELECTOR)
+    SequencerFeatureEnable = LazyFeature("SequencerFeatureEnable", BoolFeature, GxFeatureID.BOOL_SEQUENCER_FEATURE_ENABLE)
+    SequencerSetSelector = LazyFeature("SequencerSetSelector", IntFeature, GxFeatureID.INT_SEQUENCER_SET_SELECTOR)
+    SequencerSetCount = LazyFeature("SequencerSetCount", IntFeature, GxFeatureID.INT_SEQUENCER_SET_COUNT)
+    SequencerSetActive = LazyFeature("SequencerSetActive", IntFeature, GxFeatureID.INT_SEQUENCER_SET_ACTIVE)
+    SequencerSetReset = LazyFeature("SequencerSetReset", CommandFeature, GxFeatureID.COMMAND_SEQUENCER_SET_RESET)
+    SequencerPathSelector = LazyFeature("SequencerPathSelector", IntFeature, GxFeatureID.INT_SEQUENCER_PATH_SELECTOR)
+    SequencerSetNext = LazyFeature("SequencerSetNext", IntFeature, GxFeatureID.INT_SEQUENCER_SET_NEXT)
+    SequencerTriggerSource = LazyFeature("SequencerTriggerSource", EnumFeature, GxFeatureID.ENUM_SEQUENCER_TRIGGER_SOURCE)
+    SequencerSetSave = LazyFeature("SequencerSetSave", CommandFeature, GxFeatureID.COMMAND_SEQUENCER_SET_SAVE)
+    SequencerSetLoad = LazyFeature("SequencerSetLoad", CommandFeature, GxFeatureID.COMMAND_SEQUENCER_SET_LOAD)
+
+    # ---------------EnoderControl Section------------------
+    EncoderSelector = LazyFeature("EncoderSelector", EnumFeature, GxFeatureID.ENUM_ENCODER_SELECTOR)
+    EncoderDirection = LazyFeature("EncoderDirection", EnumFeature, GxFeatureID.ENUM_ENCODER_DIRECTION)
+    EncoderValue = LazyFeature("EncoderValue", IntFeature, GxFeatureID.INT_ENCODER_VALUE)
+    EncoderSourceA = LazyFeature("EncoderSourceA", EnumFeature, GxFeatureID.ENUM_ENCODER_SOURCEA)
+    EncoderSourceB = LazyFeature("EncoderSourceB", EnumFeature, GxFeatureID.ENUM_ENCODER_SOURCEB)
+    EncoderMode = LazyFeature("EncoderMode", EnumFeature, GxFeatureID.ENUM_ENCODER_MODE)
+
     def __init__(self, handle, interface_obj):
         """
         :brief  Constructor for instance initialization
@@ -45,436 +453,19 @@ class Device:
 
         self.__color_correction_param = 0
 
-        # Function code function is obsolete, please use string to obtain attribute value
-        # ---------------Device Information Section--------------------------
-        self.DeviceVendorName = StringFeature(self.__dev_handle, GxFeatureID.STRING_DEVICE_VENDOR_NAME)
-        self.DeviceModelName = StringFeature(self.__dev_handle, GxFeatureID.STRING_DEVICE_MODEL_NAME)
-        self.DeviceFirmwareVersion = StringFeature(self.__dev_handle, GxFeatureID.STRING_DEVICE_FIRMWARE_VERSION)
-        self.DeviceVersion = StringFeature(self.__dev_handle, GxFeatureID.STRING_DEVICE_VERSION)
-        self.DeviceSerialNumber = StringFeature(self.__dev_handle, GxFeatureID.STRING_DEVICE_SERIAL_NUMBER)
-        self.FactorySettingVersion = StringFeature(self.__dev_handle, GxFeatureID.STRING_FACTORY_SETTING_VERSION)
-        self.DeviceUserID = StringFeature(self.__dev_handle, GxFeatureID.STRING_DEVICE_USER_ID)
-        self.DeviceLinkSelector = IntFeature(self.__dev_handle, GxFeatureID.INT_DEVICE_LINK_SELECTOR)
-        self.DeviceLinkThroughputLimitMode = EnumFeature(self.__dev_handle,
-                                                         GxFeatureID.ENUM_DEVICE_LINK_THROUGHPUT_LIMIT_MODE)
-        self.DeviceLinkThroughputLimit = IntFeature(self.__dev_handle, GxFeatureID.INT_DEVICE_LINK_THROUGHPUT_LIMIT)
-        self.DeviceLinkCurrentThroughput = IntFeature(self.__dev_handle, GxFeatureID.INT_DEVICE_LINK_CURRENT_THROUGHPUT)
-        self.DeviceReset = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_DEVICE_RESET)
-        self.TimestampTickFrequency = IntFeature(self.__dev_handle, GxFeatureID.INT_TIMESTAMP_TICK_FREQUENCY)
-        self.TimestampLatch = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_TIMESTAMP_LATCH)
-        self.TimestampReset = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_TIMESTAMP_RESET)
-        self.TimestampLatchReset = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_TIMESTAMP_LATCH_RESET)
-        self.TimestampLatchValue = IntFeature(self.__dev_handle, GxFeatureID.INT_TIMESTAMP_LATCH_VALUE)
-        self.DevicePHYVersion = StringFeature(self.__dev_handle, GxFeatureID.STRING_DEVICE_PHY_VERSION)
-        self.DeviceTemperatureSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_DEVICE_TEMPERATURE_SELECTOR)
-        self.DeviceTemperature = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_DEVICE_TEMPERATURE)
-        self.DeviceIspFirmwareVersion = StringFeature(self.__dev_handle, GxFeatureID.STRING_DEVICE_ISP_FIRMWARE_VERSION)
-        self.LowPowerMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_LOWPOWER_MODE)
-        self.CloseCCD = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_CLOSE_CCD)
-        self.ProductionCode = StringFeature(self.__dev_handle, GxFeatureID.STRING_PRODUCTION_CODE)
-        self.DeviceOriginalName = StringFeature(self.__dev_handle, GxFeatureID.STRING_DEVICE_ORIGINAL_NAME)
-        self.Revision = IntFeature(self.__dev_handle, GxFeatureID.INT_REVISION)
-        self.VersionsSupported = IntFeature(self.__dev_handle, GxFeatureID.INT_VERSIONS_SUPPORTED)
-        self.VersionUsed = IntFeature(self.__dev_handle, GxFeatureID.INT_VERSION_USED)
-        self.TecEnable = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_TEC_ENABLE)
-        self.TecTargetTemperature = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_TEC_TARGET_TEMPERATURE)
-        self.FanEnable = self.TecEnable = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_FAN_ENABLE)
-        self.TemperatureDetectionStatus = IntFeature(self.__dev_handle, GxFeatureID.INT_TEMPERATURE_DETECTION_STATUS)
-        self.FanSpeed = IntFeature(self.__dev_handle, GxFeatureID.INT_FAN_SPEED)
-        self.DeviceHumidity = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_DEVICE_HUMIDITY)
-        self.DevicePressure = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_DEVICE_PRESSURE)
-        self.AirChangeDetectionStatus = IntFeature(self.__dev_handle, GxFeatureID.INT_AIR_CHANGE_DETECTION_STATUS)
-        self.AirTightnessDetectionStatus = IntFeature(self.__dev_handle, GxFeatureID.INT_AIR_TIGHTNESS_DETECTION_STATUS)
-        self.DeviceScanType = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_DEVICE_SCAN_TYPE)
-
-        # ---------------ImageFormat Section--------------------------------
-        self.SensorWidth = IntFeature(self.__dev_handle, GxFeatureID.INT_SENSOR_WIDTH)
-        self.SensorHeight = IntFeature(self.__dev_handle, GxFeatureID.INT_SENSOR_HEIGHT)
-        self.WidthMax = IntFeature(self.__dev_handle, GxFeatureID.INT_WIDTH_MAX)
-        self.HeightMax = IntFeature(self.__dev_handle, GxFeatureID.INT_HEIGHT_MAX)
-        self.OffsetX = IntFeature(self.__dev_handle, GxFeatureID.INT_OFFSET_X)
-        self.OffsetY = IntFeature(self.__dev_handle, GxFeatureID.INT_OFFSET_Y)
-        self.Width = IntFeature(self.__dev_handle, GxFeatureID.INT_WIDTH)
-        self.Height = IntFeature(self.__dev_handle, GxFeatureID.INT_HEIGHT)
-        self.BinningHorizontal = IntFeature(self.__dev_handle, GxFeatureID.INT_BINNING_HORIZONTAL)
-        self.BinningVertical = IntFeature(self.__dev_handle, GxFeatureID.INT_BINNING_VERTICAL)
-        self.DecimationHorizontal = IntFeature(self.__dev_handle, GxFeatureID.INT_DECIMATION_HORIZONTAL)
-        self.DecimationVertical = IntFeature(self.__dev_handle, GxFeatureID.INT_DECIMATION_VERTICAL)
-        self.PixelSize = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_PIXEL_SIZE)
-        self.PixelColorFilter = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_PIXEL_COLOR_FILTER)
-        self.PixelFormat = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_PIXEL_FORMAT)
-        self.ReverseX = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_REVERSE_X)
-        self.ReverseY = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_REVERSE_Y)
-        self.TestPattern = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_TEST_PATTERN)
-        self.TestPatternGeneratorSelector = EnumFeature(self.__dev_handle,
-                                                        GxFeatureID.ENUM_TEST_PATTERN_GENERATOR_SELECTOR)
-        self.RegionSendMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_REGION_SEND_MODE)
-        self.RegionMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_REGION_MODE)
-        self.RegionSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_REGION_SELECTOR)
-        self.CenterWidth = IntFeature(self.__dev_handle, GxFeatureID.INT_CENTER_WIDTH)
-        self.CenterHeight = IntFeature(self.__dev_handle, GxFeatureID.INT_CENTER_HEIGHT)
-        self.BinningHorizontalMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_BINNING_HORIZONTAL_MODE)
-        self.BinningVerticalMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_BINNING_VERTICAL_MODE)
-        self.SensorShutterMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SENSOR_SHUTTER_MODE)
-        self.DecimationLineNumber = IntFeature(self.__dev_handle, GxFeatureID.INT_DECIMATION_LINENUMBER)
-        self.SensorDecimationHorizontal = IntFeature(self.__dev_handle, GxFeatureID.INT_SENSOR_DECIMATION_HORIZONTAL)
-        self.SensorDecimationVertical = IntFeature(self.__dev_handle, GxFeatureID.INT_SENSOR_DECIMATION_VERTICAL)
-        self.SensorSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SENSOR_SELECTOR)
-        self.CurrentSensorWidth = IntFeature(self.__dev_handle, GxFeatureID.INT_CURRENT_SENSOR_WIDTH)
-        self.CurrentSensorHeight = IntFeature(self.__dev_handle, GxFeatureID.INT_CURRENT_SENSOR_HEIGHT)
-        self.CurrentSensorOffsetX = IntFeature(self.__dev_handle, GxFeatureID.INT_CURRENT_SENSOR_OFFSETX)
-        self.CurrentSensorOffsetY = IntFeature(self.__dev_handle, GxFeatureID.INT_CURRENT_SENSOR_OFFSETY)
-        self.CurrentSensorWidthMax = IntFeature(self.__dev_handle, GxFeatureID.INT_CURRENT_SENSOR_WIDTHMAX)
-        self.CurrectSensorHeightMax = IntFeature(self.__dev_handle, GxFeatureID.INT_CURRENT_SENSOR_HEIGHTMAX)
-        self.SensorBitDepth = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SENSOR_BIT_DEPTH)
-        self.WatermarkEnable = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_WATERMARK_ENABLE)
-
-        # ---------------TransportLayer Section-------------------------------
-        self.PayloadSize = IntFeature(self.__dev_handle, GxFeatureID.INT_PAYLOAD_SIZE)
-        self.GevCurrentIPConfigurationLLA = BoolFeature(self.__dev_handle,
-                                                        GxFeatureID.BOOL_GEV_CURRENT_IP_CONFIGURATION_LLA)
-        self.GevCurrentIPConfigurationDHCP = BoolFeature(self.__dev_handle,
-                                                         GxFeatureID.BOOL_GEV_CURRENT_IP_CONFIGURATION_DHCP)
-        self.GevCurrentIPConfigurationPersistentIP = BoolFeature(self.__dev_handle,
-                                                         GxFeatureID.BOOL_GEV_CURRENT_IP_CONFIGURATION_PERSISTENT_IP)
-        self.EstimatedBandwidth = IntFeature(self.__dev_handle, GxFeatureID.INT_ESTIMATED_BANDWIDTH)
-        self.GevHeartbeatTimeout = IntFeature(self.__dev_handle, GxFeatureID.INT_GEV_HEARTBEAT_TIMEOUT)
-        self.GevSCPSPacketSize = IntFeature(self.__dev_handle, GxFeatureID.INT_GEV_PACKET_SIZE)
-        self.GevSCPD = IntFeature(self.__dev_handle, GxFeatureID.INT_GEV_PACKET_DELAY)
-        self.GevLinkSpeed = IntFeature(self.__dev_handle, GxFeatureID.INT_GEV_LINK_SPEED)
-        self.DeviceTapGeometry = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_DEVICE_TAP_GEOMETRY)
-
-        # ---------------AcquisitionTrigger Section---------------------------
-        self.AcquisitionMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_ACQUISITION_MODE)
-        self.AcquisitionStart = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_ACQUISITION_START)
-        self.AcquisitionStop = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_ACQUISITION_STOP)
-        self.TriggerMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_TRIGGER_MODE)
-        self.TriggerSoftware = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_TRIGGER_SOFTWARE)
-        self.TriggerActivation = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_TRIGGER_ACTIVATION)
-        self.ExposureTime = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_EXPOSURE_TIME)
-        self.ExposureAuto = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_EXPOSURE_AUTO)
-        self.TriggerFilterRaisingEdge = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_TRIGGER_FILTER_RAISING)
-        self.TriggerFilterFallingEdge = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_TRIGGER_FILTER_FALLING)
-        self.TriggerSource = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_TRIGGER_SOURCE)
-        self.ExposureMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_EXPOSURE_MODE)
-        self.TriggerSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_TRIGGER_SELECTOR)
-        self.TriggerDelay = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_TRIGGER_DELAY)
-        self.TransferControlMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_TRANSFER_CONTROL_MODE)
-        self.TransferOperationMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_TRANSFER_OPERATION_MODE)
-        self.TransferStart = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_TRANSFER_START)
-        self.TransferBlockCount = IntFeature(self.__dev_handle, GxFeatureID.INT_TRANSFER_BLOCK_COUNT)
-        self.FrameBufferOverwriteActive = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_FRAMESTORE_COVER_ACTIVE)
-        self.AcquisitionFrameRateMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_ACQUISITION_FRAME_RATE_MODE)
-        self.AcquisitionFrameRate = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_ACQUISITION_FRAME_RATE)
-        self.CurrentAcquisitionFrameRate = FloatFeature(self.__dev_handle,
-                                                        GxFeatureID.FLOAT_CURRENT_ACQUISITION_FRAME_RATE)
-        self.FixedPatternNoiseCorrectMode = EnumFeature(self.__dev_handle,
-                                                        GxFeatureID.ENUM_FIXED_PATTERN_NOISE_CORRECT_MODE)
-        self.AcquisitionBurstFrameCount = IntFeature(self.__dev_handle, GxFeatureID.INT_ACQUISITION_BURST_FRAME_COUNT)
-        self.AcquisitionStatusSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_ACQUISITION_STATUS_SELECTOR)
-        self.AcquisitionStatus = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_ACQUISITION_STATUS)
-        self.ExposureDelay = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_EXPOSURE_DELAY)
-        self.ExposureOverlapTimeMax = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_EXPOSURE_OVERLAP_TIME_MAX)
-        self.ExposureTimeMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_EXPOSURE_TIME_MODE)
-        self.FrameBufferCount = IntFeature(self.__dev_handle, GxFeatureID.INT_FRAME_BUFFER_COUNT)
-        self.FrameBufferFlush = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_FRAME_BUFFER_FLUSH)
-        self.AcquisitionBurstMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_ACQUISITION_BURST_MODE)
-        self.OverlapMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_OVERLAP_MODE)
-        self.MultiSourceSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_MULTISOURCE_SELECTOR)
-        self.MultiSourceEnable = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_MULTISOURCE_ENABLE)
-        self.TriggerCacheEnable = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_TRIGGER_CACHE_ENABLE)
-
-        # ----------------DigitalIO Section----------------------------------
-        self.UserOutputSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_USER_OUTPUT_SELECTOR)
-        self.UserOutputValue = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_USER_OUTPUT_VALUE)
-        self.LineSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_LINE_SELECTOR)
-        self.LineMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_LINE_MODE)
-        self.LineInverter = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_LINE_INVERTER)
-        self.LineSource = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_LINE_SOURCE)
-        self.LineStatus = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_LINE_STATUS)
-        self.LineStatusAll = IntFeature(self.__dev_handle, GxFeatureID.INT_LINE_STATUS_ALL)
-        self.PulseWidth = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_PULSE_WIDTH)
-        self.LineRange = IntFeature(self.__dev_handle, GxFeatureID.INT_LINE_RANGE)
-        self.LineDelay = IntFeature(self.__dev_handle, GxFeatureID.INT_LINE_DELAY)
-        self.LineFilterRaisingEdge = IntFeature(self.__dev_handle, GxFeatureID.INT_LINE_FILTER_RAISING_EDGE)
-        self.LineFilterFallingEdge = IntFeature(self.__dev_handle, GxFeatureID.INT_LINE_FILTER_FALLING_EDGE)
-
-        # ----------------AnalogControls Section----------------------------
-        self.GainAuto = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_GAIN_AUTO)
-        self.GainSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_GAIN_SELECTOR)
-        self.BlackLevelAuto = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_BLACK_LEVEL_AUTO)
-        self.BlackLevelSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_BLACK_LEVEL_SELECTOR)
-        self.BalanceWhiteAuto = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_BALANCE_WHITE_AUTO)
-        self.BalanceRatioSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_BALANCE_RATIO_SELECTOR)
-        self.BalanceRatio = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_BALANCE_RATIO)
-        self.DeadPixelCorrect = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_DEAD_PIXEL_CORRECT)
-        self.Gain = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_GAIN)
-        self.BlackLevel = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_BLACK_LEVEL)
-        self.GammaEnable = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_GAMMA_ENABLE)
-        self.GammaMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_GAMMA_MODE)
-        self.Gamma = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_GAMMA)
-        self.DigitalShift = IntFeature(self.__dev_handle, GxFeatureID.INT_DIGITAL_SHIFT)
-        self.LightSourcePreset = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_LIGHT_SOURCE_PRESET)
-        self.BlackLevelCalibStatus = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_BLACKLEVEL_CALIB_STATUS)
-        self.BlackLevelCalibValue = IntFeature(self.__dev_handle, GxFeatureID.INT_BLACKLEVEL_CALIB_VALUE)
-        self.PGAGain = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_PGA_GAIN)
-
-        # ---------------CustomFeature Section------------------------------
-        self.ExpectedGrayValue = IntFeature(self.__dev_handle, GxFeatureID.INT_GRAY_VALUE)
-        self.AAROIOffsetX = IntFeature(self.__dev_handle, GxFeatureID.INT_AAROI_OFFSETX)
-        self.AAROIOffsetY = IntFeature(self.__dev_handle, GxFeatureID.INT_AAROI_OFFSETY)
-        self.AAROIWidth = IntFeature(self.__dev_handle, GxFeatureID.INT_AAROI_WIDTH)
-        self.AAROIHeight = IntFeature(self.__dev_handle, GxFeatureID.INT_AAROI_HEIGHT)
-        self.AutoGainMin = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_AUTO_GAIN_MIN)
-        self.AutoGainMax = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_AUTO_GAIN_MAX)
-        self.AutoExposureTimeMin = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_AUTO_EXPOSURE_TIME_MIN)
-        self.AutoExposureTimeMax = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_AUTO_EXPOSURE_TIME_MAX)
-        self.ContrastParam = IntFeature(self.__dev_handle, GxFeatureID.INT_CONTRAST_PARAM)
-        self.GammaParam = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_GAMMA_PARAM)
-        self.ColorCorrectionParam = IntFeature(self.__dev_handle, GxFeatureID.INT_COLOR_CORRECTION_PARAM)
-        self.AWBLampHouse = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_AWB_LAMP_HOUSE)
-        self.AWBROIOffsetX = IntFeature(self.__dev_handle, GxFeatureID.INT_AWBROI_OFFSETX)
-        self.AWBROIOffsetY = IntFeature(self.__dev_handle, GxFeatureID.INT_AWBROI_OFFSETY)
-        self.AWBROIWidth = IntFeature(self.__dev_handle, GxFeatureID.INT_AWBROI_WIDTH)
-        self.AWBROIHeight = IntFeature(self.__dev_handle, GxFeatureID.INT_AWBROI_HEIGHT)
-        self.SharpnessMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SHARPNESS_MODE)
-        self.Sharpness = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_SHARPNESS)
-        self.DataFieldSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_USER_DATA_FIELD_SELECTOR)
-        self.DataFieldValue = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_USER_DATA_FIELD_VALUE)
-        self.FlatFieldCorrection = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_FLAT_FIELD_CORRECTION)
-        self.NoiseReductionMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_NOISE_REDUCTION_MODE)
-        self.NoiseReduction = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_NOISE_REDUCTION)
-        self.FFCLoad = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_FFCLOAD)
-        self.FFCSave = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_FFCSAVE)
-        self.StaticDefectCorrection = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_STATIC_DEFECT_CORRECTION)
-        self.NoiseReductionMode2D = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_2D_NOISE_REDUCTION_MODE)
-        self.NoiseReductionMode3D = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_3D_NOISE_REDUCTION_MODE)
-        self.CloseISP = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_CLOSE_ISP)
-        self.StaticDefectCorrectionValueAll = BufferFeature(self.__dev_handle,
-                                                            GxFeatureID.BUFFER_STATIC_DEFECT_CORRECTION_VALUE_ALL)
-        self.StaticDefectCorrectionFlashValue = BufferFeature(self.__dev_handle,
-                                                              GxFeatureID.BUFFER_STATIC_DEFECT_CORRECTION_FLASH_VALUE)
-        self.StaticDefectCorrectionFinish = IntFeature(self.__dev_handle,
-                                                       GxFeatureID.INT_STATIC_DEFECT_CORRECTION_FINISH)
-        self.StaticDefectCorrectionInfo = BufferFeature(self.__dev_handle,
-                                                        GxFeatureID.BUFFER_STATIC_DEFECT_CORRECTION_INFO)
-        self.StripCalibrationStart = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_STRIP_CALIBRATION_START)
-        self.StripCalibrationStop = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_STRIP_CALIBRATION_STOP)
-        self.UserDataFiledValueAll = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_USER_DATA_FILED_VALUE_ALL)
-        self.ShadingCorrectionMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SHADING_CORRECTION_MODE)
-        self.FFCGenerate = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_FFC_GENERATE)
-        self.FFCGenerateStatus = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_FFC_GENERATE_STATUS)
-        self.FFCExpectedGrayValueEnable = EnumFeature(self.__dev_handle,
-                                                      GxFeatureID.ENUM_FFC_EXPECTED_GRAY_VALUE_ENABLE)
-        self.FFCExpectedGray = IntFeature(self.__dev_handle, GxFeatureID.INT_FFC_EXPECTED_GRAY)
-        self.FFCCoeffinientsSize = IntFeature(self.__dev_handle, GxFeatureID.INT_FFC_COEFFICIENTS_SIZE)
-        self.FFCValueAll = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_FFC_VALUE_ALL)
-        self.DSNUSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_DSNU_SELECTOR)
-        self.DSNUGenerate = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_DSNU_GENERATE)
-        self.DSNUGenerateStatus = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_DSNU_GENERATE_STATUS)
-        self.DSNUSave = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_DSNU_SAVE)
-        self.DSNULoad = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_DSNU_LOAD)
-        self.PRNUSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_PRNU_SELECTOR)
-        self.PRNUGenerate = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_PRNU_GENERATE)
-        self.PRNUGenerateStatus = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_PRNU_GENERATE_STATUS)
-        self.PRNUSave = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_PRNU_SAVE)
-        self.PRNULoad = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_PRNU_LOAD)
-        self.DataFieldValueAll = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_USER_DATA_FILED_VALUE_ALL)
-        self.StaticDefectCorrectionCalibStatus = IntFeature(self.__dev_handle,
-                                                            GxFeatureID.INT_STATIC_DEFECT_CORRECTION_CALIB_STATUS)
-        self.FFCFactoryStatus = IntFeature(self.__dev_handle, GxFeatureID.INT_FFC_FACTORY_STATUS)
-        self.DSNUFactoryStatus = IntFeature(self.__dev_handle, GxFeatureID.INT_DSNU_FACTORY_STATUS)
-        self.PRNUFactoryStatus = IntFeature(self.__dev_handle, GxFeatureID.INT_PRNU_FACTORY_STATUS)
-        self.Detect = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_DETECT)
-        self.FFCCoefficient = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_FFC_COEFFICIENT)
-        self.FFCFlashLoad = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_FFCFLASH_LOAD)
-        self.FFCFlashSave = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_FFCFLASH_SAVE)
-
-        # ---------------UserSetControl Section-------------------------------
-        self.UserSetSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_USER_SET_SELECTOR)
-        self.UserSetLoad = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_USER_SET_LOAD)
-        self.UserSetSave = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_USER_SET_SAVE)
-        self.UserSetDefault = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_USER_SET_DEFAULT)
-        self.DataFieldValueAllUsedStatus = IntFeature(self.__dev_handle,
-                                                      GxFeatureID.INT_DATA_FIELD_VALUE_ALL_USED_STATUS)
-
-        # ---------------Event Section----------------------------------------
-        self.EventSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_EVENT_SELECTOR)
-        self.EventNotification = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_EVENT_NOTIFICATION)
-        self.EventExposureEnd = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_EXPOSURE_END)
-        self.EventExposureEndTimestamp = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_EXPOSURE_END_TIMESTAMP)
-        self.EventExposureEndFrameID = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_EXPOSURE_END_FRAME_ID)
-        self.EventBlockDiscard = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_BLOCK_DISCARD)
-        self.EventBlockDiscardTimestamp = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_BLOCK_DISCARD_TIMESTAMP)
-        self.EventOverrun = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_OVERRUN)
-        self.EventOverrunTimestamp = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_OVERRUN_TIMESTAMP)
-        self.EventFrameStartOvertrigger = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_FRAME_START_OVER_TRIGGER)
-        self.EventFrameStartOvertriggerTimestamp = IntFeature(self.__dev_handle,
-                                                              GxFeatureID.INT_EVENT_FRAME_START_OVER_TRIGGER_TIMESTAMP)
-        self.EventBlockNotEmpty = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_BLOCK_NOT_EMPTY)
-        self.EventBlockNotEmptyTimestamp = IntFeature(self.__dev_handle,
-                                                      GxFeatureID.INT_EVENT_BLOCK_NOT_EMPTY_TIMESTAMP)
-        self.EventInternalError = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_INTERNAL_ERROR)
-        self.EventInternalErrorTimestamp = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_INTERNAL_ERROR_TIMESTAMP)
-        self.EventFrameBurstStartOvertrigger = IntFeature(self.__dev_handle,
-                                                          GxFeatureID.INT_EVENT_FRAMEBURSTSTART_OVERTRIGGER)
-        self.EventFrameBurstStartOvertriggerFrameID = IntFeature(self.__dev_handle,
-                                                                 GxFeatureID.INT_EVENT_FRAMEBURSTSTART_OVERTRIGGER_FRAMEID)
-        self.EventFrameBurstStartOvertriggerTimestamp = IntFeature(self.__dev_handle,
-                                                                   GxFeatureID.INT_EVENT_FRAMEBURSTSTART_OVERTRIGGER_TIMESTAMP)
-        self.EventFrameStartWait = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_FRAMESTART_WAIT)
-        self.EventFrameStartWaitTimestamp = IntFeature(self.__dev_handle,
-                                                       GxFeatureID.INT_EVENT_FRAMESTART_WAIT_TIMESTAMP)
-        self.EventFrameBurstStartWait = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_FRAMEBURSTSTART_WAIT)
-        self.EventFrameBurstStartWaitTimestamp = IntFeature(self.__dev_handle,
-                                                            GxFeatureID.INT_EVENT_FRAMEBURSTSTART_WAIT_TIMESTAMP)
-        self.EventBlockDiscardFrameID = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_BLOCK_DISCARD_FRAMEID)
-        self.EventFrameStartOvertriggerFrameID = IntFeature(self.__dev_handle,
-                                                            GxFeatureID.INT_EVENT_FRAMESTART_OVERTRIGGER_FRAMEID)
-        self.EventBlockNotEmptyFrameID = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_BLOCK_NOT_EMPTY_FRAMEID)
-        self.EventFrameStartWaitFrameID = IntFeature(self.__dev_handle, GxFeatureID.INT_EVENT_FRAMESTART_WAIT_FRAMEID)
-        self.EventFrameBurstStartWaitFrameID = IntFeature(self.__dev_handle,
-                                                          GxFeatureID.INT_EVENT_FRAMEBURSTSTART_WAIT_FRAMEID)
-        self.EventSimpleMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_EVENT_SIMPLE_MODE)
-
-        # ---------------LUT Section------------------------------------------
-        self.LUTSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_LUT_SELECTOR)
-        self.LUTValueAll = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_LUT_VALUE_ALL)
-        self.LUTEnable = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_LUT_ENABLE)
-        self.LUTIndex = IntFeature(self.__dev_handle, GxFeatureID.INT_LUT_INDEX)
-        self.LUTValue = IntFeature(self.__dev_handle, GxFeatureID.INT_LUT_VALUE)
-        self.LUTFactoryStatus = IntFeature(self.__dev_handle, GxFeatureID.INT_LUT_FACTORY_STATUS)
-
-        # ---------------ChunkData Section------------------------------------
-        self.ChunkModeActive = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_CHUNK_MODE_ACTIVE)
-        self.ChunkSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_CHUNK_SELECTOR)
-        self.ChunkEnable = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_CHUNK_ENABLE)
-
-        # ---------------Color Transformation Control-------------------------
-        self.ColorTransformationMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_COLOR_TRANSFORMATION_MODE)
-        self.ColorTransformationEnable = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_COLOR_TRANSFORMATION_ENABLE)
-        self.ColorTransformationValueSelector = EnumFeature(self.__dev_handle,
-                                                            GxFeatureID.ENUM_COLOR_TRANSFORMATION_VALUE_SELECTOR)
-        self.ColorTransformationValue = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_COLOR_TRANSFORMATION_VALUE)
-        self.SaturationMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SATURATION_MODE)
-        self.Saturation = IntFeature(self.__dev_handle, GxFeatureID.INT_SATURATION)
-
-        # ---------------CounterAndTimerControl Section-----------------------
-        self.TimerSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_TIMER_SELECTOR)
-        self.TimerDuration = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_TIMER_DURATION)
-        self.TimerDelay = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_TIMER_DELAY)
-        self.TimerTriggerSource = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_TIMER_TRIGGER_SOURCE)
-        self.CounterSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_COUNTER_SELECTOR)
-        self.CounterEventSource = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_COUNTER_EVENT_SOURCE)
-        self.CounterResetSource = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_COUNTER_RESET_SOURCE)
-        self.CounterResetActivation = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_COUNTER_RESET_ACTIVATION)
-        self.CounterReset = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_COUNTER_RESET)
-        self.CounterTriggerSource = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_COUNTER_TRIGGER_SOURCE)
-        self.CounterDuration = IntFeature(self.__dev_handle, GxFeatureID.INT_COUNTER_DURATION)
-        self.TimerTriggerActivation = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_TIMER_TRIGGER_ACTIVATION)
-        self.CounterValue = IntFeature(self.__dev_handle, GxFeatureID.INT_COUNTER_VALUE)
-
-        # ---------------RemoveParameterLimitControl Section------------------
-        self.RemoveParameterLimit = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_REMOVE_PARAMETER_LIMIT)
-
-        # ---------------HDRControl Section------------------
-        self.HDRMode = EnumFeature(self.__dev_handle,GxFeatureID.ENUM_HDR_MODE)
-        self.HDRTargetLongValue = IntFeature(self.__dev_handle, GxFeatureID.INT_HDR_TARGET_LONG_VALUE)
-        self.HDRTargetShortValue = IntFeature(self.__dev_handle, GxFeatureID.INT_HDR_TARGET_SHORT_VALUE)
-        self.HDRTargetMainValue = IntFeature(self.__dev_handle, GxFeatureID.INT_HDR_TARGET_MAIN_VALUE)
-
-        # ---------------MultiGrayControl Section------------------
-        self.MGCMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_MGC_MODE)
-        self.MGCSelector = IntFeature(self.__dev_handle, GxFeatureID.INT_MGC_SELECTOR)
-        self.MGCExposureTime = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_MGC_EXPOSURE_TIME)
-        self.MGCGain = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_MGC_GAIN)
-
-        # ---------------ImageQualityControl Section------------------
-        self.StripedCalibrationInfo = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_STRIPED_CALIBRATION_INFO)
-        self.Contrast = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_CONTRAST)
-        self.HotPixelCorrection = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_HOTPIXEL_CORRECTION)
-
-        # ---------------GyroControl Section------------------
-        self.IMUData = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_IMU_DATA)
-        self.IMUConfigAccRange = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_IMU_CONFIG_ACC_RANGE)
-        self.IMUConfigAccOdrLowPassFilterSwitch = EnumFeature(self.__dev_handle,
-                                                        GxFeatureID.ENUM_IMU_CONFIG_ACC_ODR_LOW_PASS_FILTER_SWITCH)
-        self.IMUConfigAccOdr = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_IMU_CONFIG_ACC_ODR)
-        self.IMUConfigAccOdrLowPassFilterFrequency = EnumFeature(self.__dev_handle,
-                                                        GxFeatureID.ENUM_IMU_CONFIG_ACC_ODR_LOW_PASS_FILTER_FREQUENCY)
-        self.IMUConfigGyroXRange = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_IMU_CONFIG_GYRO_XRANGE)
-        self.IMUConfigGyroYRange = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_IMU_CONFIG_GYRO_YRANGE)
-        self.IMUConfigGyroZRange = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_IMU_CONFIG_GYRO_ZRANGE)
-        self.IMUConfigGyroOdrLowPassFilterSwitch = EnumFeature(self.__dev_handle,
-                                                        GxFeatureID.ENUM_IMU_CONFIG_GYRO_ODR_LOW_PASS_FILTER_SWITCH)
-        self.IMUConfigGyroOdr = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_IMU_CONFIG_GYRO_ODR)
-        self.IMUConfigGyroOdrLowPassFilterFrequency = EnumFeature(self.__dev_handle,
-                                                        GxFeatureID.ENUM_IMU_CONFIG_GYRO_ODR_LOW_PASS_FILTER_FREQUENCY)
-        self.IMURoomTemperature = FloatFeature(self.__dev_handle, GxFeatureID.FLOAT_IMU_ROOM_TEMPERATURE)
-        self.IMUTemperatureOdr = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_IMU_TEMPERATURE_ODR)
-
-        # ---------------FrameBufferControl Section------------------
-        self.FrameBufferCount = IntFeature(self.__dev_handle, GxFeatureID.INT_FRAME_BUFFER_COUNT)
-        self.FrameBufferFlush = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_FRAME_BUFFER_FLUSH)
-
-        # ---------------SerialPortControl Section------------------
-        self.DeviceSerialPortSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SERIALPORT_SELECTOR)
-        self.SerialPortSource = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SERIALPORT_SOURCE)
-        self.DeviceSerialPortBaudRate = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SERIALPORT_BAUDRATE)
-        self.SerialPortDataBits = IntFeature(self.__dev_handle, GxFeatureID.INT_SERIALPORT_DATA_BITS)
-        self.SerialPortStopBits = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SERIALPORT_STOP_BITS)
-        self.SerialPortParity = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SERIALPORT_PARITY)
-        self.TransmitQueueMaxCharacterCount = IntFeature(self.__dev_handle,
-                                                         GxFeatureID.INT_TRANSMIT_QUEUE_MAX_CHARACTER_COUNT)
-        self.TransmitQueueCurrentCharacterCount = IntFeature(self.__dev_handle,
-                                                             GxFeatureID.INT_TRANSMIT_QUEUE_CURRENT_CHARACTER_COUNT)
-        self.ReceiveQueueMaxCharacterCount = IntFeature(self.__dev_handle,
-                                                        GxFeatureID.INT_RECEIVE_QUEUE_MAX_CHARACTER_COUNT)
-        self.ReceiveQueueCurrentCharacterCount = IntFeature(self.__dev_handle,
-                                                            GxFeatureID.INT_RECEIVE_QUEUE_CURRENT_CHARACTER_COUNT)
-        self.ReceiveFramingErrorCount = IntFeature(self.__dev_handle, GxFeatureID.INT_RECEIVE_FRAMING_ERROR_COUNT)
-        self.ReceiveParityErrorCount = IntFeature(self.__dev_handle, GxFeatureID.INT_RECEIVE_PARITY_ERROR_COUNT)
-        self.ReceiveQueueClear = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_RECEIVE_QUEUE_CLEAR)
-        self.SerialPortData = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_SERIALPORT_DATA)
-        self.SerialPortDataLength = IntFeature(self.__dev_handle, GxFeatureID.INT_SERIALPORT_DATA_LENGTH)
-        self.SerialPortDetectionStatus = IntFeature(self.__dev_handle, GxFeatureID.INT_SERIAL_PORT_DETECTION_STATUS)
-
-        # ---------------CoaXPress Section------------------
-        self.CxpLinkConfiguration = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_CXP_LINK_CONFIGURATION)
-        self.CxpLinkConfigurationPreferred = EnumFeature(self.__dev_handle,
-                                                         GxFeatureID.ENUM_CXP_LINK_CONFIGURATION_PREFERRED)
-        self.CxpLinkConfigurationStatus = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_CXP_LINK_CONFIGURATION_STATUS)
-        self.Image1StreamID = IntFeature(self.__dev_handle, GxFeatureID.INT_IMAGE1_STREAM_ID)
-        self.CxpConnectionSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_CXP_CONNECTION_SELECTOR)
-        self.CxpConnectionTestMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_CXP_CONNECTION_TEST_MODE)
-        self.CxpConnectionTestErrorCount = IntFeature(self.__dev_handle, GxFeatureID.INT_RECEIVE_FRAMING_ERROR_COUNT)
-        self.CxpConnectionTestPacketRxCount = IntFeature(self.__dev_handle, GxFeatureID.INT_RECEIVE_FRAMING_ERROR_COUNT)
-        self.CxpConnectionTestPacketTxCount = IntFeature(self.__dev_handle, GxFeatureID.INT_RECEIVE_FRAMING_ERROR_COUNT)
-
-        # ---------------SequencerControl Section------------------
-        self.SequencerMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SEQUENCER_MODE)
-        self.SequencerConfigurationMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SEQUENCER_CONFIGURATION_MODE)
-        self.SequencerFeatureSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SEQUENCER_FEATURE_SELECTOR)
-        self.SequencerFeatureEnable = BoolFeature(self.__dev_handle, GxFeatureID.BOOL_SEQUENCER_FEATURE_ENABLE)
-        self.SequencerSetSelector = IntFeature(self.__dev_handle, GxFeatureID.INT_SEQUENCER_SET_SELECTOR)
-        self.SequencerSetCount = IntFeature(self.__dev_handle, GxFeatureID.INT_SEQUENCER_SET_COUNT)
-        self.SequencerSetActive = IntFeature(self.__dev_handle, GxFeatureID.INT_SEQUENCER_SET_ACTIVE)
-        self.SequencerSetReset = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_SEQUENCER_SET_RESET)
-        self.SequencerPathSelector = IntFeature(self.__dev_handle, GxFeatureID.INT_SEQUENCER_PATH_SELECTOR)
-        self.SequencerSetNext = IntFeature(self.__dev_handle, GxFeatureID.INT_SEQUENCER_SET_NEXT)
-        self.SequencerTriggerSource = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_SEQUENCER_TRIGGER_SOURCE)
-        self.SequencerSetSave = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_SEQUENCER_SET_SAVE)
-        self.SequencerSetLoad = CommandFeature(self.__dev_handle, GxFeatureID.COMMAND_SEQUENCER_SET_LOAD)
-
-        # ---------------EnoderControl Section------------------
-        self.EncoderSelector = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_ENCODER_SELECTOR)
-        self.EncoderDirection = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_ENCODER_DIRECTION)
-        self.EncoderValue = IntFeature(self.__dev_handle, GxFeatureID.INT_ENCODER_VALUE)
-        self.EncoderSourceA = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_ENCODER_SOURCEA)
-        self.EncoderSourceB = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_ENCODER_SOURCEB)
-        self.EncoderMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_ENCODER_MODE)
+        # The features of the device, local device and stream handles share one cache
+        self.__feature_cache = FeatureCache()
+        FeatureCacheManager.attach(self.__dev_handle, self.__feature_cache)
+
         self.__get_stream_handle()
 
+    def _get_feature_handle(self):
+        """
+        :brief      Handle the features of the device are built with, see LazyFeature
+        :return:    Device handle
+        """
+        return self.__dev_handle
+
     def __get_stream_handle(self):
         """
         :brief      Get stream handle and create stream object
@@ -487,6 +478,7 @@ class Device:
             status, stream_handle = gx_get_data_stream_handle_from_device(self.__dev_handle, index + 1)
             StatusProcessor.process(status, 'Device', '__get_stream_handle')
 
+            FeatureCacheManager.attach(stream_handle, self.__feature_cache)
             self.data_stream.append(DataStream( self.__dev_handle, stream_handle))
 
     def get_stream_channel_num(self):
@@ -511,6 +503,7 @@ class Device:
         :return:    None
         """
         status = gx_close_device(self.__dev_handle)
+        FeatureCacheManager.release(self.__feature_cache)
         StatusProcessor.process(status, 'Device', 'close_device')
         self.__dev_handle = None
         self.__py_offline_callback = None
@@ -518,6 +511,13 @@ class Device:
         self.__py_feature_callback = None
         self.__py_feature_callback_char = None
 
+    def get_feature_cache(self):
+        """
+        :brief      Get the feature cache of the device, to read its hit/miss counters or disable it
+        :return:    FeatureCache
+        """
+        return self.__feature_cache
+
     def get_stream_number(self):
         """
         :brief      Get the number of stream channels supported by the current device.
@@ -554,6 +554,7 @@ class Device:
         """
         status, local_handle = gx_local_device_handle_from_device( self.__dev_handle)
         StatusProcessor.process(status, 'Device', 'register_device_offline_callback')
+        FeatureCacheManager.attach(local_handle, self.__feature_cache)
         feature_control = FeatureControl( local_handle)
         return  feature_control
 
@@ -601,6 +602,7 @@ class Device:
                     Interface is obsolete.
         :return:    none
         """
+        self.__feature_cache.invalidate()
         self.__py_offline_callback()
 
 
@@ -614,6 +616,7 @@ class Device:
         payload_size = self.data_stream[0].get_payload_size()
         self.data_stream[0].set_payload_size(payload_size)
         status = gx_send_command(self.__dev_handle, GxFeatureID.COMMAND_ACQUISITION_START)
+        self.__feature_cache.invalidate()
         StatusProcessor.process(status, 'Device', 'stream_on')
         self.data_stream[0].set_acquisition_flag(True)
 
@@ -623,7 +626,14 @@ class Device:
                     Interface is obsolete.
         :return:    none
         """
-        status = gx_send_command(self.__dev_handle, GxFeatureID.COMMAND_ACQUISITION_STOP)
+        # the stop command waits for the capture callback, a callback waiting for room in
+        # DataStream.frames gives up its frame once stopping is set
+        self.data_stream[0].stopping = True
+        try:
+            status = gx_send_command(self.__dev_handle, GxFeatureID.COMMAND_ACQUISITION_STOP)
+        finally:
+            self.data_stream[0].stopping = False
+        self.__feature_cache.invalidate()
         StatusProcessor.process(status, 'Device', 'stream_off')
         self.data_stream[0].set_acquisition_flag(False)
 
@@ -659,6 +669,7 @@ class Device:
                                      "Expected verify type is bool, not %s" % type(verify))
 
         status = gx_import_config_file(self.__dev_handle, file_path, verify)
+        self.__feature_cache.invalidate()
         StatusProcessor.process(status, 'Device', 'import_config_file')
 
     def register_device_feature_callback(self, callback_func, feature_id, args):
@@ -740,6 +751,8 @@ class Device:
         :brief      Device feature event callback function with an unused c_void_p.
         :return:    none
         """
+        # the device changed a value behind the cache
+        self.__feature_cache.invalidate()
         self.__py_feature_callback(c_feature_id, c_user_param)
 
     def __on_device_feature_callback_char(self, c_feature_name, c_user_param):
@@ -747,6 +760,7 @@ class Device:
         :brief      Device feature event callback function with an unused c_void_p.
         :return:    none
         """
+        self.__feature_cache.invalidate()
         self.__py_feature_callback_char(c_feature_name, c_user_param)
 
     def read_remote_device_port(self, address, buff, size):
@@ -783,6 +797,7 @@ class Device:
                                      "Expected address type is int, not %s" % type(address))
 
         status, r_size = gx_write_remote_device_port(self.__dev_handle, address, buf, size)
+        self.__feature_cache.invalidate()
         StatusProcessor.process(status, 'Device', 'write_remote_device_port')
 
     def read_remote_device_port_stacked(self, entries, size):
@@ -816,6 +831,7 @@ class Device:
                                      "Expected size type is int, not %s" % type(size))
 
         status = gx_set_write_remote_device_port_stacked(self.__dev_handle, entries, size)
+        self.__feature_cache.invalidate()
         StatusProcessor.process(status, 'Device', 'set_write_remote_device_port_stacked')
 
     def create_image_process_config(self):
@@ -856,22 +872,21 @@ class Device:
 
 
 class GEVDevice(Device):
+    GevCurrentIPConfigurationLLA = LazyFeature("GevCurrentIPConfigurationLLA", BoolFeature, GxFeatureID.BOOL_GEV_CURRENT_IP_CONFIGURATION_LLA)
+    GevCurrentIPConfigurationDHCP = LazyFeature("GevCurrentIPConfigurationDHCP", BoolFeature, GxFeatureID.BOOL_GEV_CURRENT_IP_CONFIGURATION_DHCP)
+    GevCurrentIPConfigurationPersistentIP = LazyFeature("GevCurrentIPConfigurationPersistentIP", BoolFeature,
+                                                        GxFeatureID.BOOL_GEV_CURRENT_IP_CONFIGURATION_PERSISTENT_IP)
+    EstimatedBandwidth = LazyFeature("EstimatedBandwidth", IntFeature, GxFeatureID.INT_ESTIMATED_BANDWIDTH)
+    GevHeartbeatTimeout = LazyFeature("GevHeartbeatTimeout", IntFeature, GxFeatureID.INT_GEV_HEARTBEAT_TIMEOUT)
+    GevSCPSPacketSize = LazyFeature("GevSCPSPacketSize", IntFeature, GxFeatureID.INT_GEV_PACKET_SIZE)
+    GevSCPD = LazyFeature("GevSCPD", IntFeature, GxFeatureID.INT_GEV_PACKET_DELAY)
+    GevLinkSpeed = LazyFeature("GevLinkSpeed", IntFeature, GxFeatureID.INT_GEV_LINK_SPEED)
+    DeviceCommandTimeout = LazyFeature("DeviceCommandTimeout", IntFeature, GxFeatureID.INT_COMMAND_TIMEOUT)
+    DeviceCommandRetryCount = LazyFeature("DeviceCommandRetryCount", IntFeature, GxFeatureID.INT_COMMAND_RETRY_COUNT)
+
     def __init__(self, handle, interface_obj):
         self.__dev_handle = handle
         Device.__init__(self, self.__dev_handle, interface_obj)
-        self.GevCurrentIPConfigurationLLA = BoolFeature(self.__dev_handle,
-                                                        GxFeatureID.BOOL_GEV_CURRENT_IP_CONFIGURATION_LLA)
-        self.GevCurrentIPConfigurationDHCP = BoolFeature(self.__dev_handle,
-                                                         GxFeatureID.BOOL_GEV_CURRENT_IP_CONFIGURATION_DHCP)
-        self.GevCurrentIPConfigurationPersistentIP = BoolFeature(self.__dev_handle,
-                                                                 GxFeatureID.BOOL_GEV_CURRENT_IP_CONFIGURATION_PERSISTENT_IP)
-        self.EstimatedBandwidth = IntFeature(self.__dev_handle, GxFeatureID.INT_ESTIMATED_BANDWIDTH)
-        self.GevHeartbeatTimeout = IntFeature(self.__dev_handle, GxFeatureID.INT_GEV_HEARTBEAT_TIMEOUT)
-        self.GevSCPSPacketSize = IntFeature(self.__dev_handle, GxFeatureID.INT_GEV_PACKET_SIZE)
-        self.GevSCPD = IntFeature(self.__dev_handle, GxFeatureID.INT_GEV_PACKET_DELAY)
-        self.GevLinkSpeed = IntFeature(self.__dev_handle, GxFeatureID.INT_GEV_LINK_SPEED)
-        self.DeviceCommandTimeout = IntFeature(self.__dev_handle, GxFeatureID.INT_COMMAND_TIMEOUT)
-        self.DeviceCommandRetryCount = IntFeature(self.__dev_handle, GxFeatureID.INT_COMMAND_RETRY_COUNT)
 
 class U3VDevice(Device):
     """
@@ -889,22 +904,23 @@ class U2Device(Device):
     The U2Device class inherits from the Device class
     """
 
+    AcquisitionSpeedLevel = LazyFeature("AcquisitionSpeedLevel", IntFeature, GxFeatureID.INT_ACQUISITION_SPEED_LEVEL)
+    AcquisitionFrameCount = LazyFeature("AcquisitionFrameCount", IntFeature, GxFeatureID.INT_ACQUISITION_FRAME_COUNT)
+    TriggerSwitch = LazyFeature("TriggerSwitch", EnumFeature, GxFeatureID.ENUM_TRIGGER_SWITCH)
+    UserOutputMode = LazyFeature("UserOutputMode", EnumFeature, GxFeatureID.ENUM_USER_OUTPUT_MODE)
+    StrobeSwitch = LazyFeature("StrobeSwitch", EnumFeature, GxFeatureID.ENUM_STROBE_SWITCH)
+    ADCLevel = LazyFeature("ADCLevel", IntFeature, GxFeatureID.INT_ADC_LEVEL)
+    HBlanking = LazyFeature("HBlanking", IntFeature, GxFeatureID.INT_H_BLANKING)
+    VBlanking = LazyFeature("VBlanking", IntFeature, GxFeatureID.INT_V_BLANKING)
+    UserPassword = LazyFeature("UserPassword", StringFeature, GxFeatureID.STRING_USER_PASSWORD)
+    VerifyPassword = LazyFeature("VerifyPassword", StringFeature, GxFeatureID.STRING_VERIFY_PASSWORD)
+    UserData = LazyFeature("UserData", BufferFeature, GxFeatureID.BUFFER_USER_DATA)
+    AALightEnvironment = LazyFeature("AALightEnvironment", EnumFeature, GxFeatureID.ENUM_AA_LIGHT_ENVIRONMENT)
+    FrameInformation = LazyFeature("FrameInformation", BufferFeature, GxFeatureID.BUFFER_FRAME_INFORMATION)
+    ImageGrayRaiseSwitch = LazyFeature("ImageGrayRaiseSwitch", EnumFeature, GxFeatureID.ENUM_IMAGE_GRAY_RAISE_SWITCH)
+
     def __init__(self, handle, interface_obj):
         self.__dev_handle = handle
         Device.__init__(self, self.__dev_handle, interface_obj)
-        self.AcquisitionSpeedLevel = IntFeature(self.__dev_handle, GxFeatureID.INT_ACQUISITION_SPEED_LEVEL)
-        self.AcquisitionFrameCount = IntFeature(self.__dev_handle, GxFeatureID.INT_ACQUISITION_FRAME_COUNT)
-        self.TriggerSwitch = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_TRIGGER_SWITCH)
-        self.UserOutputMode = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_USER_OUTPUT_MODE)
-        self.StrobeSwitch = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_STROBE_SWITCH)
-        self.ADCLevel = IntFeature(self.__dev_handle, GxFeatureID.INT_ADC_LEVEL)
-        self.HBlanking = IntFeature(self.__dev_handle, GxFeatureID.INT_H_BLANKING)
-        self.VBlanking = IntFeature(self.__dev_handle, GxFeatureID.INT_V_BLANKING)
-        self.UserPassword = StringFeature(self.__dev_handle, GxFeatureID.STRING_USER_PASSWORD)
-        self.VerifyPassword = StringFeature(self.__dev_handle, GxFeatureID.STRING_VERIFY_PASSWORD)
-        self.UserData = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_USER_DATA)
-        self.AALightEnvironment = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_AA_LIGHT_ENVIRONMENT)
-        self.FrameInformation = BufferFeature(self.__dev_handle, GxFeatureID.BUFFER_FRAME_INFORMATION)
-        self.ImageGrayRaiseSwitch = EnumFeature(self.__dev_handle, GxFeatureID.ENUM_IMAGE_GRAY_RAISE_SWITCH)
 
 
@@ -4,7 +4,11 @@
 
 
 import numpy
-from numpy.compat import long
+try:
+    from numpy.compat import long
+except ImportError:
+    # numpy.compat was removed in numpy 2
+    long = int
 
 from gxipy.Device import Device
 from gxipy.gxwrapper import *
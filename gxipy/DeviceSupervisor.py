@@ -0,0 +1,500 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import numpy
+from gxipy.gxidef import *
+from gxipy.Device import *
+from gxipy.Exception import *
+import threading
+import time
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+# features kept by a DeviceSupervisor when none are named, the ones a camera lacks are skipped
+DEVICE_SUPERVISOR_FEATURES = (
+    "PixelFormat", "BinningHorizontal", "BinningVertical", "Width", "Height", "OffsetX", "OffsetY",
+    "ExposureAuto", "ExposureTime", "GainAuto", "Gain", "BalanceWhiteAuto",
+    "AcquisitionFrameRateMode", "AcquisitionFrameRate", "TriggerMode", "TriggerSource", "TriggerActivation",
+    "ChunkModeActive",
+)
+
+
+class DeviceSupervisorState:
+    CLOSED = "closed"           # open() not called yet, or close() called
+    ONLINE = "online"           # the device is open
+    RECOVERING = "recovering"   # the device went offline, reopening it
+    FAILED = "failed"           # max_attempts reopen attempts failed, get_last_error tells the last failure
+
+    def __init__(self):
+        pass
+
+
+class DeviceSupervisor:
+    """
+    Keeps one camera, opened by serial number, running across disconnects. The supervisor registers the
+    device offline callback; when it fires, a thread closes the dead device, re-enumerates with
+    DeviceManager.update_device_list and reopens the serial number, waiting between the attempts with an
+    exponential backoff bounded by backoff_max. The reopened device gets the feature snapshot taken by
+    the last snapshot() or stream_on(), the acquisition buffer number, the numpy buffers and the capture
+    callback registered through the supervisor, then on_reconnect(device) is called and stream_on sent
+    again if the stream was on. Configure the camera through get_device(), and go through the supervisor
+    for what has to be registered again.
+    Frames lost during an outage are estimated from the frame rate measured by the capture callback and
+    the time between the last frame before the drop and the first one after it.
+    """
+    def __init__(self, device_manager, sn, features=None, access_mode=GxAccessMode.CONTROL,
+                 backoff_initial=0.1, backoff_max=5.0, max_attempts=0, on_reconnect=None):
+        """
+        :brief  Constructor for instance initialization
+        :param  device_manager:     DeviceManager object
+        :param  sn:                 serial number of the camera
+        :param  features:           list of the feature names restored after a reconnect,
+                                    None for DEVICE_SUPERVISOR_FEATURES
+        :param  access_mode:        GxAccessMode the device is opened with
+        :param  backoff_initial:    seconds before the second reopen attempt, doubled after every failure
+        :param  backoff_max:        maximum seconds between two reopen attempts
+        :param  max_attempts:       reopen attempts per outage before giving up, 0 for no limit
+        :param  on_reconnect:       function called with the reopened Device before the stream is started,
+                                    for what the supervisor doesn't know about (workers, feature callbacks)
+        """
+        if not isinstance(sn, str):
+            raise ParameterTypeError("DeviceSupervisor.__init__: "
+                                     "Expected sn type is str, not %s" % type(sn))
+
+        if features is not None and (isinstance(features, str) or not isinstance(features, (list, tuple))):
+            raise ParameterTypeError("DeviceSupervisor.__init__: "
+                                     "Expected features type is a list of str, not %s" % type(features))
+
+        for name, value in (("backoff_initial", backoff_initial), ("backoff_max", backoff_max)):
+            if not isinstance(value, (INT_TYPE, float)):
+                raise ParameterTypeError("DeviceSupervisor.__init__: "
+                                         "Expected %s type is float, not %s" % (name, type(value)))
+            if value <= 0:
+                raise InvalidParameter("DeviceSupervisor.__init__: %s must be a positive number of seconds" % name)
+
+        if not isinstance(max_attempts, INT_TYPE):
+            raise ParameterTypeError("DeviceSupervisor.__init__: "
+                                     "Expected max_attempts type is int, not %s" % type(max_attempts))
+
+        if max_attempts < 0 or max_attempts > UNSIGNED_INT_MAX:
+            raise InvalidParameter("DeviceSupervisor.__init__: max_attempts out of bounds, minimum=0, maximum=%s"
+                                   % hex(UNSIGNED_INT_MAX).__str__())
+
+        if on_reconnect is not None and not isinstance(on_reconnect, types.FunctionType):
+            raise ParameterTypeError("DeviceSupervisor.__init__: "
+                                     "Expected on_reconnect type is function, not %s" % type(on_reconnect))
+
+        self.__device_manager = device_manager
+        self.__sn = sn
+        self.__features = list(DEVICE_SUPERVISOR_FEATURES if features is None else features)
+        self.__access_mode = access_mode
+        self.__backoff_initial = float(backoff_initial)
+        self.__backoff_max = float(max(backoff_max, backoff_initial))
+        self.__max_attempts = max_attempts
+        self.__on_reconnect = on_reconnect
+
+        self.__device = None
+        self.__state = DeviceSupervisorState.CLOSED
+        self.__condition = threading.Condition()
+        self.__offline = threading.Event()
+        self.__closing = threading.Event()
+        self.__thread = None
+        self.__last_error = None
+
+        # what is restored on the reopened device
+        self.__snapshot = None
+        self.__buffer_num = None
+        self.__numpy_buffers = None
+        self.__capture_callback = None
+        self.__capture_fast = False
+        self.__streaming = False
+
+        self.__reset_statistics()
+
+    def __reset_statistics(self):
+        self.__reconnect_count = 0
+        self.__attempt_count = 0
+        self.__failed_attempt_count = 0
+        self.__last_recovery_seconds = None
+        self.__max_recovery_seconds = 0.0
+        self.__total_recovery_seconds = 0.0
+        self.__frame_count = 0
+        self.__frames_lost = 0
+        self.__last_frames_lost = None
+        self.__first_frame_time = None
+        self.__last_frame_time = None
+        self.__session_frame_count = 0
+        self.__offline_frame_time = None
+        self.__offline_frame_rate = None
+
+    def open(self):
+        """
+        :brief      Open the device and start watching it
+        :return:    Device object
+        """
+        if self.__state != DeviceSupervisorState.CLOSED:
+            raise InvalidCall("DeviceSupervisor.open: the supervisor is already open")
+
+        self.__reset_statistics()
+        self.__last_error = None
+        self.__offline.clear()
+        self.__closing.clear()
+        device = self.__device_manager.open_device_by_sn(self.__sn, self.__access_mode)
+        try:
+            self.__watch(device)
+        except Exception:
+            device.close_device()
+            raise
+
+        self.__set_state(device, DeviceSupervisorState.ONLINE)
+        self.__thread = threading.Thread(target=self.__run, name="DeviceSupervisor")
+        self.__thread.daemon = True
+        self.__thread.start()
+        return device
+
+    def close(self):
+        """
+        :brief      Stop watching, stop the stream and close the device
+        :return:    None
+        """
+        if self.__state == DeviceSupervisorState.CLOSED:
+            return
+
+        self.__closing.set()
+        self.__offline.set()
+        self.__thread.join()
+        self.__thread = None
+
+        device = self.__device
+        streaming = self.__streaming
+        self.__streaming = False
+        self.__set_state(None, DeviceSupervisorState.CLOSED)
+        if device is None:
+            return
+        try:
+            if streaming:
+                device.stream_off()
+        finally:
+            device.close_device()
+
+    def get_device(self):
+        """
+        :brief      Get the device, it is another object after every reconnect
+        :return:    Device object, None while the device is offline
+        """
+        return self.__device
+
+    def get_state(self):
+        """
+        :return:    DeviceSupervisorState
+        """
+        return self.__state
+
+    def get_last_error(self):
+        """
+        :brief      Get the exception of the last failed reopen attempt
+        :return:    Exception object, None if no attempt failed
+        """
+        return self.__last_error
+
+    def wait_online(self, timeout=None):
+        """
+        :brief      Wait for the device to be open, e.g. after an outage
+        :param      timeout:    wait time in seconds, None to wait without limit
+        :return:    True if the device is open, False on timeout, when recovery failed or the supervisor is closed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__condition:
+            while self.__state == DeviceSupervisorState.RECOVERING:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.__condition.wait(remaining)
+            return self.__state == DeviceSupervisorState.ONLINE
+
+    def snapshot(self):
+        """
+        :brief      Keep the current values of the supervised features, they are written to the reopened
+                    device. Taken by stream_on too.
+        :return:    OrderedDict of name: value, see FeatureControl.snapshot
+        """
+        device = self.__get_online_device('snapshot')
+        feature_control = device.get_remote_device_feature_control()
+        names = []
+        for feature_name in self.__features:
+            try:
+                if feature_control.is_implemented(feature_name) and feature_control.is_writable(feature_name):
+                    names.append(feature_name)
+            except Exception:
+                continue
+        self.__snapshot = feature_control.snapshot(names)
+        return self.__snapshot
+
+    def get_snapshot(self):
+        """
+        :return:    OrderedDict of the feature values written after a reconnect, None before the first snapshot
+        """
+        return self.__snapshot
+
+    def set_acquisition_buffer_number(self, buf_num):
+        """
+        :brief      DataStream.set_acquisition_buffer_number of the first stream, repeated after a reconnect
+        :return:    None
+        """
+        self.__get_online_device('set_acquisition_buffer_number').data_stream[0].set_acquisition_buffer_number(buf_num)
+        self.__buffer_num = buf_num
+
+    def register_numpy_buffers(self, count, shape=None, dtype=numpy.uint8, huge_pages=False, lock=False):
+        """
+        :brief      DataStream.register_numpy_buffers of the first stream, repeated before every stream_on
+                    of the supervisor, a reconnect included, until unregister_numpy_buffers
+        :return:    BufferArena object
+        """
+        device = self.__get_online_device('register_numpy_buffers')
+        arena = device.data_stream[0].register_numpy_buffers(count, shape, dtype, huge_pages, lock)
+        if arena is not None:
+            self.__numpy_buffers = (count, shape, dtype, huge_pages, lock)
+        return arena
+
+    def unregister_numpy_buffers(self):
+        """
+        :brief      Forget the numpy buffers, the registered ones stay until stream_off
+        :return:    None
+        """
+        self.__numpy_buffers = None
+        device = self.__device
+        if device is not None and not device.data_stream[0].acquisition_flag:
+            device.data_stream[0].unregister_numpy_buffers()
+
+    def register_capture_callback(self, callback_func, fast=False):
+        """
+        :brief      DataStream.register_capture_callback of the first stream, registered again after a
+                    reconnect. The frames are counted on the way to callback_func, for get_statistics.
+        :param      callback_func:  callback function
+        :param      fast:           see DataStream.register_capture_callback
+        :return:    None
+        """
+        if not isinstance(callback_func, types.FunctionType):
+            raise ParameterTypeError("DeviceSupervisor.register_capture_callback: "
+                                     "Expected callback type is function not %s" % type(callback_func))
+
+        device = self.__get_online_device('register_capture_callback')
+        self.__capture_callback = callback_func
+        self.__capture_fast = fast
+        try:
+            self.__register_capture_callback(device)
+        except Exception:
+            self.__capture_callback = None
+            raise
+
+    def unregister_capture_callback(self):
+        """
+        :brief      DataStream.unregister_capture_callback of the first stream
+        :return:    None
+        """
+        self.__capture_callback = None
+        device = self.__device
+        if device is not None:
+            device.data_stream[0].unregister_capture_callback()
+
+    def stream_on(self):
+        """
+        :brief      Take a feature snapshot and start the stream, restarted after every reconnect
+        :return:    None
+        """
+        device = self.__get_online_device('stream_on')
+        self.snapshot()
+        self.__start_stream(device)
+        self.__streaming = True
+
+    def stream_off(self):
+        """
+        :brief      Stop the stream, it is not restarted by a reconnect
+        :return:    None
+        """
+        device = self.__get_online_device('stream_off')
+        self.__streaming = False
+        device.stream_off()
+
+    def get_statistics(self):
+        """
+        :brief      Reconnect counters
+        :return:    dict: state, reconnects, attempts (reopen attempts), failed_attempts,
+                    last_recovery_seconds (offline event to stream restarted, None before the first reconnect),
+                    max_recovery_seconds, total_recovery_seconds, frames (seen by the capture callback),
+                    frames_lost (estimated over every outage), last_frames_lost (None until a frame arrived
+                    after the last reconnect, or without capture callback)
+        """
+        return {
+            "state": self.__state,
+            "reconnects": self.__reconnect_count,
+            "attempts": self.__attempt_count,
+            "failed_attempts": self.__failed_attempt_count,
+            "last_recovery_seconds": self.__last_recovery_seconds,
+            "max_recovery_seconds": self.__max_recovery_seconds,
+            "total_recovery_seconds": self.__total_recovery_seconds,
+            "frames": self.__frame_count,
+            "frames_lost": self.__frames_lost,
+            "last_frames_lost": self.__last_frames_lost,
+        }
+
+    def __get_online_device(self, func_name):
+        device = self.__device
+        if device is None:
+            raise InvalidCall("DeviceSupervisor.%s: the device is %s" % (func_name, self.__state))
+        return device
+
+    def __set_state(self, device, state):
+        with self.__condition:
+            self.__device = device
+            self.__state = state
+            self.__condition.notify_all()
+
+    def __watch(self, device):
+        """
+        :brief      Register the offline callback of a device
+        """
+        def on_offline():
+            self.__offline.set()
+
+        device.register_device_offline_callback(on_offline)
+
+    def __register_capture_callback(self, device):
+        callback_func = self.__capture_callback
+
+        def on_capture(frame):
+            self.__count_frame()
+            callback_func(frame)
+
+        device.data_stream[0].register_capture_callback(on_capture, self.__capture_fast)
+
+    def __count_frame(self):
+        """
+        :brief      Per frame bookkeeping of the capture callback: a time and a counter,
+                    the outage estimate is made on the first frame after a reconnect
+        """
+        now = time.perf_counter()
+        self.__frame_count += 1
+        self.__session_frame_count += 1
+        if self.__first_frame_time is None:
+            self.__first_frame_time = now
+            if self.__offline_frame_time is not None:
+                self.__estimate_frames_lost(now)
+        self.__last_frame_time = now
+
+    def __estimate_frames_lost(self, now):
+        frame_rate = self.__offline_frame_rate
+        self.__offline_frame_time = None
+        if frame_rate is None:
+            return
+        # frames the camera would have delivered between the last frame before the drop and this one
+        lost = max(0, int(round((now - self.__last_frame_time) * frame_rate)) - 1)
+        self.__last_frames_lost = lost
+        self.__frames_lost += lost
+
+    def __start_stream(self, device):
+        if self.__numpy_buffers is not None and device.data_stream[0].get_numpy_buffers() is None:
+            count, shape, dtype, huge_pages, lock = self.__numpy_buffers
+            device.data_stream[0].register_numpy_buffers(count, shape, dtype, huge_pages, lock)
+        device.stream_on()
+
+    def __run(self):
+        while True:
+            self.__offline.wait()
+            if self.__closing.is_set():
+                return
+            self.__offline.clear()
+            self.__recover()
+
+    def __recover(self):
+        """
+        :brief      Reopen the device after the offline callback, bounded exponential backoff between attempts
+        """
+        start = time.perf_counter()
+        device = self.__device
+        self.__set_state(None, DeviceSupervisorState.RECOVERING)
+
+        # rate of the frames before the drop, for the frames lost estimate
+        self.__offline_frame_rate = None
+        self.__offline_frame_time = None
+        if self.__last_frame_time is not None:
+            if self.__session_frame_count > 1 and self.__last_frame_time > self.__first_frame_time:
+                self.__offline_frame_rate = (self.__session_frame_count - 1) / \
+                                            (self.__last_frame_time - self.__first_frame_time)
+            self.__offline_frame_time = self.__last_frame_time
+        self.__first_frame_time = None
+        self.__session_frame_count = 0
+        self.__release(device)
+
+        delay = self.__backoff_initial
+        attempt = 0
+        while not self.__closing.is_set():
+            attempt += 1
+            self.__attempt_count += 1
+            try:
+                device = self.__reopen()
+                break
+            except Exception as error:
+                self.__failed_attempt_count += 1
+                self.__last_error = error
+                if self.__max_attempts != 0 and attempt >= self.__max_attempts:
+                    self.__set_state(None, DeviceSupervisorState.FAILED)
+                    return
+            self.__closing.wait(delay)
+            delay = min(delay * 2, self.__backoff_max)
+        else:
+            return
+
+        elapsed = time.perf_counter() - start
+        self.__reconnect_count += 1
+        self.__last_recovery_seconds = elapsed
+        self.__max_recovery_seconds = max(self.__max_recovery_seconds, elapsed)
+        self.__total_recovery_seconds += elapsed
+        self.__set_state(device, DeviceSupervisorState.ONLINE)
+
+    @staticmethod
+    def __release(device):
+        """
+        :brief      Close the handles of the dead device, its calls fail with an offline status
+        """
+        try:
+            # unregisters the numpy buffers, their arena is closed even if the driver calls fail
+            device.data_stream[0].set_acquisition_flag(False)
+        except Exception:
+            pass
+        try:
+            device.close_device()
+        except Exception:
+            pass
+
+    def __reopen(self):
+        """
+        :brief      One reopen attempt: enumerate, open by serial number, restore
+        :return:    Device object
+        """
+        self.__device_manager.update_device_list()
+        device = self.__device_manager.open_device_by_sn(self.__sn, self.__access_mode)
+        try:
+            if self.__snapshot:
+                device.get_remote_device_feature_control().apply(self.__snapshot, rollback=False)
+            if self.__buffer_num is not None:
+                device.data_stream[0].set_acquisition_buffer_number(self.__buffer_num)
+            if self.__capture_callback is not None:
+                self.__register_capture_callback(device)
+            if self.__on_reconnect is not None:
+                self.__on_reconnect(device)
+            self.__watch(device)
+            if self.__streaming:
+                self.__start_stream(device)
+        except Exception:
+            try:
+                device.close_device()
+            except Exception:
+                pass
+            raise
+        return device
@@ -7,6 +7,7 @@
 from gxipy.gxiapi import *
 from gxipy.ImageProc import *
 from gxipy.StatusProcessor import *
+from gxipy.FeatureCache import *
 
 if sys.version_info.major > 2:
     INT_TYPE = int
@@ -21,8 +22,27 @@ class Feature:
         """
         self.__handle = handle
         self.__feature = feature
+        self.__cache = FeatureCacheManager.get_cache(handle)
         self.feature_name = self.get_name()
 
+    def _read(self, kind, reader):
+        """
+        :brief      Read through the feature cache of the device, if the handle has one
+        :param      kind:       FeatureCacheKind
+        :param      reader:     function reading from the device
+        :return:    value returned by reader
+        """
+        if self.__cache is None:
+            return reader()
+        return self.__cache.read(self.__handle, self.__feature, self.feature_name, kind, reader)
+
+    def _invalidate(self):
+        """
+        :brief      Invalidate the feature cache of the device after a write
+        """
+        if self.__cache is not None:
+            self.__cache.invalidate()
+
     def get_name(self):
         """
         brief:  Getting Feature Name
@@ -40,6 +60,12 @@ class Feature:
         brief:  Determining whether the feature is implemented
         return: is_implemented
         """
+        return self._read(FeatureCacheKind.IMPLEMENTED, self.__is_implemented)
+
+    def __is_implemented(self):
+        """
+        brief:  Uncached is_implemented
+        """
         status, is_implemented = gx_is_implemented(self.__handle, self.__feature)
         if status == GxStatusList.SUCCESS:
             return is_implemented
@@ -53,6 +79,12 @@ class Feature:
         brief:  Determining whether the feature is readable
         return: is_readable
         """
+        return self._read(FeatureCacheKind.READABLE, self.__is_readable)
+
+    def __is_readable(self):
+        """
+        brief:  Uncached is_readable
+        """
         implemented = self.is_implemented()
         if not implemented:
             return False
@@ -66,6 +98,12 @@ class Feature:
         brief:  Determining whether the feature is writable
         return: is_writable
         """
+        return self._read(FeatureCacheKind.WRITABLE, self.__is_writable)
+
+    def __is_writable(self):
+        """
+        brief:  Uncached is_writable
+        """
         implemented = self.is_implemented()
         if not implemented:
             return False
@@ -103,6 +141,12 @@ class IntFeature(Feature):
         :brief      Getting integer range
         :return:    integer range dictionary
         """
+        return self._read(FeatureCacheKind.RANGE, self.__get_range)
+
+    def __get_range(self):
+        """
+        :brief      Uncached get_range
+        """
         implemented = self.is_implemented()
         if not implemented:
             #print("%s.get_range is not support" % self.feature_name)
@@ -117,6 +161,12 @@ class IntFeature(Feature):
         :brief      Getting integer value
         :return:    integer value
         """
+        return self._read(FeatureCacheKind.VALUE, self.__get)
+
+    def __get(self):
+        """
+        :brief      Uncached get
+        """
         readable = self.is_readable()
         if not readable:
             #print("%s.get is not readable" % self.feature_name)
@@ -153,6 +203,7 @@ class IntFeature(Feature):
             return
 
         status = gx_set_int(self.__handle, self.__feature, int_value)
+        self._invalidate()
         StatusProcessor.process(status, 'IntFeature', 'set')
 
 
@@ -186,6 +237,12 @@ class FloatFeature(Feature):
         :brief      Getting float range
         :return:    float range dictionary
         """
+        return self._read(FeatureCacheKind.RANGE, self.__get_range)
+
+    def __get_range(self):
+        """
+        :brief      Uncached get_range
+        """
         implemented = self.is_implemented()
         if not implemented:
             #print("%s.get_range is not support" % self.feature_name)
@@ -200,6 +257,12 @@ class FloatFeature(Feature):
         :brief      Getting float value
         :return:    float value
         """
+        return self._read(FeatureCacheKind.VALUE, self.__get)
+
+    def __get(self):
+        """
+        :brief      Uncached get
+        """
         readable = self.is_readable()
         if not readable:
             #print("%s.get: is not readable" % self.feature_name)
@@ -234,6 +297,7 @@ class FloatFeature(Feature):
             return
 
         status = gx_set_float(self.__handle, self.__feature, float_value)
+        self._invalidate()
         StatusProcessor.process(status, 'FloatFeature', 'set')
 
 
@@ -252,6 +316,12 @@ class EnumFeature(Feature):
         :brief      Getting range of Enum feature
         :return:    enum_dict:    enum range dictionary
         """
+        return self._read(FeatureCacheKind.RANGE, self.__get_range)
+
+    def __get_range(self):
+        """
+        :brief      Uncached get_range
+        """
         implemented = self.is_implemented()
         if not implemented:
             #print("%s.get_range: is not support" % self.feature_name)
@@ -275,6 +345,12 @@ class EnumFeature(Feature):
         :return:    enum_value:     enum value
                     enum_str:       string for enum description
         """
+        return self._read(FeatureCacheKind.VALUE, self.__get)
+
+    def __get(self):
+        """
+        :brief      Uncached get
+        """
         readable = self.is_readable()
         if not readable:
             #print("%s.get: is not readable" % self.feature_name)
@@ -312,6 +388,7 @@ class EnumFeature(Feature):
             return
 
         status = gx_set_enum(self.__handle, self.__feature, enum_value)
+        self._invalidate()
         StatusProcessor.process(status, 'EnumFeature', 'set')
 
 
@@ -330,6 +407,12 @@ class BoolFeature(Feature):
         :brief      Getting bool value
         :return:    bool value[bool]
         """
+        return self._read(FeatureCacheKind.VALUE, self.__get)
+
+    def __get(self):
+        """
+        :brief      Uncached get
+        """
         readable = self.is_readable()
         if not readable:
            # print("%s.get is not readable" % self.feature_name)
@@ -355,6 +438,7 @@ class BoolFeature(Feature):
             raise InvalidAccess("%s.set: is not writeable" % self.feature_name)
 
         status = gx_set_bool(self.__handle, self.__feature, bool_value)
+        self._invalidate()
         StatusProcessor.process(status, 'BoolFeature', 'set')
 
 
@@ -373,6 +457,12 @@ class StringFeature(Feature):
         :brief      Getting the maximum length that string can set
         :return:    length:     the maximum length that string can set
         """
+        return self._read(FeatureCacheKind.MAX_LENGTH, self.__get_string_max_length)
+
+    def __get_string_max_length(self):
+        """
+        :brief      Uncached get_string_max_length
+        """
         implemented = self.is_implemented()
         if not implemented:
             #print("%s.get_string_max_length is not support" % self.feature_name)
@@ -387,6 +477,12 @@ class StringFeature(Feature):
         :brief      Getting string value
         :return:    strings
         """
+        return self._read(FeatureCacheKind.VALUE, self.__get)
+
+    def __get(self):
+        """
+        :brief      Uncached get
+        """
         readable = self.is_readable()
         if not readable:
             #print("%s.get is not readable" % self.feature_name)
@@ -420,6 +516,7 @@ class StringFeature(Feature):
             return
 
         status = gx_set_string(self.__handle, self.__feature, input_string)
+        self._invalidate()
         StatusProcessor.process(status, 'StringFeature', 'set')
 
 
@@ -487,6 +584,7 @@ class BufferFeature(Feature):
 
         status = gx_set_buffer(self.__handle, self.__feature,
                                buf.get_ctype_array(), buf.get_length())
+        self._invalidate()
         StatusProcessor.process(status, 'BuffFeature', 'set_buffer')
 
 
@@ -511,5 +609,6 @@ class CommandFeature(Feature):
             raise NoImplemented("%s.send_command is not support" % self.feature_name)
 
         status = gx_send_command(self.__handle, self.__feature)
+        self._invalidate()
         StatusProcessor.process(status, 'CommandFeature', 'send_command')
 
@@ -0,0 +1,207 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+from gxipy.gxwrapper import *
+from gxipy.gxidef import *
+from gxipy.Exception import *
+import threading
+import time
+import types
+
+
+class FeatureCacheKind:
+    IMPLEMENTED = 0             # Feature.is_implemented
+    READABLE = 1                # Feature.is_readable
+    WRITABLE = 2                # Feature.is_writable
+    ACCESS_MODE = 3             # node access mode of FeatureControl.is_implemented/is_readable/is_writable
+    VALUE = 4                   # Feature.get, Feature_s.get
+    RANGE = 5                   # Feature.get_range, Feature_s.get_range
+    MAX_LENGTH = 6              # StringFeature.get_string_max_length, StringFeature_s.get_string_max_length
+    RANGE_DISPLAY_NAME = 7      # EnumFeature_s.get_range_display_name
+    NODE_TYPE = 8               # Feature_s class of a node, FeatureControl.apply and snapshot
+
+    def __init__(self):
+        pass
+
+
+class FeatureCache:
+    def __init__(self):
+        """
+        :brief  Cache of feature reads for one device, shared by its device, local device and stream handles.
+                Node types are kept for the life of the cache, access modes until invalidate(). Values and ranges follow the node metadata:
+                CACHABLE_NOCACHE nodes are always read from the device, nodes with a polling time
+                expire after it, the others are kept until invalidate().
+                Writes, commands, feature files and feature callbacks of the device invalidate the cache.
+        """
+        self.__lock = threading.Lock()
+        self.__enabled = True
+        self.__entries = {}
+        self.__lifetimes = {}
+        self.__metadata = {}
+        self.__generation = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__bypassed = 0
+        self.__invalidations = 0
+
+    def set_enabled(self, enabled):
+        """
+        :brief      Enable or disable the cache, disabling drops the cached values
+        :param      enabled:    bool
+        :return:    None
+        """
+        if not isinstance(enabled, bool):
+            raise ParameterTypeError("FeatureCache.set_enabled: "
+                                     "Expected enabled type is bool, not %s" % type(enabled))
+
+        self.__enabled = enabled
+        self.invalidate()
+
+    def is_enabled(self):
+        return self.__enabled
+
+    def invalidate(self):
+        """
+        :brief      Drop every cached value and access mode, node metadata is kept
+        :return:    None
+        """
+        with self.__lock:
+            self.__generation += 1
+            self.__entries = {}
+            self.__invalidations += 1
+
+    def get_generation(self):
+        """
+        :brief      Number of invalidations since creation, not reset by reset_statistics.
+                    Unchanged between two calls means no write, command or callback of the device in between.
+        :return:    int
+        """
+        return self.__generation
+
+    def get_statistics(self):
+        """
+        :brief      Cache counters since creation or reset_statistics
+        :return:    dict: hits, misses, bypassed (reads of nodes that may not be cached), invalidations,
+                    entries (values currently cached)
+        """
+        return {
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "bypassed": self.__bypassed,
+            "invalidations": self.__invalidations,
+            "entries": len(self.__entries),
+        }
+
+    def reset_statistics(self):
+        self.__hits = 0
+        self.__misses = 0
+        self.__bypassed = 0
+        self.__invalidations = 0
+
+    def __get_lifetime(self, handle, feature_name):
+        """
+        :brief      Lifetime of a node value from its caching mode and polling time, read once per node
+        :return:    None: must not be cached, 0: until invalidated, else seconds
+        """
+        key = (handle, feature_name)
+        if key in self.__lifetimes:
+            return self.__lifetimes[key]
+
+        lifetime = None
+        status, cachable = gx_get_node_cachable(handle, feature_name)
+        if status == GxStatusList.SUCCESS and cachable in (GxNodeCachableType.CACHABLE_WRITETHROUGH,
+                                                           GxNodeCachableType.CACHABLE_WRITEAROUND):
+            status, polling = gx_get_node_polling(handle, feature_name)
+            if status == GxStatusList.SUCCESS:
+                lifetime = polling / 1000.0 if polling > 0 else 0
+        self.__lifetimes[key] = lifetime
+        return lifetime
+
+    def read(self, handle, feature, feature_name, kind, reader):
+        """
+        :brief      Cached read
+        :param      handle:         handle the feature is read through
+        :param      feature:        feature code ID or node name
+        :param      feature_name:   node name, for the caching mode and polling time
+        :param      kind:           FeatureCacheKind
+        :param      reader:         function reading the value from the device, its exceptions are not cached
+        :return:    value
+        """
+        if not self.__enabled:
+            return reader()
+
+        entry_key = (handle, feature, kind)
+        if kind >= FeatureCacheKind.NODE_TYPE:
+            if entry_key not in self.__metadata:
+                self.__metadata[entry_key] = reader()
+            return self.__metadata[entry_key]
+
+        entry = self.__entries.get(entry_key)
+        if entry is not None and (entry[1] is None or entry[1] > time.perf_counter()):
+            self.__hits += 1
+            return entry[0]
+
+        if kind < FeatureCacheKind.VALUE:
+            lifetime = 0
+        else:
+            lifetime = self.__get_lifetime(handle, feature_name)
+            if lifetime is None:
+                self.__bypassed += 1
+                return reader()
+
+        self.__misses += 1
+        generation = self.__generation
+        value = reader()
+        with self.__lock:
+            # a write during the read may have changed the value already
+            if generation == self.__generation:
+                self.__entries[entry_key] = (value, time.perf_counter() + lifetime if lifetime else None)
+        return value
+
+
+class FeatureCacheManager:
+    __caches = {}
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def attach(handle, cache):
+        """
+        :brief      Route the feature reads through handle to cache
+        :param      handle:     device, local device or stream handle
+        :param      cache:      FeatureCache
+        :return:    None
+        """
+        if not isinstance(cache, FeatureCache):
+            raise ParameterTypeError("FeatureCacheManager.attach: "
+                                     "Expected cache type is FeatureCache, not %s" % type(cache))
+        FeatureCacheManager.__caches[handle] = cache
+
+    @staticmethod
+    def release(cache):
+        """
+        :brief      Detach every handle of a cache, the handles may be reused by the next open device
+        :return:    None
+        """
+        for handle, attached in list(FeatureCacheManager.__caches.items()):
+            if attached is cache:
+                del FeatureCacheManager.__caches[handle]
+
+    @staticmethod
+    def get_cache(handle):
+        """
+        :return:    FeatureCache of a handle, None if reads through it are not cached
+        """
+        return FeatureCacheManager.__caches.get(handle)
+
+    @staticmethod
+    def invalidate(handle):
+        """
+        :brief      Invalidate the cache of a handle, if any
+        :return:    None
+        """
+        cache = FeatureCacheManager.__caches.get(handle)
+        if cache is not None:
+            cache.invalidate()
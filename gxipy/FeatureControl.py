@@ -7,7 +7,10 @@ from gxipy.gxwrapper import *
 from gxipy.dxwrapper import *
 from gxipy.gxidef import *
 from gxipy.Feature_s import *
+from gxipy.FeatureCache import *
 from gxipy.StatusProcessor import *
+from collections import OrderedDict
+import time
 import types
 
 class FeatureControl:
@@ -17,6 +20,30 @@ class FeatureControl:
         :param handle:
         """
         self.__handle = handle
+        self.__cache = FeatureCacheManager.get_cache(handle)
+
+    def get_feature_cache(self):
+        """
+        :brief      Feature cache of the device this handle belongs to
+        :return:    FeatureCache, None if reads through this handle are not cached
+        """
+        return self.__cache
+
+    def __get_access_mode(self, feature_name, func_name):
+        """
+        :brief      Node access mode, through the feature cache if the handle has one
+        :param feature_name:    Feature node name
+        :param func_name:       Caller name for the error message
+        :return:    GxNodeAccessMode
+        """
+        def read():
+            status, node_access = gx_get_node_access_mode(self.__handle, feature_name)
+            StatusProcessor.process(status, 'FeatureControl', func_name)
+            return node_access
+
+        if self.__cache is None:
+            return read()
+        return self.__cache.read(self.__handle, feature_name, feature_name, FeatureCacheKind.ACCESS_MODE, read)
 
     def is_implemented(self,feature_name):
         """
@@ -28,8 +55,7 @@ class FeatureControl:
             raise ParameterTypeError("FeatureControl.is_implemented: "
                                      "Expected feature_name type is int, not %s" % type(feature_name))
 
-        status, node_access = gx_get_node_access_mode( self.__handle ,feature_name)
-        StatusProcessor.process(status, 'FeatureControl', 'is_implemented')
+        node_access = self.__get_access_mode(feature_name, 'is_implemented')
         if ((node_access == GxNodeAccessMode.MODE_NI) or (node_access == GxNodeAccessMode.MODE_UNDEF)):
             return  False
         else:
@@ -44,8 +70,7 @@ class FeatureControl:
             raise ParameterTypeError("FeatureControl.get_int_feature: "
                                      "Expected feature_name type is str, not %s" % type(feature_name))
 
-        status, node_access = gx_get_node_access_mode( self.__handle ,feature_name)
-        StatusProcessor.process(status, 'FeatureControl', 'is_readable')
+        node_access = self.__get_access_mode(feature_name, 'is_readable')
         if ((node_access == GxNodeAccessMode.MODE_RO) or (node_access == GxNodeAccessMode.MODE_RW)):
             return True
         else:
@@ -60,8 +85,7 @@ class FeatureControl:
             raise ParameterTypeError("FeatureControl.get_int_feature: "
                                      "Expected feature_name type is str, not %s" % type(feature_name))
 
-        status, node_access = gx_get_node_access_mode( self.__handle ,feature_name)
-        StatusProcessor.process(status, 'FeatureControl', 'is_readable')
+        node_access = self.__get_access_mode(feature_name, 'is_readable')
         if ((node_access == GxNodeAccessMode.MODE_WO) or (node_access == GxNodeAccessMode.MODE_RW)):
             return True
         else:
@@ -202,6 +226,7 @@ class FeatureControl:
         :return:    None
         """
         status = gx_feature_load(self.__handle, file_path, verify)
+        FeatureCacheManager.invalidate(self.__handle)
         StatusProcessor.process(status, 'FeatureControl', 'feature_load')
 
     def read_port(self, address, size):
@@ -235,6 +260,7 @@ class FeatureControl:
                                      "Expected address type is int, not %s" % type(address))
 
         status = gx_writer_port( self.__handle, address, buff, size)
+        FeatureCacheManager.invalidate(self.__handle)
         StatusProcessor.process(status, 'FeatureControl', 'write_port')
 
     def read_port_stacked(self, entries, size):
@@ -268,6 +294,7 @@ class FeatureControl:
                                      "Expected size type is int, not %s" % type(size))
 
         status = gx_set_write_remote_device_port_stacked(self.__handle, entries, size)
+        FeatureCacheManager.invalidate(self.__handle)
         StatusProcessor.process(status, 'Device', 'set_write_remote_device_port_stacked')
 
         return status
@@ -342,3 +369,226 @@ class FeatureControl:
         StatusProcessor.process(status, 'FeatureControl', 'get_feature_polling')
         return node_polling
 
+    # Probe order of the node type for a value: int values may also set enum and float nodes,
+    # strings may be enum symbolics
+    __PROBE_ORDER = {
+        bool:   (BoolFeature_s,),
+        int:    (IntFeature_s, EnumFeature_s, FloatFeature_s),
+        float:  (FloatFeature_s,),
+        str:    (EnumFeature_s, StringFeature_s),
+        None:   (IntFeature_s, FloatFeature_s, EnumFeature_s, BoolFeature_s, StringFeature_s),
+    }
+
+    # Width and OffsetX, Height and OffsetY limit each other
+    __ROI_AXES = (("Width", "OffsetX"), ("Height", "OffsetY"))
+
+    def __get_feature_type(self, feature_name, value, func_name):
+        """
+        :brief      Feature_s class of a node, probed once per device through the typed getters
+        :param feature_name:    Feature node name
+        :param value:           Value to be written, None to probe every type
+        :param func_name:       Caller name for the error message
+        :return:    IntFeature_s, FloatFeature_s, EnumFeature_s, BoolFeature_s or StringFeature_s
+        """
+        if value is None:
+            value_type = None
+        elif isinstance(value, bool):
+            value_type = bool
+        elif isinstance(value, INT_TYPE):
+            value_type = int
+        elif isinstance(value, (float, str)):
+            value_type = type(value)
+        else:
+            raise ParameterTypeError("FeatureControl.%s: Expected '%s' value type is int, float, bool or str, "
+                                     "not %s" % (func_name, feature_name, type(value)))
+
+        # the gx_ functions are only defined once the library is loaded
+        readers = {
+            IntFeature_s:       gx_get_int_feature,
+            FloatFeature_s:     gx_get_float_feature,
+            EnumFeature_s:      gx_get_enum_feature,
+            BoolFeature_s:      gx_get_bool_feature,
+            StringFeature_s:    gx_get_string_feature,
+        }
+
+        def probe():
+            for feature_class in FeatureControl.__PROBE_ORDER[value_type]:
+                status = readers[feature_class](self.__handle, feature_name)[0]
+                if status == GxStatusList.SUCCESS:
+                    return feature_class
+            raise UnexpectedError("FeatureControl.%s: The feature '%s' is not implemented "
+                                  "or is not an int, float, enum, bool or string feature" % (func_name, feature_name))
+
+        if self.__cache is None:
+            feature_class = probe()
+        else:
+            feature_class = self.__cache.read(self.__handle, feature_name, feature_name,
+                                              FeatureCacheKind.NODE_TYPE, probe)
+
+        if value_type is not None and feature_class not in FeatureControl.__PROBE_ORDER[value_type]:
+            raise ParameterTypeError("FeatureControl.%s: Expected '%s' value type for %s, not %s"
+                                     % (func_name, feature_name, feature_class.__name__, type(value)))
+        return feature_class
+
+    @staticmethod
+    def __get_order(feature_name, features, current):
+        """
+        :brief      Sort key of a feature in apply: selectors, then the modes, auto functions, binning
+                    and pixel format that change the ranges of other features, then the ROI, then the rest.
+                    An offset moving towards the origin is written before its size, else after it.
+        :return:    tuple
+        """
+        if feature_name.endswith("Selector"):
+            return (0,)
+        if feature_name == "PixelFormat" or feature_name.endswith(("Mode", "Auto")) \
+                or feature_name.startswith(("Binning", "Decimation")):
+            return (1,)
+        for axis, (size_name, offset_name) in enumerate(FeatureControl.__ROI_AXES):
+            if feature_name in (size_name, offset_name):
+                offset_first = offset_name in features and current.get(offset_name) is not None \
+                    and features[offset_name] < current[offset_name]
+                return (2, axis, 0 if (feature_name == offset_name) == offset_first else 1)
+        return (3,)
+
+    @staticmethod
+    def __changes_others(feature_name):
+        """
+        :brief      Whether writing a feature may change the value of others: selectors, modes,
+                    auto functions, binning, decimation and pixel format
+        """
+        return feature_name.endswith(("Selector", "Mode", "Auto")) or feature_name == "PixelFormat" \
+            or feature_name.startswith(("Binning", "Decimation"))
+
+    @staticmethod
+    def __is_equal(feature_class, current, value):
+        """
+        :brief      Whether a feature already holds value, current is the value of Feature_s.get or snapshot
+        """
+        if current is None:
+            return False
+        if feature_class is EnumFeature_s and isinstance(current, tuple):
+            current = current[1] if isinstance(value, str) else current[0]
+        return current == value
+
+    @staticmethod
+    def __write(feature, value):
+        """
+        :brief      Write value through Feature_s.set, ints of a float node are converted
+        """
+        if isinstance(feature, FloatFeature_s):
+            value = float(value)
+        feature.set(value)
+
+    def snapshot(self, names):
+        """
+        :brief      Read several features, through the feature cache of the device
+        :param names:   Iterable of feature node names
+        :return:    OrderedDict of name: value, enum features give their symbolic string,
+                    so the result can be passed to apply
+        """
+        if isinstance(names, str):
+            raise ParameterTypeError("FeatureControl.snapshot: "
+                                     "Expected names type is a list of str, not %s" % type(names))
+
+        values = OrderedDict()
+        for feature_name in names:
+            if not isinstance(feature_name, str):
+                raise ParameterTypeError("FeatureControl.snapshot: "
+                                         "Expected feature_name type is str, not %s" % type(feature_name))
+
+            feature_class = self.__get_feature_type(feature_name, None, 'snapshot')
+            value = feature_class(self.__handle, feature_name).get()
+            values[feature_name] = value[1] if feature_class is EnumFeature_s else value
+        return values
+
+    def apply(self, features, rollback=True, current=None):
+        """
+        :brief      Write several features in dependency order. Features already holding the value are
+                    not written, so switching between profiles costs one write per changed feature.
+                    A dict is written selectors first, then modes, auto functions, binning and pixel format,
+                    then the ROI, then the rest. A list of (name, value) pairs is written as given.
+        :param features:    dict or list of (name, value), values int, float, bool or str (enum symbolic)
+        :param rollback:    On failure restore the features written so far before raising
+        :param current:     dict of the values the features are known to hold, as returned by snapshot,
+                            the features not in it are read through the feature cache
+        :return:    OrderedDict of name: {"written": bool, "seconds": write time}, in write order
+        """
+        if isinstance(features, dict):
+            items = list(features.items())
+        elif isinstance(features, (list, tuple)):
+            items = list(features)
+        else:
+            raise ParameterTypeError("FeatureControl.apply: "
+                                     "Expected features type is dict or list, not %s" % type(features))
+
+        if current is not None and not isinstance(current, dict):
+            raise ParameterTypeError("FeatureControl.apply: "
+                                     "Expected current type is dict, not %s" % type(current))
+
+        # one pass over the cache for the types and current values
+        plan = []
+        known = current or {}
+        current = {}
+        for item in items:
+            if not isinstance(item, tuple) or len(item) != 2 or not isinstance(item[0], str):
+                raise ParameterTypeError("FeatureControl.apply: "
+                                         "Expected feature type is (str, value), not %s" % repr(item))
+
+            feature_name, value = item
+            feature_class = self.__get_feature_type(feature_name, value, 'apply')
+            feature = feature_class(self.__handle, feature_name)
+            if feature_name in known:
+                current[feature_name] = known[feature_name]
+            else:
+                try:
+                    current[feature_name] = feature.get()
+                except Exception:
+                    # write only or not available now, written unconditionally
+                    current[feature_name] = None
+            plan.append((feature_name, value, feature))
+
+        if isinstance(features, dict):
+            plan.sort(key=lambda step: FeatureControl.__get_order(step[0], features, current))
+
+        report = OrderedDict()
+        written = []
+        # once a feature changing others is written, the values read before are stale
+        stale = False
+        for feature_name, value, feature in plan:
+            previous = current[feature_name]
+            if stale:
+                try:
+                    previous = feature.get()
+                except Exception:
+                    previous = None
+            if FeatureControl.__is_equal(type(feature), previous, value):
+                report[feature_name] = {"written": False, "seconds": 0.0}
+                continue
+
+            start = time.perf_counter()
+            try:
+                FeatureControl.__write(feature, value)
+            except Exception:
+                if rollback:
+                    self.__rollback(written)
+                raise
+            report[feature_name] = {"written": True, "seconds": time.perf_counter() - start}
+            written.append((feature, previous))
+            stale = stale or FeatureControl.__changes_others(feature_name)
+        return report
+
+    @staticmethod
+    def __rollback(written):
+        """
+        :brief      Restore the features written by a failed apply, in reverse order, best effort
+        :param written:     list of (Feature_s, value of Feature_s.get before the write)
+        """
+        for feature, previous in reversed(written):
+            if previous is None:
+                continue
+            try:
+                if isinstance(feature, EnumFeature_s) and isinstance(previous, tuple):
+                    previous = previous[1]
+                FeatureControl.__write(feature, previous)
+            except Exception:
+                pass
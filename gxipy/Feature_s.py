@@ -8,6 +8,7 @@ from gxipy.dxwrapper import *
 from gxipy.ImageProc import *
 from gxipy.gxiapi import *
 from gxipy.StatusProcessor import *
+from gxipy.FeatureCache import *
 import types
 
 if sys.version_info.major > 2:
@@ -24,6 +25,25 @@ class Feature_s:
         """
         self.__handle = handle
         self.__feature_name = feature_name
+        self.__cache = FeatureCacheManager.get_cache(handle)
+
+    def _read(self, kind, reader):
+        """
+        :brief      Read through the feature cache of the device, if the handle has one
+        :param kind:            FeatureCacheKind
+        :param reader:          Function reading from the device
+        :return:    Value returned by reader
+        """
+        if self.__cache is None:
+            return reader()
+        return self.__cache.read(self.__handle, self.__feature_name, self.__feature_name, kind, reader)
+
+    def _invalidate(self):
+        """
+        :brief      Invalidate the feature cache of the device after a write
+        """
+        if self.__cache is not None:
+            self.__cache.invalidate()
 
 class IntFeature_s(Feature_s):
     def __init__(self, handle, feature_name):
@@ -56,6 +76,12 @@ class IntFeature_s(Feature_s):
         :brief      Getting integer range
         :return:    integer range dictionary
         """
+        return self._read(FeatureCacheKind.RANGE, self.__get_range)
+
+    def __get_range(self):
+        """
+        :brief      Uncached get_range
+        """
         status, int_feature_info = gx_get_int_feature(self.__handle, self.__feature_name)
         StatusProcessor.process(status, 'IntFeature_s', 'get_range')
 
@@ -67,6 +93,12 @@ class IntFeature_s(Feature_s):
         :return:    enum_value:     enum value
                     enum_str:       string for enum description
         """
+        return self._read(FeatureCacheKind.VALUE, self.__get)
+
+    def __get(self):
+        """
+        :brief      Uncached get
+        """
         status, int_feature_info = gx_get_int_feature(self.__handle, self.__feature_name)
         StatusProcessor.process(status, 'IntFeature_s', 'get')
 
@@ -83,6 +115,7 @@ class IntFeature_s(Feature_s):
                                      "Expected int_value type is int, not %s" % type(int_value))
 
         status = gx_set_int_feature_value(self.__handle, self.__feature_name, int_value)
+        self._invalidate()
         StatusProcessor.process(status, 'IntFeature_s', 'set')
 
 class EnumFeature_s(Feature_s):
@@ -110,6 +143,12 @@ class EnumFeature_s(Feature_s):
         :brief      Getting range of Enum feature
         :return:    enum_dict:    enum range dictionary
         """
+        return self._read(FeatureCacheKind.RANGE, self.__get_range)
+
+    def __get_range(self):
+        """
+        :brief      Uncached get_range
+        """
         status, enum_feature_info = gx_get_enum_feature( self.__handle, self.__feature_name)
         StatusProcessor.process(status, 'FeatureControl', 'gx_get_enum_feature')
 
@@ -130,6 +169,12 @@ class EnumFeature_s(Feature_s):
         :brief      Getting range of Enum feature (include display name)
         :return:    enum_dict:    enum range dictionary
         """
+        return self._read(FeatureCacheKind.RANGE_DISPLAY_NAME, self.__get_range_display_name)
+
+    def __get_range_display_name(self):
+        """
+        :brief      Uncached get_range_display_name
+        """
         status, enum_feature_info = gx_get_enum_detail_feature( self.__handle, self.__feature_name)
         StatusProcessor.process(status, 'FeatureControl', 'get_range_display_name')
 
@@ -141,6 +186,12 @@ class EnumFeature_s(Feature_s):
         :return:    enum_value:     enum value
                     enum_str:       string for enum description
         """
+        return self._read(FeatureCacheKind.VALUE, self.__get)
+
+    def __get(self):
+        """
+        :brief      Uncached get
+        """
         status, enum_feature_info = gx_get_enum_feature(self.__handle, self.__feature_name)
         StatusProcessor.process(status, 'FeatureControl', 'gx_get_enum_feature')
 
@@ -154,9 +205,11 @@ class EnumFeature_s(Feature_s):
         """
         if isinstance(enum_value, int):
             status = gx_set_enum_feature_value(self.__handle, self.__feature_name, enum_value)
+            self._invalidate()
             StatusProcessor.process(status, 'EnumFeature_s', 'set')
         elif isinstance(enum_value, str):
             status = gx_set_enum_feature_value_string( self.__handle, self.__feature_name, enum_value)
+            self._invalidate()
             StatusProcessor.process(status, 'EnumFeature_s', 'set')
         else:
             raise ParameterTypeError("EnumFeature_s.set: "
@@ -195,6 +248,12 @@ class FloatFeature_s(Feature_s):
         :brief      Getting float range
         :return:    float range dictionary
         """
+        return self._read(FeatureCacheKind.RANGE, self.__get_range)
+
+    def __get_range(self):
+        """
+        :brief      Uncached get_range
+        """
         status, float_feature_info = gx_get_float_feature(self.__handle, self.__feature_name)
         StatusProcessor.process(status, 'FloatFeature_s', 'get_range')
         return self.__range_dict( float_feature_info)
@@ -204,6 +263,12 @@ class FloatFeature_s(Feature_s):
         :brief      Getting float value
         :return:    float value
         """
+        return self._read(FeatureCacheKind.VALUE, self.__get)
+
+    def __get(self):
+        """
+        :brief      Uncached get
+        """
         status, float_feature_info = gx_get_float_feature(self.__handle, self.__feature_name)
         StatusProcessor.process(status, 'FloatFeature_s', 'get_range')
         return float_feature_info.cur_value
@@ -219,6 +284,7 @@ class FloatFeature_s(Feature_s):
                                      "Expected float_value type is float, not %s" % type(float_value))
 
         status = gx_set_float_feature_value(self.__handle, self.__feature_name, float_value)
+        self._invalidate()
         StatusProcessor.process(status, 'FloatFeature_s', 'set')
 
 class BoolFeature_s(Feature_s):
@@ -237,6 +303,12 @@ class BoolFeature_s(Feature_s):
         :brief      Getting bool value
         :return:    bool value[bool]
         """
+        return self._read(FeatureCacheKind.VALUE, self.__get)
+
+    def __get(self):
+        """
+        :brief      Uncached get
+        """
         status, bool_feature_value = gx_get_bool_feature( self.__handle, self.__feature_name)
         StatusProcessor.process(status, 'BoolFeature_s', 'get')
         return  bool_feature_value
@@ -252,6 +324,7 @@ class BoolFeature_s(Feature_s):
                                      "Expected bool_value type is bool, not %s" % type(bool_value))
 
         status = gx_set_bool_feature_value( self.__handle, self.__feature_name, bool_value)
+        self._invalidate()
         StatusProcessor.process(status, 'BoolFeature_s', 'set')
 
 class StringFeature_s(Feature_s):
@@ -270,6 +343,12 @@ class StringFeature_s(Feature_s):
         :brief      String max length
         :return:    Max length
         """
+        return self._read(FeatureCacheKind.MAX_LENGTH, self.__get_string_max_length)
+
+    def __get_string_max_length(self):
+        """
+        :brief      Uncached get_string_max_length
+        """
         status, string_value = gx_get_string_feature( self.__handle, self.__feature_name)
         StatusProcessor.process(status, 'StringFeature_s', 'get_string_max_length')
         return  string_value.max_length
@@ -279,6 +358,12 @@ class StringFeature_s(Feature_s):
         :brief      Getting string value
         :return:    strings
         """
+        return self._read(FeatureCacheKind.VALUE, self.__get)
+
+    def __get(self):
+        """
+        :brief      Uncached get
+        """
         status, string_value = gx_get_string_feature(self.__handle, self.__feature_name)
         StatusProcessor.process(status, 'StringFeature_s', 'get')
         return string_decoding( string_value.cur_value)
@@ -294,6 +379,7 @@ class StringFeature_s(Feature_s):
                                      "Expected input_string type is string, not %s" % type(input_string))
 
         status = gx_set_string_feature_value( self.__handle, self.__feature_name, input_string)
+        self._invalidate()
         StatusProcessor.process(status, 'StringFeature_s', 'set')
 
 class CommandFeature_s(Feature_s):
@@ -313,6 +399,7 @@ class CommandFeature_s(Feature_s):
         :return:    None
         """
         status = gx_feature_send_command(self.__handle, self.__feature_name)
+        self._invalidate()
         StatusProcessor.process(status, 'CommandFeature_s', 'send_command')
 
 
@@ -363,5 +450,6 @@ class RegisterFeature_s(Feature_s):
             raise UnexpectedError("buff length out of bounds, %s.length_max:%d" % (self.__feature_name, max_length))
 
         status = gx_set_register_feature_value(self.__handle, self.__feature_name,buf.get_ctype_array(), buf.get_length())
+        self._invalidate()
         StatusProcessor.process(status, 'RegisterFeature_s', 'set_buffer')
 
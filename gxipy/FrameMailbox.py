@@ -0,0 +1,417 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import numpy
+from gxipy.gxwrapper import *
+from gxipy.gxidef import *
+from gxipy.ImageProc import *
+from gxipy.Exception import *
+import collections
+import functools
+import threading
+import time
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+
+class FrameMailbox:
+    """
+    Single slot holding the newest frame. put() overwrites the slot and gives the replaced frame back
+    at once, take() empties it, so a consumer always gets the newest frame and never more than one
+    frame waits for it.
+    """
+    def __init__(self):
+        self.__condition = threading.Condition()
+        self.__image = None
+        self.__closed = False
+        self.__put_count = 0
+        self.__overwrite_count = 0
+
+    def put(self, image):
+        """
+        :brief      Replace the frame in the slot, the previous one is released
+        :param      image:  RawImage object
+        :return:    None
+        """
+        with self.__condition:
+            if self.__closed:
+                replaced = image
+            else:
+                replaced = self.__image
+                self.__image = image
+                self.__put_count += 1
+                if replaced is not None:
+                    self.__overwrite_count += 1
+                self.__condition.notify_all()
+        if replaced is not None:
+            replaced.release()
+
+    def take(self, timeout=1000):
+        """
+        :brief      Take the frame out of the slot, waiting for one if it is empty
+        :param      timeout:    wait time in ms
+        :return:    RawImage object, None on timeout or when the mailbox is closed
+        """
+        deadline = time.monotonic() + timeout / 1000.0
+        with self.__condition:
+            while self.__image is None:
+                remaining = deadline - time.monotonic()
+                if self.__closed or remaining <= 0:
+                    return None
+                self.__condition.wait(remaining)
+            image = self.__image
+            self.__image = None
+            return image
+
+    def open(self):
+        """
+        :brief      Accept frames again after close()
+        :return:    None
+        """
+        with self.__condition:
+            self.__closed = False
+            self.__put_count = 0
+            self.__overwrite_count = 0
+
+    def close(self):
+        """
+        :brief      Release the frame in the slot and wake the waiting consumers, later frames are released
+                    by put() until open()
+        :return:    None
+        """
+        with self.__condition:
+            image = self.__image
+            self.__image = None
+            self.__closed = True
+            self.__condition.notify_all()
+        if image is not None:
+            image.release()
+
+    def get_statistics(self):
+        """
+        :brief      put:            frames put into the slot
+                    overwritten:    frames replaced before they were taken
+        :return:    dict
+        """
+        with self.__condition:
+            return {"put": self.__put_count, "overwritten": self.__overwrite_count}
+
+
+class _SharedFrame:
+    """
+    A driver buffer handed to both channels: it is queued back once every image borrowing it is released.
+    """
+    def __init__(self, image, count):
+        self.image = image
+        self.count = count
+
+
+class MailboxWorker:
+    """
+    One acquisition thread feeding two consumers of the same DataStream:
+    the control channel, a FrameMailbox always holding the newest frame (get_latest), and the record
+    channel, a queue receiving every frame in order (get_record_image).
+    Both channels borrow the driver buffer of a frame (dq_buf zero_copy), it is queued back once both
+    released it. The record channel holds at most record_buffer_num driver buffers: when the recorder
+    falls further behind the frames queued for it are copied, so the driver keeps free buffers and a slow
+    recorder costs the control channel a copy, not a wait. The record queue never blocks the acquisition
+    thread either, a frame that finds it full (record_queue_size) is dropped and counted. The control
+    channel holds at most two frames (the slot and the one being processed), whatever its pace.
+    """
+    def __init__(self, data_stream, record_queue_size=256, record_buffer_num=2, timeout=1000,
+                 drop_incomplete=True):
+        """
+        :brief  Constructor for instance initialization
+        :param  data_stream:        DataStream object, acquisition is started by the user (Device.stream_on)
+        :param  record_queue_size:  frames the record queue holds, range:[1, 0xFFFFFFFF]; the acquisition
+                                    buffer number should leave record_buffer_num + 3 buffers
+                                    (DataStream.set_acquisition_buffer_number)
+        :param  record_buffer_num:  driver buffers the record channel may hold before frames are copied,
+                                    range:[0, 0xFFFFFFFF], 0 copies every recorded frame
+        :param  timeout:            dq_buf timeout of the acquisition thread, range:[0, 0xFFFFFFFF]
+        :param  drop_incomplete:    True: frames whose status is not SUCCESS go to neither channel
+        """
+        for name, value in (("record_queue_size", record_queue_size), ("record_buffer_num", record_buffer_num),
+                            ("timeout", timeout)):
+            if not isinstance(value, INT_TYPE):
+                raise ParameterTypeError("MailboxWorker.__init__: "
+                                         "Expected %s type is int, not %s" % (name, type(value)))
+
+        if record_queue_size < 1 or record_queue_size > UNSIGNED_INT_MAX:
+            raise InvalidParameter("MailboxWorker.__init__: record_queue_size out of bounds, minimum=1, maximum=%s"
+                                   % hex(UNSIGNED_INT_MAX).__str__())
+
+        if record_buffer_num < 0 or record_buffer_num > UNSIGNED_INT_MAX:
+            raise InvalidParameter("MailboxWorker.__init__: record_buffer_num out of bounds, minimum=0, maximum=%s"
+                                   % hex(UNSIGNED_INT_MAX).__str__())
+
+        if timeout < 0 or timeout > UNSIGNED_INT_MAX:
+            raise InvalidParameter("MailboxWorker.__init__: timeout out of bounds, minimum=0, maximum=%s"
+                                   % hex(UNSIGNED_INT_MAX).__str__())
+
+        self.__data_stream = data_stream
+        self.__record_queue_size = record_queue_size
+        self.__record_buffer_num = record_buffer_num
+        self.__timeout = timeout
+        self.__drop_incomplete = drop_incomplete
+        self.__mailbox = FrameMailbox()
+        self.__record_queue = collections.deque()
+        self.__record_not_empty = threading.Event()
+        self.__mutex = threading.Lock()
+        self.__record_borrowed = 0
+        self.__running = False
+        self.__thread = None
+        self.__last_error = None
+        self.__lost_frame_base = None
+        self.__reset_statistics()
+
+    def __reset_statistics(self):
+        self.__acquired_count = 0
+        self.__timeout_count = 0
+        self.__incomplete_drop_count = 0
+        self.__latest_count = 0
+        self.__recorded_count = 0
+        self.__record_copy_count = 0
+        self.__record_drop_count = 0
+
+    def start(self):
+        """
+        :brief      Start the acquisition thread
+        :return:    None
+        """
+        if self.__running:
+            return
+
+        self.__reset_statistics()
+        self.__last_error = None
+        try:
+            self.__lost_frame_base = self.__data_stream.StreamLostFrameCount.get()
+        except Exception:
+            self.__lost_frame_base = None
+
+        self.__mailbox.open()
+        self.__running = True
+        self.__thread = threading.Thread(target=self.__run, name="MailboxWorker")
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def stop(self):
+        """
+        :brief      Stop the acquisition thread and give the frames of both channels back to the driver
+        :return:    None
+        """
+        if not self.__running:
+            return
+
+        self.__running = False
+        self.__thread.join()
+        self.__thread = None
+        self.__mailbox.close()
+        while True:
+            try:
+                self.__record_queue.popleft().release()
+            except IndexError:
+                break
+        self.__record_not_empty.set()
+
+    def is_running(self):
+        """
+        :brief      Whether the acquisition thread is running
+        :return:    True/False
+        """
+        return self.__running
+
+    def get_last_error(self):
+        """
+        :brief      Get the exception that stopped the acquisition thread
+        :return:    Exception object, None if the thread didn't fail
+        """
+        return self.__last_error
+
+    def get_latest(self, timeout=1000):
+        """
+        :brief      Control channel: take the newest frame, waiting if it was already taken.
+                    Release the image when done with it, its driver buffer is shared with the record channel.
+        :param      timeout:    wait time in ms, range:[0, 0xFFFFFFFF]
+        :return:    RawImage object, None on timeout or when the worker is stopped
+        """
+        if not isinstance(timeout, INT_TYPE):
+            raise ParameterTypeError("MailboxWorker.get_latest: "
+                                     "Expected timeout type is int, not %s" % type(timeout))
+
+        if (timeout < 0) or (timeout > UNSIGNED_INT_MAX):
+            print("MailboxWorker.get_latest: "
+                  "timeout out of bounds, minimum=0, maximum=%s"
+                  % hex(UNSIGNED_INT_MAX).__str__())
+            return None
+
+        image = self.__mailbox.take(timeout)
+        if image is not None:
+            self.__latest_count += 1
+        return image
+
+    def get_record_image(self, timeout=1000):
+        """
+        :brief      Record channel: take the oldest frame not yet recorded
+        :param      timeout:    wait time in ms, range:[0, 0xFFFFFFFF]
+        :return:    RawImage object, None on timeout or when the worker is stopped
+        """
+        if not isinstance(timeout, INT_TYPE):
+            raise ParameterTypeError("MailboxWorker.get_record_image: "
+                                     "Expected timeout type is int, not %s" % type(timeout))
+
+        if (timeout < 0) or (timeout > UNSIGNED_INT_MAX):
+            print("MailboxWorker.get_record_image: "
+                  "timeout out of bounds, minimum=0, maximum=%s"
+                  % hex(UNSIGNED_INT_MAX).__str__())
+            return None
+
+        deadline = time.monotonic() + timeout / 1000.0
+        while True:
+            try:
+                image = self.__record_queue.popleft()
+                self.__recorded_count += 1
+                return image
+            except IndexError:
+                pass
+
+            if not self.__running:
+                return None
+
+            # clear first and look again, a frame queued in between would otherwise be missed
+            self.__record_not_empty.clear()
+            if len(self.__record_queue) != 0:
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.__record_not_empty.wait(remaining):
+                return None
+
+    def get_record_queue_length(self):
+        """
+        :brief      Get the number of frames waiting for the recorder
+        :return:    queue length
+        """
+        return len(self.__record_queue)
+
+    def get_statistics(self):
+        """
+        :brief      Get frame counters since start()
+                    acquired:           frames dequeued from the driver
+                    timeout:            dq_buf timeouts
+                    incomplete_dropped: frames dropped because their status is not SUCCESS
+                    latest:             frames taken by get_latest
+                    overwritten:        frames replaced in the mailbox before get_latest took them
+                    recorded:           frames taken by get_record_image
+                    record_copied:      frames copied for the record channel because it held
+                                        record_buffer_num driver buffers
+                    record_dropped:     frames dropped because the record queue was full
+                    driver_lost:        StreamLostFrameCount increase, None if the feature is not readable
+        :return:    dict
+        """
+        driver_lost = None
+        if self.__lost_frame_base is not None:
+            try:
+                driver_lost = self.__data_stream.StreamLostFrameCount.get() - self.__lost_frame_base
+            except Exception:
+                driver_lost = None
+
+        return {
+            "acquired": self.__acquired_count,
+            "timeout": self.__timeout_count,
+            "incomplete_dropped": self.__incomplete_drop_count,
+            "latest": self.__latest_count,
+            "overwritten": self.__mailbox.get_statistics()["overwritten"],
+            "recorded": self.__recorded_count,
+            "record_copied": self.__record_copy_count,
+            "record_dropped": self.__record_drop_count,
+            "driver_lost": driver_lost,
+        }
+
+    def __run(self):
+        """
+        :brief      Acquisition thread body
+        :return:    None
+        """
+        while self.__running:
+            if self.__data_stream.acquisition_flag is False:
+                time.sleep(0.01)
+                continue
+
+            try:
+                image = self.__data_stream.dq_buf(self.__timeout, zero_copy=True)
+            except Exception as error:
+                self.__last_error = error
+                self.__running = False
+                self.__mailbox.close()
+                self.__record_not_empty.set()
+                return
+
+            if image is None:
+                self.__timeout_count += 1
+                continue
+
+            self.__acquired_count += 1
+            if self.__drop_incomplete and image.get_status() != GxFrameStatusList.SUCCESS:
+                self.__incomplete_drop_count += 1
+                image.release()
+                continue
+
+            self.__dispatch(image)
+
+    def __dispatch(self, image):
+        """
+        :brief      Hand a dequeued frame to both channels
+        :param      image:  zero-copy RawImage from dq_buf
+        :return:    None
+        """
+        record_image = None
+        record_borrows = False
+        if len(self.__record_queue) >= self.__record_queue_size:
+            self.__record_drop_count += 1
+        else:
+            with self.__mutex:
+                record_borrows = self.__record_borrowed < self.__record_buffer_num
+                if record_borrows:
+                    self.__record_borrowed += 1
+            if not record_borrows:
+                # the recorder is behind, keep its frame without keeping the driver buffer
+                record_image = image.copy()
+                self.__record_copy_count += 1
+
+        shared = _SharedFrame(image, 2 if record_borrows else 1)
+        latest_image = self.__borrow(shared, False)
+        if record_borrows:
+            record_image = self.__borrow(shared, True)
+
+        self.__mailbox.put(latest_image)
+        if record_image is not None:
+            self.__record_queue.append(record_image)
+            self.__record_not_empty.set()
+
+    def __borrow(self, shared, record):
+        """
+        :brief      An image over the driver buffer of a shared frame
+        """
+        image = RawImage(GxFrameData.from_buffer_copy(shared.image.frame_data),
+                         BufferLease(functools.partial(self.__give_back, shared, record)))
+        image.user_param = shared.image.user_param
+        return image
+
+    def __give_back(self, shared, record):
+        """
+        :brief      Release one borrower of a shared frame, the last one queues the buffer back
+        """
+        with self.__mutex:
+            shared.count -= 1
+            if record:
+                self.__record_borrowed -= 1
+            last = shared.count == 0
+        if last:
+            shared.image.release()
+            shared.image = None
@@ -9,6 +9,9 @@ from gxipy.dxwrapper import *
 from gxipy.gxiapi import *
 from gxipy.gxidef import *
 from gxipy.ImageProc import *
+from gxipy.ConvertEngine import *
+import os
+import threading
 import types
 
 if sys.version_info.major > 2:
@@ -43,10 +46,10 @@ class ImageFormatConvert:
         if not (isinstance(dest_pixel_format, INT_TYPE)):
             raise ParameterTypeError("dest_pixel_format must to be GxPixelFormatEntry's element.")
 
-        self.__check_handle()
-        status = dx_image_format_convert_set_output_pixel_format(self.image_convert_handle, dest_pixel_format)
-        if status != DxStatus.OK:
-            raise UnexpectedError("dx_image_format_convert_set_output_pixel_format failure, Error code:%s" % hex(status).__str__())
+        if self.__check_handle():
+            status = dx_image_format_convert_set_output_pixel_format(self.image_convert_handle, dest_pixel_format)
+            if status != DxStatus.OK:
+                raise UnexpectedError("dx_image_format_convert_set_output_pixel_format failure, Error code:%s" % hex(status).__str__())
         self.image_pixel_format_des = dest_pixel_format
 
     def get_dest_format(self):
@@ -54,7 +57,9 @@ class ImageFormatConvert:
         :brief     get desired pixel format
         :param:    dest_pixel_format(desired pixel format)
         """
-        self.__check_handle()
+        if not self.__check_handle():
+            return self.image_pixel_format_des
+
         status, pixel_format = dx_image_format_convert_get_output_pixel_format(self.image_convert_handle)
         if status != DxStatus.OK:
             raise UnexpectedError("dx_image_format_convert_get_output_pixel_format failure, Error code:%s" % hex(status).__str__())
@@ -69,10 +74,10 @@ class ImageFormatConvert:
         if not isinstance(cvt_type, INT_TYPE):
             raise ParameterTypeError("cc_type param must be int in DxRGBChannelOrder")
 
-        self.__check_handle()
-        status = dx_image_format_convert_set_interpolation_type(self.image_convert_handle, cvt_type)
-        if status != DxStatus.OK:
-            raise UnexpectedError("dx_image_format_convert_set_interpolation_type failure, Error code:%s" % hex(status).__str__())
+        if self.__check_handle():
+            status = dx_image_format_convert_set_interpolation_type(self.image_convert_handle, cvt_type)
+            if status != DxStatus.OK:
+                raise UnexpectedError("dx_image_format_convert_set_interpolation_type failure, Error code:%s" % hex(status).__str__())
         self.interpolation_type = cvt_type
 
     def get_interpolation_type(self):
@@ -90,13 +95,13 @@ class ImageFormatConvert:
         if not isinstance(alpha_value, INT_TYPE):
             raise ParameterTypeError("alpha_value param must be int type.")
 
-        self.__check_handle()
         if alpha_value < 0 or alpha_value > 255:
             raise InvalidParameter("DX_PARAMETER_OUT_OF_BOUND")
 
-        status = dx_image_format_convert_set_alpha_value(self.image_convert_handle, alpha_value)
-        if status != DxStatus.OK:
-            raise UnexpectedError("image_format_convert_set_alpha_value failure, Error code:%s" % hex(status).__str__())
+        if self.__check_handle():
+            status = dx_image_format_convert_set_alpha_value(self.image_convert_handle, alpha_value)
+            if status != DxStatus.OK:
+                raise UnexpectedError("image_format_convert_set_alpha_value failure, Error code:%s" % hex(status).__str__())
 
         self.alpha_value = alpha_value
 
@@ -116,10 +121,10 @@ class ImageFormatConvert:
         if not isinstance(valid_bits, INT_TYPE):
             raise ParameterTypeError("valid_bits param must be int in DxValidBit element.")
 
-        self.__check_handle()
-        status = dx_image_format_convert_set_valid_bits(self.image_convert_handle, valid_bits)
-        if status != DxStatus.OK:
-            raise UnexpectedError("image_format_convert_set_alpha_value failure, Error code:%s" % hex(status).__str__())
+        if self.__check_handle():
+            status = dx_image_format_convert_set_valid_bits(self.image_convert_handle, valid_bits)
+            if status != DxStatus.OK:
+                raise UnexpectedError("image_format_convert_set_alpha_value failure, Error code:%s" % hex(status).__str__())
 
         self.valid_bits = valid_bits
 
@@ -146,7 +151,9 @@ class ImageFormatConvert:
         if not (isinstance(pixel_format, INT_TYPE)):
             raise ParameterTypeError("pixel_format must to be GxPixelFormatEntry's element.")
 
-        self.__check_handle()
+        if not self.__check_handle():
+            return get_pixel_buffer_size(pixel_format, width, height)
+
         status, buffer_size_c = dx_image_format_convert_get_buffer_size_for_conversion(self.image_convert_handle, pixel_format, width, height)
         if status != DxStatus.OK:
             raise UnexpectedError("image_format_convert_get_buffer_size_for_conversion failure, Error code:%s" % hex(status).__str__())
@@ -164,7 +171,9 @@ class ImageFormatConvert:
         if not isinstance(raw_image, RawImage):
             raise ParameterTypeError("raw_image param must be RawImage type")
 
-        self.__check_handle()
+        if not self.__check_handle():
+            return get_pixel_buffer_size(self.image_pixel_format_des, raw_image.get_width(), raw_image.get_height())
+
         status, buffer_size_c = dx_image_format_convert_get_buffer_size_for_conversion(self.image_convert_handle, self.image_pixel_format_des,
                                                                                        raw_image.get_width(), raw_image.get_height())
         if status != DxStatus.OK:
@@ -257,9 +266,15 @@ class ImageFormatConvert:
         if not (isinstance(flip, bool)):
             raise ParameterTypeError("flip must to be  bool type.")
 
-        self.__check_handle()
         input_length = self.get_buffer_size_for_conversion_ex(input_width, input_height, src_fixel_format)
+        engine = ConvertEngineManager.select(src_fixel_format, self.image_pixel_format_des)
+        if engine is not None:
+            engine.convert(input_address, input_length, output_address, output_length, src_fixel_format,
+                           self.image_pixel_format_des, input_width, input_height, self.valid_bits,
+                           self.interpolation_type, DxRGBChannelOrder.ORDER_RGB, flip)
+            return
 
+        self.__check_handle()
         status = dx_image_format_convert(self.image_convert_handle, input_address, input_length, output_address, output_length, src_fixel_format, input_width,
                                 input_height, flip)
         if status != DxStatus.OK:
@@ -340,25 +355,180 @@ class ImageFormatConvert:
         if not (isinstance(flip, bool)):
             raise ParameterTypeError("flip must to be  bool type.")
 
-        self.__check_handle()
         input_length = self.get_buffer_size_for_conversion_ex(raw_image.get_width(), raw_image.get_height(), raw_image.get_pixel_format())
+        engine = ConvertEngineManager.select(raw_image.get_pixel_format(), self.image_pixel_format_des)
+        if engine is not None:
+            engine.convert(raw_image.frame_data.image_buf, input_length, output_address, output_length,
+                           raw_image.get_pixel_format(), self.image_pixel_format_des, raw_image.get_width(),
+                           raw_image.get_height(), self.valid_bits, self.interpolation_type,
+                           DxRGBChannelOrder.ORDER_RGB, flip)
+            return
 
+        self.__check_handle()
         status = dx_image_format_convert(self.image_convert_handle, raw_image.frame_data.image_buf, input_length, output_address,
                                          output_length, raw_image.get_pixel_format(), raw_image.get_width(), raw_image.get_height(), flip)
         if status != DxStatus.OK:
             raise UnexpectedError("image_format_convert failure, Error code:%s" % hex(status).__str__())
 
+    def convert_batch(self, raw_images, dest_format, out=None, flip=False, thread_num=None):
+        """
+        :brief  Convert a list of images of the same size and pixel format into one numpy array.
+                The frames are split into contiguous chunks, one per thread, every thread reuses one
+                conversion handle configured like this object for its whole chunk.
+        :param  raw_images:     list of RawImage, same width, height and pixel format
+        :param  dest_format:    output pixel format, GxPixelFormatEntry, planar formats are not supported
+        :param  out:            C-contiguous numpy array of shape (N, H, W, C) and the dtype of dest_format
+                                (uint8, uint16 above 8 bit), None allocates it
+        :param  flip:           Image flip or not, true:flip false:not flip
+        :param  thread_num:     number of threads, None uses the cpu count
+        :return numpy array (N, H, W, C)
+        """
+        if not isinstance(raw_images, (list, tuple)) or len(raw_images) == 0:
+            raise ParameterTypeError("raw_images param must be a non empty list of RawImage")
+
+        for raw_image in raw_images:
+            if not isinstance(raw_image, RawImage):
+                raise ParameterTypeError("raw_images param must be a non empty list of RawImage")
+            if raw_image.frame_data.image_buf is None:
+                raise ParameterTypeError("raw_image.frame_data.image_buf is NULL pointer")
+
+        if not (isinstance(dest_format, INT_TYPE)):
+            raise ParameterTypeError("dest_format must to be GxPixelFormatEntry's element.")
+
+        if not (isinstance(flip, bool)):
+            raise ParameterTypeError("flip must to be  bool type.")
+
+        if thread_num is None:
+            thread_num = os.cpu_count() or 1
+        elif not isinstance(thread_num, INT_TYPE):
+            raise ParameterTypeError("thread_num param must be int type.")
+        elif thread_num < 1:
+            raise InvalidParameter("thread_num must be greater than 0")
+
+        width = raw_images[0].get_width()
+        height = raw_images[0].get_height()
+        src_format = raw_images[0].get_pixel_format()
+        for raw_image in raw_images:
+            if raw_image.get_width() != width or raw_image.get_height() != height or \
+                    raw_image.get_pixel_format() != src_format:
+                raise InvalidParameter("raw_images must have the same width, height and pixel format")
+
+        planar_formats = (GxPixelFormatEntry.RGB8_PLANAR, GxPixelFormatEntry.RGB10_PLANAR,
+                          GxPixelFormatEntry.RGB12_PLANAR, GxPixelFormatEntry.RGB16_PLANAR,
+                          GxPixelFormatEntry.YUV420_8_PLANAR)
+        if dest_format in planar_formats:
+            raise InvalidParameter("convert_batch does not support planar output formats")
+
+        if self.image_pixel_format_des != dest_format:
+            self.set_dest_format(dest_format)
+
+        frame_length = self.get_buffer_size_for_conversion_ex(width, height, dest_format)
+        input_length = self.get_buffer_size_for_conversion_ex(width, height, src_format)
+
+        if (dest_format & PIXEL_BIT_MASK) in (GX_PIXEL_16BIT, GX_PIXEL_48BIT):
+            dtype = numpy.uint16
+        else:
+            dtype = numpy.uint8
+
+        pixel_length = width * height * numpy.dtype(dtype).itemsize
+        if frame_length % pixel_length != 0:
+            raise InvalidParameter("convert_batch does not support this output format")
+
+        shape = (len(raw_images), height, width, frame_length // pixel_length)
+        if out is None:
+            out = numpy.empty(shape, dtype=dtype)
+        elif not isinstance(out, numpy.ndarray):
+            raise ParameterTypeError("out param must be numpy.ndarray type.")
+        elif out.shape != shape or out.dtype != dtype or not out.flags["C_CONTIGUOUS"] or not out.flags["WRITEABLE"]:
+            raise InvalidParameter("out must be a writeable C-contiguous %s array of shape %s"
+                                   % (numpy.dtype(dtype).name, str(shape)))
+
+        engine = ConvertEngineManager.select(src_format, dest_format)
+        thread_num = min(thread_num, len(raw_images))
+        chunk = (len(raw_images) + thread_num - 1) // thread_num
+        output_address = out.ctypes.data
+        errors = []
+
+        def convert_chunk(handle, begin, end):
+            try:
+                for index in range(begin, end):
+                    raw_image = raw_images[index]
+                    if engine is not None:
+                        engine.convert(raw_image.frame_data.image_buf, input_length,
+                                       output_address + index * frame_length, frame_length, src_format,
+                                       dest_format, width, height, self.valid_bits, self.interpolation_type,
+                                       DxRGBChannelOrder.ORDER_RGB, flip)
+                        continue
+                    status = dx_image_format_convert(handle, raw_image.frame_data.image_buf, input_length,
+                                                     output_address + index * frame_length, frame_length,
+                                                     src_format, width, height, flip)
+                    if status != DxStatus.OK:
+                        raise UnexpectedError("image_format_convert failure, Error code:%s" % hex(status).__str__())
+            except Exception as error:
+                errors.append(error)
+
+        if engine is None:
+            self.__check_handle()
+            handles = [self.image_convert_handle]
+        else:
+            handles = [None]
+        threads = []
+        try:
+            for _ in range(1, thread_num):
+                handles.append(self.__create_configured_handle() if engine is None else None)
+
+            for index, handle in enumerate(handles):
+                begin = index * chunk
+                end = min(begin + chunk, len(raw_images))
+                if begin >= end:
+                    break
+                thread = threading.Thread(target=convert_chunk, args=(handle, begin, end))
+                thread.start()
+                threads.append(thread)
+        finally:
+            for thread in threads:
+                thread.join()
+            for handle in handles[1:]:
+                if handle is not None:
+                    dx_image_format_convert_destroy(handle)
+
+        if len(errors) != 0:
+            raise errors[0]
+
+        return out
+
+    def __create_configured_handle(self):
+        """
+        :brief  Create an extra conversion handle with the settings of this object
+        :return handle
+        """
+        status, handle = dx_image_format_convert_create()
+        if status != DxStatus.OK:
+            raise UnexpectedError("dx_image_format_convert_create failure, Error code:%s" % hex(status).__str__())
+
+        settings = ((dx_image_format_convert_set_output_pixel_format, self.image_pixel_format_des),
+                    (dx_image_format_convert_set_valid_bits, self.valid_bits),
+                    (dx_image_format_convert_set_alpha_value, self.alpha_value),
+                    (dx_image_format_convert_set_interpolation_type, self.interpolation_type))
+        for setter, value in settings:
+            status = setter(handle, value)
+            if status != DxStatus.OK:
+                dx_image_format_convert_destroy(handle)
+                raise UnexpectedError("%s failure, Error code:%s" % (setter.__name__, hex(status).__str__()))
+
+        return handle
+
     def __check_handle(self):
         """
         :brief  The transformation handle is initialized the first time it is called
-        :return NONE
+        :return False if DxImageProc is not loaded and conversions go through the numpy engine
         """
+        if not ConvertEngineManager.is_dx_available():
+            return False
+
         if self.image_convert_handle is None:
             status, handle = dx_image_format_convert_create()
             if status != DxStatus.OK:
                 raise UnexpectedError("dx_image_format_convert_create failure, Error code:%s" % hex(status).__str__())
             self.image_convert_handle = handle
-
-
-
-
+        return True
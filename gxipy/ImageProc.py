@@ -9,6 +9,10 @@ from gxipy.dxwrapper import *
 from gxipy.gxidef import *
 from gxipy.gxiapi import *
 from gxipy.StatusProcessor import *
+from gxipy.ConvertEngine import *
+import collections
+import threading
+import weakref
 import types
 
 COLOR_TRANSFORM_MATRIX_SIZE = 9  # 3*3
@@ -61,6 +65,207 @@ class Buffer:
         return len(self.data_array)
 
 
+class BufferLease:
+    """
+    Lifetime handle of a buffer that an image borrows instead of copying (zero-copy mode).
+    The release function is called exactly once: either by release(), or when the last object
+    attached to the lease (the image array and every numpy view over it) has been garbage collected.
+    """
+    def __init__(self, release_func=None):
+        """
+        :brief  Constructor for instance initialization
+        :param  release_func:   called without arguments when the buffer is given back, may be None
+        """
+        self.__release_func = release_func
+        self.__released = False
+
+    def attach(self, owner):
+        """
+        :brief      Release the lease automatically once owner has been garbage collected
+        :param      owner:  object that keeps the borrowed memory reachable
+        :return:    None
+        """
+        weakref.finalize(owner, self.release)
+
+    def release(self):
+        """
+        :brief      Give the borrowed buffer back, later calls do nothing
+        :return:    None
+        """
+        if self.__released:
+            return
+
+        self.__released = True
+        if self.__release_func is not None:
+            self.__release_func()
+
+    def is_released(self):
+        """
+        :brief      Whether the borrowed buffer has been given back
+        :return:    bool
+        """
+        return self.__released
+
+
+def _destroy_convert_handles(entries):
+    """
+    :brief      Destroy every handle of a _ConvertHandleSet, runs when its thread ends or on eviction
+    :param      entries:    OrderedDict key -> (handle, buffer_size)
+    :return:    None
+    """
+    while len(entries) != 0:
+        _, (handle, _) = entries.popitem(last=False)
+        status = dx_image_format_convert_destroy(handle)
+        if status != DxStatus.OK:
+            print("image_format_convert_destroy failure, Error code:%s" % hex(status).__str__())
+
+
+class _ConvertHandleSet:
+    """
+    DxImageFormatConvert handles of one thread, least recently used first.
+    """
+    def __init__(self):
+        self.entries = collections.OrderedDict()
+        self.generation = None
+        weakref.finalize(self, _destroy_convert_handles, self.entries)
+
+
+class _ConvertHandleCache:
+    """
+    Per-thread LRU cache of configured DxImageFormatConvert handles used by RawImage.convert.
+    A handle is keyed by (output format, valid_bits, interpolation type, channel order, width, height)
+    and keeps the output buffer size queried for it, so a cached conversion is a single
+    dx_image_format_convert call. Handles are not shared between threads.
+    """
+    capacity = 8
+    # bumped by resize, a thread destroys its handles when it sees another generation
+    generation = 0
+    hit_count = 0
+    miss_count = 0
+    __local = threading.local()
+    __lock = threading.Lock()
+
+    @staticmethod
+    def __get_handle_set():
+        handle_set = getattr(_ConvertHandleCache.__local, "handle_set", None)
+        if handle_set is None:
+            handle_set = _ConvertHandleSet()
+            _ConvertHandleCache.__local.handle_set = handle_set
+        elif handle_set.generation != _ConvertHandleCache.generation:
+            _destroy_convert_handles(handle_set.entries)
+        handle_set.generation = _ConvertHandleCache.generation
+        return handle_set
+
+    @staticmethod
+    def resize(capacity):
+        """
+        :brief      Set the number of handles kept per thread, every thread drops its handles on its next conversion
+        :return:    None
+        """
+        with _ConvertHandleCache.__lock:
+            _ConvertHandleCache.capacity = capacity
+            _ConvertHandleCache.generation += 1
+        _ConvertHandleCache.clear()
+
+    @staticmethod
+    def get_statistics():
+        """
+        :return:    dict {"capacity", "hit", "miss"}
+        """
+        with _ConvertHandleCache.__lock:
+            return {"capacity": _ConvertHandleCache.capacity,
+                    "hit": _ConvertHandleCache.hit_count,
+                    "miss": _ConvertHandleCache.miss_count}
+
+    @staticmethod
+    def create(pixelformat, valid_bits, convert_type, channel_order, width, height):
+        """
+        :brief      Create and configure a DxImageFormatConvert handle
+        :return:    (handle, output buffer size)
+        """
+        status, handle = dx_image_format_convert_create()
+        if status != DxStatus.OK:
+            raise UnexpectedError("dx_image_format_convert_create failure, Error code:%s" % hex(status).__str__())
+
+        try:
+            status = dx_image_format_convert_set_output_pixel_format(handle, pixelformat)
+            if status != DxStatus.OK:
+                raise UnexpectedError(
+                    "dx_image_format_convert_set_output_pixel_format failure, Error code:%s" % hex(status).__str__())
+
+            status = dx_image_format_convert_set_valid_bits(handle, valid_bits)
+            if status != DxStatus.OK:
+                raise UnexpectedError("image_format_convert_set_valid_bits failure, Error code:%s" % hex(status).__str__())
+
+            status = dx_image_format_convert_set_alpha_value(handle, channel_order)
+            if status != DxStatus.OK:
+                raise UnexpectedError("image_format_convert_set_alpha_value failure, Error code:%s" % hex(status).__str__())
+
+            status = dx_image_format_convert_set_interpolation_type(handle, convert_type)
+            if status != DxStatus.OK:
+                raise UnexpectedError("image_format_convert_set_interpolation_type failure, Error code:%s" % hex(status).__str__())
+
+            status, buffer_size_c = dx_image_format_convert_get_buffer_size_for_conversion(handle, pixelformat,
+                                                                                           width, height)
+            if status != DxStatus.OK:
+                raise UnexpectedError("dx_image_format_convert_get_buffer_size_for_conversion failure, Error code:%s" % hex(status).__str__())
+        except UnexpectedError:
+            dx_image_format_convert_destroy(handle)
+            raise
+
+        return handle, buffer_size_c
+
+    @staticmethod
+    def acquire(pixelformat, valid_bits, convert_type, channel_order, width, height):
+        """
+        :brief      Get a configured handle of the calling thread, creating it on a miss
+        :return:    (handle, output buffer size)
+        """
+        entries = _ConvertHandleCache.__get_handle_set().entries
+        if _ConvertHandleCache.capacity == 0:
+            return _ConvertHandleCache.create(pixelformat, valid_bits, convert_type, channel_order, width, height)
+
+        key = (pixelformat, valid_bits, convert_type, channel_order, width, height)
+        entry = entries.get(key)
+        if entry is not None:
+            entries.move_to_end(key)
+            with _ConvertHandleCache.__lock:
+                _ConvertHandleCache.hit_count += 1
+            return entry
+
+        with _ConvertHandleCache.__lock:
+            _ConvertHandleCache.miss_count += 1
+        entry = _ConvertHandleCache.create(pixelformat, valid_bits, convert_type, channel_order, width, height)
+        entries[key] = entry
+        while len(entries) > _ConvertHandleCache.capacity:
+            _, (handle, _) = entries.popitem(last=False)
+            dx_image_format_convert_destroy(handle)
+        return entry
+
+    @staticmethod
+    def release(handle):
+        """
+        :brief      Give a handle back after the conversion, only uncached handles are destroyed
+        :return:    None
+        """
+        # looked up in the cache rather than by capacity, which another thread may have changed since acquire
+        handle_set = getattr(_ConvertHandleCache.__local, "handle_set", None)
+        if handle_set is not None and any(cached is handle for cached, buffer_size in handle_set.entries.values()):
+            return
+
+        status = dx_image_format_convert_destroy(handle)
+        if status != DxStatus.OK:
+            raise UnexpectedError("image_format_convert_destroy failure, Error code:%s" % hex(status).__str__())
+
+    @staticmethod
+    def clear():
+        """
+        :brief      Destroy the cached handles of the calling thread
+        :return:    None
+        """
+        _destroy_convert_handles(_ConvertHandleCache.__get_handle_set().entries)
+
+
 class RGBImage:
     def __init__(self, frame_data):
         self.frame_data = frame_data
@@ -206,10 +411,22 @@ class RGBImage:
         return self.frame_data.image_size
 
 class RawImage:
-    def __init__(self, frame_data):
+    def __init__(self, frame_data, lease=None):
+        """
+        :brief  Constructor for instance initialization
+        :param  frame_data:     GxFrameData, a new buffer is allocated when image_buf is None
+        :param  lease:          BufferLease, if given the image borrows frame_data.image_buf (zero-copy)
+                                instead of copying it, the lease is released when the image and all
+                                numpy views over it have been dropped
+        """
         self.frame_data = frame_data
+        self.__lease = None
 
-        if self.frame_data.image_buf is not None:
+        if self.frame_data.image_buf is not None and lease is not None:
+            self.__image_array = (c_ubyte * self.frame_data.image_size).from_address(self.frame_data.image_buf)
+            self.__lease = lease
+            self.__lease.attach(self.__image_array)
+        elif self.frame_data.image_buf is not None:
             self.__image_array = string_at(self.frame_data.image_buf, self.frame_data.image_size)
         else:
             self.__image_array = (c_ubyte * self.frame_data.image_size)()
@@ -304,31 +521,13 @@ class RawImage:
             print("ImageProc.__convert_to_special_pixelformat: not support")
             return None
 
-        status, handle = dx_image_format_convert_create()
-        if status != DxStatus.OK:
-            raise UnexpectedError("dx_image_format_convert_create failure, Error code:%s" % hex(status).__str__())
-
-        status = dx_image_format_convert_set_output_pixel_format(handle, pixelformat)
-        if status != DxStatus.OK:
-            raise UnexpectedError(
-                "dx_image_format_convert_set_output_pixel_format failure, Error code:%s" % hex(status).__str__())
-
-        status = dx_image_format_convert_set_valid_bits(handle, valid_bits)
-        if status != DxStatus.OK:
-            raise UnexpectedError("image_format_convert_set_valid_bits failure, Error code:%s" % hex(status).__str__())
-
-        status = dx_image_format_convert_set_alpha_value(handle, channel_order)
-        if status != DxStatus.OK:
-            raise UnexpectedError("image_format_convert_set_alpha_value failure, Error code:%s" % hex(status).__str__())
-
-        status = dx_image_format_convert_set_interpolation_type(handle, convert_type)
-        if status != DxStatus.OK:
-            raise UnexpectedError("image_format_convert_set_interpolation_type failure, Error code:%s" % hex(status).__str__())
-
-        status, buffer_size_c = dx_image_format_convert_get_buffer_size_for_conversion(handle, pixelformat,
-                                                                                       self.frame_data.width, self.frame_data.height)
-        if status != DxStatus.OK:
-            raise UnexpectedError("dx_image_format_convert_get_buffer_size_for_conversion failure, Error code:%s" % hex(status).__str__())
+        engine = ConvertEngineManager.select(self.frame_data.pixel_format, pixelformat)
+        if engine is not None:
+            handle = None
+            buffer_size_c = engine.get_buffer_size(pixelformat, self.frame_data.width, self.frame_data.height)
+        else:
+            handle, buffer_size_c = _ConvertHandleCache.acquire(pixelformat, valid_bits, convert_type, channel_order,
+                                                                self.frame_data.width, self.frame_data.height)
 
         image = None
         frame_data = GxFrameData()
@@ -346,15 +545,19 @@ class RawImage:
         else:
             image = RawImage(frame_data)
 
+        if engine is not None:
+            engine.convert(self.frame_data.image_buf, self.frame_data.image_size, image.frame_data.image_buf,
+                           image.frame_data.image_size, self.frame_data.pixel_format, pixelformat,
+                           self.frame_data.width, self.frame_data.height, valid_bits, convert_type, channel_order, flip)
+            return image
+
         status = dx_image_format_convert(handle, self.frame_data.image_buf, self.frame_data.image_size, image.frame_data.image_buf,
                                          image.frame_data.image_size, self.frame_data.pixel_format, self.frame_data.width, self.frame_data.height, flip)
         if status != DxStatus.OK:
+            _ConvertHandleCache.release(handle)
             raise UnexpectedError("image_format_convert failure, Error code:%s" % hex(status).__str__())
 
-        status = dx_image_format_convert_destroy(handle)
-        if status != DxStatus.OK:
-            raise UnexpectedError("image_format_convert_destroy failure, Error code:%s" % hex(status).__str__())
-
+        _ConvertHandleCache.release(handle)
         return image
 
     def __raw8_to_rgb(self, raw8_image, convert_type, pixel_color_filter, flip):
@@ -949,25 +1152,38 @@ class RawImage:
         image_str = string_at(self.__image_array, self.frame_data.image_size)
         return image_str
 
+    def get_buffer(self):
+        """
+        :brief      The payload held by the image, nothing is copied: its own copy, or the driver buffer
+                    borrowed by a zero-copy image. frame_data.image_buf of a copied dq_buf or capture
+                    callback image still points at the driver buffer, read the payload through this.
+        :return:    memoryview of image_size bytes
+        """
+        return memoryview(self.__image_array)
+
     def get_chunkdata(self):
         """
         :brief      get Raw data
         :return:    raw data[string]
         """
-        if self.frame_data.pixel_format & PIXEL_BIT_MASK == GX_PIXEL_8BIT:
-            imagedata_size = self.frame_data.width * self.frame_data.height
-        elif self.frame_data.pixel_format & PIXEL_BIT_MASK == GX_PIXEL_16BIT:
-            imagedata_size = self.frame_data.width * self.frame_data.height * 2
-        elif self.frame_data.pixel_format & PIXEL_BIT_MASK == GX_PIXEL_12BIT:
-            imagedata_size = int(self.frame_data.width * self.frame_data.height * 1.5)
-        elif self.frame_data.pixel_format & PIXEL_BIT_MASK == GX_PIXEL_24BIT:
-            imagedata_size = self.frame_data.width * self.frame_data.height * 3
-        else:
-            imagedata_size = 0
+        imagedata_size = Utility.get_image_data_size(self.frame_data.pixel_format, self.frame_data.width,
+                                                     self.frame_data.height)
 
         chunkdata_str = string_at(self.frame_data.image_buf+imagedata_size, self.frame_data.image_size - imagedata_size )
         return chunkdata_str
 
+    def get_chunkdata_array(self):
+        """
+        :brief      get the chunk data as a view on the image buffer, nothing is copied
+        :return:    numpy.Array object of uint8, empty if the payload holds no chunk data
+        """
+        imagedata_size = Utility.get_image_data_size(self.frame_data.pixel_format, self.frame_data.width,
+                                                     self.frame_data.height)
+        if imagedata_size >= self.frame_data.image_size:
+            return numpy.zeros(0, dtype=numpy.uint8)
+        return numpy.frombuffer(self.__image_array, dtype=numpy.uint8,
+                                count=self.frame_data.image_size - imagedata_size, offset=imagedata_size)
+
     def save_raw(self, file_path):
         """
         :brief      save raw data
@@ -1041,10 +1257,202 @@ class RawImage:
         """
         return self.user_param
 
+    def is_zero_copy(self):
+        """
+        :brief      Whether the image borrows its buffer instead of owning a copy
+        :return:    bool
+        """
+        return self.__lease is not None
+
+    def get_lease(self):
+        """
+        :brief      Get the lifetime handle of the borrowed buffer
+        :return:    BufferLease object, None if the image owns its buffer
+        """
+        return self.__lease
+
+    def copy(self):
+        """
+        :brief      Copy the image into a buffer it owns, frame_data.image_buf points at the copy,
+                    so the copy stays valid once the driver buffer of a zero-copy image is released
+        :return:    RawImage object
+        """
+        frame_data = GxFrameData.from_buffer_copy(self.frame_data)
+        frame_data.image_buf = None
+        raw_image = RawImage(frame_data)
+        memmove(raw_image.frame_data.image_buf, self.__image_array, self.frame_data.image_size)
+        raw_image.user_param = self.user_param
+        return raw_image
+
+    def release(self):
+        """
+        :brief      Give a borrowed buffer back before the image is dropped.
+                    numpy arrays returned by get_numpy_array must not be used afterwards.
+        :return:    None
+        """
+        if self.__lease is not None:
+            self.__lease.release()
+
+
+# borrowed views kept by a CaptureFrame, one per driver buffer (the driver reuses a fixed set)
+CAPTURE_FRAME_VIEW_CACHE_NUM = 64
+
+
+class CaptureFrame:
+    """
+    Frame handed to a capture callback registered with DataStream.register_capture_callback(fast=True).
+    One object is reused for every frame of the stream and reads the fields of the driver's callback
+    parameter directly, the payload is the driver buffer itself: get_buffer and get_numpy_array return
+    borrowed views, built once per driver buffer, that are only valid until the callback returns.
+    retain() copies the frame into a RawImage that can be kept.
+    """
+    def __init__(self):
+        self.__param = None
+        self.__views = {}
+
+    def _bind(self, param):
+        """
+        :brief      Point the frame at the callback parameter of the current frame
+        :param      param:  GxFrameCallbackParam
+        """
+        self.__param = param
+
+    def _unbind(self):
+        self.__param = None
+
+    def __get_param(self, func_name):
+        param = self.__param
+        if param is None:
+            raise InvalidCall("CaptureFrame.%s: the frame is only valid during the capture callback, "
+                              "use retain() to keep it" % func_name)
+        return param
+
+    def __get_view(self, param):
+        """
+        :brief      (ctypes array, memoryview) over the driver buffer of param
+        """
+        key = (param.image_buf, param.image_size)
+        view = self.__views.get(key)
+        if view is None:
+            if len(self.__views) >= CAPTURE_FRAME_VIEW_CACHE_NUM:
+                self.__views.clear()
+            array = (c_ubyte * param.image_size).from_address(param.image_buf)
+            view = self.__views[key] = (array, memoryview(array), {})
+        return view
+
+    def is_valid(self):
+        """
+        :brief      Whether the frame may be read, only during the capture callback
+        :return:    bool
+        """
+        return self.__param is not None
+
+    def get_status(self):
+        return self.__get_param("get_status").status
+
+    def get_width(self):
+        return self.__get_param("get_width").width
+
+    def get_height(self):
+        return self.__get_param("get_height").height
+
+    def get_pixel_format(self):
+        return self.__get_param("get_pixel_format").pixel_format
+
+    def get_image_size(self):
+        return self.__get_param("get_image_size").image_size
+
+    def get_frame_id(self):
+        return self.__get_param("get_frame_id").frame_id
+
+    def get_timestamp(self):
+        return self.__get_param("get_timestamp").timestamp
+
+    def get_buffer(self):
+        """
+        :brief      The payload, borrowed from the driver until the callback returns
+        :return:    memoryview of image_size bytes
+        """
+        return self.__get_view(self.__get_param("get_buffer"))[1]
+
+    def get_numpy_array(self):
+        """
+        :brief      The payload as an array of Image.height * Image.width (* 3 for RGB8/BGR8), borrowed from
+                    the driver until the callback returns
+        :return:    numpy.Array object, None for an incomplete frame or a packed pixel format
+        """
+        param = self.__get_param("get_numpy_array")
+        if param.status != GxFrameStatusList.SUCCESS:
+            return None
+
+        array, buffer, arrays = self.__get_view(param)
+        key = (param.width, param.height, param.pixel_format)
+        image_np = arrays.get(key)
+        if image_np is not None:
+            return image_np
+
+        image_size = param.width * param.height
+        if param.pixel_format & PIXEL_BIT_MASK == GX_PIXEL_8BIT:
+            image_np = numpy.frombuffer(array, dtype=numpy.ubyte, count=image_size). \
+                reshape(param.height, param.width)
+        elif param.pixel_format & PIXEL_BIT_MASK == GX_PIXEL_16BIT:
+            image_np = numpy.frombuffer(array, dtype=numpy.uint16, count=image_size). \
+                reshape(param.height, param.width)
+        elif param.pixel_format in (GxPixelFormatEntry.RGB8, GxPixelFormatEntry.BGR8):
+            image_np = numpy.frombuffer(array, dtype=numpy.ubyte, count=image_size * 3). \
+                reshape(param.height, param.width, 3)
+        else:
+            return None
+        arrays[key] = image_np
+        return image_np
+
+    def retain(self):
+        """
+        :brief      Copy the frame out of the driver buffer
+        :return:    RawImage object owning its data
+        """
+        param = self.__get_param("retain")
+        frame_data = GxFrameData()
+        frame_data.image_buf = None
+        frame_data.width = param.width
+        frame_data.height = param.height
+        frame_data.pixel_format = param.pixel_format
+        frame_data.image_size = param.image_size
+        frame_data.frame_id = param.frame_id
+        frame_data.timestamp = param.timestamp
+        frame_data.status = param.status
+        if sys.platform == 'linux2' or sys.platform == 'linux':
+            frame_data.offset_x = param.offset_x
+            frame_data.offset_y = param.offset_y
+        raw_image = RawImage(frame_data)
+        # the copy is the buffer of the image, the driver buffer is reused once the callback returns
+        memmove(raw_image.frame_data.image_buf, param.image_buf, param.image_size)
+        return raw_image
+
+
 class Utility:
     def __init__(self):
         pass
 
+    @staticmethod
+    def get_image_data_size(pixel_format, width, height):
+        """
+        :brief      Size of the image data at the start of a payload, the chunk data follows it
+        :param      pixel_format:   pixel format, GxPixelFormatEntry
+        :param      width:          image width
+        :param      height:         image height
+        :return:    size in bytes, 0 for an unknown pixel size
+        """
+        if pixel_format & PIXEL_BIT_MASK == GX_PIXEL_8BIT:
+            return width * height
+        elif pixel_format & PIXEL_BIT_MASK == GX_PIXEL_16BIT:
+            return width * height * 2
+        elif pixel_format & PIXEL_BIT_MASK == GX_PIXEL_12BIT:
+            return int(width * height * 1.5)
+        elif pixel_format & PIXEL_BIT_MASK == GX_PIXEL_24BIT:
+            return width * height * 3
+        return 0
+
     @staticmethod
     def get_gamma_lut(gamma=1):
         """
@@ -1275,6 +1683,31 @@ class Utility:
         else:
             return GxPixelFormatEntry.UNDEFINED
 
+    @staticmethod
+    def set_convert_handle_cache_size(cache_size):
+        """
+        :brief      Set how many configured conversion handles RawImage.convert keeps per thread
+        :param      cache_size:     range:[0, 1024], 0 creates and destroys a handle for every frame
+        :return:    None
+        """
+        if not isinstance(cache_size, INT_TYPE):
+            raise ParameterTypeError("Utility.set_convert_handle_cache_size: "
+                                     "Expected cache_size type is int, not %s" % type(cache_size))
+
+        if (cache_size < 0) or (cache_size > 1024):
+            print("Utility.set_convert_handle_cache_size: cache_size out of bounds, range:[0, 1024]")
+            return
+
+        _ConvertHandleCache.resize(cache_size)
+
+    @staticmethod
+    def get_convert_handle_cache_statistics():
+        """
+        :brief      Get the conversion handle cache counters of all threads
+        :return:    dict {"capacity", "hit", "miss"}
+        """
+        return _ConvertHandleCache.get_statistics()
+
 class _InterUtility:
     def __init__(self):
         pass
@@ -0,0 +1,296 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+from gxipy.gxidef import *
+from gxipy.Pipeline import *
+from gxipy.Exception import *
+import collections
+import threading
+import time
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+# calibration points kept for the clock rate estimate
+LATENCY_CALIBRATION_POINT_NUM = 16
+
+
+class LatencyStage:
+    DEQUEUE = "dequeue"         # frame taken from the driver, LatencyTracer.begin
+    CONVERT = "convert"         # raw to RGB conversion
+    PROCESS = "process"         # image processing
+    SINK = "sink"               # consumer, LatencyTracer.end
+
+    def __init__(self):
+        pass
+
+
+class LatencyTracer:
+    """
+    Latency of each frame from its sensor timestamp to every processing stage, in host time.
+    The device clock is related to time.perf_counter by latching it (TimestampLatch) and reading
+    the latched value back (TimestampLatchValue), the latch of the shortest round trip is kept, so the
+    offset is known within half a round trip. With several calibrations a second apart or more,
+    the drift of the device clock against the host clock is corrected as well.
+    Frames are keyed by frame ID: begin() at dequeue, stamp() after each stage, end() at the consumer.
+    """
+    def __init__(self, device, max_pending=256, calibration_interval=None):
+        """
+        :brief  Constructor for instance initialization
+        :param  device:                 Device object whose frames are traced
+        :param  max_pending:            frames in flight kept, the oldest are forgotten beyond it
+        :param  calibration_interval:   seconds between calibrations made by begin(), None: only by calibrate()
+        """
+        if not isinstance(max_pending, INT_TYPE):
+            raise ParameterTypeError("LatencyTracer.__init__: "
+                                     "Expected max_pending type is int, not %s" % type(max_pending))
+
+        if max_pending < 1 or max_pending > UNSIGNED_INT_MAX:
+            raise InvalidParameter("LatencyTracer.__init__: max_pending out of bounds, minimum=1, maximum=%s"
+                                   % hex(UNSIGNED_INT_MAX).__str__())
+
+        if calibration_interval is not None and not isinstance(calibration_interval, (INT_TYPE, float)):
+            raise ParameterTypeError("LatencyTracer.__init__: "
+                                     "Expected calibration_interval type is float, not %s" % type(calibration_interval))
+
+        self.__device = device
+        self.__max_pending = max_pending
+        self.__calibration_interval = calibration_interval
+        self.__mutex = threading.Lock()
+        self.__calibration_mutex = threading.Lock()
+        self.__tick_frequency = None
+        self.__points = collections.deque(maxlen=LATENCY_CALIBRATION_POINT_NUM)
+        self.__round_trip = None
+        self.__rate = 1.0
+        self.__pending = collections.OrderedDict()
+        self.__stages = collections.OrderedDict()
+        self.__evicted_count = 0
+        self.__discarded_count = 0
+
+    def calibrate(self, samples=8):
+        """
+        :brief      Relate the device clock to the host clock, call it again after TimestampReset
+        :param      samples:    latches taken, the one of the shortest round trip is kept
+        :return:    offset uncertainty in seconds (half the round trip)
+        """
+        if not isinstance(samples, INT_TYPE):
+            raise ParameterTypeError("LatencyTracer.calibrate: "
+                                     "Expected samples type is int, not %s" % type(samples))
+
+        if samples < 1:
+            raise InvalidParameter("LatencyTracer.calibrate: samples out of bounds, minimum=1")
+
+        with self.__calibration_mutex:
+            tick_frequency = self.__device.TimestampTickFrequency.get()
+            if tick_frequency <= 0:
+                raise UnexpectedError("LatencyTracer.calibrate: TimestampTickFrequency is %d" % tick_frequency)
+
+            best = None
+            for i in range(samples):
+                before = time.perf_counter()
+                self.__device.TimestampLatch.send_command()
+                after = time.perf_counter()
+                ticks = self.__device.TimestampLatchValue.get()
+                if best is None or after - before < best[0]:
+                    best = (after - before, (before + after) / 2.0, ticks / float(tick_frequency))
+
+            round_trip, host_time, device_time = best
+            with self.__mutex:
+                if tick_frequency != self.__tick_frequency or \
+                        (self.__points and device_time < self.__points[-1][1]):
+                    # a new clock, or the device clock was reset
+                    self.__points.clear()
+                self.__tick_frequency = tick_frequency
+                self.__points.append((host_time, device_time))
+                self.__round_trip = round_trip
+                self.__rate = self.__get_rate()
+            return round_trip / 2.0
+
+    def __get_rate(self):
+        """
+        :brief      Host seconds per device second, least squares over the calibration points
+        :return:    rate, 1.0 until the points span a second
+        """
+        if len(self.__points) < 2 or self.__points[-1][1] - self.__points[0][1] < 1.0:
+            return 1.0
+
+        count = float(len(self.__points))
+        mean_host = sum(point[0] for point in self.__points) / count
+        mean_device = sum(point[1] for point in self.__points) / count
+        numerator = sum((point[1] - mean_device) * (point[0] - mean_host) for point in self.__points)
+        denominator = sum((point[1] - mean_device) ** 2 for point in self.__points)
+        return numerator / denominator if denominator > 0 else 1.0
+
+    def is_calibrated(self):
+        return len(self.__points) != 0
+
+    def get_calibration(self):
+        """
+        :brief      Current clock relation
+        :return:    dict: tick_frequency, offset (host seconds at device time 0), uncertainty (seconds),
+                    rate (host seconds per device second), points (calibrations in use),
+                    None before calibrate()
+        """
+        with self.__mutex:
+            if not self.__points:
+                return None
+            host_time, device_time = self.__points[-1]
+            return {
+                "tick_frequency": self.__tick_frequency,
+                "offset": host_time - device_time * self.__rate,
+                "uncertainty": self.__round_trip / 2.0,
+                "rate": self.__rate,
+                "points": len(self.__points),
+            }
+
+    def to_host_time(self, timestamp):
+        """
+        :brief      Convert a device timestamp to time.perf_counter seconds
+        :param      timestamp:  device ticks, RawImage.get_timestamp()
+        :return:    host seconds, None before calibrate()
+        """
+        with self.__mutex:
+            if not self.__points:
+                return None
+            host_time, device_time = self.__points[-1]
+            return host_time + (timestamp / float(self.__tick_frequency) - device_time) * self.__rate
+
+    @staticmethod
+    def __get_key(frame):
+        if isinstance(frame, INT_TYPE):
+            return frame
+        return frame.get_frame_id()
+
+    def begin(self, raw_image, host_time=None):
+        """
+        :brief      Start tracing a frame, recording the dequeue stage.
+                    A frame already traced with the same timestamp is left as it is, so a Pipeline
+                    fed by a traced AcquisitionWorker keeps the dequeue time of the worker.
+        :param      raw_image:  RawImage object
+        :param      host_time:  time.perf_counter of the dequeue, None: now
+        :return:    frame key for stamp() and end()
+        """
+        now = time.perf_counter() if host_time is None else host_time
+        if self.__calibration_interval is not None and \
+                (not self.__points or now - self.__points[-1][0] >= self.__calibration_interval):
+            self.calibrate()
+
+        key = raw_image.get_frame_id()
+        timestamp = raw_image.get_timestamp()
+        with self.__mutex:
+            entry = self.__pending.get(key)
+            if entry is not None and entry[2] == timestamp:
+                return key
+
+        sensor_time = self.to_host_time(timestamp)
+        with self.__mutex:
+            # a frame ID seen again after a restart of acquisition starts over
+            self.__pending.pop(key, None)
+            self.__pending[key] = [sensor_time, now, timestamp]
+            while len(self.__pending) > self.__max_pending:
+                self.__pending.popitem(last=False)
+                self.__evicted_count += 1
+        self.__record(LatencyStage.DEQUEUE, sensor_time, None, now)
+        return key
+
+    def stamp(self, frame, stage):
+        """
+        :brief      Record that a frame finished a stage
+        :param      frame:  key returned by begin(), or the RawImage
+        :param      stage:  stage name, LatencyStage or any str
+        :return:    None
+        """
+        now = time.perf_counter()
+        with self.__mutex:
+            entry = self.__pending.get(LatencyTracer.__get_key(frame))
+            if entry is None:
+                return
+            previous = entry[1]
+            entry[1] = now
+        self.__record(stage, entry[0], previous, now)
+
+    def end(self, frame, stage=LatencyStage.SINK):
+        """
+        :brief      Record the last stage of a frame and stop tracing it
+        :return:    None
+        """
+        self.stamp(frame, stage)
+        self.discard(frame, False)
+
+    def discard(self, frame, dropped=True):
+        """
+        :brief      Stop tracing a frame that was dropped
+        :return:    None
+        """
+        with self.__mutex:
+            if self.__pending.pop(LatencyTracer.__get_key(frame), None) is not None and dropped:
+                self.__discarded_count += 1
+
+    def __record(self, stage, sensor_time, previous, now):
+        """
+        :brief      Add the latency since the sensor timestamp and since the previous stage of a frame
+        """
+        histograms = self.__stages.get(stage)
+        if histograms is None:
+            with self.__mutex:
+                histograms = self.__stages.setdefault(stage, (LatencyHistogram(), LatencyHistogram()))
+        if sensor_time is not None:
+            histograms[0].record(max(now - sensor_time, 0.0))
+        if previous is not None:
+            histograms[1].record(now - previous)
+
+    def get_histogram(self, stage):
+        """
+        :brief      Latency from the sensor timestamp to the end of a stage
+        :return:    LatencyHistogram object, None if the stage was never stamped
+        """
+        histograms = self.__stages.get(stage)
+        return None if histograms is None else histograms[0]
+
+    def get_stage_histogram(self, stage):
+        """
+        :brief      Time from the previous stage of a frame to the end of this one
+        :return:    LatencyHistogram object, None if the stage was never stamped
+        """
+        histograms = self.__stages.get(stage)
+        return None if histograms is None else histograms[1]
+
+    def get_statistics(self):
+        """
+        :brief      Per-stage latencies in seconds, in the order the stages were first stamped
+        :return:    OrderedDict, stage name -> {count, mean, p50, p99, max: since the sensor timestamp,
+                    stage_mean, stage_p50, stage_p99: since the previous stage},
+                    "pending" -> frames in flight, "evicted" -> frames forgotten for max_pending,
+                    "discarded" -> frames dropped before the end
+        """
+        statistics = collections.OrderedDict()
+        for stage, (latency, stage_latency) in list(self.__stages.items()):
+            statistics[stage] = {
+                "count": latency.get_count(),
+                "mean": latency.get_mean(),
+                "p50": latency.get_percentile(50),
+                "p99": latency.get_percentile(99),
+                "max": latency.get_max(),
+                "stage_mean": stage_latency.get_mean(),
+                "stage_p50": stage_latency.get_percentile(50),
+                "stage_p99": stage_latency.get_percentile(99),
+            }
+        statistics["pending"] = len(self.__pending)
+        statistics["evicted"] = self.__evicted_count
+        statistics["discarded"] = self.__discarded_count
+        return statistics
+
+    def reset_statistics(self):
+        """
+        :brief      Drop the histograms and the frames in flight, the calibration is kept
+        :return:    None
+        """
+        with self.__mutex:
+            self.__stages = collections.OrderedDict()
+            self.__pending.clear()
+            self.__evicted_count = 0
+            self.__discarded_count = 0
@@ -0,0 +1,50 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import inspect
+
+
+class LazyFeature(object):
+    def __init__(self, name, feature_class, feature_id):
+        """
+        :brief  Class attribute standing for a feature object that is built on first access, so opening
+                a device does not resolve the names of hundreds of features it may never use.
+                The owner class provides _get_feature_handle(), the built feature replaces the
+                descriptor in the instance dictionary.
+        :param  name:           The attribute name the descriptor is assigned to
+        :param  feature_class:  IntFeature, FloatFeature, EnumFeature, BoolFeature, StringFeature,
+                                BufferFeature or CommandFeature
+        :param  feature_id:     The feature code ID
+        """
+        self.__feature_class = feature_class
+        self.__feature_id = feature_id
+        self.__name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        feature = self.__feature_class(instance._get_feature_handle(), self.__feature_id)
+        instance.__dict__[self.__name] = feature
+        return feature
+
+    def get_feature_class(self):
+        return self.__feature_class
+
+    def get_feature_id(self):
+        return self.__feature_id
+
+    @staticmethod
+    def get_names(owner):
+        """
+        :brief      Names of the lazy features of a class, its base classes included
+        :param      owner:  Device or DataStream class
+        :return:    list of attribute names
+        """
+        names = []
+        for klass in reversed(inspect.getmro(owner)):
+            for name, value in vars(klass).items():
+                if isinstance(value, LazyFeature) and name not in names:
+                    names.append(name)
+        return names
@@ -0,0 +1,411 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import numpy
+from gxipy.gxidef import *
+from gxipy.dxwrapper import *
+from gxipy.ImageProc import *
+from gxipy.Exception import *
+import bisect
+import threading
+import time
+import types
+
+if sys.version_info.major > 2:
+    import queue
+    INT_TYPE = int
+else:
+    import Queue as queue
+    INT_TYPE = (int, long)
+
+# histogram bucket upper bounds in microseconds: 1us, 2us ... 8us, then 8 buckets per power of two up to ~67s
+HISTOGRAM_SUB_BUCKET_NUM = 8
+HISTOGRAM_BOUNDS = list(range(1, HISTOGRAM_SUB_BUCKET_NUM + 1))
+while HISTOGRAM_BOUNDS[-1] < (1 << 26):
+    _octave = HISTOGRAM_BOUNDS[-1]
+    HISTOGRAM_BOUNDS.extend(_octave + _octave // HISTOGRAM_SUB_BUCKET_NUM * step
+                            for step in range(1, HISTOGRAM_SUB_BUCKET_NUM + 1))
+HISTOGRAM_BUCKET_NUM = len(HISTOGRAM_BOUNDS)
+
+# end marker put into the stage queues by Pipeline.stop
+_PIPELINE_END = object()
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram, bucket i counts latencies up to HISTOGRAM_BOUNDS[i] microseconds,
+    8 buckets per power of two keep percentiles within 12.5% of the real value.
+    """
+    def __init__(self):
+        self.__mutex = threading.Lock()
+        self.__buckets = [0] * (HISTOGRAM_BUCKET_NUM + 1)
+        self.__count = 0
+        self.__total = 0.0
+        self.__max = 0.0
+
+    def record(self, seconds):
+        """
+        :brief      Add one latency sample
+        :param      seconds:    latency in seconds
+        :return:    None
+        """
+        index = bisect.bisect_left(HISTOGRAM_BOUNDS, seconds * 1000000)
+        with self.__mutex:
+            self.__buckets[index] += 1
+            self.__count += 1
+            self.__total += seconds
+            if seconds > self.__max:
+                self.__max = seconds
+
+    def get_count(self):
+        """
+        :brief      Get the number of samples
+        :return:    sample number
+        """
+        return self.__count
+
+    def get_mean(self):
+        """
+        :brief      Get the mean latency in seconds
+        :return:    mean latency, 0 if there is no sample
+        """
+        with self.__mutex:
+            if self.__count == 0:
+                return 0.0
+            return self.__total / self.__count
+
+    def get_max(self):
+        """
+        :brief      Get the largest latency in seconds
+        :return:    max latency
+        """
+        return self.__max
+
+    def get_percentile(self, percent):
+        """
+        :brief      Get the upper bound of the bucket holding the given percentile, at most the max latency
+        :param      percent:    range:[0, 100]
+        :return:    latency in seconds, 0 if there is no sample
+        """
+        with self.__mutex:
+            if self.__count == 0:
+                return 0.0
+            threshold = self.__count * percent / 100.0
+            accumulated = 0
+            for index, count in enumerate(self.__buckets[:-1]):
+                accumulated += count
+                if accumulated >= threshold and count != 0:
+                    return min(HISTOGRAM_BOUNDS[index] / 1000000.0, self.__max)
+            return self.__max
+
+    def get_buckets(self):
+        """
+        :brief      Get the non empty buckets
+        :return:    list of (upper bound in seconds, count), the bound of the overflow bucket is the max latency
+        """
+        with self.__mutex:
+            bounds = [bound / 1000000.0 for bound in HISTOGRAM_BOUNDS] + [self.__max]
+            return [(bounds[index], count) for index, count in enumerate(self.__buckets) if count != 0]
+
+
+class PipelineStage:
+    """
+    One processing step of a Pipeline, func is called on worker_num threads of the stage.
+    func takes the output of the previous stage and returns the input of the next one,
+    returning None drops the frame.
+    The gx_/dx_ wrappers call into the library through ctypes.CDLL/WinDLL, which release the GIL
+    for the duration of the call, so conversion and image processing stages run in parallel.
+    """
+    def __init__(self, name, func, worker_num=1, queue_size=4):
+        """
+        :brief  Constructor for instance initialization
+        :param  name:           stage name
+        :param  func:           callable(item) -> item
+        :param  worker_num:     number of threads of the stage, range:[1, 256]
+        :param  queue_size:     size of the bounded input queue, range:[1, 0xFFFFFFFF]
+        """
+        if not callable(func):
+            raise ParameterTypeError("PipelineStage.__init__: "
+                                     "Expected func type is callable, not %s" % type(func))
+
+        if not isinstance(worker_num, INT_TYPE):
+            raise ParameterTypeError("PipelineStage.__init__: "
+                                     "Expected worker_num type is int, not %s" % type(worker_num))
+
+        if not isinstance(queue_size, INT_TYPE):
+            raise ParameterTypeError("PipelineStage.__init__: "
+                                     "Expected queue_size type is int, not %s" % type(queue_size))
+
+        if worker_num < 1 or worker_num > 256:
+            raise InvalidParameter("PipelineStage.__init__: worker_num out of bounds, minimum=1, maximum=256")
+
+        if queue_size < 1 or queue_size > UNSIGNED_INT_MAX:
+            raise InvalidParameter("PipelineStage.__init__: queue_size out of bounds, minimum=1, maximum=%s"
+                                   % hex(UNSIGNED_INT_MAX).__str__())
+
+        self.name = name
+        self.func = func
+        self.worker_num = worker_num
+        self.queue_size = queue_size
+        self.histogram = LatencyHistogram()
+        self.drop_count = 0
+        self.error_count = 0
+        self.last_error = None
+
+
+class Pipeline:
+    """
+    Runs frames through a chain of PipelineStage connected by bounded queues and hands the
+    results to sink on a single thread, in the order they were submitted.
+    Frames coming from one DataStream are submitted in frame_id order, so the sink sees them
+    in frame_id order even when a stage has several workers.
+    A full queue blocks the stage in front of it, submit() reports it to the producer.
+    """
+    def __init__(self, stages, sink, sink_queue_size=16, tracer=None):
+        """
+        :brief  Constructor for instance initialization
+        :param  stages:             list of PipelineStage
+        :param  sink:               callable(item), called in submission order, dropped frames are skipped
+        :param  sink_queue_size:    size of the bounded sink queue
+        :param  tracer:             LatencyTracer, submitted RawImages are stamped after every stage and the sink
+        """
+        if not isinstance(stages, (list, tuple)) or len(stages) == 0:
+            raise ParameterTypeError("Pipeline.__init__: Expected stages type is a non empty list of PipelineStage")
+
+        for stage in stages:
+            if not isinstance(stage, PipelineStage):
+                raise ParameterTypeError("Pipeline.__init__: "
+                                         "Expected stage type is PipelineStage, not %s" % type(stage))
+
+        if not callable(sink):
+            raise ParameterTypeError("Pipeline.__init__: "
+                                     "Expected sink type is callable, not %s" % type(sink))
+
+        if tracer is not None:
+            # LatencyTracer builds on this module
+            from gxipy.LatencyTracer import LatencyTracer
+            if not isinstance(tracer, LatencyTracer):
+                raise ParameterTypeError("Pipeline.__init__: "
+                                         "Expected tracer type is LatencyTracer, not %s" % type(tracer))
+
+        self.__stages = list(stages)
+        self.__tracer = tracer
+        self.__sink_stage = PipelineStage("sink", sink, 1, sink_queue_size)
+        self.__queues = []
+        self.__threads = []
+        self.__submit_mutex = threading.Lock()
+        self.__sequence = 0
+        self.__submit_drop_count = 0
+        self.__running = False
+
+    def start(self):
+        """
+        :brief      Start the worker threads of every stage
+        :return:    None
+        """
+        if self.__running:
+            return
+
+        self.__sequence = 0
+        all_stages = self.__stages + [self.__sink_stage]
+        self.__queues = [queue.Queue(stage.queue_size) for stage in all_stages]
+        self.__threads = []
+        for index, stage in enumerate(self.__stages):
+            workers = []
+            for worker_index in range(stage.worker_num):
+                thread = threading.Thread(target=self.__run_stage, args=(index,),
+                                          name="Pipeline-%s-%d" % (stage.name, worker_index))
+                thread.daemon = True
+                workers.append(thread)
+            self.__threads.append(workers)
+
+        sink_thread = threading.Thread(target=self.__run_sink, name="Pipeline-sink")
+        sink_thread.daemon = True
+        self.__threads.append([sink_thread])
+
+        self.__running = True
+        for workers in self.__threads:
+            for thread in workers:
+                thread.start()
+
+    def stop(self):
+        """
+        :brief      Process every submitted frame, then stop the threads stage by stage
+        :return:    None
+        """
+        if not self.__running:
+            return
+
+        self.__running = False
+        for index, workers in enumerate(self.__threads):
+            for _ in workers:
+                self.__queues[index].put(_PIPELINE_END)
+            for thread in workers:
+                thread.join()
+        self.__threads = []
+
+    def is_running(self):
+        """
+        :brief      Whether the pipeline is started
+        :return:    True/False
+        """
+        return self.__running
+
+    def submit(self, item, timeout=None):
+        """
+        :brief      Put a frame into the first stage
+        :param      item:       input of the first stage, normally a RawImage
+        :param      timeout:    seconds to wait for room, None waits forever, 0 does not wait
+        :return:    True if queued, False if the first queue stayed full or the pipeline is stopped
+        """
+        if not self.__running:
+            return False
+
+        key = None
+        if self.__tracer is not None and hasattr(item, "get_frame_id"):
+            key = self.__tracer.begin(item)
+
+        with self.__submit_mutex:
+            try:
+                self.__queues[0].put([self.__sequence, time.perf_counter(), item, key],
+                                     timeout != 0, timeout or None)
+            except queue.Full:
+                self.__submit_drop_count += 1
+                if key is not None:
+                    self.__tracer.discard(key)
+                return False
+            self.__sequence += 1
+        return True
+
+    def get_stage_histogram(self, name):
+        """
+        :brief      Get the processing latency histogram of a stage
+        :param      name:   stage name, "sink" for the sink
+        :return:    LatencyHistogram object, None if there is no such stage
+        """
+        for stage in self.__stages + [self.__sink_stage]:
+            if stage.name == name:
+                return stage.histogram
+        return None
+
+    def get_statistics(self):
+        """
+        :brief      Get per-stage counters and latencies
+        :return:    dict, stage name -> {count, dropped, errors, queued, mean, p50, p99, max},
+                    "submit_dropped" -> frames refused by submit()
+        """
+        statistics = {"submit_dropped": self.__submit_drop_count}
+        for index, stage in enumerate(self.__stages + [self.__sink_stage]):
+            histogram = stage.histogram
+            statistics[stage.name] = {
+                "count": histogram.get_count(),
+                "dropped": stage.drop_count,
+                "errors": stage.error_count,
+                "queued": self.__queues[index].qsize() if self.__queues else 0,
+                "mean": histogram.get_mean(),
+                "p50": histogram.get_percentile(50),
+                "p99": histogram.get_percentile(99),
+                "max": histogram.get_max(),
+            }
+        return statistics
+
+    def __run_stage(self, index):
+        """
+        :brief      Worker thread body of stage index
+        :param      index:  stage index
+        :return:    None
+        """
+        stage = self.__stages[index]
+        input_queue = self.__queues[index]
+        output_queue = self.__queues[index + 1]
+        while True:
+            packet = input_queue.get()
+            if packet is _PIPELINE_END:
+                return
+
+            # a dropped frame keeps its place so the sink doesn't wait for it
+            if packet[2] is not None:
+                start = time.perf_counter()
+                try:
+                    packet[2] = stage.func(packet[2])
+                except Exception as error:
+                    stage.error_count += 1
+                    stage.last_error = error
+                    packet[2] = None
+                stage.histogram.record(time.perf_counter() - start)
+                if packet[2] is None:
+                    stage.drop_count += 1
+
+                if packet[3] is not None:
+                    if packet[2] is None:
+                        self.__tracer.discard(packet[3])
+                    else:
+                        self.__tracer.stamp(packet[3], stage.name)
+
+            output_queue.put(packet)
+
+    def __run_sink(self):
+        """
+        :brief      Sink thread body, reorders the packets by sequence number
+        :return:    None
+        """
+        stage = self.__sink_stage
+        input_queue = self.__queues[-1]
+        pending = {}
+        expected = 0
+        while True:
+            packet = input_queue.get()
+            if packet is _PIPELINE_END:
+                return
+
+            pending[packet[0]] = packet
+            while expected in pending:
+                packet = pending.pop(expected)
+                expected += 1
+                if packet[2] is None:
+                    continue
+
+                start = time.perf_counter()
+                try:
+                    stage.func(packet[2])
+                except Exception as error:
+                    stage.error_count += 1
+                    stage.last_error = error
+                stage.histogram.record(time.perf_counter() - start)
+                if packet[3] is not None:
+                    self.__tracer.end(packet[3], stage.name)
+
+
+def convert_stage(mode="RGB", flip=False, valid_bits=DxValidBit.BIT8_15,
+                  convert_type=DxBayerConvertType.NEIGHBOUR, channel_order=DxRGBChannelOrder.ORDER_RGB):
+    """
+    :brief      Stage function running RawImage.convert, incomplete frames are dropped
+    :param      mode:           see RawImage.convert
+    :param      flip:           see RawImage.convert
+    :param      valid_bits:     see RawImage.convert
+    :param      convert_type:   see RawImage.convert
+    :param      channel_order:  see RawImage.convert
+    :return:    callable(RawImage) -> converted image
+    """
+    def convert(raw_image):
+        if raw_image.get_status() != GxFrameStatusList.SUCCESS:
+            return None
+        return raw_image.convert(mode, flip, valid_bits, convert_type, channel_order)
+    return convert
+
+
+def improvement_stage(color_correction_param=0, contrast_lut=None, gamma_lut=None,
+                      channel_order=DxRGBChannelOrder.ORDER_RGB):
+    """
+    :brief      Stage function running RGBImage.image_improvement in place
+    :param      color_correction_param:     see RGBImage.image_improvement
+    :param      contrast_lut:               see RGBImage.image_improvement
+    :param      gamma_lut:                  see RGBImage.image_improvement
+    :param      channel_order:              see RGBImage.image_improvement
+    :return:    callable(RGBImage) -> RGBImage
+    """
+    def improvement(rgb_image):
+        rgb_image.image_improvement(color_correction_param, contrast_lut, gamma_lut, channel_order)
+        return rgb_image
+    return improvement
@@ -0,0 +1,578 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import numpy
+from gxipy.gxwrapper import *
+from gxipy.gxidef import *
+from gxipy.ImageProc import *
+from gxipy.Exception import *
+from multiprocessing import connection
+import collections
+import ctypes
+import multiprocessing
+import pickle
+import struct
+import threading
+import time
+import traceback
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+# header of a frame ring, at the start of the shared memory block
+_RING_HEADER_DTYPE = numpy.dtype([
+    ("published", numpy.uint64),        # frames published by the worker
+    ("dropped", numpy.uint64),          # frames the worker dropped because every slot was in use
+    ("reserved_index", numpy.uint64),
+    ("slot_num", numpy.uint32),
+    ("slot_size", numpy.uint32),
+    ("reserved", numpy.uint8, 40),
+])
+
+# header of one slot, the fields of the frame it holds
+_SLOT_HEADER_DTYPE = numpy.dtype([
+    ("frame_id", numpy.uint64),
+    ("timestamp", numpy.uint64),
+    ("pixel_format", numpy.uint32),
+    ("width", numpy.uint32),
+    ("height", numpy.uint32),
+    ("image_size", numpy.uint32),
+    ("status", numpy.int32),
+    ("busy", numpy.uint32),             # set by the worker when it publishes the slot, cleared on release
+    ("host_time", numpy.float64),       # timestamp in time.perf_counter seconds, 0 without host_time
+    ("reserved", numpy.uint8, 16),
+])
+
+# message of the worker announcing one published frame: the slot index, the other messages are
+# pickled tuples, which are longer
+_FRAME_NOTIFICATION = struct.Struct("<I")
+
+
+class FrameRing:
+    """
+    Single producer, single consumer ring of frame slots in a multiprocessing.shared_memory block:
+    a ring header, one header per slot (frame_id, timestamp, pixel_format, width, height, image_size,
+    status, busy), then the slot payloads. The producer writes a frame into a slot that is not busy and
+    marks it busy, the consumer clears busy when it is done with the frame, in any order.
+    A frame that finds every slot busy is dropped and counted.
+    """
+    def __init__(self, name=None, slot_num=8, slot_size=0):
+        """
+        :brief  Create a ring (name None) or attach to the ring of that name
+        :param  name:       shared memory block name of an existing ring
+        :param  slot_num:   slots of a new ring
+        :param  slot_size:  payload bytes of a slot of a new ring
+        """
+        # Python 3.8+, imported here so that import gxipy works without it
+        from multiprocessing import shared_memory
+
+        if name is None:
+            size = FrameRing.get_size(slot_num, slot_size)
+            self.__memory = shared_memory.SharedMemory(create=True, size=size)
+            self.__header = numpy.ndarray((1,), dtype=_RING_HEADER_DTYPE, buffer=self.__memory.buf)[0]
+            self.__header["published"] = 0
+            self.__header["dropped"] = 0
+            self.__header["slot_num"] = slot_num
+            self.__header["slot_size"] = slot_size
+        else:
+            self.__memory = shared_memory.SharedMemory(name=name)
+            self.__header = numpy.ndarray((1,), dtype=_RING_HEADER_DTYPE, buffer=self.__memory.buf)[0]
+
+        self.__slot_num = int(self.__header["slot_num"])
+        self.__slot_size = int(self.__header["slot_size"])
+        self.__slots = numpy.ndarray((self.__slot_num,), dtype=_SLOT_HEADER_DTYPE, buffer=self.__memory.buf,
+                                     offset=_RING_HEADER_DTYPE.itemsize)
+        self.__payload_offset = FrameRing.__get_payload_offset(self.__slot_num)
+        # the ctypes view pins the mapping, it is dropped by close()
+        self.__base = (ctypes.c_ubyte * (self.__slot_num * self.__slot_size)).from_buffer(
+            self.__memory.buf, self.__payload_offset) if self.__slot_num * self.__slot_size else None
+
+    @staticmethod
+    def __get_payload_offset(slot_num):
+        offset = _RING_HEADER_DTYPE.itemsize + _SLOT_HEADER_DTYPE.itemsize * slot_num
+        return (offset + 4095) // 4096 * 4096
+
+    @staticmethod
+    def get_size(slot_num, slot_size):
+        """
+        :return:    bytes of the shared memory block of a ring
+        """
+        return FrameRing.__get_payload_offset(slot_num) + slot_num * slot_size
+
+    def get_name(self):
+        return self.__memory.name
+
+    def get_slot_num(self):
+        return self.__slot_num
+
+    def get_slot_size(self):
+        return self.__slot_size
+
+    def get_header(self):
+        """
+        :return:    numpy record of the ring header, shared with the other process
+        """
+        return self.__header
+
+    def get_slot_header(self, slot):
+        """
+        :return:    numpy record of the header of a slot
+        """
+        return self.__slots[slot]
+
+    def get_slot_address(self, slot):
+        """
+        :return:    address of the payload of a slot in this process
+        """
+        return ctypes.addressof(self.__base) + slot * self.__slot_size
+
+    def find_free_slot(self, start):
+        """
+        :brief      First slot that is not busy, from start on round the ring
+        :return:    slot index, None if every slot is busy
+        """
+        busy = self.__slots["busy"]
+        for offset in range(self.__slot_num):
+            slot = (start + offset) % self.__slot_num
+            if busy[slot] == 0:
+                return slot
+        return None
+
+    def unlink(self):
+        """
+        :brief      Remove the name of the block, it is destroyed once every process has unmapped it
+        :return:    None
+        """
+        self.__memory.unlink()
+
+    def close(self, unlink=False):
+        """
+        :brief      Unmap the ring, views and images over it must be dropped before
+        :param      unlink:     True: destroy the block once every process has unmapped it
+        :return:    None
+        """
+        self.__header = None
+        self.__slots = None
+        self.__base = None
+        if unlink:
+            self.__memory.unlink()
+        self.__memory.close()
+
+
+def _send_message(capture_connection, message):
+    capture_connection.send_bytes(pickle.dumps(message, pickle.HIGHEST_PROTOCOL))
+
+
+def _serve_commands(device, capture_connection, send_mutex):
+    """
+    :brief      Worker thread executing the commands the parent sends (ProcessCapture.send_command)
+                until the parent closes the pipe
+    """
+    feature_control = device.get_remote_device_feature_control()
+    while True:
+        try:
+            message = pickle.loads(capture_connection.recv_bytes())
+        except (EOFError, OSError):
+            return
+        try:
+            if message[0] == "command":
+                feature_control.get_command_feature(message[1]).send_command()
+        except Exception:
+            with send_mutex:
+                _send_message(capture_connection, ("error", traceback.format_exc()))
+
+
+def _capture_process_main(serial_number, capture_connection, stop_event, features, buffer_num, timeout,
+                          calibration_interval):
+    """
+    :brief      Body of the worker process of one camera: opens it, publishes its frames into the ring
+                the parent created, and announces each one on capture_connection
+    """
+    device = None
+    ring = None
+    # the command thread reports its errors on the pipe the frames are announced on
+    send_mutex = threading.Lock()
+    try:
+        from gxipy.DeviceManager import DeviceManager
+        from gxipy.LatencyTracer import LatencyTracer
+        device_manager = DeviceManager()
+        device_manager.update_device_list()
+        device = device_manager.open_device_by_sn(serial_number)
+        if features:
+            device.get_remote_device_feature_control().apply(features, rollback=False)
+        data_stream = device.data_stream[0]
+        if buffer_num is not None:
+            data_stream.set_acquisition_buffer_number(buffer_num)
+        try:
+            tick_frequency = device.TimestampTickFrequency.get()
+        except Exception:
+            tick_frequency = 0
+
+        _send_message(capture_connection, ("ready", data_stream.get_payload_size(), tick_frequency))
+        message = pickle.loads(capture_connection.recv_bytes())
+        if message[0] != "ring":
+            return
+        ring = FrameRing(message[1])
+        header = ring.get_header()
+        slot_num = ring.get_slot_num()
+        slot_size = ring.get_slot_size()
+
+        tracer = None
+        if calibration_interval is not None:
+            tracer = LatencyTracer(device)
+            tracer.calibrate()
+            calibrated = time.perf_counter()
+
+        command_thread = threading.Thread(target=_serve_commands, args=(device, capture_connection, send_mutex),
+                                          name="ProcessCapture-commands")
+        command_thread.daemon = True
+        command_thread.start()
+
+        device.stream_on()
+        with send_mutex:
+            _send_message(capture_connection, ("started",))
+        slot = 0
+        while not stop_event.is_set():
+            if tracer is not None and calibration_interval and \
+                    time.perf_counter() - calibrated >= calibration_interval:
+                tracer.calibrate(4)
+                calibrated = time.perf_counter()
+            image = data_stream.dq_buf(timeout, zero_copy=True)
+            if image is None:
+                continue
+
+            slot = ring.find_free_slot(slot)
+            if slot is None:
+                header["dropped"] += 1
+                image.release()
+                slot = 0
+                continue
+
+            frame_data = image.frame_data
+            image_size = min(frame_data.image_size, slot_size)
+            ctypes.memmove(ring.get_slot_address(slot), frame_data.image_buf, image_size)
+            slot_header = ring.get_slot_header(slot)
+            slot_header["frame_id"] = frame_data.frame_id
+            slot_header["timestamp"] = frame_data.timestamp
+            slot_header["pixel_format"] = frame_data.pixel_format
+            slot_header["width"] = frame_data.width
+            slot_header["height"] = frame_data.height
+            slot_header["image_size"] = image_size
+            slot_header["status"] = frame_data.status
+            slot_header["host_time"] = 0.0 if tracer is None else tracer.to_host_time(frame_data.timestamp)
+            slot_header["busy"] = 1
+            image.release()
+            header["published"] += 1
+            with send_mutex:
+                capture_connection.send_bytes(_FRAME_NOTIFICATION.pack(slot))
+            slot = (slot + 1) % slot_num
+        device.stream_off()
+    except Exception:
+        try:
+            with send_mutex:
+                _send_message(capture_connection, ("error", traceback.format_exc()))
+        except Exception:
+            pass
+    finally:
+        if ring is not None:
+            ring.close()
+        if device is not None:
+            try:
+                device.close_device()
+            except Exception:
+                pass
+
+
+class ProcessCapture:
+    """
+    Captures each camera in a worker process of its own, so that the driver callbacks, dq_buf and the
+    Python work around them use one core per camera instead of sharing the GIL of one process.
+    A worker copies each frame into a FrameRing in shared memory and announces it on a pipe, the
+    parent gets RawImages over the ring slots (zero-copy, get_numpy_array is a view) and waits on
+    the pipes of every camera at once (wait). An image gives its slot back on release() or once it
+    and its numpy views are dropped; a worker whose slots are all held drops frames.
+    Commands such as TriggerSoftware are sent to the worker that owns the camera (send_command).
+    """
+    def __init__(self, serial_numbers, slot_num=8, features=None, buffer_num=None, timeout=100,
+                 start_method="spawn", host_time=False, calibration_interval=5.0):
+        """
+        :brief  Constructor for instance initialization
+        :param  serial_numbers:     list of camera serial numbers
+        :param  slot_num:           frames in flight per camera, slots of each ring
+        :param  features:           dict or list of (name, value) applied by each worker with FeatureControl.apply
+                                    before the stream is turned on (values must be picklable)
+        :param  buffer_num:         acquisition buffer number of each worker, None keeps the default
+        :param  timeout:            dq_buf timeout of the workers in ms, the latency of stop()
+        :param  start_method:       multiprocessing start method, spawn does not inherit the open library
+        :param  host_time:          True: each worker relates the device clock to time.perf_counter
+                                    (LatencyTracer), get_frame returns the host time of the frames
+        :param  calibration_interval:   seconds between two clock calibrations of a worker, None: only at start
+        """
+        if sys.version_info < (3, 8):
+            raise InvalidCall("ProcessCapture.__init__: needs Python 3.8 or later (multiprocessing.shared_memory)")
+
+        if not isinstance(serial_numbers, (list, tuple)) or not serial_numbers:
+            raise ParameterTypeError("ProcessCapture.__init__: "
+                                     "Expected serial_numbers type is a non-empty list, not %s"
+                                     % type(serial_numbers))
+
+        if len(set(serial_numbers)) != len(serial_numbers):
+            raise InvalidParameter("ProcessCapture.__init__: serial_numbers are not unique")
+
+        if not isinstance(slot_num, INT_TYPE):
+            raise ParameterTypeError("ProcessCapture.__init__: "
+                                     "Expected slot_num type is int, not %s" % type(slot_num))
+
+        if slot_num < 1 or slot_num > UNSIGNED_INT_MAX:
+            raise InvalidParameter("ProcessCapture.__init__: slot_num out of bounds, minimum=1, maximum=%s"
+                                   % hex(UNSIGNED_INT_MAX).__str__())
+
+        if not isinstance(timeout, INT_TYPE):
+            raise ParameterTypeError("ProcessCapture.__init__: "
+                                     "Expected timeout type is int, not %s" % type(timeout))
+
+        if calibration_interval is not None and not isinstance(calibration_interval, (INT_TYPE, float)):
+            raise ParameterTypeError("ProcessCapture.__init__: "
+                                     "Expected calibration_interval type is float, not %s" % type(calibration_interval))
+
+        self.__serial_numbers = list(serial_numbers)
+        self.__slot_num = slot_num
+        self.__features = features
+        self.__buffer_num = buffer_num
+        self.__timeout = timeout
+        # None: no clock relation, 0: calibrated at start only
+        self.__calibration_interval = (calibration_interval or 0) if host_time else None
+        self.__context = multiprocessing.get_context(start_method)
+        self.__workers = collections.OrderedDict()
+        self.__connections = {}
+        self.__stop_event = None
+        self.__running = False
+
+    def start(self, timeout=30.0):
+        """
+        :brief      Start a worker per camera and wait until each one acquires
+        :param      timeout:    seconds a worker may take to open its camera
+        :return:    None
+        """
+        if self.__running:
+            return
+
+        self.__stop_event = self.__context.Event()
+        self.__workers = collections.OrderedDict()
+        self.__connections = {}
+        try:
+            for serial_number in self.__serial_numbers:
+                parent_connection, child_connection = self.__context.Pipe()
+                process = self.__context.Process(
+                    target=_capture_process_main, name="ProcessCapture-%s" % serial_number,
+                    args=(serial_number, child_connection, self.__stop_event, self.__features,
+                          self.__buffer_num, self.__timeout, self.__calibration_interval))
+                process.daemon = True
+                process.start()
+                child_connection.close()
+                self.__workers[serial_number] = {
+                    "process": process, "connection": parent_connection, "ring": None,
+                    "announced": collections.deque(), "taken": 0, "mutex": threading.Lock(), "error": None,
+                    "outstanding": 0, "tick_frequency": 0}
+                self.__connections[parent_connection] = serial_number
+
+            deadline = time.perf_counter() + timeout
+            for serial_number, worker in self.__workers.items():
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or not worker["connection"].poll(remaining):
+                    raise Timeout("ProcessCapture.start: %s did not open in time" % serial_number)
+                message = pickle.loads(worker["connection"].recv_bytes())
+                if message[0] != "ready":
+                    raise UnexpectedError("ProcessCapture.start: %s failed\n%s" % (serial_number, message[1]))
+                worker["tick_frequency"] = message[2]
+                worker["ring"] = FrameRing(slot_num=self.__slot_num, slot_size=message[1])
+                _send_message(worker["connection"], ("ring", worker["ring"].get_name()))
+
+            # a trigger sent before the stream of a worker is on would be lost
+            for serial_number, worker in self.__workers.items():
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or not worker["connection"].poll(remaining):
+                    raise Timeout("ProcessCapture.start: %s did not start in time" % serial_number)
+                message = pickle.loads(worker["connection"].recv_bytes())
+                if message[0] != "started":
+                    raise UnexpectedError("ProcessCapture.start: %s failed\n%s" % (serial_number, message[1]))
+        except Exception:
+            self.__running = True
+            self.stop()
+            raise
+        self.__running = True
+
+    def stop(self):
+        """
+        :brief      Stop the workers and destroy the rings, the frames not taken are discarded.
+                    A ring whose images are still held stays mapped until the last one is released.
+        :return:    None
+        """
+        if not self.__running:
+            return
+
+        self.__running = False
+        self.__stop_event.set()
+        for serial_number, worker in self.__workers.items():
+            process = worker["process"]
+            process.join(max(self.__timeout / 1000.0 * 10, 5.0))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            worker["connection"].close()
+            worker["announced"].clear()
+            if worker["ring"] is not None:
+                with worker["mutex"]:
+                    held = worker["outstanding"] != 0
+                    if held:
+                        # images still point into the ring, it is unmapped when the last one is released
+                        worker["ring"].unlink()
+                    else:
+                        worker["ring"].close(unlink=True)
+                    worker["ring"] = None
+        self.__connections = {}
+
+    def is_running(self):
+        return self.__running
+
+    def get_serial_numbers(self):
+        return list(self.__serial_numbers)
+
+    def get_last_error(self, serial_number):
+        """
+        :return:    traceback text of the last failure of a worker or of a command it was sent,
+                    None if none failed
+        """
+        return self.__get_worker(serial_number, "get_last_error")["error"]
+
+    def get_tick_frequency(self, serial_number):
+        """
+        :return:    TimestampTickFrequency of the camera, 0 if it has none
+        """
+        return self.__get_worker(serial_number, "get_tick_frequency")["tick_frequency"]
+
+    def send_command(self, serial_number, feature_name):
+        """
+        :brief      Have the worker of a camera execute a command feature, TriggerSoftware for example.
+                    The command is not waited for, a failure is reported by get_last_error.
+        :param      serial_number:  camera serial number
+        :param      feature_name:   command feature name
+        :return:    None
+        """
+        if not self.__running:
+            raise InvalidCall("ProcessCapture.send_command: the capture is not started")
+
+        _send_message(self.__get_worker(serial_number, "send_command")["connection"], ("command", feature_name))
+
+    def __get_worker(self, serial_number, func_name):
+        worker = self.__workers.get(serial_number)
+        if worker is None:
+            raise InvalidParameter("ProcessCapture.%s: %s is not captured" % (func_name, serial_number))
+        return worker
+
+    def __drain(self, capture_connection):
+        """
+        :brief      Count the frames announced on a pipe and keep the error a worker reports
+        """
+        worker = self.__workers[self.__connections[capture_connection]]
+        try:
+            while capture_connection.poll():
+                message = capture_connection.recv_bytes()
+                if len(message) == _FRAME_NOTIFICATION.size:
+                    worker["announced"].append(_FRAME_NOTIFICATION.unpack(message)[0])
+                else:
+                    message = pickle.loads(message)
+                    if message[0] == "error":
+                        worker["error"] = message[1]
+        except (EOFError, OSError):
+            # the worker exited, nothing more will come
+            del self.__connections[capture_connection]
+
+    def wait(self, timeout=1000):
+        """
+        :brief      Wait until a camera has a frame to take, on the pipes of every worker at once
+        :param      timeout:    wait time in ms, None waits forever
+        :return:    list of the serial numbers with frames to take, empty on timeout
+        """
+        ready = [serial_number for serial_number, worker in self.__workers.items() if worker["announced"]]
+        if ready or not self.__running:
+            return ready
+
+        for capture_connection in connection.wait(list(self.__connections),
+                                                  None if timeout is None else timeout / 1000.0):
+            self.__drain(capture_connection)
+        return [serial_number for serial_number, worker in self.__workers.items() if worker["announced"]]
+
+    def get_image(self, serial_number):
+        """
+        :brief      Take the oldest frame of a camera without waiting
+        :return:    RawImage over the ring slot, None if no frame is ready
+        """
+        return self.get_frame(serial_number)[0]
+
+    def get_frame(self, serial_number):
+        """
+        :brief      Take the oldest frame of a camera without waiting, with its host time
+        :return:    (RawImage over the ring slot, time.perf_counter seconds of its timestamp, 0 without
+                    host_time), (None, None) if no frame is ready
+        """
+        worker = self.__get_worker(serial_number, "get_frame")
+        if not worker["announced"] and worker["connection"] in self.__connections:
+            self.__drain(worker["connection"])
+        if not worker["announced"] or worker["ring"] is None:
+            return None, None
+
+        slot = worker["announced"].popleft()
+        worker["taken"] += 1
+        ring = worker["ring"]
+        slot_header = ring.get_slot_header(slot)
+        frame_data = GxFrameData()
+        frame_data.status = int(slot_header["status"])
+        frame_data.image_buf = ring.get_slot_address(slot)
+        frame_data.width = int(slot_header["width"])
+        frame_data.height = int(slot_header["height"])
+        frame_data.pixel_format = int(slot_header["pixel_format"])
+        frame_data.image_size = int(slot_header["image_size"])
+        frame_data.frame_id = int(slot_header["frame_id"])
+        frame_data.timestamp = int(slot_header["timestamp"])
+        host_time = float(slot_header["host_time"])
+        with worker["mutex"]:
+            worker["outstanding"] += 1
+        return RawImage(frame_data, BufferLease(lambda: ProcessCapture.__release(worker, ring, slot))), host_time
+
+    @staticmethod
+    def __release(worker, ring, slot):
+        """
+        :brief      Give a slot back to the worker
+        """
+        with worker["mutex"]:
+            worker["outstanding"] -= 1
+            if worker["ring"] is not ring:
+                # stopped meanwhile
+                if worker["outstanding"] == 0:
+                    ring.close()
+                return
+            ring.get_slot_header(slot)["busy"] = 0
+
+    def get_statistics(self):
+        """
+        :return:    OrderedDict of serial number: {published, dropped (every slot in use), taken, held (images
+                    not released), alive}
+        """
+        statistics = collections.OrderedDict()
+        for serial_number, worker in self.__workers.items():
+            ring = worker["ring"]
+            header = None if ring is None else ring.get_header()
+            statistics[serial_number] = {
+                "published": worker["taken"] + len(worker["announced"]) if header is None
+                else int(header["published"]),
+                "dropped": 0 if header is None else int(header["dropped"]),
+                "taken": worker["taken"],
+                "held": worker["outstanding"],
+                "alive": worker["process"].is_alive(),
+            }
+        return statistics
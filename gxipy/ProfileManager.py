@@ -0,0 +1,340 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+from gxipy.FeatureControl import *
+from gxipy.Exception import *
+from collections import OrderedDict
+import os
+import tempfile
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+
+class ProfileSection:
+    REMOTE_DEVICE = "Remote device"     # remote device features, FeatureControl.feature_save of the device
+    LOCAL_DEVICE = "Local device"       # local device features
+    STREAM = "Stream"                   # stream features
+
+    def __init__(self):
+        pass
+
+
+class ProfileManager:
+    # features an automatic function keeps changing while it is not Off
+    __AUTO_FEATURES = {
+        "ExposureAuto":     ("ExposureTime",),
+        "GainAuto":         ("Gain",),
+        "BalanceWhiteAuto": ("BalanceRatio",),
+    }
+
+    # selected features not named after their selector (SFNC), the others start with the selector name
+    __SELECTED = {
+        "RegionSelector":   ("Width", "Height", "OffsetX", "OffsetY"),
+    }
+
+    def __init__(self, feature_control, section=ProfileSection.REMOTE_DEVICE):
+        """
+        :brief  Named feature profiles of one feature control, kept in memory. A profile is read from a GenApi
+                persistence file written by Device.export_config_file or FeatureControl.feature_save, applying
+                it writes only the features that differ from the live state instead of every node of the file.
+                Switching from the profile applied last, with no other write to the device in between,
+                writes the difference of the two profiles without reading the device.
+        :param  feature_control:    FeatureControl the profiles are applied to
+        :param  section:            ProfileSection read from files written by Device.export_config_file,
+                                    files with a single section are read whole
+        """
+        if not isinstance(feature_control, FeatureControl):
+            raise ParameterTypeError("ProfileManager.__init__: "
+                                     "Expected feature_control type is FeatureControl, not %s" % type(feature_control))
+
+        if section not in (ProfileSection.REMOTE_DEVICE, ProfileSection.LOCAL_DEVICE, ProfileSection.STREAM):
+            raise ParameterTypeError("ProfileManager.__init__: "
+                                     "Expected section is in ProfileSection, not %s" % section)
+
+        self.__feature_control = feature_control
+        self.__section = section
+        self.__profiles = OrderedDict()
+        self.__types = {}
+        self.__applied = None
+
+    @staticmethod
+    def parse(file_path, section=ProfileSection.REMOTE_DEVICE):
+        """
+        :brief      Read the feature lines of a GenApi persistence file. The file replays the selectors
+                    before every selected feature and restores them after it, a feature is keyed by the
+                    selector lines right before it that select it.
+        :param      file_path:  persistence file path
+        :param      section:    ProfileSection, files without section lines are read whole
+        :return:    entries:    OrderedDict of (selectors, feature name): value text, selectors a tuple of
+                                (selector name, value text)
+                    selectors:  OrderedDict of selector name: value text the file leaves the device with
+        """
+        if not isinstance(file_path, str):
+            raise ParameterTypeError("ProfileManager.parse: "
+                                     "Expected file_path type is str, not %s" % type(file_path))
+
+        with open(file_path, "r") as persistence_file:
+            lines = persistence_file.read().splitlines()
+
+        entries = OrderedDict()
+        selectors = OrderedDict()
+        run = OrderedDict()
+        current_section = None
+        for line in lines:
+            line = line.strip()
+            if line.startswith("</"):
+                current_section = section if section in line else ""
+                continue
+
+            feature_name, separator, text = line.partition("\t")
+            if not separator or feature_name.startswith("#") or current_section not in (None, section):
+                continue
+
+            text = text.strip()
+            if feature_name.endswith("Selector"):
+                run[feature_name] = text
+                selectors[feature_name] = text
+                continue
+
+            selected = tuple((selector_name, selector_text) for selector_name, selector_text in run.items()
+                             if ProfileManager.__is_selected(selector_name, feature_name))
+            key = (selected, feature_name)
+            # a later line of the same feature wins, at the position of the first one
+            entries[key] = text
+            run = OrderedDict()
+        return entries, selectors
+
+    @staticmethod
+    def __is_selected(selector_name, feature_name):
+        return feature_name.startswith(selector_name[:-len("Selector")]) \
+            or feature_name in ProfileManager.__SELECTED.get(selector_name, ())
+
+    def __get_sample(self, feature_name):
+        """
+        :brief      Live value of a feature, whose type tells how to read its text, None if not available
+        """
+        if feature_name not in self.__types:
+            try:
+                self.__types[feature_name] = self.__feature_control.snapshot([feature_name])[feature_name]
+            except Exception:
+                self.__types[feature_name] = None
+        return self.__types[feature_name]
+
+    @staticmethod
+    def __to_value(sample, text):
+        """
+        :brief      Value of a persistence file text, typed like sample
+        """
+        if isinstance(sample, bool):
+            return text.lower() in ("1", "true", "on")
+        if isinstance(sample, INT_TYPE):
+            try:
+                return int(text)
+            except ValueError:
+                return int(float(text))
+        if isinstance(sample, float):
+            return float(text)
+        return text
+
+    def load(self, name, file_path):
+        """
+        :brief      Read a profile from a persistence file and keep it under name, replacing a profile of that name
+        :param      name:       profile name(type: str)
+        :param      file_path:  persistence file path(type: str)
+        :return:    list of the feature names of the file that this device does not implement, they are ignored
+        """
+        if not isinstance(name, str):
+            raise ParameterTypeError("ProfileManager.load: "
+                                     "Expected name type is str, not %s" % type(name))
+
+        text_entries, text_selectors = ProfileManager.parse(file_path, self.__section)
+        ignored = []
+
+        def convert(feature_name, text):
+            sample = self.__get_sample(feature_name)
+            if sample is None:
+                if feature_name not in ignored:
+                    ignored.append(feature_name)
+                return None
+            try:
+                return ProfileManager.__to_value(sample, text)
+            except ValueError:
+                raise InvalidParameter("ProfileManager.load: The value '%s' of '%s' in %s is not a %s"
+                                       % (text, feature_name, file_path, type(sample).__name__))
+
+        entries = OrderedDict()
+        for (text_selectors_of_entry, feature_name), text in text_entries.items():
+            value = convert(feature_name, text)
+            if value is None:
+                continue
+            # selectors the device does not implement select nothing
+            selected = tuple((selector_name, convert(selector_name, selector_text))
+                             for selector_name, selector_text in text_selectors_of_entry)
+            selected = tuple(selector for selector in selected if selector[1] is not None)
+            entries[(selected, feature_name)] = value
+
+        selectors = OrderedDict()
+        for selector_name, selector_text in text_selectors.items():
+            value = convert(selector_name, selector_text)
+            if value is not None:
+                selectors[selector_name] = value
+
+        self.__profiles[name] = (entries, selectors)
+        if self.__applied is not None and self.__applied[0] == name:
+            self.__applied = None
+        return ignored
+
+    def capture(self, name):
+        """
+        :brief      Keep the live state of the device as profile name, through FeatureControl.feature_save
+        :param      name:       profile name(type: str)
+        :return:    list of the ignored feature names, see load
+        """
+        file_descriptor, file_path = tempfile.mkstemp(suffix=".txt")
+        os.close(file_descriptor)
+        try:
+            self.__feature_control.feature_save(file_path)
+            return self.load(name, file_path)
+        finally:
+            os.remove(file_path)
+
+    def remove(self, name):
+        """
+        :brief      Forget a profile
+        :return:    None
+        """
+        self.__get_profile(name, 'remove')
+        del self.__profiles[name]
+        if self.__applied is not None and self.__applied[0] == name:
+            self.__applied = None
+
+    def get_names(self):
+        """
+        :return:    list of the profile names, in load order
+        """
+        return list(self.__profiles)
+
+    def get_profile(self, name):
+        """
+        :brief      Values of a profile
+        :return:    OrderedDict of feature name: value, selected features are named
+                    "Feature[Selector=value]"
+        """
+        entries, selectors = self.__get_profile(name, 'get_profile')
+        return OrderedDict((ProfileManager.__get_display_name(key), value) for key, value in entries.items())
+
+    def get_applied(self):
+        """
+        :return:    name of the profile applied last, None if none or if it was removed or reloaded
+        """
+        return None if self.__applied is None else self.__applied[0]
+
+    def __get_profile(self, name, func_name):
+        if not isinstance(name, str):
+            raise ParameterTypeError("ProfileManager.%s: "
+                                     "Expected name type is str, not %s" % (func_name, type(name)))
+
+        if name not in self.__profiles:
+            raise InvalidParameter("ProfileManager.%s: No profile named '%s'" % (func_name, name))
+        return self.__profiles[name]
+
+    @staticmethod
+    def __get_display_name(key):
+        selected, feature_name = key
+        if not selected:
+            return feature_name
+        return "%s[%s]" % (feature_name, ",".join("%s=%s" % selector for selector in selected))
+
+    @staticmethod
+    def __get_blocks(entries):
+        """
+        :brief      Group the entries by selectors, the unselected features first, then in file order
+        :return:    list of (selectors, OrderedDict of feature name: value)
+        """
+        blocks = OrderedDict([((), OrderedDict())])
+        for (selected, feature_name), value in entries.items():
+            blocks.setdefault(selected, OrderedDict())[feature_name] = value
+        return list(blocks.items())
+
+    def diff(self, name):
+        """
+        :brief      Features of a profile whose live value differs, read through the feature cache.
+                    Selected features are read after writing their selectors, the selectors are restored.
+        :param      name:   profile name(type: str)
+        :return:    OrderedDict of feature name: (live value, profile value), names as in get_profile
+        """
+        entries, selectors = self.__get_profile(name, 'diff')
+        blocks = ProfileManager.__get_blocks(entries)
+        selector_names = [selector_name for selector_name in selectors]
+        restore = self.__feature_control.snapshot(selector_names) if len(blocks) > 1 else None
+
+        changed = OrderedDict()
+        try:
+            for selected, block in blocks:
+                if not block:
+                    continue
+                if selected:
+                    self.__feature_control.apply(list(selected))
+                live = self.__feature_control.snapshot(list(block))
+                for feature_name, value in block.items():
+                    if live[feature_name] != value:
+                        changed[ProfileManager.__get_display_name((selected, feature_name))] = \
+                            (live[feature_name], value)
+        finally:
+            if restore:
+                self.__feature_control.apply(list(restore.items()))
+        return changed
+
+    def __get_known(self):
+        """
+        :brief      Live values known without reading the device: those of the profile applied last,
+                    if nothing was written to the device since
+        :return:    dict of (selectors, feature name): value, dict of selector name: value
+        """
+        cache = self.__feature_control.get_feature_cache()
+        if self.__applied is None or cache is None or cache.get_generation() != self.__applied[1]:
+            return {}, {}
+
+        entries, selectors = self.__profiles[self.__applied[0]]
+        unknown = set()
+        for (selected, feature_name), value in entries.items():
+            if feature_name in ProfileManager.__AUTO_FEATURES and value != "Off":
+                unknown.update(ProfileManager.__AUTO_FEATURES[feature_name])
+        return dict((key, value) for key, value in entries.items() if key[1] not in unknown), dict(selectors)
+
+    def apply(self, name):
+        """
+        :brief      Write the features of a profile that differ from the live state, in dependency order
+                    (see FeatureControl.apply), the unselected features first, then each selector group.
+                    The selectors are left as the file leaves them.
+        :param      name:   profile name(type: str)
+        :return:    OrderedDict of feature name: {"written": bool, "seconds": write time}, names as in get_profile
+        """
+        entries, selectors = self.__get_profile(name, 'apply')
+        known, selector_state = self.__get_known()
+        self.__applied = None
+
+        report = OrderedDict()
+        for selected, block in ProfileManager.__get_blocks(entries):
+            if not block:
+                continue
+            if selected:
+                self.__feature_control.apply(list(selected), current=selector_state)
+                selector_state.update(selected)
+            current = dict((feature_name, known[(selected, feature_name)]) for feature_name in block
+                           if (selected, feature_name) in known)
+            block_report = self.__feature_control.apply(block, current=current)
+            for feature_name, result in block_report.items():
+                report[ProfileManager.__get_display_name((selected, feature_name))] = result
+
+        if selectors:
+            self.__feature_control.apply(list(selectors.items()), current=selector_state)
+
+        cache = self.__feature_control.get_feature_cache()
+        self.__applied = (name, None if cache is None else cache.get_generation())
+        return report
@@ -0,0 +1,445 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+import numpy
+from gxipy.gxidef import *
+from gxipy.ImageProc import *
+from gxipy.Exception import *
+import glob
+import mmap
+import os
+import struct
+import threading
+import types
+
+if sys.version_info.major > 2:
+    import queue
+    INT_TYPE = int
+else:
+    import Queue as queue
+    INT_TYPE = (int, long)
+
+RECORD_MAGIC = b"GXRAWSEG"
+RECORD_VERSION = 1
+RECORD_SUFFIX = ".gxraw"
+# magic, version, header size, index capacity, frame count, segment index, reserved,
+# data offset, data used, segment size
+RECORD_HEADER_FORMAT = "<8sIIIIIIQQQ"
+RECORD_HEADER_SIZE = 4096
+RECORD_DATA_ALIGNMENT = 64
+RECORD_INDEX_DTYPE = numpy.dtype([("frame_id", "<u8"), ("timestamp", "<u8"), ("pixel_format", "<u4"),
+                                  ("width", "<u4"), ("height", "<u4"), ("status", "<i4"),
+                                  ("offset", "<u8"), ("size", "<u8")])
+
+# end marker of the writer queue
+_RECORDER_END = None
+
+
+class _RecordSegment:
+    """
+    One memory-mapped segment file: header, index of index_capacity entries, frame data.
+    """
+    def __init__(self, path, segment_index, segment_size, index_capacity):
+        self.path = path
+        self.segment_size = segment_size
+        self.index_capacity = index_capacity
+        self.segment_index = segment_index
+        self.data_offset = _align(RECORD_HEADER_SIZE + index_capacity * RECORD_INDEX_DTYPE.itemsize, mmap.PAGESIZE)
+        self.data_used = 0
+        self.frame_count = 0
+
+        self.file = open(path, "w+b")
+        self.file.truncate(segment_size)
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(self.file.fileno(), 0, segment_size)
+            except OSError:
+                # sparse file on file systems without fallocate
+                pass
+        self.map = mmap.mmap(self.file.fileno(), segment_size)
+        self.array = numpy.frombuffer(self.map, dtype=numpy.uint8)
+        self.index = numpy.frombuffer(self.map, dtype=RECORD_INDEX_DTYPE, count=index_capacity,
+                                      offset=RECORD_HEADER_SIZE)
+        self.write_header()
+
+    def write_header(self):
+        struct.pack_into(RECORD_HEADER_FORMAT, self.map, 0, RECORD_MAGIC, RECORD_VERSION, RECORD_HEADER_SIZE,
+                         self.index_capacity, self.frame_count, self.segment_index, 0,
+                         self.data_offset, self.data_used, self.segment_size)
+
+    def fits(self, size):
+        if self.frame_count >= self.index_capacity:
+            return False
+        return self.data_offset + _align(self.data_used, RECORD_DATA_ALIGNMENT) + size <= self.segment_size
+
+    def append(self, raw_image):
+        """
+        :brief      Copy the frame data into the map, then publish its index entry and the frame count
+        :param      raw_image:  RawImage object
+        :return:    None
+        """
+        frame_data = raw_image.frame_data
+        offset = self.data_offset + _align(self.data_used, RECORD_DATA_ALIGNMENT)
+        # the payload the image holds, image_buf may point at a driver buffer reused since
+        payload = numpy.frombuffer(raw_image.get_buffer(), dtype=numpy.uint8, count=frame_data.image_size)
+        self.array[offset:offset + frame_data.image_size] = payload
+
+        entry = self.index[self.frame_count]
+        entry["frame_id"] = frame_data.frame_id
+        entry["timestamp"] = frame_data.timestamp
+        entry["pixel_format"] = frame_data.pixel_format
+        entry["width"] = frame_data.width
+        entry["height"] = frame_data.height
+        entry["status"] = frame_data.status
+        entry["offset"] = offset
+        entry["size"] = frame_data.image_size
+
+        self.data_used = offset + frame_data.image_size - self.data_offset
+        self.frame_count += 1
+        self.write_header()
+
+    def close(self):
+        """
+        :brief      Flush the map and cut the preallocated file down to the used size
+        :return:    None
+        """
+        self.write_header()
+        self.map.flush()
+        del self.array
+        del self.index
+        self.map.close()
+        self.file.truncate(self.data_offset + self.data_used)
+        self.file.close()
+
+
+def _align(value, alignment):
+    return (value + alignment - 1) // alignment * alignment
+
+
+class RawRecorder:
+    """
+    Records RawImages into memory-mapped segment files on a background writer thread.
+    A segment is preallocated to segment_size and holds a fixed header, an index entry per frame
+    (RECORD_INDEX_DTYPE) and the raw frame data; a new segment is started when the next frame or
+    index entry doesn't fit, the finished one is truncated to its used size.
+    The payload is read on the writer thread from the data the image holds (RawImage.get_buffer), not
+    from frame_data.image_buf, so images copied by get_image, dq_buf or the capture callback can be
+    recorded and given back right away. Zero-copy images hold their driver buffer until written,
+    so keep queue_size below the acquisition buffer number.
+    """
+    def __init__(self, directory, prefix="capture", segment_size=1 << 30, index_capacity=65536, queue_size=64):
+        """
+        :brief  Constructor for instance initialization
+        :param  directory:          output directory, created if missing
+        :param  prefix:             segment file name prefix, files are <prefix>_<index>.gxraw
+        :param  segment_size:       segment file size limit in bytes
+        :param  index_capacity:     maximum number of frames per segment
+        :param  queue_size:         writer queue size
+        """
+        if not isinstance(directory, str):
+            raise ParameterTypeError("RawRecorder.__init__: "
+                                     "Expected directory type is str, not %s" % type(directory))
+
+        if not isinstance(prefix, str):
+            raise ParameterTypeError("RawRecorder.__init__: "
+                                     "Expected prefix type is str, not %s" % type(prefix))
+
+        for name, value in (("segment_size", segment_size), ("index_capacity", index_capacity),
+                            ("queue_size", queue_size)):
+            if not isinstance(value, INT_TYPE):
+                raise ParameterTypeError("RawRecorder.__init__: "
+                                         "Expected %s type is int, not %s" % (name, type(value)))
+            if value < 1:
+                raise InvalidParameter("RawRecorder.__init__: %s must be greater than 0" % name)
+
+        if index_capacity > UNSIGNED_INT_MAX:
+            raise InvalidParameter("RawRecorder.__init__: index_capacity out of bounds, maximum=%s"
+                                   % hex(UNSIGNED_INT_MAX).__str__())
+
+        data_offset = _align(RECORD_HEADER_SIZE + index_capacity * RECORD_INDEX_DTYPE.itemsize, mmap.PAGESIZE)
+        if segment_size <= data_offset:
+            raise InvalidParameter("RawRecorder.__init__: segment_size must be greater than %d "
+                                   "for index_capacity %d" % (data_offset, index_capacity))
+
+        self.__directory = directory
+        self.__prefix = prefix
+        self.__segment_size = segment_size
+        self.__index_capacity = index_capacity
+        self.__data_capacity = segment_size - data_offset
+        self.__queue = queue.Queue(queue_size)
+        self.__thread = None
+        self.__segment = None
+        self.__segment_paths = []
+        self.__running = False
+        self.__last_error = None
+        self.__recorded_count = 0
+        self.__recorded_bytes = 0
+        self.__drop_count = 0
+        self.__error_count = 0
+
+    def start(self):
+        """
+        :brief      Start the writer thread
+        :return:    None
+        """
+        if self.__running:
+            return
+
+        if not os.path.isdir(self.__directory):
+            os.makedirs(self.__directory)
+
+        self.__running = True
+        self.__thread = threading.Thread(target=self.__run, name="RawRecorder")
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def stop(self):
+        """
+        :brief      Write the queued frames, close the current segment and stop the writer thread
+        :return:    None
+        """
+        if not self.__running:
+            return
+
+        self.__running = False
+        self.__queue.put(_RECORDER_END)
+        self.__thread.join()
+        self.__thread = None
+
+    def record(self, raw_image, timeout=None):
+        """
+        :brief      Queue a frame for writing
+        :param      raw_image:  RawImage object
+        :param      timeout:    seconds to wait for room in the queue, None waits forever, 0 does not wait
+        :return:    True if queued, False if the frame was dropped
+        """
+        if not isinstance(raw_image, RawImage):
+            raise ParameterTypeError("RawRecorder.record: "
+                                     "Expected raw_image type is RawImage, not %s" % type(raw_image))
+
+        if not self.__running or raw_image.frame_data.image_buf is None:
+            self.__drop_count += 1
+            return False
+
+        if raw_image.frame_data.image_size > self.__data_capacity:
+            print("RawRecorder.record: frame of %d bytes doesn't fit in a segment" % raw_image.frame_data.image_size)
+            self.__drop_count += 1
+            return False
+
+        try:
+            self.__queue.put(raw_image, timeout != 0, timeout or None)
+        except queue.Full:
+            self.__drop_count += 1
+            return False
+        return True
+
+    def get_segment_paths(self):
+        """
+        :brief      Get the paths of the segment files written so far
+        :return:    list of str
+        """
+        return list(self.__segment_paths)
+
+    def get_last_error(self):
+        """
+        :brief      Get the last exception raised while writing
+        :return:    Exception object, None if there was none
+        """
+        return self.__last_error
+
+    def get_statistics(self):
+        """
+        :brief      Get recorder counters
+        :return:    dict {"recorded", "bytes", "dropped", "errors", "queued", "segments"}
+        """
+        return {"recorded": self.__recorded_count,
+                "bytes": self.__recorded_bytes,
+                "dropped": self.__drop_count,
+                "errors": self.__error_count,
+                "queued": self.__queue.qsize(),
+                "segments": len(self.__segment_paths)}
+
+    def __open_segment(self):
+        segment_index = len(self.__segment_paths)
+        path = os.path.join(self.__directory, "%s_%06d%s" % (self.__prefix, segment_index, RECORD_SUFFIX))
+        self.__segment = _RecordSegment(path, segment_index, self.__segment_size, self.__index_capacity)
+        self.__segment_paths.append(path)
+
+    def __run(self):
+        """
+        :brief      Writer thread body
+        :return:    None
+        """
+        while True:
+            raw_image = self.__queue.get()
+            if raw_image is _RECORDER_END:
+                break
+
+            try:
+                size = raw_image.frame_data.image_size
+                if self.__segment is not None and not self.__segment.fits(size):
+                    self.__segment.close()
+                    self.__segment = None
+                if self.__segment is None:
+                    self.__open_segment()
+                self.__segment.append(raw_image)
+                self.__recorded_count += 1
+                self.__recorded_bytes += size
+            except Exception as error:
+                self.__error_count += 1
+                self.__last_error = error
+            # drop the reference now, a zero-copy image gives its buffer back here
+            raw_image = None
+
+        if self.__segment is not None:
+            self.__segment.close()
+            self.__segment = None
+
+
+class RawRecordReader:
+    """
+    Random access to the frames of RawRecorder segment files.
+    Frames are returned as read-only numpy views on the memory-mapped files, nothing is copied;
+    close() only unmaps the files once no view is left.
+    """
+    def __init__(self, path):
+        """
+        :brief  Constructor for instance initialization
+        :param  path:   segment file, or directory holding the .gxraw segments of one recording
+        """
+        if not isinstance(path, str):
+            raise ParameterTypeError("RawRecordReader.__init__: "
+                                     "Expected path type is str, not %s" % type(path))
+
+        if os.path.isdir(path):
+            paths = sorted(glob.glob(os.path.join(path, "*" + RECORD_SUFFIX)))
+        else:
+            paths = [path]
+
+        self.__files = []
+        self.__maps = []
+        indexes = []
+        for segment_path in paths:
+            segment_file = open(segment_path, "rb")
+            segment_map = mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ)
+            header = struct.unpack_from(RECORD_HEADER_FORMAT, segment_map, 0)
+            if header[0] != RECORD_MAGIC or header[1] != RECORD_VERSION:
+                segment_map.close()
+                segment_file.close()
+                raise InvalidParameter("RawRecordReader.__init__: %s is not a raw record segment" % segment_path)
+            header_size, frame_count = header[2], header[4]
+            indexes.append(numpy.frombuffer(segment_map, dtype=RECORD_INDEX_DTYPE, count=frame_count,
+                                            offset=header_size))
+            self.__files.append(segment_file)
+            self.__maps.append(segment_map)
+
+        self.__paths = paths
+        if len(indexes) != 0:
+            self.__index = numpy.concatenate(indexes)
+            self.__segment_of = numpy.concatenate([numpy.full(len(index), number, dtype=numpy.int32)
+                                                   for number, index in enumerate(indexes)])
+        else:
+            self.__index = numpy.zeros(0, dtype=RECORD_INDEX_DTYPE)
+            self.__segment_of = numpy.zeros(0, dtype=numpy.int32)
+
+        self.__position_of_frame_id = dict((int(frame_id), position)
+                                           for position, frame_id in enumerate(self.__index["frame_id"]))
+        self.__timestamp_order = numpy.argsort(self.__index["timestamp"], kind="stable")
+        self.__sorted_timestamps = self.__index["timestamp"][self.__timestamp_order]
+
+    def __len__(self):
+        return len(self.__index)
+
+    def get_segment_paths(self):
+        """
+        :brief      Get the segment files of the recording
+        :return:    list of str
+        """
+        return list(self.__paths)
+
+    def get_index(self):
+        """
+        :brief      Get the index of every frame in recording order
+        :return:    numpy structured array of RECORD_INDEX_DTYPE
+        """
+        return self.__index
+
+    def get_frame(self, position):
+        """
+        :brief      Get a frame by its position in the recording
+        :param      position:   range:[0, len(reader))
+        :return:    (index entry, numpy view): the view is (height, width) uint8/uint16 for 8/16 bit
+                    formats, (height, width, 3) for RGB8/BGR8, the raw bytes otherwise
+        """
+        entry, data = self.get_frame_data(position)
+        return entry, _frame_view(entry, data)
+
+    def get_frame_data(self, position):
+        """
+        :brief      Get the whole recorded payload of a frame, image and chunk data
+        :param      position:   range:[0, len(reader))
+        :return:    (index entry, read-only uint8 numpy view)
+        """
+        entry = self.__index[position]
+        segment_map = self.__maps[self.__segment_of[position]]
+        return entry, numpy.frombuffer(segment_map, dtype=numpy.uint8, count=int(entry["size"]),
+                                       offset=int(entry["offset"]))
+
+    def get_by_frame_id(self, frame_id):
+        """
+        :brief      Get a frame by frame_id
+        :param      frame_id:   frame id
+        :return:    (index entry, numpy view), None if the frame was not recorded
+        """
+        position = self.__position_of_frame_id.get(frame_id)
+        if position is None:
+            return None
+        return self.get_frame(position)
+
+    def get_by_timestamp(self, timestamp):
+        """
+        :brief      Get the last frame whose timestamp is not later than timestamp
+        :param      timestamp:  device timestamp
+        :return:    (index entry, numpy view), None if every frame is later
+        """
+        sorted_position = numpy.searchsorted(self.__sorted_timestamps, timestamp, side="right") - 1
+        if sorted_position < 0:
+            return None
+        return self.get_frame(int(self.__timestamp_order[sorted_position]))
+
+    def close(self):
+        """
+        :brief      Unmap the segment files, maps still referenced by a view stay open until it is dropped
+        :return:    None
+        """
+        self.__index = numpy.zeros(0, dtype=RECORD_INDEX_DTYPE)
+        self.__position_of_frame_id = {}
+        for segment_map in self.__maps:
+            try:
+                segment_map.close()
+            except BufferError:
+                pass
+        for segment_file in self.__files:
+            segment_file.close()
+        self.__maps = []
+        self.__files = []
+
+
+def _frame_view(entry, data):
+    """
+    :brief      Shape the raw bytes of a recorded frame after its pixel format
+    :param      entry:  index entry
+    :param      data:   uint8 numpy array of the frame
+    :return:    numpy array
+    """
+    pixel_format = int(entry["pixel_format"])
+    width = int(entry["width"])
+    height = int(entry["height"])
+    if (pixel_format & PIXEL_BIT_MASK) == GX_PIXEL_8BIT and len(data) >= width * height:
+        return data[:width * height].reshape(height, width)
+    elif (pixel_format & PIXEL_BIT_MASK) == GX_PIXEL_16BIT and len(data) >= width * height * 2:
+        return data[:width * height * 2].view(numpy.uint16).reshape(height, width)
+    elif pixel_format in (GxPixelFormatEntry.RGB8, GxPixelFormatEntry.BGR8) and len(data) >= width * height * 3:
+        return data[:width * height * 3].reshape(height, width, 3)
+    return data
@@ -0,0 +1,2074 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+# In-process stand-in for libgxiapi, selected with GXIPY_BACKEND=sim.
+# gxwrapper imports this module before its wrapper functions are defined, so only the
+# structures and constants at the top of gxwrapper are available at import time.
+
+import numpy
+from gxipy.gxwrapper import *
+from gxipy.gxidef import *
+import collections
+import itertools
+import random
+import struct
+import threading
+import time
+import types
+
+if sys.version_info.major > 2:
+    INT_TYPE = int
+else:
+    INT_TYPE = (int, long)
+
+SIM_TICK_FREQUENCY = 1000000000         # device timestamp ticks per second
+SIM_DEFAULT_BUFFER_NUM = 5              # acquisition buffers until GXSetAcqusitionBufferNumber
+SIM_PACKET_SIZE = 8192                  # bytes per packet for StreamDeliveredPacketCount
+# section header of the feature files, the layout of a GenApi persistence file as exported by GxIAPI
+SIM_FEATURE_FILE_SECTION = ("</---------------------------------------------------Remote device features are as follows:"
+                            "--------------------------------------------------->")
+
+# pixel format: (symbolic, bayer pattern or None for mono, bit depth)
+_SIM_PIXEL_FORMATS = collections.OrderedDict([
+    (GxPixelFormatEntry.MONO8, ("Mono8", None, 8)),
+    (GxPixelFormatEntry.MONO10, ("Mono10", None, 10)),
+    (GxPixelFormatEntry.MONO12, ("Mono12", None, 12)),
+    (GxPixelFormatEntry.BAYER_GR8, ("BayerGR8", "GR", 8)),
+    (GxPixelFormatEntry.BAYER_RG8, ("BayerRG8", "RG", 8)),
+    (GxPixelFormatEntry.BAYER_GB8, ("BayerGB8", "GB", 8)),
+    (GxPixelFormatEntry.BAYER_BG8, ("BayerBG8", "BG", 8)),
+    (GxPixelFormatEntry.BAYER_GR10, ("BayerGR10", "GR", 10)),
+    (GxPixelFormatEntry.BAYER_RG10, ("BayerRG10", "RG", 10)),
+    (GxPixelFormatEntry.BAYER_GB10, ("BayerGB10", "GB", 10)),
+    (GxPixelFormatEntry.BAYER_BG10, ("BayerBG10", "BG", 10)),
+    (GxPixelFormatEntry.BAYER_GR12, ("BayerGR12", "GR", 12)),
+    (GxPixelFormatEntry.BAYER_RG12, ("BayerRG12", "RG", 12)),
+    (GxPixelFormatEntry.BAYER_GB12, ("BayerGB12", "GB", 12)),
+    (GxPixelFormatEntry.BAYER_BG12, ("BayerBG12", "BG", 12)),
+])
+
+# colour of the four sites of a 2x2 Bayer cell, by row
+_SIM_BAYER_ROWS = {
+    "RG": ("RG", "GB"),
+    "GR": ("GR", "BG"),
+    "GB": ("GB", "RG"),
+    "BG": ("BG", "GR"),
+}
+
+_SIM_COLOR_FILTERS = {
+    None: GxPixelColorFilterEntry.NONE,
+    "RG": GxPixelColorFilterEntry.BAYER_RG,
+    "GB": GxPixelColorFilterEntry.BAYER_GB,
+    "GR": GxPixelColorFilterEntry.BAYER_GR,
+    "BG": GxPixelColorFilterEntry.BAYER_BG,
+}
+
+_SIM_STATUS_REASONS = {
+    GxStatusList.NOT_IMPLEMENTED: "not implemented by the simulated camera",
+    GxStatusList.OUT_OF_RANGE: "value out of range",
+    GxStatusList.INVALID_ACCESS: "feature is not accessible now",
+    GxStatusList.INVALID_PARAMETER: "invalid parameter",
+    GxStatusList.ERROR_TYPE: "feature type mismatch",
+    GxStatusList.OFFLINE: "device is offline",
+    GxStatusList.INVALID_CALL: "invalid call",
+}
+
+# handle kinds
+_SIM_HANDLE_INTERFACE = 0
+_SIM_HANDLE_DEVICE = 1
+_SIM_HANDLE_LOCAL_DEVICE = 2
+_SIM_HANDLE_STREAM = 3
+
+# marker queued in place of a frame when a timeout is injected
+_SIM_STALL = -1
+
+# chunks appended to the payload, by ChunkSelector value: (symbolic, value format). Every chunk is its
+# value followed by the trailer (chunk id = selector value, length), little endian as on USB3 Vision.
+_SIM_CHUNKS = collections.OrderedDict([
+    (GxChunkSelectorEntry.FRAME_ID, ("FrameID", "<Q")),
+    (GxChunkSelectorEntry.TIME_STAMP, ("Timestamp", "<Q")),
+    (GxChunkSelectorEntry.COUNTER_VALUE, ("CounterValue", "<Q")),
+    (4, ("ExposureTime", "<d")),
+    (5, ("Gain", "<d")),
+    (6, ("LineStatusAll", "<Q")),
+])
+_SIM_CHUNK_TRAILER = "<II"
+
+
+class SimulatedFault:
+    NONE = 0                    # the frame is delivered intact
+    LOSS = 1                    # the frame never reaches a buffer, counted as lost
+    INCOMPLETE = 2              # the tail of the frame is missing, status GxFrameStatusList.INCOMPLETE
+    TIMEOUT = 3                 # nothing arrives for this frame, the waiting call returns TIMEOUT
+
+    def __init__(self):
+        pass
+
+
+def _arg_object(arg):
+    """
+    :brief      The object behind byref(), or the argument itself
+    """
+    return getattr(arg, "_obj", arg)
+
+
+def _arg_value(arg):
+    """
+    :brief      Value of a ctypes scalar or string buffer, plain python values are returned as is
+    """
+    arg = _arg_object(arg)
+    return getattr(arg, "value", arg)
+
+
+def _arg_string(arg):
+    value = _arg_value(arg)
+    if isinstance(value, bytes):
+        value = value.decode()
+    return value
+
+
+def _set_char_array(array, string):
+    """
+    :brief      Copy a str into a ctypes char buffer, truncated to fit with its terminator
+    """
+    data = string.encode()[:ctypes.sizeof(array) - 1]
+    ctypes.memmove(array, data + b"\0", len(data) + 1)
+
+
+def _set_char_field(structure, field, string):
+    """
+    :brief      Set a char array field of a structure, truncated to fit with its terminator
+    """
+    size = getattr(type(structure), field).size
+    setattr(structure, field, string.encode()[:size - 1])
+
+
+def _render_scene(width, height, pattern, depth):
+    """
+    :brief      Static test scene: red ramps along x, green along y, blue along the diagonal,
+                mosaicked with the Bayer pattern or reduced to luminance for mono
+    :return:    numpy array (height, width), uint8 for 8 bit formats, uint16 otherwise
+    """
+    x = numpy.arange(width, dtype=numpy.uint32) * 255 // max(width - 1, 1)
+    y = numpy.arange(height, dtype=numpy.uint32) * 255 // max(height - 1, 1)
+    red = numpy.broadcast_to(x, (height, width))
+    green = numpy.broadcast_to(y[:, None], (height, width))
+    blue = 255 - (red + green) // 2
+
+    if pattern is None:
+        scene = (red * 77 + green * 150 + blue * 29) >> 8
+    else:
+        planes = {"R": red, "G": green, "B": blue}
+        scene = numpy.empty((height, width), dtype=numpy.uint32)
+        for row in (0, 1):
+            for column in (0, 1):
+                colour = _SIM_BAYER_ROWS[pattern][row][column]
+                scene[row::2, column::2] = planes[colour][row::2, column::2]
+
+    scene <<= depth - 8
+    return scene.astype(numpy.uint8 if depth == 8 else numpy.uint16)
+
+
+class _SimulatedFunction:
+    """
+    :brief  Callable standing in for a ctypes foreign function, gxwrapper sets argtypes/restype on some
+    """
+    def __init__(self, func):
+        self.__func = func
+        self.argtypes = None
+        self.restype = c_int
+
+    def __call__(self, *args):
+        return self.__func(*args)
+
+
+class SimulatedFeature:
+    def __init__(self, name, feature_id, feature_type, value=0, minimum=0, maximum=0, increment=1,
+                 entries=None, unit="", writable=True, streaming_locked=False,
+                 cachable=GxNodeCachableType.CACHABLE_WRITETHROUGH, polling=-1):
+        """
+        :brief  One node of the simulated camera
+        :param  name:               GenICam feature name
+        :param  feature_id:         GxFeatureID code, None if only reachable by name
+        :param  feature_type:       GxFeatureType
+        :param  entries:            enum entries [(value, symbolic)]
+        :param  streaming_locked:   True: read only while acquisition is running
+        :param  cachable:           GxNodeCachableType reported by GXGetNodeCachable
+        :param  polling:            polling time in ms reported by GXGetNodePolling, -1 for none
+        """
+        self.name = name
+        self.feature_id = feature_id
+        self.feature_type = feature_type
+        self.value = value
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increment = increment
+        self.entries = entries or []
+        self.unit = unit
+        self.writable = writable
+        self.streaming_locked = streaming_locked
+        self.cachable = cachable
+        self.polling = polling
+
+    def get_symbolic(self, value=None):
+        """
+        :brief      Symbolic of an enum entry, of the current value by default
+        :return:    symbolic, None if the value is not an entry
+        """
+        if value is None:
+            value = self.value
+        for entry_value, symbolic in self.entries:
+            if entry_value == value:
+                return symbolic
+        return None
+
+    def get_entry_value(self, symbolic):
+        """
+        :brief      Value of an enum entry
+        :return:    value, None if there is no such entry
+        """
+        for entry_value, entry_symbolic in self.entries:
+            if entry_symbolic == symbolic:
+                return entry_value
+        return None
+
+    def to_string(self):
+        """
+        :brief      Value as written to a feature file
+        """
+        if self.feature_type == GxFeatureType.ENUM:
+            return self.get_symbolic()
+        if self.feature_type == GxFeatureType.BOOL:
+            return "1" if self.value else "0"
+        return str(self.value)
+
+    def from_string(self, text):
+        """
+        :brief      Parse a value read from a feature file
+        :return:    value, None if the text does not parse
+        """
+        try:
+            if self.feature_type == GxFeatureType.INT:
+                return int(text)
+            if self.feature_type == GxFeatureType.FLOAT:
+                return float(text)
+            if self.feature_type == GxFeatureType.BOOL:
+                return text.strip().lower() in ("1", "true", "on")
+            if self.feature_type == GxFeatureType.ENUM:
+                return self.get_entry_value(text.strip())
+        except ValueError:
+            return None
+        return text
+
+
+class _SimulatedStream:
+    def __init__(self, camera):
+        """
+        :brief  Acquisition engine of one simulated camera: a producer thread renders frames into a
+                fixed set of buffers and hands them to the capture callback or the output queue
+        """
+        self.__camera = camera
+        self.__condition = threading.Condition()
+        self.__buffer_num = SIM_DEFAULT_BUFFER_NUM
+        self.__buffers = []
+        self.__retired_buffers = []
+        self.__user_buffers = collections.OrderedDict()
+        self.__user_buffers_in_use = False
+        self.__free = collections.deque()
+        self.__filled = collections.deque()
+        self.__outstanding = {}
+        self.__buf_ids = itertools.count(1)
+        self.__callback = None
+        self.__thread = None
+        self.__running = False
+        # device times of the triggers not served yet, latched when the trigger arrives
+        self.__triggers = collections.deque()
+        self.__frame_index = 0
+        self.__statistics = collections.OrderedDict([
+            ("generated", 0), ("delivered", 0), ("lost", 0), ("incomplete", 0), ("timeout", 0), ("packets", 0)])
+
+    def is_running(self):
+        return self.__running
+
+    def get_buffer_number(self):
+        return self.__buffer_num
+
+    def get_statistics(self):
+        with self.__condition:
+            return dict(self.__statistics)
+
+    def set_buffer_number(self, buffer_num):
+        with self.__condition:
+            if self.__running:
+                return GxStatusList.INVALID_CALL
+            self.__buffer_num = buffer_num
+        return GxStatusList.SUCCESS
+
+    def register_buffer(self, address, size, user_param):
+        """
+        :brief      Acquire into a user buffer, the registered buffers replace the stream's own from the next start
+        :param      address:    buffer address
+        :param      size:       buffer size in bytes
+        :param      user_param: user_param of the frames filled into this buffer
+        """
+        with self.__condition:
+            if self.__running:
+                return GxStatusList.INVALID_CALL
+            if address in self.__user_buffers:
+                return GxStatusList.INVALID_PARAMETER
+            self.__user_buffers[address] = (size, user_param)
+        return GxStatusList.SUCCESS
+
+    def unregister_buffer(self, address):
+        with self.__condition:
+            if self.__running:
+                return GxStatusList.INVALID_CALL
+            if self.__user_buffers.pop(address, None) is None:
+                return GxStatusList.INVALID_PARAMETER
+        return GxStatusList.SUCCESS
+
+    def set_callback(self, callback):
+        with self.__condition:
+            self.__callback = callback
+        return GxStatusList.SUCCESS
+
+    def wake(self):
+        with self.__condition:
+            self.__condition.notify_all()
+
+    def trigger(self):
+        with self.__condition:
+            if self.__running:
+                self.__triggers.append(self.__camera.get_device_time())
+                self.__condition.notify_all()
+        return GxStatusList.SUCCESS
+
+    def __allocate(self, payload_size):
+        """
+        :return:    status, INVALID_PARAMETER if a registered user buffer is smaller than the payload
+        """
+        if self.__user_buffers:
+            if any(size < payload_size for size, user_param in self.__user_buffers.values()):
+                return GxStatusList.INVALID_PARAMETER
+            # the memory belongs to the user, nothing is retired
+            self.__buffers = []
+            for address, (size, user_param) in self.__user_buffers.items():
+                array = (c_ubyte * payload_size).from_address(address)
+                frame_buffer = GxFrameBuffer()
+                frame_buffer.image_buf = address
+                frame_buffer.user_param = user_param
+                self.__buffers.append((array, frame_buffer))
+            self.__user_buffers_in_use = True
+            return GxStatusList.SUCCESS
+
+        if self.__user_buffers_in_use:
+            self.__buffers = []
+            self.__user_buffers_in_use = False
+        if len(self.__buffers) == self.__buffer_num and \
+                all(ctypes.sizeof(array) == payload_size for array, frame_buffer in self.__buffers):
+            return GxStatusList.SUCCESS
+
+        # images may still point into the old buffers
+        self.__retired_buffers.extend(self.__buffers)
+        self.__buffers = []
+        for index in range(self.__buffer_num):
+            array = (c_ubyte * payload_size)()
+            frame_buffer = GxFrameBuffer()
+            frame_buffer.image_buf = ctypes.addressof(array)
+            self.__buffers.append((array, frame_buffer))
+        return GxStatusList.SUCCESS
+
+    def start(self):
+        with self.__condition:
+            if self.__running:
+                return GxStatusList.SUCCESS
+            status = self.__allocate(self.__camera.get_payload_size())
+            if status != GxStatusList.SUCCESS:
+                return status
+            # built before the first frame, not while the first triggers are sent
+            self.__camera.get_scene()
+            self.__free = collections.deque(range(len(self.__buffers)))
+            self.__filled.clear()
+            self.__outstanding.clear()
+            self.__triggers.clear()
+            self.__running = True
+            self.__thread = threading.Thread(target=self.__run,
+                                             name="gxipy-sim-%s" % self.__camera.get_serial_number())
+            self.__thread.daemon = True
+            self.__thread.start()
+        return GxStatusList.SUCCESS
+
+    def stop(self):
+        with self.__condition:
+            if not self.__running:
+                return GxStatusList.SUCCESS
+            self.__running = False
+            self.__condition.notify_all()
+            thread = self.__thread
+            self.__thread = None
+
+        # stop may be called from the capture callback
+        if thread is not threading.current_thread():
+            thread.join()
+
+        with self.__condition:
+            self.__filled.clear()
+            self.__outstanding.clear()
+            self.__free = collections.deque(range(len(self.__buffers)))
+        return GxStatusList.SUCCESS
+
+    def close(self):
+        self.stop()
+        with self.__condition:
+            self.__callback = None
+            self.__buffers = []
+            self.__retired_buffers = []
+            self.__user_buffers.clear()
+            self.__user_buffers_in_use = False
+
+    def __take_buffer(self):
+        """
+        :brief      Buffer for the next frame, called with the condition held
+        :return:    buffer index, None if the frame is lost or the stream stopped
+        """
+        while not self.__free:
+            if not self.__running:
+                return None
+            if not self.__camera.is_realtime():
+                # a free running camera waits for the consumer, nothing is lost
+                self.__condition.wait()
+                continue
+            if self.__camera.get_buffer_handling_mode() != GxDSStreamBufferHandlingModeEntry.OLDEST_FIRST:
+                for position, index in enumerate(self.__filled):
+                    if index != _SIM_STALL:
+                        del self.__filled[position]
+                        self.__statistics["lost"] += 1
+                        return index
+            return None
+        return self.__free.popleft()
+
+    def __wait_frame_time(self, next_time):
+        """
+        :brief      Sleep until next_time unless the stream is stopped, called with the condition held
+        """
+        while self.__running:
+            delay = next_time - time.perf_counter()
+            if delay <= 0:
+                return
+            self.__condition.wait(delay)
+
+    def __run(self):
+        camera = self.__camera
+        next_time = time.perf_counter()
+        while True:
+            # drawn before the stream lock is taken, the two locks are never nested
+            fault, fraction = camera.draw_fault()
+            trigger_time = None
+            with self.__condition:
+                if camera.is_trigger_mode():
+                    while self.__running and not self.__triggers and camera.is_trigger_mode():
+                        self.__condition.wait()
+                    if self.__triggers:
+                        trigger_time = self.__triggers.popleft()
+                    next_time = time.perf_counter()
+                elif camera.is_realtime():
+                    next_time += 1.0 / camera.get_frame_rate()
+                    # do not try to catch up after a long stall
+                    next_time = max(next_time, time.perf_counter() - 1.0)
+                    self.__wait_frame_time(next_time)
+                if not self.__running:
+                    return
+
+                if fault == SimulatedFault.TIMEOUT:
+                    if self.__callback is None:
+                        self.__filled.append(_SIM_STALL)
+                        self.__condition.notify_all()
+                    continue
+
+                frame_index = self.__frame_index
+                self.__frame_index += 1
+                self.__statistics["generated"] += 1
+                if fault == SimulatedFault.LOSS:
+                    self.__statistics["lost"] += 1
+                    continue
+
+                index = self.__take_buffer()
+                if index is None:
+                    if not self.__running:
+                        return
+                    self.__statistics["lost"] += 1
+                    continue
+                array, frame_buffer = self.__buffers[index]
+                callback = self.__callback
+
+            # the producer owns the buffer until it is queued
+            incomplete = fault == SimulatedFault.INCOMPLETE
+            # a triggered frame is exposed when the trigger arrives, not when this thread gets to run
+            if trigger_time is not None and camera.is_realtime():
+                timestamp = trigger_time
+            else:
+                timestamp = camera.get_device_time(frame_index)
+            camera.render(array, frame_index, fraction if incomplete else None, timestamp)
+            frame_buffer.status = GxFrameStatusList.INCOMPLETE if incomplete else GxFrameStatusList.SUCCESS
+            frame_buffer.width = camera.get_width()
+            frame_buffer.height = camera.get_height()
+            frame_buffer.pixel_format = camera.get_pixel_format()
+            frame_buffer.image_size = ctypes.sizeof(array)
+            frame_buffer.frame_id = frame_index
+            frame_buffer.timestamp = timestamp
+            frame_buffer.buf_id = next(self.__buf_ids)
+
+            with self.__condition:
+                self.__statistics["delivered"] += 1
+                self.__statistics["packets"] += (frame_buffer.image_size + SIM_PACKET_SIZE - 1) // SIM_PACKET_SIZE
+                if incomplete:
+                    self.__statistics["incomplete"] += 1
+                if callback is None:
+                    self.__filled.append(index)
+                    if camera.get_buffer_handling_mode() == GxDSStreamBufferHandlingModeEntry.NEWEST_ONLY:
+                        while len(self.__filled) > 1:
+                            older = self.__filled.popleft()
+                            if older != _SIM_STALL:
+                                self.__free.append(older)
+                                self.__statistics["lost"] += 1
+                    self.__condition.notify_all()
+                    continue
+
+            self.__deliver(callback, frame_buffer)
+            with self.__condition:
+                self.__free.append(index)
+                self.__condition.notify_all()
+
+    def __deliver(self, callback, frame_buffer):
+        param = GxFrameCallbackParam()
+        param.status = frame_buffer.status
+        param.image_buf = frame_buffer.image_buf
+        param.image_size = frame_buffer.image_size
+        param.width = frame_buffer.width
+        param.height = frame_buffer.height
+        param.pixel_format = frame_buffer.pixel_format
+        param.frame_id = frame_buffer.frame_id
+        param.timestamp = frame_buffer.timestamp
+        callback(ctypes.pointer(param))
+
+    def dequeue(self, timeout):
+        """
+        :brief      Wait for a filled buffer
+        :param      timeout:    ms
+        :return:    status, buffer index
+        """
+        deadline = time.perf_counter() + timeout / 1000.0
+        with self.__condition:
+            if self.__callback is not None or not self.__running:
+                return GxStatusList.INVALID_CALL, None
+            while not self.__filled:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or not self.__running:
+                    self.__statistics["timeout"] += 1
+                    return GxStatusList.TIMEOUT, None
+                self.__condition.wait(remaining)
+            index = self.__filled.popleft()
+            if index != _SIM_STALL:
+                return GxStatusList.SUCCESS, index
+            self.__statistics["timeout"] += 1
+
+        # an injected timeout costs the caller the whole wait, like a frame that never arrives
+        if self.__camera.is_realtime():
+            time.sleep(timeout / 1000.0)
+        return GxStatusList.TIMEOUT, None
+
+    def get_frame_buffer(self, index):
+        return self.__buffers[index]
+
+    def lend(self, index):
+        """
+        :brief      Hand a dequeued buffer to the user until queue() is called with its buf_id
+        """
+        with self.__condition:
+            frame_buffer = self.__buffers[index][1]
+            self.__outstanding[frame_buffer.buf_id] = index
+            return frame_buffer
+
+    def release(self, index):
+        with self.__condition:
+            self.__free.append(index)
+            self.__condition.notify_all()
+
+    def queue(self, buf_id):
+        with self.__condition:
+            index = self.__outstanding.pop(buf_id, None)
+            if index is None:
+                return GxStatusList.INVALID_PARAMETER
+            self.__free.append(index)
+            self.__condition.notify_all()
+        return GxStatusList.SUCCESS
+
+    def flush(self):
+        with self.__condition:
+            while self.__filled:
+                index = self.__filled.popleft()
+                if index != _SIM_STALL:
+                    self.__free.append(index)
+            self.__condition.notify_all()
+        return GxStatusList.SUCCESS
+
+
+class SimulatedCamera:
+    # stream counter features: key of _SimulatedStream.get_statistics
+    __STREAM_COUNTERS = {
+        "StreamDeliveredFrameCount":    "delivered",
+        "StreamLostFrameCount":         "lost",
+        "StreamIncompleteFrameCount":   "incomplete",
+        "StreamDeliveredPacketCount":   "packets",
+    }
+
+    def __init__(self, serial_number="SIM00000001", model_name="MER2-SIM-U3C", width=1280, height=1024,
+                 pixel_format=GxPixelFormatEntry.BAYER_RG8, frame_rate=30.0, seed=0):
+        """
+        :brief  A simulated U3V camera, attach it with SimulatedGxLibrary.add_camera
+        :param  serial_number:  DeviceSerialNumber, also used by open_device_by_sn
+        :param  model_name:     DeviceModelName
+        :param  width:          sensor width, also the initial Width
+        :param  height:         sensor height, also the initial Height
+        :param  pixel_format:   initial PixelFormat, Mono8/10/12 or Bayer 8/10/12
+        :param  frame_rate:     initial AcquisitionFrameRate (fps)
+        :param  seed:           seed of the fault generator, see set_faults
+        """
+        if not isinstance(serial_number, str):
+            raise _parameter_type_error("SimulatedCamera: "
+                                        "Expected serial_number type is str, not %s" % type(serial_number))
+
+        if not isinstance(width, INT_TYPE) or not isinstance(height, INT_TYPE):
+            raise _parameter_type_error("SimulatedCamera: Expected width and height type is int")
+
+        if pixel_format not in _SIM_PIXEL_FORMATS:
+            raise _parameter_type_error("SimulatedCamera: pixel_format %s is not simulated, supported: %s"
+                                        % (hex(pixel_format), ", ".join(name for name, pattern, depth
+                                                                        in _SIM_PIXEL_FORMATS.values())))
+
+        self.__serial_number = serial_number
+        self.__model_name = model_name
+        self.__lock = threading.RLock()
+        self.__online = True
+        self.__session = 0
+        self.__opened = False
+        self.__realtime = True
+        self.__seed = seed
+        # the fault generator has its own lock, the stream thread draws from it without the camera lock
+        self.__fault_lock = threading.Lock()
+        self.__random = random.Random(seed)
+        self.__loss_rate = 0.0
+        self.__incomplete_rate = 0.0
+        self.__timeout_rate = 0.0
+        self.__epoch = time.perf_counter()
+        self.__scene_key = None
+        self.__scene = None
+        self.__stream = _SimulatedStream(self)
+        self.__offline_callbacks = {}
+        self.__feature_callbacks = {}
+        self.__features = collections.OrderedDict()
+        self.__features_by_id = {}
+        self.__chunk_enabled = dict((selector, False) for selector in _SIM_CHUNKS)
+        self.__power_on = (width, height, pixel_format, frame_rate)
+        self.__build_features(width, height, pixel_format, frame_rate)
+
+    def __add(self, feature):
+        self.__features[feature.name] = feature
+        if feature.feature_id is not None:
+            self.__features_by_id[feature.feature_id] = feature
+
+    def __build_features(self, width, height, pixel_format, frame_rate):
+        switch = [(GxSwitchEntry.OFF, "Off"), (GxSwitchEntry.ON, "On")]
+        auto = [(GxAutoEntry.OFF, "Off"), (GxAutoEntry.CONTINUOUS, "Continuous"), (GxAutoEntry.ONCE, "Once")]
+        nocache = GxNodeCachableType.CACHABLE_NOCACHE
+        add = self.__add
+
+        # ---------------Device Information Section--------------------------
+        add(SimulatedFeature("DeviceVendorName", GxFeatureID.STRING_DEVICE_VENDOR_NAME, GxFeatureType.STRING,
+                             "Daheng Imaging", writable=False))
+        add(SimulatedFeature("DeviceModelName", GxFeatureID.STRING_DEVICE_MODEL_NAME, GxFeatureType.STRING,
+                             self.__model_name, writable=False))
+        add(SimulatedFeature("DeviceVersion", GxFeatureID.STRING_DEVICE_VERSION, GxFeatureType.STRING,
+                             "V1.0.0", writable=False))
+        add(SimulatedFeature("DeviceFirmwareVersion", GxFeatureID.STRING_DEVICE_FIRMWARE_VERSION,
+                             GxFeatureType.STRING, "sim-1.0", writable=False))
+        add(SimulatedFeature("DeviceSerialNumber", GxFeatureID.STRING_DEVICE_SERIAL_NUMBER, GxFeatureType.STRING,
+                             self.__serial_number, writable=False))
+        add(SimulatedFeature("DeviceUserID", GxFeatureID.STRING_DEVICE_USER_ID, GxFeatureType.STRING, "",
+                             maximum=64))
+        add(SimulatedFeature("TimestampTickFrequency", GxFeatureID.INT_TIMESTAMP_TICK_FREQUENCY,
+                             GxFeatureType.INT, SIM_TICK_FREQUENCY, SIM_TICK_FREQUENCY, SIM_TICK_FREQUENCY,
+                             writable=False))
+        add(SimulatedFeature("TimestampLatch", GxFeatureID.COMMAND_TIMESTAMP_LATCH, GxFeatureType.COMMAND))
+        add(SimulatedFeature("TimestampReset", GxFeatureID.COMMAND_TIMESTAMP_RESET, GxFeatureType.COMMAND))
+        add(SimulatedFeature("TimestampLatchValue", GxFeatureID.INT_TIMESTAMP_LATCH_VALUE, GxFeatureType.INT,
+                             0, 0, 0x7FFFFFFFFFFFFFFF, writable=False, cachable=nocache))
+        add(SimulatedFeature("DeviceTemperature", GxFeatureID.FLOAT_DEVICE_TEMPERATURE, GxFeatureType.FLOAT,
+                             40.0, -40.0, 120.0, unit="C", writable=False, cachable=nocache, polling=1000))
+
+        # ---------------ImageFormat Section--------------------------------
+        add(SimulatedFeature("SensorWidth", GxFeatureID.INT_SENSOR_WIDTH, GxFeatureType.INT, width, width, width,
+                             writable=False))
+        add(SimulatedFeature("SensorHeight", GxFeatureID.INT_SENSOR_HEIGHT, GxFeatureType.INT, height, height,
+                             height, writable=False))
+        add(SimulatedFeature("WidthMax", GxFeatureID.INT_WIDTH_MAX, GxFeatureType.INT, width, 16, width,
+                             writable=False, cachable=nocache))
+        add(SimulatedFeature("HeightMax", GxFeatureID.INT_HEIGHT_MAX, GxFeatureType.INT, height, 2, height,
+                             writable=False, cachable=nocache))
+        add(SimulatedFeature("Width", GxFeatureID.INT_WIDTH, GxFeatureType.INT, width, 16, width, 4,
+                             streaming_locked=True))
+        add(SimulatedFeature("Height", GxFeatureID.INT_HEIGHT, GxFeatureType.INT, height, 2, height, 2,
+                             streaming_locked=True))
+        add(SimulatedFeature("OffsetX", GxFeatureID.INT_OFFSET_X, GxFeatureType.INT, 0, 0, 0, 4,
+                             streaming_locked=True))
+        add(SimulatedFeature("OffsetY", GxFeatureID.INT_OFFSET_Y, GxFeatureType.INT, 0, 0, 0, 2,
+                             streaming_locked=True))
+        add(SimulatedFeature("PixelFormat", GxFeatureID.ENUM_PIXEL_FORMAT, GxFeatureType.ENUM, pixel_format,
+                             entries=[(value, name) for value, (name, pattern, depth) in _SIM_PIXEL_FORMATS.items()],
+                             streaming_locked=True))
+        add(SimulatedFeature("PixelSize", GxFeatureID.ENUM_PIXEL_SIZE, GxFeatureType.ENUM, GxPixelSizeEntry.BPP8,
+                             entries=[(GxPixelSizeEntry.BPP8, "Bpp8"), (GxPixelSizeEntry.BPP10, "Bpp10"),
+                                      (GxPixelSizeEntry.BPP12, "Bpp12")],
+                             writable=False, cachable=nocache))
+        add(SimulatedFeature("PixelColorFilter", GxFeatureID.ENUM_PIXEL_COLOR_FILTER, GxFeatureType.ENUM,
+                             GxPixelColorFilterEntry.NONE,
+                             entries=[(GxPixelColorFilterEntry.NONE, "None"),
+                                      (GxPixelColorFilterEntry.BAYER_RG, "BayerRG"),
+                                      (GxPixelColorFilterEntry.BAYER_GB, "BayerGB"),
+                                      (GxPixelColorFilterEntry.BAYER_GR, "BayerGR"),
+                                      (GxPixelColorFilterEntry.BAYER_BG, "BayerBG")],
+                             writable=False, cachable=nocache))
+
+        # ---------------TransportLayer Section-------------------------------
+        add(SimulatedFeature("PayloadSize", GxFeatureID.INT_PAYLOAD_SIZE, GxFeatureType.INT, 0, 0, 0x7FFFFFFF,
+                             writable=False, cachable=nocache))
+
+        # ---------------AcquisitionTrigger Section---------------------------
+        add(SimulatedFeature("AcquisitionMode", GxFeatureID.ENUM_ACQUISITION_MODE, GxFeatureType.ENUM,
+                             GxAcquisitionModeEntry.CONTINUOUS,
+                             entries=[(GxAcquisitionModeEntry.CONTINUOUS, "Continuous")], streaming_locked=True))
+        add(SimulatedFeature("AcquisitionStart", GxFeatureID.COMMAND_ACQUISITION_START, GxFeatureType.COMMAND))
+        add(SimulatedFeature("AcquisitionStop", GxFeatureID.COMMAND_ACQUISITION_STOP, GxFeatureType.COMMAND))
+        add(SimulatedFeature("TriggerMode", GxFeatureID.ENUM_TRIGGER_MODE, GxFeatureType.ENUM, GxSwitchEntry.OFF,
+                             entries=switch))
+        add(SimulatedFeature("TriggerSource", GxFeatureID.ENUM_TRIGGER_SOURCE, GxFeatureType.ENUM,
+                             GxTriggerSourceEntry.SOFTWARE,
+                             entries=[(GxTriggerSourceEntry.SOFTWARE, "Software"),
+                                      (GxTriggerSourceEntry.LINE0, "Line0"),
+                                      (GxTriggerSourceEntry.LINE2, "Line2"),
+                                      (GxTriggerSourceEntry.LINE3, "Line3")]))
+        add(SimulatedFeature("TriggerSoftware", GxFeatureID.COMMAND_TRIGGER_SOFTWARE, GxFeatureType.COMMAND))
+        add(SimulatedFeature("ExposureTime", GxFeatureID.FLOAT_EXPOSURE_TIME, GxFeatureType.FLOAT, 10000.0,
+                             20.0, 1000000.0, 0.0, unit="us"))
+        add(SimulatedFeature("ExposureAuto", GxFeatureID.ENUM_EXPOSURE_AUTO, GxFeatureType.ENUM, GxAutoEntry.OFF,
+                             entries=auto))
+        add(SimulatedFeature("AcquisitionFrameRateMode", GxFeatureID.ENUM_ACQUISITION_FRAME_RATE_MODE,
+                             GxFeatureType.ENUM, GxSwitchEntry.ON, entries=switch))
+        add(SimulatedFeature("AcquisitionFrameRate", GxFeatureID.FLOAT_ACQUISITION_FRAME_RATE,
+                             GxFeatureType.FLOAT, float(frame_rate), 0.1, 10000.0, 0.0, unit="Hz"))
+        add(SimulatedFeature("CurrentAcquisitionFrameRate", GxFeatureID.FLOAT_CURRENT_ACQUISITION_FRAME_RATE,
+                             GxFeatureType.FLOAT, 0.0, 0.0, 100000.0, 0.0, unit="Hz", writable=False,
+                             cachable=nocache))
+
+        # ---------------AnalogControls Section-------------------------------
+        add(SimulatedFeature("GainAuto", GxFeatureID.ENUM_GAIN_AUTO, GxFeatureType.ENUM, GxAutoEntry.OFF,
+                             entries=auto))
+        add(SimulatedFeature("Gain", GxFeatureID.FLOAT_GAIN, GxFeatureType.FLOAT, 0.0, 0.0, 24.0, 0.0,
+                             unit="dB"))
+        add(SimulatedFeature("BalanceWhiteAuto", GxFeatureID.ENUM_BALANCE_WHITE_AUTO, GxFeatureType.ENUM,
+                             GxAutoEntry.OFF, entries=auto))
+        add(SimulatedFeature("BalanceRatioSelector", GxFeatureID.ENUM_BALANCE_RATIO_SELECTOR, GxFeatureType.ENUM,
+                             GxBalanceRatioSelectorEntry.RED,
+                             entries=[(GxBalanceRatioSelectorEntry.RED, "Red"),
+                                      (GxBalanceRatioSelectorEntry.GREEN, "Green"),
+                                      (GxBalanceRatioSelectorEntry.BLUE, "Blue")]))
+        add(SimulatedFeature("BalanceRatio", GxFeatureID.FLOAT_BALANCE_RATIO, GxFeatureType.FLOAT, 1.0, 1.0,
+                             7.999, 0.0))
+
+        # ---------------ChunkData Section------------------------------------
+        add(SimulatedFeature("ChunkModeActive", GxFeatureID.BOOL_CHUNK_MODE_ACTIVE, GxFeatureType.BOOL, False,
+                             streaming_locked=True))
+        add(SimulatedFeature("ChunkSelector", GxFeatureID.ENUM_CHUNK_SELECTOR, GxFeatureType.ENUM,
+                             GxChunkSelectorEntry.FRAME_ID,
+                             entries=[(selector, name) for selector, (name, value_format) in _SIM_CHUNKS.items()]))
+        add(SimulatedFeature("ChunkEnable", GxFeatureID.BOOL_CHUNK_ENABLE, GxFeatureType.BOOL, False,
+                             streaming_locked=True, cachable=nocache))
+
+        # ---------------DataStream Section-----------------------------------
+        add(SimulatedFeature("StreamAnnouncedBufferCount", GxFeatureID.INT_ANNOUNCED_BUFFER_COUNT,
+                             GxFeatureType.INT, 0, 0, 0x7FFFFFFF, writable=False, cachable=nocache))
+        add(SimulatedFeature("StreamDeliveredFrameCount", GxFeatureID.INT_DELIVERED_FRAME_COUNT,
+                             GxFeatureType.INT, 0, 0, 0x7FFFFFFFFFFFFFFF, writable=False, cachable=nocache))
+        add(SimulatedFeature("StreamLostFrameCount", GxFeatureID.INT_LOST_FRAME_COUNT,
+                             GxFeatureType.INT, 0, 0, 0x7FFFFFFFFFFFFFFF, writable=False, cachable=nocache))
+        add(SimulatedFeature("StreamIncompleteFrameCount", GxFeatureID.INT_INCOMPLETE_FRAME_COUNT,
+                             GxFeatureType.INT, 0, 0, 0x7FFFFFFFFFFFFFFF, writable=False, cachable=nocache))
+        add(SimulatedFeature("StreamDeliveredPacketCount", GxFeatureID.INT_DELIVERED_PACKET_COUNT,
+                             GxFeatureType.INT, 0, 0, 0x7FFFFFFFFFFFFFFF, writable=False, cachable=nocache))
+        add(SimulatedFeature("StreamBufferHandlingMode", GxFeatureID.ENUM_STREAM_BUFFER_HANDLING_MODE,
+                             GxFeatureType.ENUM, GxDSStreamBufferHandlingModeEntry.OLDEST_FIRST,
+                             entries=[(GxDSStreamBufferHandlingModeEntry.OLDEST_FIRST, "OldestFirst"),
+                                      (GxDSStreamBufferHandlingModeEntry.OLDEST_FIRST_OVERWRITE,
+                                       "OldestFirstOverwrite"),
+                                      (GxDSStreamBufferHandlingModeEntry.NEWEST_ONLY, "NewestOnly")],
+                             streaming_locked=True))
+
+        self.__update_limits()
+
+    def __value(self, name):
+        return self.__features[name].value
+
+    def __update_limits(self):
+        """
+        :brief      Refresh the features derived from the ROI and the pixel format
+        """
+        features = self.__features
+        sensor_width = self.__value("SensorWidth")
+        sensor_height = self.__value("SensorHeight")
+        features["Width"].maximum = sensor_width - self.__value("OffsetX")
+        features["Height"].maximum = sensor_height - self.__value("OffsetY")
+        features["OffsetX"].maximum = sensor_width - self.__value("Width")
+        features["OffsetY"].maximum = sensor_height - self.__value("Height")
+        features["WidthMax"].value = features["Width"].maximum
+        features["HeightMax"].value = features["Height"].maximum
+
+        name, pattern, depth = _SIM_PIXEL_FORMATS[self.__value("PixelFormat")]
+        features["PixelSize"].value = depth
+        features["PixelColorFilter"].value = _SIM_COLOR_FILTERS[pattern]
+        features["PayloadSize"].value = self.__value("Width") * self.__value("Height") * (1 if depth == 8 else 2) + \
+            sum(struct.calcsize(value_format) + struct.calcsize(_SIM_CHUNK_TRAILER)
+                for selector, (name, value_format) in self.__get_chunks())
+
+    def __get_chunks(self):
+        """
+        :return:    [(selector, (symbolic, value format))] of the chunks sent with every frame
+        """
+        if not self.__value("ChunkModeActive"):
+            return []
+        return [(selector, chunk) for selector, chunk in _SIM_CHUNKS.items() if self.__chunk_enabled[selector]]
+
+    def __read_statistics(self, feature):
+        """
+        :brief      Stream counters the refresh of feature needs. Read before the camera lock is taken:
+                    the stream thread takes the camera lock after its own, never the other way round.
+        :return:    dict of get_statistics, None if feature is not a stream counter
+        """
+        if feature is None or feature.name not in SimulatedCamera.__STREAM_COUNTERS:
+            return None
+        return self.__stream.get_statistics()
+
+    def __refresh(self, feature, statistics=None):
+        """
+        :brief      Update a value that changes without being written
+        :param      statistics:     stream counters read by __read_statistics
+        """
+        name = feature.name
+        if name == "CurrentAcquisitionFrameRate":
+            feature.value = self.get_frame_rate()
+        elif name == "DeviceTemperature":
+            # warms up by 10 degrees over the first minutes of uptime
+            feature.value = 40.0 + 10.0 * min(1.0, (time.perf_counter() - self.__epoch) / 600.0)
+        elif name == "ChunkEnable":
+            feature.value = self.__chunk_enabled[self.__value("ChunkSelector")]
+        elif name == "StreamAnnouncedBufferCount":
+            feature.value = self.__stream.get_buffer_number() if self.__stream.is_running() else 0
+        elif statistics is not None and name in SimulatedCamera.__STREAM_COUNTERS:
+            feature.value = statistics[SimulatedCamera.__STREAM_COUNTERS[name]]
+
+    # ---------------user interface----------------------------------------
+    def get_serial_number(self):
+        return self.__serial_number
+
+    def get_model_name(self):
+        return self.__model_name
+
+    def get_user_id(self):
+        return self.__value("DeviceUserID")
+
+    def get_feature(self, name):
+        """
+        :brief      Direct access to a node, bypassing the access checks of the GX entry points
+        :return:    SimulatedFeature, None if the camera has no such feature
+        """
+        statistics = self.__read_statistics(self.__features.get(name))
+        with self.__lock:
+            feature = self.__features.get(name)
+            if feature is not None:
+                self.__refresh(feature, statistics)
+            return feature
+
+    def get_feature_names(self):
+        return list(self.__features.keys())
+
+    def set_faults(self, loss_rate=0.0, incomplete_rate=0.0, timeout_rate=0.0, seed=None):
+        """
+        :brief      Inject faults into the frame stream, each frame draws one fault from a generator
+                    seeded with seed, so the same settings always give the same fault sequence
+        :param      loss_rate:          probability that a frame is lost before reaching a buffer
+        :param      incomplete_rate:    probability that a frame is delivered incomplete
+        :param      timeout_rate:       probability that nothing arrives in a frame slot
+        :param      seed:               generator seed, None keeps the seed given to the constructor
+        :return:    None
+        """
+        rates = (loss_rate, incomplete_rate, timeout_rate)
+        if any(not isinstance(rate, (INT_TYPE, float)) for rate in rates):
+            raise _parameter_type_error("SimulatedCamera.set_faults: Expected rate type is float")
+
+        if any(rate < 0 for rate in rates) or sum(rates) > 1.0:
+            print("SimulatedCamera.set_faults: rates must be positive with a sum of at most 1.0")
+            return
+
+        if seed is not None:
+            self.__seed = seed
+        with self.__fault_lock:
+            self.__loss_rate, self.__incomplete_rate, self.__timeout_rate = rates
+            self.__random = random.Random(self.__seed)
+
+    def set_realtime(self, realtime):
+        """
+        :brief      True (default): frames are paced by the frame rate and lost when no buffer is free.
+                    False: frames are produced as fast as the consumer frees buffers and never lost
+                    for lack of buffers, timestamps advance by one frame period per frame, so runs are
+                    reproducible.
+        :return:    None
+        """
+        with self.__lock:
+            self.__realtime = bool(realtime)
+        self.__stream.wake()
+
+    def is_realtime(self):
+        return self.__realtime
+
+    def set_online(self, online):
+        """
+        :brief      Unplug (False) or plug back (True) the camera. Unplugging stops acquisition, invalidates
+                    the open handles and calls the registered offline callbacks, the camera has to be
+                    closed and opened again once it is back. Plugging back powers the camera up again,
+                    the features are back at their initial values.
+        :return:    None
+        """
+        with self.__lock:
+            if bool(online) == self.__online:
+                return
+            self.__online = bool(online)
+            if online:
+                self.__features.clear()
+                self.__features_by_id.clear()
+                self.__chunk_enabled = dict((selector, False) for selector in _SIM_CHUNKS)
+                self.__build_features(*self.__power_on)
+                return
+            self.__session += 1
+            self.__opened = False
+            callbacks = list(self.__offline_callbacks.values())
+            self.__offline_callbacks.clear()
+            self.__feature_callbacks.clear()
+        self.__stream.close()
+        for callback in callbacks:
+            callback(None)
+
+    def is_online(self):
+        return self.__online
+
+    def get_statistics(self):
+        """
+        :brief      Counters of the current acquisition session
+        :return:    dict: generated, delivered, lost, incomplete, timeout, packets
+        """
+        return self.__stream.get_statistics()
+
+    def get_frame_rate(self):
+        """
+        :brief      Effective frame rate: AcquisitionFrameRate when enabled, limited by the exposure time
+        """
+        limit = 1000000.0 / self.__value("ExposureTime")
+        if self.__value("AcquisitionFrameRateMode") == GxSwitchEntry.ON:
+            return min(self.__value("AcquisitionFrameRate"), limit)
+        return limit
+
+    # ---------------used by SimulatedGxLibrary----------------------------
+    def get_width(self):
+        return self.__value("Width")
+
+    def get_height(self):
+        return self.__value("Height")
+
+    def get_pixel_format(self):
+        return self.__value("PixelFormat")
+
+    def get_payload_size(self):
+        return self.__value("PayloadSize")
+
+    def get_buffer_handling_mode(self):
+        return self.__value("StreamBufferHandlingMode")
+
+    def is_trigger_mode(self):
+        return self.__value("TriggerMode") == GxSwitchEntry.ON
+
+    def get_session(self):
+        return self.__session
+
+    def get_stream(self):
+        return self.__stream
+
+    def is_opened(self):
+        return self.__opened
+
+    def open(self):
+        with self.__lock:
+            if self.__opened:
+                return GxStatusList.REPEAT_OPENED
+            self.__opened = True
+            self.__stream = _SimulatedStream(self)
+            self.__epoch = time.perf_counter()
+            return GxStatusList.SUCCESS
+
+    def close(self):
+        with self.__lock:
+            self.__opened = False
+            self.__offline_callbacks.clear()
+            self.__feature_callbacks.clear()
+        self.__stream.close()
+
+    def get_device_time(self, frame_index=None):
+        """
+        :brief      Device clock in ticks, a frame timestamp is derived from its index when not realtime
+        """
+        if frame_index is not None and not self.__realtime:
+            return int(frame_index * SIM_TICK_FREQUENCY / self.get_frame_rate())
+        return int((time.perf_counter() - self.__epoch) * SIM_TICK_FREQUENCY)
+
+    def draw_fault(self):
+        """
+        :brief      Fault of the next frame
+        :return:    SimulatedFault, fraction of the frame received when INCOMPLETE
+        """
+        with self.__fault_lock:
+            draw = self.__random.random()
+            if draw < self.__loss_rate:
+                return SimulatedFault.LOSS, 1.0
+            draw -= self.__loss_rate
+            if draw < self.__incomplete_rate:
+                return SimulatedFault.INCOMPLETE, self.__random.random()
+            draw -= self.__incomplete_rate
+            if draw < self.__timeout_rate:
+                return SimulatedFault.TIMEOUT, 0.0
+            return SimulatedFault.NONE, 1.0
+
+    def get_scene(self):
+        """
+        :brief      Test scene of the current ROI and pixel format, built on the first call after a change
+        :return:    numpy array (height, width)
+        """
+        width = self.get_width()
+        height = self.get_height()
+        pixel_format = self.get_pixel_format()
+        if self.__scene_key != (width, height, pixel_format):
+            name, pattern, depth = _SIM_PIXEL_FORMATS[pixel_format]
+            self.__scene = _render_scene(width, height, pattern, depth)
+            self.__scene_key = (width, height, pixel_format)
+        return self.__scene
+
+    def render(self, array, frame_index, received=None, timestamp=0):
+        """
+        :brief      Draw frame frame_index into a buffer: the test scene with a bright band moving down
+                    four rows per frame, then the enabled chunks
+        :param      array:      ctypes buffer of at least PayloadSize bytes
+        :param      received:   None for a complete frame, else the fraction of rows received
+        :param      timestamp:  device timestamp of the frame, for the Timestamp chunk
+        """
+        height = self.get_height()
+        depth = _SIM_PIXEL_FORMATS[self.get_pixel_format()][2]
+        scene = self.get_scene()
+        image = numpy.frombuffer(array, dtype=scene.dtype, count=scene.size).reshape(scene.shape)
+        image[...] = scene
+        band = (frame_index * 4) % height
+        image[band:band + 8] = (1 << depth) - 1
+        if received is not None:
+            image[int(height * received):] = 0
+
+        offset = scene.nbytes
+        for selector, (name, value_format) in self.__get_chunks():
+            if name == "ExposureTime" or name == "Gain":
+                value = self.__value(name)
+            elif name == "Timestamp":
+                value = timestamp
+            elif name == "LineStatusAll":
+                # Line0 toggles every 16 frames
+                value = (frame_index >> 4) & 1
+            else:
+                value = frame_index
+            struct.pack_into(value_format, array, offset, value)
+            offset += struct.calcsize(value_format)
+            struct.pack_into(_SIM_CHUNK_TRAILER, array, offset, selector, struct.calcsize(value_format))
+            offset += struct.calcsize(_SIM_CHUNK_TRAILER)
+
+    def find_feature(self, key):
+        """
+        :param      key:    feature name or GxFeatureID
+        :return:    status, SimulatedFeature
+        """
+        if isinstance(key, INT_TYPE):
+            feature = self.__features_by_id.get(key)
+        else:
+            feature = self.__features.get(key)
+        if feature is None:
+            return GxStatusList.NOT_IMPLEMENTED, None
+        return GxStatusList.SUCCESS, feature
+
+    def is_feature_writable(self, feature):
+        if not feature.writable:
+            return False
+        return not (feature.streaming_locked and self.__stream.is_running())
+
+    def read_feature(self, key, feature_type=None):
+        """
+        :return:    status, SimulatedFeature with its value refreshed
+        """
+        statistics = self.__read_statistics(self.find_feature(key)[1])
+        with self.__lock:
+            status, feature = self.find_feature(key)
+            if status != GxStatusList.SUCCESS:
+                return status, None
+            if feature_type is not None and feature.feature_type != feature_type:
+                return GxStatusList.ERROR_TYPE, None
+            self.__refresh(feature, statistics)
+            return GxStatusList.SUCCESS, feature
+
+    def write_feature(self, key, feature_type, value):
+        """
+        :brief      Validate and write a value, or execute a command (value is ignored)
+        :return:    status
+        """
+        with self.__lock:
+            status, feature = self.find_feature(key)
+            if status != GxStatusList.SUCCESS:
+                return status
+            if feature.feature_type != feature_type:
+                return GxStatusList.ERROR_TYPE
+            if not self.is_feature_writable(feature):
+                return GxStatusList.INVALID_ACCESS
+
+            if feature_type == GxFeatureType.COMMAND:
+                status = self.__execute(feature.name)
+            else:
+                status = self.__check(feature, value)
+                if status == GxStatusList.SUCCESS:
+                    feature.value = value
+                    if feature.name == "ChunkEnable":
+                        self.__chunk_enabled[self.__value("ChunkSelector")] = bool(value)
+                    self.__update_limits()
+            if status != GxStatusList.SUCCESS:
+                return status
+            callbacks = [callback for callback in self.__feature_callbacks.values()
+                         if callback[0] in (feature.name, feature.feature_id)]
+
+        if feature.name in ("TriggerMode", "AcquisitionFrameRate", "AcquisitionFrameRateMode", "ExposureTime"):
+            self.__stream.wake()
+        for key, callback, args in callbacks:
+            callback(key if isinstance(key, INT_TYPE) else key.encode(), args)
+        return GxStatusList.SUCCESS
+
+    def __check(self, feature, value):
+        feature_type = feature.feature_type
+        if feature_type == GxFeatureType.INT:
+            if value < feature.minimum or value > feature.maximum:
+                return GxStatusList.OUT_OF_RANGE
+            if feature.increment > 1 and (value - feature.minimum) % feature.increment:
+                return GxStatusList.OUT_OF_RANGE
+        elif feature_type == GxFeatureType.FLOAT:
+            if value < feature.minimum or value > feature.maximum:
+                return GxStatusList.OUT_OF_RANGE
+        elif feature_type == GxFeatureType.ENUM:
+            if feature.get_symbolic(value) is None:
+                return GxStatusList.OUT_OF_RANGE
+        elif feature_type == GxFeatureType.STRING:
+            if feature.maximum and len(value) > feature.maximum:
+                return GxStatusList.OUT_OF_RANGE
+        return GxStatusList.SUCCESS
+
+    def __execute(self, name):
+        if name == "AcquisitionStart":
+            return self.__stream.start()
+        elif name == "AcquisitionStop":
+            return self.__stream.stop()
+        elif name == "TriggerSoftware":
+            return self.__stream.trigger()
+        elif name == "TimestampLatch":
+            self.__features["TimestampLatchValue"].value = self.get_device_time()
+        elif name == "TimestampReset":
+            self.__epoch = time.perf_counter()
+        return GxStatusList.SUCCESS
+
+    def add_offline_callback(self, callback_handle, callback):
+        with self.__lock:
+            self.__offline_callbacks[callback_handle] = callback
+
+    def remove_offline_callback(self, callback_handle):
+        with self.__lock:
+            return self.__offline_callbacks.pop(callback_handle, None) is not None
+
+    def add_feature_callback(self, callback_handle, key, callback, args):
+        with self.__lock:
+            self.__feature_callbacks[callback_handle] = (key, callback, args)
+
+    def remove_feature_callback(self, callback_handle):
+        with self.__lock:
+            return self.__feature_callbacks.pop(callback_handle, None) is not None
+
+    def save_features(self, file_path):
+        """
+        :brief      Write the writable features to a feature file, one "name<TAB>value" per line
+        :return:    status
+        """
+        with self.__lock:
+            lines = ["FileVersion: 1.0",
+                     "DeviceModelName: %s" % self.__model_name,
+                     "",
+                     SIM_FEATURE_FILE_SECTION,
+                     "# GenApi persistence file (version 3.0.0)",
+                     "# Device = SimulatedCamera -- DeviceSerialNumber = %s" % self.__serial_number]
+            for feature in self.__features.values():
+                if feature.writable and feature.feature_type != GxFeatureType.COMMAND:
+                    lines.append("%s\t%s" % (feature.name, feature.to_string()))
+        try:
+            with open(file_path, "w") as feature_file:
+                feature_file.write("\n".join(lines) + "\n")
+        except (IOError, OSError):
+            return GxStatusList.INVALID_PARAMETER
+        return GxStatusList.SUCCESS
+
+    def load_features(self, file_path, verify=False):
+        """
+        :brief      Apply a feature file written by save_features, values that depend on each other
+                    (Width and OffsetX) are retried until they settle
+        :return:    status
+        """
+        try:
+            with open(file_path, "r") as feature_file:
+                lines = feature_file.read().splitlines()
+        except (IOError, OSError):
+            return GxStatusList.INVALID_PARAMETER
+
+        pending = []
+        for line in lines:
+            name, separator, text = line.strip().partition("\t")
+            if not separator or name.startswith("#"):
+                continue
+            status, feature = self.find_feature(name.strip())
+            if status != GxStatusList.SUCCESS:
+                continue
+            value = feature.from_string(text)
+            if value is None:
+                return GxStatusList.INVALID_PARAMETER
+            pending.append((feature, value))
+
+        for attempt in range(len(pending) + 1):
+            failed = [(feature, value) for feature, value in pending
+                      if self.write_feature(feature.name, feature.feature_type, value) != GxStatusList.SUCCESS]
+            if not failed or len(failed) == len(pending):
+                break
+            pending = failed
+
+        if failed:
+            return GxStatusList.OUT_OF_RANGE
+        if verify and any(feature.value != value for feature, value in pending):
+            return GxStatusList.ERROR
+        return GxStatusList.SUCCESS
+
+
+def _parameter_type_error(message):
+    # gxipy.Exception imports the whole API, which is still being loaded when gxwrapper creates the library
+    from gxipy.Exception import ParameterTypeError
+    return ParameterTypeError(message)
+
+
+class SimulatedGxLibrary:
+    def __init__(self, cameras=None):
+        """
+        :brief  Replacement of the vendor library object used by gxwrapper, implements the GX* entry
+                points on top of SimulatedCamera objects
+        :param  cameras:    SimulatedCamera list attached at creation
+        """
+        self.__lock = threading.RLock()
+        self.__handle_numbers = itertools.count(0x5100, 0x10)
+        self.__callback_numbers = itertools.count(1)
+        self.__cameras = []
+        self.__device_list = []
+        self.__handles = {}
+        self.__last_error = (GxStatusList.SUCCESS, "")
+        self.__log_type = 0
+        self.__interface_handle = next(self.__handle_numbers)
+        self.__handles[self.__interface_handle] = (_SIM_HANDLE_INTERFACE, None, 0)
+
+        for camera in cameras or []:
+            self.add_camera(camera)
+
+        # ctypes function pointers accept argtypes/restype, bound methods do not
+        for name in dir(type(self)):
+            if name.startswith("GX"):
+                setattr(self, name, _SimulatedFunction(getattr(self, name)))
+
+    # ---------------user interface----------------------------------------
+    def add_camera(self, camera):
+        """
+        :brief      Attach a camera, it is listed from the next update_device_list
+        :return:    None
+        """
+        if not isinstance(camera, SimulatedCamera):
+            raise _parameter_type_error("SimulatedGxLibrary.add_camera: "
+                                        "Expected camera type is SimulatedCamera, not %s" % type(camera))
+        with self.__lock:
+            if self.get_camera(camera.get_serial_number()) is not None:
+                print("SimulatedGxLibrary.add_camera: serial number %s is already attached"
+                      % camera.get_serial_number())
+                return
+            self.__cameras.append(camera)
+
+    def remove_camera(self, serial_number):
+        """
+        :brief      Detach a camera, it goes offline first
+        :return:    SimulatedCamera, None if no camera has this serial number
+        """
+        with self.__lock:
+            camera = self.get_camera(serial_number)
+            if camera is None:
+                return None
+            self.__cameras.remove(camera)
+        camera.set_online(False)
+        return camera
+
+    def get_camera(self, serial_number):
+        with self.__lock:
+            for camera in self.__cameras:
+                if camera.get_serial_number() == serial_number:
+                    return camera
+            return None
+
+    def get_cameras(self):
+        with self.__lock:
+            return list(self.__cameras)
+
+    # ---------------helpers-----------------------------------------------
+    def __fail(self, status, subject=""):
+        reason = _SIM_STATUS_REASONS.get(status, "error %d" % status)
+        self.__last_error = (status, "%s: %s" % (subject, reason) if subject else reason)
+        return status
+
+    def __new_handle(self, kind, camera):
+        handle = next(self.__handle_numbers)
+        self.__handles[handle] = (kind, camera, camera.get_session())
+        return handle
+
+    def __camera(self, handle, kinds=None):
+        """
+        :return:    status, SimulatedCamera behind a handle
+        """
+        entry = self.__handles.get(_arg_value(handle))
+        if entry is None or (kinds is not None and entry[0] not in kinds):
+            return self.__fail(GxStatusList.INVALID_HANDLE), None
+        kind, camera, session = entry
+        if camera is None:
+            # the interface has no simulated features
+            return self.__fail(GxStatusList.NOT_IMPLEMENTED, "interface"), None
+        if session != camera.get_session() or not camera.is_online():
+            return self.__fail(GxStatusList.OFFLINE, camera.get_serial_number()), None
+        return GxStatusList.SUCCESS, camera
+
+    def __read(self, handle, key, feature_type=None):
+        """
+        :return:    status, SimulatedFeature
+        """
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status, None
+        key = _arg_value(key)
+        if isinstance(key, bytes):
+            key = key.decode()
+        status, feature = camera.read_feature(key, feature_type)
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, str(key)), None
+        return status, feature
+
+    def __write(self, handle, key, feature_type, value=None):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        key = _arg_value(key)
+        if isinstance(key, bytes):
+            key = key.decode()
+        status = camera.write_feature(key, feature_type, value)
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, str(key))
+        return status
+
+    def __access_mode(self, camera, feature):
+        if feature.feature_type == GxFeatureType.COMMAND:
+            return GxNodeAccessMode.MODE_WO
+        if camera.is_feature_writable(feature):
+            return GxNodeAccessMode.MODE_RW
+        return GxNodeAccessMode.MODE_RO
+
+    def __node(self, handle, feature_name):
+        """
+        :return:    status, SimulatedCamera, SimulatedFeature or None if the node does not exist
+        """
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status, None, None
+        status, feature = camera.read_feature(_arg_string(feature_name))
+        return GxStatusList.SUCCESS, camera, feature
+
+    # ---------------library-----------------------------------------------
+    def GXInitLib(self):
+        return GxStatusList.SUCCESS
+
+    def GXCloseLib(self):
+        return GxStatusList.SUCCESS
+
+    def GXSetLogType(self, log_type):
+        self.__log_type = _arg_value(log_type)
+        return GxStatusList.SUCCESS
+
+    def GXGetLogType(self, log_type):
+        _arg_object(log_type).value = self.__log_type
+        return GxStatusList.SUCCESS
+
+    def GXGetLastError(self, err_code, err_content, content_size):
+        code, message = self.__last_error
+        buffer = _arg_object(err_content)
+        _set_char_array(buffer, message)
+        _arg_object(err_code).value = code
+        _arg_object(content_size).value = min(len(message.encode()) + 1, ctypes.sizeof(buffer))
+        return GxStatusList.SUCCESS
+
+    # ---------------enumeration and open----------------------------------
+    def GXUpdateDeviceList(self, device_num, time_out):
+        with self.__lock:
+            self.__device_list = [camera for camera in self.__cameras if camera.is_online()]
+            _arg_object(device_num).value = len(self.__device_list)
+        return GxStatusList.SUCCESS
+
+    def GXUpdateAllDeviceList(self, device_num, time_out):
+        return self.GXUpdateDeviceList(device_num, time_out)
+
+    def GXUpdateAllDeviceListEx(self, device_type, device_num, time_out):
+        if not _arg_value(device_type) & GxTLClassList.TL_TYPE_U3V:
+            with self.__lock:
+                self.__device_list = []
+            _arg_object(device_num).value = 0
+            return GxStatusList.SUCCESS
+        return self.GXUpdateDeviceList(device_num, time_out)
+
+    def GXGetInterfaceNum(self, interface_number):
+        _arg_object(interface_number).value = 1
+        return GxStatusList.SUCCESS
+
+    def GXGetInterfaceInfo(self, interface_index, interface_info):
+        if _arg_value(interface_index) != 1:
+            return self.__fail(GxStatusList.INVALID_PARAMETER, "interface index")
+        info = _arg_object(interface_info)
+        info.TLayer_type = GxTLClassList.TL_TYPE_U3V
+        u3v_info = info.IF_info.U3V_interface_info
+        _set_char_field(u3v_info, "interface_id", "SIM-U3V-0")
+        _set_char_field(u3v_info, "display_name", "Simulated U3V Interface")
+        _set_char_field(u3v_info, "serial_number", "SIM-IF-0")
+        _set_char_field(u3v_info, "description", "gxipy simulated backend")
+        return GxStatusList.SUCCESS
+
+    def GXGetInterfaceHandle(self, interface_index, handle):
+        if _arg_value(interface_index) != 1:
+            return self.__fail(GxStatusList.INVALID_PARAMETER, "interface index")
+        _arg_object(handle).value = self.__interface_handle
+        return GxStatusList.SUCCESS
+
+    def GXGetAllDeviceBaseInfo(self, devices_info, buf_size):
+        devices = _arg_object(devices_info)
+        with self.__lock:
+            device_list = list(self.__device_list)
+        for index in range(min(len(devices), len(device_list))):
+            camera = device_list[index]
+            info = devices[index]
+            _set_char_field(info, "vendor_name", "Daheng Imaging")
+            _set_char_field(info, "model_name", camera.get_model_name())
+            _set_char_field(info, "serial_number", camera.get_serial_number())
+            _set_char_field(info, "display_name", "%s(%s)" % (camera.get_model_name(), camera.get_serial_number()))
+            _set_char_field(info, "device_id", "SIM-%s" % camera.get_serial_number())
+            _set_char_field(info, "user_id", camera.get_user_id())
+            info.access_status = GxAccessStatus.NOACCESS if camera.is_opened() else GxAccessStatus.READWRITE
+            info.device_class = GxDeviceClassList.U3V
+        return GxStatusList.SUCCESS
+
+    def __open(self, camera, handle):
+        if camera is None:
+            return self.__fail(GxStatusList.NOT_FOUND_DEVICE)
+        if not camera.is_online():
+            return self.__fail(GxStatusList.OFFLINE, camera.get_serial_number())
+        status = camera.open()
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, camera.get_serial_number())
+        with self.__lock:
+            device_handle = self.__new_handle(_SIM_HANDLE_DEVICE, camera)
+            self.__new_handle(_SIM_HANDLE_LOCAL_DEVICE, camera)
+            self.__new_handle(_SIM_HANDLE_STREAM, camera)
+        _arg_object(handle).value = device_handle
+        return GxStatusList.SUCCESS
+
+    def GXOpenDeviceByIndex(self, index, handle):
+        index = _arg_value(index)
+        with self.__lock:
+            camera = self.__device_list[index - 1] if 0 < index <= len(self.__device_list) else None
+        return self.__open(camera, handle)
+
+    def GXOpenDevice(self, open_param, handle):
+        param = _arg_object(open_param)
+        content = param.content.decode() if param.content is not None else ""
+        camera = None
+        with self.__lock:
+            if param.open_mode == GxOpenMode.INDEX:
+                index = int(content) if content.isdigit() else 0
+                camera = self.__device_list[index - 1] if 0 < index <= len(self.__device_list) else None
+            for candidate in self.__device_list:
+                if (param.open_mode == GxOpenMode.SN and candidate.get_serial_number() == content) or \
+                        (param.open_mode == GxOpenMode.USER_ID and candidate.get_user_id() == content):
+                    camera = candidate
+        return self.__open(camera, handle)
+
+    def GXCloseDevice(self, handle):
+        with self.__lock:
+            entry = self.__handles.get(_arg_value(handle))
+            if entry is None or entry[0] != _SIM_HANDLE_DEVICE:
+                return self.__fail(GxStatusList.INVALID_HANDLE)
+            kind, camera, session = entry
+            for number, (other_kind, other_camera, other_session) in list(self.__handles.items()):
+                if other_camera is camera and other_session == session:
+                    del self.__handles[number]
+        if session == camera.get_session():
+            camera.close()
+        return GxStatusList.SUCCESS
+
+    def __related_handle(self, handle, kind, output):
+        entry = self.__handles.get(_arg_value(handle))
+        if entry is None or entry[1] is None:
+            return self.__fail(GxStatusList.INVALID_HANDLE)
+        for number, (other_kind, camera, session) in self.__handles.items():
+            if other_kind == kind and camera is entry[1] and session == entry[2]:
+                _arg_object(output).value = number
+                return GxStatusList.SUCCESS
+        return self.__fail(GxStatusList.INVALID_HANDLE)
+
+    def GXGetParentInterfaceFromDev(self, handle, interface_handle):
+        if _arg_value(handle) not in self.__handles:
+            return self.__fail(GxStatusList.INVALID_HANDLE)
+        _arg_object(interface_handle).value = self.__interface_handle
+        return GxStatusList.SUCCESS
+
+    def GXGetLocalDeviceHandleFromDev(self, handle, local_device_handle):
+        return self.__related_handle(handle, _SIM_HANDLE_LOCAL_DEVICE, local_device_handle)
+
+    def GXGetDataStreamNumFromDev(self, handle, stream_number):
+        status, camera = self.__camera(handle, (_SIM_HANDLE_DEVICE,))
+        if status != GxStatusList.SUCCESS:
+            return status
+        _arg_object(stream_number).value = 1
+        return GxStatusList.SUCCESS
+
+    def GXGetDataStreamHandleFromDev(self, handle, stream_index, stream_handle):
+        if _arg_value(stream_index) != 1:
+            return self.__fail(GxStatusList.INVALID_PARAMETER, "stream index")
+        return self.__related_handle(handle, _SIM_HANDLE_STREAM, stream_handle)
+
+    def GXGetPayLoadSize(self, handle, payload_size):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        _arg_object(payload_size).value = camera.get_payload_size()
+        return GxStatusList.SUCCESS
+
+    # ---------------features by name--------------------------------------
+    def GXGetNodeAccessMode(self, handle, feature_name, access_mode):
+        status, camera, feature = self.__node(handle, feature_name)
+        if status != GxStatusList.SUCCESS:
+            return status
+        _arg_object(access_mode).value = GxNodeAccessMode.MODE_NI if feature is None \
+            else self.__access_mode(camera, feature)
+        return GxStatusList.SUCCESS
+
+    def GXGetNodeCachable(self, handle, feature_name, cachable):
+        status, camera, feature = self.__node(handle, feature_name)
+        if status != GxStatusList.SUCCESS:
+            return status
+        if feature is None:
+            return self.__fail(GxStatusList.NOT_IMPLEMENTED, _arg_string(feature_name))
+        _arg_object(cachable).value = feature.cachable
+        return GxStatusList.SUCCESS
+
+    def GXGetNodePolling(self, handle, feature_name, polling):
+        status, camera, feature = self.__node(handle, feature_name)
+        if status != GxStatusList.SUCCESS:
+            return status
+        if feature is None:
+            return self.__fail(GxStatusList.NOT_IMPLEMENTED, _arg_string(feature_name))
+        _arg_object(polling).value = feature.polling
+        return GxStatusList.SUCCESS
+
+    def GXGetNodeVisibility(self, handle, feature_name, visibility):
+        status, camera, feature = self.__node(handle, feature_name)
+        if status != GxStatusList.SUCCESS:
+            return status
+        if feature is None:
+            return self.__fail(GxStatusList.NOT_IMPLEMENTED, _arg_string(feature_name))
+        _arg_object(visibility).value = GxNodeVisibilityType.VISIBILITY_BEGINNER
+        return GxStatusList.SUCCESS
+
+    def GXGetNodeNameSpace(self, handle, feature_name, name_space):
+        status, camera, feature = self.__node(handle, feature_name)
+        if status != GxStatusList.SUCCESS:
+            return status
+        if feature is None:
+            return self.__fail(GxStatusList.NOT_IMPLEMENTED, _arg_string(feature_name))
+        _arg_object(name_space).value = GxNodeNameSpaceType.NAMESPACE_STANDARD
+        return GxStatusList.SUCCESS
+
+    def GXGetNodeStreamable(self, handle, feature_name, streamable):
+        status, camera, feature = self.__node(handle, feature_name)
+        if status != GxStatusList.SUCCESS:
+            return status
+        if feature is None:
+            return self.__fail(GxStatusList.NOT_IMPLEMENTED, _arg_string(feature_name))
+        _arg_object(streamable).value = GxNodeStreamableType.STREAMABLE_YES if feature.writable \
+            else GxNodeStreamableType.STREAMABLE_NO
+        return GxStatusList.SUCCESS
+
+    def GXGetIntValue(self, handle, feature_name, int_feature):
+        status, feature = self.__read(handle, feature_name, GxFeatureType.INT)
+        if status != GxStatusList.SUCCESS:
+            return status
+        output = _arg_object(int_feature)
+        output.value = feature.value
+        output.min = feature.minimum
+        output.max = feature.maximum
+        output.inc = feature.increment
+        return GxStatusList.SUCCESS
+
+    def GXSetIntValue(self, handle, feature_name, value):
+        return self.__write(handle, feature_name, GxFeatureType.INT, int(_arg_value(value)))
+
+    def __fill_enum(self, feature, output, detail):
+        output.cur_value.cur_value = feature.value
+        _set_char_field(output.cur_value, "cur_symbolic", feature.get_symbolic())
+        output.supported_number = len(feature.entries)
+        for index, (value, symbolic) in enumerate(feature.entries):
+            output.supported_value[index].cur_value = value
+            _set_char_field(output.supported_value[index], "cur_symbolic", symbolic)
+            if detail:
+                _set_char_field(output.supported_value[index], "cur_displayname", symbolic)
+        if detail:
+            _set_char_field(output.cur_value, "cur_displayname", feature.get_symbolic())
+
+    def GXGetEnumValue(self, handle, feature_name, enum_feature):
+        status, feature = self.__read(handle, feature_name, GxFeatureType.ENUM)
+        if status != GxStatusList.SUCCESS:
+            return status
+        self.__fill_enum(feature, _arg_object(enum_feature), False)
+        return GxStatusList.SUCCESS
+
+    def GXGetEnumDetailValue(self, handle, feature_name, enum_feature):
+        status, feature = self.__read(handle, feature_name, GxFeatureType.ENUM)
+        if status != GxStatusList.SUCCESS:
+            return status
+        self.__fill_enum(feature, _arg_object(enum_feature), True)
+        return GxStatusList.SUCCESS
+
+    def GXSetEnumValue(self, handle, feature_name, value):
+        return self.__write(handle, feature_name, GxFeatureType.ENUM, int(_arg_value(value)))
+
+    def GXSetEnumValueByString(self, handle, feature_name, value):
+        status, feature = self.__read(handle, feature_name, GxFeatureType.ENUM)
+        if status != GxStatusList.SUCCESS:
+            return status
+        entry_value = feature.get_entry_value(_arg_string(value))
+        if entry_value is None:
+            return self.__fail(GxStatusList.INVALID_PARAMETER, "%s=%s" % (feature.name, _arg_string(value)))
+        return self.__write(handle, feature_name, GxFeatureType.ENUM, entry_value)
+
+    def GXGetFloatValue(self, handle, feature_name, float_feature):
+        status, feature = self.__read(handle, feature_name, GxFeatureType.FLOAT)
+        if status != GxStatusList.SUCCESS:
+            return status
+        output = _arg_object(float_feature)
+        output.cur_value = feature.value
+        output.min = feature.minimum
+        output.max = feature.maximum
+        output.inc = feature.increment
+        output.inc_is_valid = feature.increment > 0
+        _set_char_field(output, "unit", feature.unit)
+        return GxStatusList.SUCCESS
+
+    def GXSetFloatValue(self, handle, feature_name, value):
+        return self.__write(handle, feature_name, GxFeatureType.FLOAT, float(_arg_value(value)))
+
+    def GXGetBoolValue(self, handle, feature_name, bool_value):
+        status, feature = self.__read(handle, feature_name, GxFeatureType.BOOL)
+        if status != GxStatusList.SUCCESS:
+            return status
+        _arg_object(bool_value).value = bool(feature.value)
+        return GxStatusList.SUCCESS
+
+    def GXSetBoolValue(self, handle, feature_name, value):
+        return self.__write(handle, feature_name, GxFeatureType.BOOL, bool(_arg_value(value)))
+
+    def GXGetStringValue(self, handle, feature_name, string_feature):
+        status, feature = self.__read(handle, feature_name, GxFeatureType.STRING)
+        if status != GxStatusList.SUCCESS:
+            return status
+        output = _arg_object(string_feature)
+        _set_char_field(output, "cur_value", feature.value)
+        output.max_length = feature.maximum or len(feature.value)
+        return GxStatusList.SUCCESS
+
+    def GXSetStringValue(self, handle, feature_name, value):
+        return self.__write(handle, feature_name, GxFeatureType.STRING, _arg_string(value))
+
+    def GXSetCommandValue(self, handle, feature_name):
+        return self.__write(handle, feature_name, GxFeatureType.COMMAND)
+
+    # ---------------features by GxFeatureID-------------------------------
+    def GXGetFeatureName(self, handle, feature_id, name_buffer, size):
+        status, camera = self.__camera(handle)
+        if status == GxStatusList.SUCCESS:
+            status, feature = camera.find_feature(_arg_value(feature_id))
+        name = feature.name if status == GxStatusList.SUCCESS else ""
+        # the caller sizes its buffer from the first call, also when the feature is unknown
+        _arg_object(size).value = len(name) + 1
+        if name_buffer is not None:
+            _set_char_array(_arg_object(name_buffer), name)
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, hex(_arg_value(feature_id)))
+        return GxStatusList.SUCCESS
+
+    def GXIsImplemented(self, handle, feature_id, is_implemented):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        status, feature = camera.find_feature(_arg_value(feature_id))
+        _arg_object(is_implemented).value = feature is not None
+        return GxStatusList.SUCCESS
+
+    def GXIsReadable(self, handle, feature_id, is_readable):
+        status, feature = self.__read(handle, feature_id)
+        if status != GxStatusList.SUCCESS:
+            return status
+        _arg_object(is_readable).value = feature.feature_type != GxFeatureType.COMMAND
+        return GxStatusList.SUCCESS
+
+    def GXIsWritable(self, handle, feature_id, is_writable):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        status, feature = camera.find_feature(_arg_value(feature_id))
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, hex(_arg_value(feature_id)))
+        _arg_object(is_writable).value = camera.is_feature_writable(feature)
+        return GxStatusList.SUCCESS
+
+    def GXGetIntRange(self, handle, feature_id, int_range):
+        status, feature = self.__read(handle, feature_id, GxFeatureType.INT)
+        if status != GxStatusList.SUCCESS:
+            return status
+        output = _arg_object(int_range)
+        output.min = feature.minimum
+        output.max = feature.maximum
+        output.inc = feature.increment
+        return GxStatusList.SUCCESS
+
+    def GXGetInt(self, handle, feature_id, int_value):
+        status, feature = self.__read(handle, feature_id, GxFeatureType.INT)
+        if status != GxStatusList.SUCCESS:
+            return status
+        _arg_object(int_value).value = feature.value
+        return GxStatusList.SUCCESS
+
+    def GXSetInt(self, handle, feature_id, value):
+        return self.__write(handle, feature_id, GxFeatureType.INT, int(_arg_value(value)))
+
+    def GXGetFloatRange(self, handle, feature_id, float_range):
+        status, feature = self.__read(handle, feature_id, GxFeatureType.FLOAT)
+        if status != GxStatusList.SUCCESS:
+            return status
+        output = _arg_object(float_range)
+        output.min = feature.minimum
+        output.max = feature.maximum
+        output.inc = feature.increment
+        output.inc_is_valid = feature.increment > 0
+        _set_char_field(output, "unit", feature.unit)
+        return GxStatusList.SUCCESS
+
+    def GXGetFloat(self, handle, feature_id, float_value):
+        status, feature = self.__read(handle, feature_id, GxFeatureType.FLOAT)
+        if status != GxStatusList.SUCCESS:
+            return status
+        _arg_object(float_value).value = feature.value
+        return GxStatusList.SUCCESS
+
+    def GXSetFloat(self, handle, feature_id, value):
+        return self.__write(handle, feature_id, GxFeatureType.FLOAT, float(_arg_value(value)))
+
+    def GXGetEnumEntryNums(self, handle, feature_id, entry_nums):
+        status, feature = self.__read(handle, feature_id, GxFeatureType.ENUM)
+        if status != GxStatusList.SUCCESS:
+            return status
+        _arg_object(entry_nums).value = len(feature.entries)
+        return GxStatusList.SUCCESS
+
+    def GXGetEnumDescription(self, handle, feature_id, enum_description, buf_size):
+        status, feature = self.__read(handle, feature_id, GxFeatureType.ENUM)
+        if status != GxStatusList.SUCCESS:
+            return status
+        descriptions = _arg_object(enum_description)
+        if len(descriptions) < len(feature.entries):
+            return self.__fail(GxStatusList.NEED_MORE_BUFFER, feature.name)
+        for index, (value, symbolic) in enumerate(feature.entries):
+            descriptions[index].value = value
+            _set_char_field(descriptions[index], "symbolic", symbolic)
+        return GxStatusList.SUCCESS
+
+    def GXGetEnum(self, handle, feature_id, enum_value):
+        status, feature = self.__read(handle, feature_id, GxFeatureType.ENUM)
+        if status != GxStatusList.SUCCESS:
+            return status
+        _arg_object(enum_value).value = feature.value
+        return GxStatusList.SUCCESS
+
+    def GXSetEnum(self, handle, feature_id, value):
+        return self.__write(handle, feature_id, GxFeatureType.ENUM, int(_arg_value(value)))
+
+    def GXGetBool(self, handle, feature_id, bool_value):
+        status, feature = self.__read(handle, feature_id, GxFeatureType.BOOL)
+        if status != GxStatusList.SUCCESS:
+            return status
+        _arg_object(bool_value).value = bool(feature.value)
+        return GxStatusList.SUCCESS
+
+    def GXSetBool(self, handle, feature_id, value):
+        return self.__write(handle, feature_id, GxFeatureType.BOOL, bool(_arg_value(value)))
+
+    def GXGetStringLength(self, handle, feature_id, string_length):
+        status, feature = self.__read(handle, feature_id, GxFeatureType.STRING)
+        if status != GxStatusList.SUCCESS:
+            return status
+        _arg_object(string_length).value = len(feature.value.encode()) + 1
+        return GxStatusList.SUCCESS
+
+    def GXGetStringMaxLength(self, handle, feature_id, string_max_length):
+        status, feature = self.__read(handle, feature_id, GxFeatureType.STRING)
+        if status != GxStatusList.SUCCESS:
+            return status
+        _arg_object(string_max_length).value = (feature.maximum or len(feature.value.encode())) + 1
+        return GxStatusList.SUCCESS
+
+    def GXGetString(self, handle, feature_id, content, size):
+        status, feature = self.__read(handle, feature_id, GxFeatureType.STRING)
+        if status != GxStatusList.SUCCESS:
+            _arg_object(size).value = 1
+            if content is not None:
+                _set_char_array(_arg_object(content), "")
+            return status
+        _arg_object(size).value = len(feature.value.encode()) + 1
+        if content is not None:
+            _set_char_array(_arg_object(content), feature.value)
+        return GxStatusList.SUCCESS
+
+    def GXSetString(self, handle, feature_id, content):
+        return self.__write(handle, feature_id, GxFeatureType.STRING, _arg_string(content))
+
+    def GXSendCommand(self, handle, feature_id):
+        return self.__write(handle, feature_id, GxFeatureType.COMMAND)
+
+    # ---------------feature files-----------------------------------------
+    def GXFeatureSave(self, handle, file_path):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        status = camera.save_features(_arg_string(file_path))
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, _arg_string(file_path))
+        return status
+
+    def GXFeatureLoad(self, handle, file_path, verify):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        status = camera.load_features(_arg_string(file_path), bool(_arg_value(verify)))
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, _arg_string(file_path))
+        return status
+
+    def GXExportConfigFile(self, handle, file_path):
+        return self.GXFeatureSave(handle, file_path)
+
+    def GXImportConfigFile(self, handle, file_path, verify):
+        return self.GXFeatureLoad(handle, file_path, verify)
+
+    # ---------------callbacks---------------------------------------------
+    def GXRegisterDeviceOfflineCallback(self, handle, user_param, call_back, call_back_handle):
+        status, camera = self.__camera(handle, (_SIM_HANDLE_DEVICE,))
+        if status != GxStatusList.SUCCESS:
+            return status
+        number = next(self.__callback_numbers)
+        camera.add_offline_callback(number, call_back)
+        _arg_object(call_back_handle).value = number
+        return GxStatusList.SUCCESS
+
+    def GXUnregisterDeviceOfflineCallback(self, handle, call_back_handle):
+        entry = self.__handles.get(_arg_value(handle))
+        if entry is None or entry[1] is None:
+            return self.__fail(GxStatusList.INVALID_HANDLE)
+        entry[1].remove_offline_callback(_arg_value(call_back_handle))
+        return GxStatusList.SUCCESS
+
+    def __register_feature_callback(self, handle, key, args, call_back, call_back_handle):
+        status, feature = self.__read(handle, key)
+        if status != GxStatusList.SUCCESS:
+            return status
+        status, camera = self.__camera(handle)
+        number = next(self.__callback_numbers)
+        camera.add_feature_callback(number, feature.feature_id if isinstance(_arg_value(key), INT_TYPE)
+                                    else feature.name, call_back, args)
+        _arg_object(call_back_handle).value = number
+        return GxStatusList.SUCCESS
+
+    def __unregister_feature_callback(self, handle, call_back_handle):
+        entry = self.__handles.get(_arg_value(handle))
+        if entry is None or entry[1] is None:
+            return self.__fail(GxStatusList.INVALID_HANDLE)
+        if not entry[1].remove_feature_callback(_arg_value(call_back_handle)):
+            return self.__fail(GxStatusList.INVALID_PARAMETER, "callback handle")
+        return GxStatusList.SUCCESS
+
+    def GXRegisterFeatureCallback(self, handle, args, call_back, feature_id, call_back_handle):
+        return self.__register_feature_callback(handle, feature_id, args, call_back, call_back_handle)
+
+    def GXUnregisterFeatureCallback(self, handle, feature_id, call_back_handle):
+        return self.__unregister_feature_callback(handle, call_back_handle)
+
+    def GXRegisterFeatureCallbackByString(self, handle, args, call_back, feature_name, call_back_handle):
+        return self.__register_feature_callback(handle, feature_name, args, call_back, call_back_handle)
+
+    def GXUnregisterFeatureCallbackByString(self, handle, feature_name, call_back_handle):
+        return self.__unregister_feature_callback(handle, call_back_handle)
+
+    # ---------------acquisition-------------------------------------------
+    def GXSetAcqusitionBufferNumber(self, handle, buffer_num):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        buffer_num = _arg_value(buffer_num)
+        if buffer_num < 1:
+            return self.__fail(GxStatusList.INVALID_PARAMETER, "buffer number")
+        status = camera.get_stream().set_buffer_number(buffer_num)
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, "buffer number can not change while acquisition runs")
+        return status
+
+    def GXRegisterBuffer(self, handle, buffer, size, user_param):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        # the driver hands back the PyObject pointer passed as user_param
+        status = camera.get_stream().register_buffer(_arg_value(buffer), _arg_value(size),
+                                                     id(_arg_value(user_param)))
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, "GXRegisterBuffer")
+        return status
+
+    def GXUnRegisterBuffer(self, handle, buffer):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        status = camera.get_stream().unregister_buffer(_arg_value(buffer))
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, "GXUnRegisterBuffer")
+        return status
+
+    def GXRegisterCaptureCallback(self, handle, user_param, call_back):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        return camera.get_stream().set_callback(call_back)
+
+    def GXUnregisterCaptureCallback(self, handle):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        return camera.get_stream().set_callback(None)
+
+    def GXGetImage(self, handle, frame_data, time_out):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        stream = camera.get_stream()
+        status, index = stream.dequeue(_arg_value(time_out))
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, "GXGetImage") if status != GxStatusList.TIMEOUT else status
+
+        output = _arg_object(frame_data)
+        array, frame_buffer = stream.get_frame_buffer(index)
+        if not output.image_buf:
+            stream.release(index)
+            return self.__fail(GxStatusList.INVALID_PARAMETER, "GXGetImage image_buf")
+        ctypes.memmove(output.image_buf, array, min(output.image_size, frame_buffer.image_size))
+        for name in ("status", "width", "height", "pixel_format", "image_size", "frame_id", "timestamp"):
+            setattr(output, name, getattr(frame_buffer, name))
+        stream.release(index)
+        return GxStatusList.SUCCESS
+
+    def GXDQBuf(self, handle, frame_buffer, time_out):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        stream = camera.get_stream()
+        status, index = stream.dequeue(_arg_value(time_out))
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, "GXDQBuf") if status != GxStatusList.TIMEOUT else status
+        _arg_object(frame_buffer).contents = stream.lend(index)
+        return GxStatusList.SUCCESS
+
+    def GXQBuf(self, handle, frame_buffer):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        status = camera.get_stream().queue(_arg_object(frame_buffer).contents.buf_id)
+        if status != GxStatusList.SUCCESS:
+            return self.__fail(status, "GXQBuf buffer is not dequeued")
+        return status
+
+    def GXFlushQueue(self, handle):
+        status, camera = self.__camera(handle)
+        if status != GxStatusList.SUCCESS:
+            return status
+        return camera.get_stream().flush()
+
+
+_simulated_library = None
+
+
+def create_simulated_library():
+    """
+    :brief      Create the library gxwrapper loads for GXIPY_BACKEND=sim, with GXIPY_SIM_CAMERAS cameras
+                attached (default 1), serial numbers SIM00000001, SIM00000002, ...
+    :return:    SimulatedGxLibrary
+    """
+    global _simulated_library
+    camera_num = int(os.environ.get("GXIPY_SIM_CAMERAS", "1"))
+    cameras = [SimulatedCamera(serial_number="SIM%08d" % (index + 1), seed=index) for index in range(camera_num)]
+    _simulated_library = SimulatedGxLibrary(cameras)
+    return _simulated_library
+
+
+def get_simulated_library():
+    """
+    :brief      The simulated library in use, to attach cameras or inject faults
+    :return:    SimulatedGxLibrary, None when gxipy runs on the vendor library
+    """
+    return _simulated_library
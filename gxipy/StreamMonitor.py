@@ -0,0 +1,412 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+from gxipy.gxidef import *
+from gxipy.Exception import *
+import collections
+import logging
+import threading
+import time
+import types
+
+if sys.version_info.major > 2:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    INT_TYPE = int
+else:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    INT_TYPE = (int, long)
+
+# metric name prefix of StreamMonitor
+STREAM_METRIC_PREFIX = "gxipy_stream_"
+
+# stream counters sampled by StreamMonitor: feature name, metric name, sample key, help
+_STREAM_COUNTERS = (
+    ("StreamDeliveredFrameCount", "delivered_frames_total", "delivered", "Frames delivered by the stream"),
+    ("StreamLostFrameCount", "lost_frames_total", "lost", "Frames lost for lack of buffers"),
+    ("StreamIncompleteFrameCount", "incomplete_frames_total", "incomplete", "Frames delivered incomplete"),
+    ("StreamDeliveredPacketCount", "delivered_packets_total", "packets", "Packets delivered by the stream"),
+    # GEVDataStream only
+    ("StreamResendPacketCount", "resend_packets_total", "resend_packets", "Packets requested again"),
+    ("StreamRescuedPacketCount", "rescued_packets_total", "rescued_packets", "Packets recovered by a resend"),
+    ("StreamResendCommandCount", "resend_commands_total", "resend_commands", "Resend commands sent"),
+    ("StreamUnexpectedPacketCount", "unexpected_packets_total", "unexpected_packets", "Packets not expected"),
+    ("StreamMissingBlockIDCount", "missing_blocks_total", "missing_blocks", "Block IDs never received"),
+)
+
+_logger = logging.getLogger("gxipy.StreamMonitor")
+
+
+class MetricsRegistry:
+    """
+    In-process metric values, one series per name and label set, rendered in the Prometheus text format.
+    """
+    def __init__(self):
+        self.__mutex = threading.Lock()
+        # name -> [type, help, OrderedDict of label tuple -> value]
+        self.__metrics = collections.OrderedDict()
+
+    def __set(self, metric_type, name, value, labels, help_text, increment):
+        key = tuple(sorted((labels or {}).items()))
+        with self.__mutex:
+            metric = self.__metrics.get(name)
+            if metric is None:
+                metric = [metric_type, help_text, collections.OrderedDict()]
+                self.__metrics[name] = metric
+            elif metric[0] != metric_type:
+                raise InvalidParameter("MetricsRegistry: %s is a %s, not a %s" % (name, metric[0], metric_type))
+            if increment:
+                value += metric[2].get(key, 0)
+            metric[2][key] = value
+
+    def set_gauge(self, name, value, labels=None, help_text=""):
+        """
+        :brief      Set the value of a gauge series
+        :param      name:       metric name
+        :param      value:      int or float
+        :param      labels:     dict of label name: value, None for no label
+        :param      help_text:  description, kept from the first call
+        :return:    None
+        """
+        self.__set("gauge", name, value, labels, help_text, False)
+
+    def set_counter(self, name, value, labels=None, help_text=""):
+        """
+        :brief      Set the value of a counter series, for counters kept elsewhere (device counters)
+        :return:    None
+        """
+        self.__set("counter", name, value, labels, help_text, False)
+
+    def inc_counter(self, name, amount=1, labels=None, help_text=""):
+        """
+        :brief      Add to a counter series
+        :return:    None
+        """
+        self.__set("counter", name, amount, labels, help_text, True)
+
+    def get(self, name, labels=None):
+        """
+        :return:    value of a series, None if it was never set
+        """
+        key = tuple(sorted((labels or {}).items()))
+        with self.__mutex:
+            metric = self.__metrics.get(name)
+            return None if metric is None else metric[2].get(key)
+
+    def remove(self, labels):
+        """
+        :brief      Drop every series carrying all of the given labels, e.g. those of a closed camera
+        :param      labels:     dict of label name: value
+        :return:    None
+        """
+        items = set(labels.items())
+        with self.__mutex:
+            for metric in self.__metrics.values():
+                for key in [key for key in metric[2] if items.issubset(key)]:
+                    del metric[2][key]
+
+    @staticmethod
+    def __escape(value):
+        return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+    def to_prometheus_text(self):
+        """
+        :brief      Render every series in the Prometheus text exposition format 0.0.4
+        :return:    str
+        """
+        lines = []
+        with self.__mutex:
+            for name, (metric_type, help_text, series) in self.__metrics.items():
+                if not series:
+                    continue
+                if help_text:
+                    lines.append("# HELP %s %s" % (name, help_text.replace("\\", "\\\\").replace("\n", "\\n")))
+                lines.append("# TYPE %s %s" % (name, metric_type))
+                for key, value in series.items():
+                    label_text = ",".join("%s=\"%s\"" % (label, MetricsRegistry.__escape(label_value))
+                                          for label, label_value in key)
+                    lines.append("%s%s %s" % (name, "{%s}" % label_text if label_text else "", repr(float(value))
+                                              if isinstance(value, float) else value))
+        return "\n".join(lines) + "\n"
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class MetricsServer:
+    """
+    Serves a MetricsRegistry at http://host:port/metrics on a daemon thread, for a Prometheus scraper
+    on the same machine. Binds to the loopback interface unless told otherwise.
+    """
+    def __init__(self, registry, port=9100, host="127.0.0.1"):
+        """
+        :brief  Constructor for instance initialization
+        :param  registry:   MetricsRegistry object
+        :param  port:       TCP port, 0 picks a free one (see get_port)
+        :param  host:       address to bind
+        """
+        if not isinstance(registry, MetricsRegistry):
+            raise ParameterTypeError("MetricsServer.__init__: "
+                                     "Expected registry type is MetricsRegistry, not %s" % type(registry))
+
+        if not isinstance(port, INT_TYPE):
+            raise ParameterTypeError("MetricsServer.__init__: "
+                                     "Expected port type is int, not %s" % type(port))
+
+        self.__registry = registry
+        self.__address = (host, port)
+        self.__server = None
+        self.__thread = None
+
+    def start(self):
+        """
+        :brief      Bind the port and start serving
+        :return:    None
+        """
+        if self.__server is not None:
+            return
+
+        registry = self.__registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.__server = _ThreadingHTTPServer(self.__address, Handler)
+        self.__thread = threading.Thread(target=self.__server.serve_forever, name="MetricsServer")
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def stop(self):
+        """
+        :brief      Stop serving and release the port
+        :return:    None
+        """
+        if self.__server is None:
+            return
+
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+        self.__server = None
+        self.__thread = None
+
+    def get_port(self):
+        """
+        :return:    port served, None when stopped
+        """
+        return None if self.__server is None else self.__server.server_address[1]
+
+
+class StreamMonitor:
+    """
+    Samples the counters of a DataStream on a thread at a fixed interval and publishes them with their
+    rates, the achieved frame rate and CurrentAcquisitionFrameRate to a MetricsRegistry, labelled by
+    serial number and stream index. A loss ratio above loss_threshold over an interval is logged as a
+    warning on the "gxipy.StreamMonitor" logger, once per excursion, and its recovery as info.
+    Counters the stream does not implement (the GEV resend counters on U3V) are skipped.
+    """
+    def __init__(self, device, stream_index=0, registry=None, interval=1.0, loss_threshold=0.01,
+                 alert_callback=None):
+        """
+        :brief  Constructor for instance initialization
+        :param  device:             Device object
+        :param  stream_index:       index in Device.data_stream
+        :param  registry:           MetricsRegistry, None creates one (see get_registry)
+        :param  interval:           sampling interval in seconds
+        :param  loss_threshold:     lost / (delivered + lost) over an interval that raises an alert, range:[0, 1]
+        :param  alert_callback:     callable(sample), called when an alert is raised or cleared, sample["alert"]
+                                    tells which
+        """
+        if not isinstance(stream_index, INT_TYPE):
+            raise ParameterTypeError("StreamMonitor.__init__: "
+                                     "Expected stream_index type is int, not %s" % type(stream_index))
+
+        if stream_index < 0 or stream_index >= len(device.data_stream):
+            raise InvalidParameter("StreamMonitor.__init__: stream_index out of bounds, minimum=0, maximum=%d"
+                                   % (len(device.data_stream) - 1))
+
+        if registry is not None and not isinstance(registry, MetricsRegistry):
+            raise ParameterTypeError("StreamMonitor.__init__: "
+                                     "Expected registry type is MetricsRegistry, not %s" % type(registry))
+
+        if not isinstance(interval, (INT_TYPE, float)) or interval <= 0:
+            raise InvalidParameter("StreamMonitor.__init__: interval must be a positive number of seconds")
+
+        if not isinstance(loss_threshold, (INT_TYPE, float)) or loss_threshold < 0 or loss_threshold > 1:
+            raise InvalidParameter("StreamMonitor.__init__: loss_threshold out of bounds, minimum=0, maximum=1")
+
+        if alert_callback is not None and not callable(alert_callback):
+            raise ParameterTypeError("StreamMonitor.__init__: "
+                                     "Expected alert_callback type is callable, not %s" % type(alert_callback))
+
+        self.__device = device
+        self.__data_stream = device.data_stream[stream_index]
+        self.__registry = registry if registry is not None else MetricsRegistry()
+        self.__interval = float(interval)
+        self.__loss_threshold = float(loss_threshold)
+        self.__alert_callback = alert_callback
+        self.__labels = {"stream": str(stream_index)}
+        self.__counters = []
+        self.__previous = None
+        self.__sample = None
+        self.__alert = False
+        self.__sample_mutex = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__thread = None
+
+    def get_registry(self):
+        return self.__registry
+
+    def get_labels(self):
+        """
+        :return:    dict of the labels of the series of this stream
+        """
+        return dict(self.__labels)
+
+    def start(self):
+        """
+        :brief      Take the first sample and start the sampler thread
+        :return:    None
+        """
+        if self.__thread is not None:
+            return
+
+        try:
+            self.__labels["serial"] = self.__device.DeviceSerialNumber.get()
+        except Exception:
+            self.__labels["serial"] = ""
+        self.__counters = []
+        for feature_name, metric_name, key, help_text in _STREAM_COUNTERS:
+            feature = getattr(self.__data_stream, feature_name, None)
+            if feature is not None and feature.is_implemented() and feature.is_readable():
+                self.__counters.append((feature, STREAM_METRIC_PREFIX + metric_name, key, help_text))
+
+        self.__previous = None
+        self.__alert = False
+        self.sample()
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__run, name="StreamMonitor")
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def stop(self):
+        """
+        :brief      Stop the sampler thread, the series stay in the registry
+        :return:    None
+        """
+        if self.__thread is None:
+            return
+
+        self.__stop_event.set()
+        self.__thread.join()
+        self.__thread = None
+
+    def is_running(self):
+        return self.__thread is not None
+
+    def get_sample(self):
+        """
+        :brief      Last sample
+        :return:    dict: time, interval (seconds), the counter deltas over the interval (delivered, lost,
+                    incomplete, packets, and the GEV resend counters), fps, expected_fps, packet_rate,
+                    loss_ratio, incomplete_ratio, alert; None before start()
+        """
+        return self.__sample
+
+    def __run(self):
+        """
+        :brief      Sampler thread body
+        :return:    None
+        """
+        while not self.__stop_event.wait(self.__interval):
+            try:
+                self.sample()
+            except Exception as error:
+                self.__registry.inc_counter(STREAM_METRIC_PREFIX + "monitor_errors_total", 1, self.__labels,
+                                            "Samples that failed to read the device")
+                _logger.debug("StreamMonitor %s: %s", self.__labels, error)
+
+    def sample(self):
+        """
+        :brief      Read the counters now and publish them, called by the sampler thread
+        :return:    sample dict, see get_sample
+        """
+        with self.__sample_mutex:
+            return self.__sample_locked()
+
+    def __sample_locked(self):
+        now = time.perf_counter()
+        values = dict((key, feature.get()) for feature, metric_name, key, help_text in self.__counters)
+        try:
+            expected_fps = self.__device.CurrentAcquisitionFrameRate.get()
+        except Exception:
+            expected_fps = None
+
+        registry = self.__registry
+        labels = self.__labels
+        for feature, metric_name, key, help_text in self.__counters:
+            registry.set_counter(metric_name, values[key], labels, help_text)
+        if expected_fps is not None:
+            registry.set_gauge(STREAM_METRIC_PREFIX + "expected_fps", expected_fps, labels,
+                               "CurrentAcquisitionFrameRate of the device")
+
+        previous = self.__previous
+        self.__previous = (now, values)
+        if previous is None:
+            self.__sample = {"time": now, "interval": 0.0, "expected_fps": expected_fps, "alert": False}
+            return self.__sample
+
+        interval = now - previous[0]
+        sample = {"time": now, "interval": interval, "expected_fps": expected_fps}
+        for key, value in values.items():
+            delta = value - previous[1][key]
+            # the driver counters start over with each acquisition
+            sample[key] = value if delta < 0 else delta
+
+        delivered = sample.get("delivered", 0)
+        lost = sample.get("lost", 0)
+        sample["fps"] = delivered / interval
+        sample["packet_rate"] = sample.get("packets", 0) / interval
+        sample["loss_ratio"] = lost / float(delivered + lost) if delivered + lost else 0.0
+        sample["incomplete_ratio"] = sample.get("incomplete", 0) / float(delivered) if delivered else 0.0
+        registry.set_gauge(STREAM_METRIC_PREFIX + "fps", sample["fps"], labels,
+                           "Frames delivered per second over the last interval")
+        registry.set_gauge(STREAM_METRIC_PREFIX + "packet_rate", sample["packet_rate"], labels,
+                           "Packets delivered per second over the last interval")
+        registry.set_gauge(STREAM_METRIC_PREFIX + "loss_ratio", sample["loss_ratio"], labels,
+                           "Lost / (delivered + lost) frames over the last interval")
+        registry.set_gauge(STREAM_METRIC_PREFIX + "incomplete_ratio", sample["incomplete_ratio"], labels,
+                           "Incomplete / delivered frames over the last interval")
+
+        alert = sample["loss_ratio"] > self.__loss_threshold
+        sample["alert"] = alert
+        registry.set_gauge(STREAM_METRIC_PREFIX + "loss_alert", 1 if alert else 0, labels,
+                           "1 while the loss ratio is above the threshold")
+        self.__sample = sample
+        if alert != self.__alert:
+            self.__alert = alert
+            if alert:
+                _logger.warning("camera %s stream %s: lost %d of %d frames (%.2f%%) in %.1f s, threshold %.2f%%",
+                                labels["serial"], labels["stream"], lost, delivered + lost,
+                                sample["loss_ratio"] * 100, interval, self.__loss_threshold * 100)
+            else:
+                _logger.info("camera %s stream %s: frame loss back below %.2f%%",
+                             labels["serial"], labels["stream"], self.__loss_threshold * 100)
+            if self.__alert_callback is not None:
+                self.__alert_callback(sample)
+        return sample
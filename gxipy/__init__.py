@@ -4,8 +4,9 @@
 
 from gxipy.gxiapi import *
 from gxipy.gxidef import *
+from gxipy import profiling
 
 
-__all__ = ["gxwrapper", "dxwrapper", "gxiapi", "gxidef"]
+__all__ = ["gxwrapper", "dxwrapper", "gxiapi", "gxidef", "profiling"]
 
 __version__ = '2.0.2503.9261'
@@ -15,6 +15,7 @@ if sys.platform == 'linux2' or sys.platform == 'linux':
     try:
         dll = CDLL(filepath)
     except OSError:
+        dll = None
         print('Cannot find libdximageproc.so or libgxiapi.so.')
 else:
     try:
@@ -23,6 +24,7 @@ else:
         else:
             dll = WinDLL('DxImageProc.dll')
     except OSError:
+        dll = None
         print('Cannot find DxImageProc.dll.')
 
 def string_encoding(string):
@@ -9,4 +9,20 @@ from gxipy.gxidef import *
 from gxipy.DeviceManager import *
 from gxipy.StatusProcessor import *
 from gxipy.ImageProc import *
+from gxipy.ConvertEngine import *
+from gxipy.AcquisitionWorker import *
+from gxipy.Pipeline import *
+from gxipy.LatencyTracer import *
+from gxipy.RawRecorder import *
+from gxipy.FeatureCache import *
+from gxipy.LazyFeature import *
+from gxipy.ProfileManager import *
+from gxipy.StreamMonitor import *
+from gxipy.BufferTuner import *
+from gxipy.CameraGroup import *
+from gxipy.ProcessCapture import *
+from gxipy.ChunkDecoder import *
+from gxipy.FrameMailbox import *
+from gxipy.DeviceSupervisor import *
+from gxipy.SimBackend import *
 import types
@@ -9,10 +9,17 @@ import os
 
 NODE_FEATURE_RESERVED_16 = 16
 
-if sys.platform == 'linux2' or sys.platform == 'linux':
+# "native" loads the vendor library, "sim" runs on the in-process simulated cameras of SimBackend
+GXIPY_BACKEND = os.environ.get("GXIPY_BACKEND", "native").lower()
+
+if GXIPY_BACKEND == "sim":
+    # created below, once the structures it fills in are defined
+    dll = None
+elif sys.platform == 'linux2' or sys.platform == 'linux':
     try:
         dll = CDLL('/usr/lib/libgxiapi.so')
     except OSError:
+        dll = None
         print("Cannot find libgxiapi.so.")
 else:
     try:
@@ -36,6 +43,7 @@ else:
         else:
             dll = WinDLL('GxIAPI.dll')
     except OSError:
+        dll = None
         print('Cannot find GxIAPI.dll.')
 
 
@@ -981,6 +989,10 @@ class GxEnumDetailFeatrue( Structure):
     def __str__(self):
         return "GxEnumDetailFeatrue\n%s" % "\n".join("%s:\t%s" % (n, getattr(self, n[0])) for n in self._fields_)
 
+if GXIPY_BACKEND == "sim":
+    from gxipy.SimBackend import create_simulated_library
+    dll = create_simulated_library()
+
 if hasattr(dll, 'GXSetLogType'):
     def gx_set_log_type(log_type):
         """
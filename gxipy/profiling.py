@@ -0,0 +1,249 @@
+#!/usr/bin/python
+# -*- coding:utf-8 -*-
+# -*-mode:python ; tab-width:4 -*- ex:set tabstop=4 shiftwidth=4 expandtab: -*-
+
+"""
+Opt-in timing of the gx_* and dx_* wrappers of gxwrapper and dxwrapper.
+
+enable() replaces every wrapper, in gxwrapper, dxwrapper and in each gxipy module that imported it,
+by a timed one that counts its calls, total and max wall time and errors (an exception, or a
+status other than SUCCESS and TIMEOUT); disable() puts the originals back, so there is no cost
+at all while profiling is off. Set GXIPY_PROFILE=1 to enable it when gxipy is imported,
+GXIPY_PROFILE=stacks to record the Python call stacks as well.
+
+    gxipy.profiling.enable()
+    ...
+    print(gxipy.profiling.report())
+    gxipy.profiling.dump_json("gxipy_profile.json")
+    gxipy.profiling.dump_collapsed("gxipy_profile.folded")    # flamegraph.pl gxipy_profile.folded
+"""
+
+from gxipy.gxwrapper import GxStatusList
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import types
+
+# modules whose gx_* and dx_* functions are timed
+PROFILING_MODULES = ("gxipy.gxwrapper", "gxipy.dxwrapper")
+PROFILING_PREFIXES = ("gx_", "dx_")
+# Python frames kept above a wrapper in the recorded stacks
+PROFILING_STACK_DEPTH = 32
+
+_mutex = threading.Lock()
+_statistics = {}            # function name -> [calls, total seconds, max seconds, errors]
+_stacks = {}                # collapsed stack -> [calls, total seconds]
+_originals = {}             # timed function -> original function
+_stack_depth = 0
+_start_time = None
+
+
+def _is_error(result):
+    """
+    :brief      Whether a wrapper result carries a failure status, a TIMEOUT is not one
+    """
+    status = result[0] if isinstance(result, tuple) and len(result) != 0 else result
+    if isinstance(status, bool) or not isinstance(status, int):
+        return False
+    return status != GxStatusList.SUCCESS and status != GxStatusList.TIMEOUT
+
+
+def _get_stack(frame, name):
+    """
+    :brief      Collapsed stack of a call: the Python frames from the outermost one, then the wrapper
+    """
+    names = [name]
+    while frame is not None and len(names) <= _stack_depth:
+        code = frame.f_code
+        names.append("%s:%s" % (frame.f_globals.get("__name__", "?"), code.co_name))
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+def _record(name, elapsed, failed, frame):
+    with _mutex:
+        entry = _statistics.get(name)
+        if entry is None:
+            entry = _statistics[name] = [0, 0.0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+        if failed:
+            entry[3] += 1
+        if frame is not None:
+            stack = _get_stack(frame, name)
+            stack_entry = _stacks.get(stack)
+            if stack_entry is None:
+                stack_entry = _stacks[stack] = [0, 0.0]
+            stack_entry[0] += 1
+            stack_entry[1] += elapsed
+
+
+def _time(name, function):
+    """
+    :brief      Timed version of a wrapper
+    """
+    perf_counter = time.perf_counter
+
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except Exception:
+            _record(name, perf_counter() - start, True, sys._getframe(1) if _stack_depth else None)
+            raise
+        _record(name, perf_counter() - start, _is_error(result), sys._getframe(1) if _stack_depth else None)
+        return result
+    return timed
+
+
+def _replace(replacements):
+    """
+    :brief      Rebind every global of the loaded gxipy modules found in replacements
+    :param      replacements:   dict of function: function to bind instead
+    """
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not (module_name == "gxipy" or module_name.startswith("gxipy.")):
+            continue
+        namespace = vars(module)
+        for attribute, value in list(namespace.items()):
+            if isinstance(value, types.FunctionType) and value in replacements:
+                namespace[attribute] = replacements[value]
+
+
+def enable(stacks=False, stack_depth=PROFILING_STACK_DEPTH):
+    """
+    :brief      Start timing the wrappers, the statistics gathered so far are kept
+    :param      stacks:         True: record the Python call stack of every call as well, for dump_collapsed,
+                                this costs a walk of the stack per call
+    :param      stack_depth:    Python frames kept per stack
+    :return:    None
+    """
+    global _stack_depth, _start_time
+    with _mutex:
+        _stack_depth = stack_depth if stacks else 0
+        if _start_time is None:
+            _start_time = time.perf_counter()
+    if _originals:
+        return
+
+    replacements = {}
+    for module_name in PROFILING_MODULES:
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        for name, value in list(vars(module).items()):
+            if name.startswith(PROFILING_PREFIXES) and isinstance(value, types.FunctionType):
+                replacements[value] = _time(name, value)
+    _replace(replacements)
+    _originals.update((timed, original) for original, timed in replacements.items())
+
+
+def disable():
+    """
+    :brief      Put the original wrappers back, the statistics are kept
+    :return:    None
+    """
+    if not _originals:
+        return
+    _replace(_originals)
+    _originals.clear()
+
+
+def is_enabled():
+    return len(_originals) != 0
+
+
+def reset():
+    """
+    :brief      Drop the statistics and restart the wall clock of the report
+    :return:    None
+    """
+    global _start_time
+    with _mutex:
+        _statistics.clear()
+        _stacks.clear()
+        _start_time = time.perf_counter() if _originals else None
+
+
+def get_statistics():
+    """
+    :brief      Statistics per wrapper since enable() or reset()
+    :return:    dict of function name: {calls, total, mean, max (seconds), errors}
+    """
+    with _mutex:
+        return dict((name, {"calls": calls, "total": total, "mean": total / calls if calls else 0.0,
+                            "max": maximum, "errors": errors})
+                    for name, (calls, total, maximum, errors) in _statistics.items())
+
+
+def get_wall_time():
+    """
+    :return:    seconds since enable() or reset(), 0.0 if profiling was never enabled
+    """
+    return 0.0 if _start_time is None else time.perf_counter() - _start_time
+
+
+def report(sort="total", limit=None):
+    """
+    :brief      Table of the wrappers, the share is the part of the wall time spent in a wrapper
+                (summed over the threads, so it may exceed 100%)
+    :param      sort:   "total", "calls", "max", "mean" or "errors", descending
+    :param      limit:  rows kept, None for all
+    :return:    str
+    """
+    if sort not in ("total", "calls", "max", "mean", "errors"):
+        raise ValueError("profiling.report: sort must be total, calls, max, mean or errors, not %s" % sort)
+
+    statistics = get_statistics()
+    wall_time = get_wall_time()
+    rows = sorted(statistics.items(), key=lambda item: item[1][sort], reverse=True)
+    if limit is not None:
+        rows = rows[:limit]
+
+    lines = ["%-40s %10s %12s %10s %10s %8s %8s" % ("function", "calls", "total ms", "mean us", "max us",
+                                                      "errors", "share")]
+    for name, result in rows:
+        lines.append("%-40s %10d %12.3f %10.2f %10.2f %8d %7.2f%%" % (
+            name, result["calls"], result["total"] * 1e3, result["mean"] * 1e6, result["max"] * 1e6,
+            result["errors"], result["total"] / wall_time * 100 if wall_time > 0 else 0.0))
+    total = sum(result["total"] for result in statistics.values())
+    lines.append("%d functions, %.3f ms in wrappers over %.3f s of wall time" % (len(statistics), total * 1e3,
+                                                                              wall_time))
+    return "\n".join(lines)
+
+
+def dump_json(file_path):
+    """
+    :brief      Write the statistics as JSON: {"wall_time": seconds, "functions": get_statistics()}
+    :return:    None
+    """
+    with open(file_path, "w") as json_file:
+        json.dump({"wall_time": get_wall_time(), "functions": get_statistics()}, json_file, indent=4,
+                  sort_keys=True)
+
+
+def dump_collapsed(file_path):
+    """
+    :brief      Write collapsed stacks for flamegraph.pl or speedscope, one "frame;frame;function weight" line
+                per stack, weighted in microseconds. Without enable(stacks=True) every function is its own
+                stack under "gxipy".
+    :return:    None
+    """
+    with _mutex:
+        if _stacks:
+            lines = ["%s %d" % (stack, round(total * 1e6)) for stack, (calls, total) in _stacks.items()]
+        else:
+            lines = ["gxipy;%s %d" % (name, round(entry[1] * 1e6)) for name, entry in _statistics.items()]
+    with open(file_path, "w") as collapsed_file:
+        collapsed_file.write("\n".join(sorted(lines)) + "\n")
+
+
+if os.environ.get("GXIPY_PROFILE", "") not in ("", "0"):
+    enable(stacks=os.environ.get("GXIPY_PROFILE") == "stacks")